@@ -0,0 +1,113 @@
+"""
+Benchmark da camada de calibração de probabilidades.
+
+Mede o custo de apply_calibration sobre o cálculo escalar e sobre o lote
+vetorizado. Usa as tabelas treinadas nos backtests quando existem e, se
+não houver previsões salvas, tabelas ajustadas em dados sintéticos
+(apenas em memória). Com previsões de backtest disponíveis, também
+compara Brier score antes/depois numa divisão treino/teste.
+
+Uso:
+    python calibration_benchmark.py [N] [--method isotonic|platt]
+"""
+import sys
+import time
+import random
+import logging
+
+import numpy as np
+
+from utils.ai import calculate_advanced_probabilities
+from utils.backtest import brier_score, load_backtest_predictions
+from utils.calibration import (
+    CALIBRATED_MARKETS, apply_calibration, build_table, load_calibration, use_calibration
+)
+from utils.probabilities import calculate_batch_probabilities, team_feature_arrays
+from probability_benchmark import random_team, SEASON_ID
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+def synthetic_tables(method, rng):
+    """Tabelas ajustadas em previsões sintéticas (superconfiantes) para todos os mercados"""
+    tables = {}
+    for market in CALIBRATED_MARKETS:
+        probs = rng.uniform(0.02, 0.98, 5000)
+        true_probs = 0.5 + (probs - 0.5) * 0.7
+        outcomes = (rng.uniform(size=probs.size) < true_probs).astype(np.float64)
+        tables[market] = build_table(probs, outcomes, method)
+    return tables
+
+
+def holdout_report(method):
+    """Brier antes/depois da calibração com metade das previsões de backtest"""
+    predictions = load_backtest_predictions()
+    for market in ("over_2_5", "btts", "cards_over_3_5", "corners_over_9_5"):
+        if market not in predictions or len(predictions[market]["prob"]) < 400:
+            continue
+        probs = predictions[market]["prob"]
+        outcomes = predictions[market]["outcome"]
+        order = np.random.default_rng(0).permutation(len(probs))
+        train, test = order[: len(order) // 2], order[len(order) // 2:]
+        table = build_table(probs[train], outcomes[train], method)
+        calibrated = np.interp(probs[test], table["x"], table["y"])
+        print(f"  {market:<18} Brier {brier_score(probs[test], outcomes[test]):.4f} -> "
+              f"{brier_score(calibrated, outcomes[test]):.4f} (n teste = {len(test)})")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    method = "isotonic"
+    if "--method" in args:
+        index = args.index("--method")
+        method = args[index + 1]
+        del args[index:index + 2]
+    n = int(args[0]) if args else 2000
+
+    if load_calibration():
+        print("Usando tabelas de calibração treinadas.")
+    else:
+        print(f"Sem tabelas treinadas; usando tabelas sintéticas ({method}) em memória.")
+        use_calibration(synthetic_tables(method, np.random.default_rng(7)))
+
+    rng = random.Random(42)
+    home_teams = [random_team(rng) for _ in range(n)]
+    away_teams = [random_team(rng) for _ in range(n)]
+
+    # Escalar: cálculo vs calibração de cada resultado
+    start = time.perf_counter()
+    results = [calculate_advanced_probabilities(h, a, season_id=SEASON_ID, use_cache=False)
+               for h, a in zip(home_teams, away_teams)]
+    scalar_time = time.perf_counter() - start
+    results = [r for r in results if r]
+
+    start = time.perf_counter()
+    for result in results:
+        apply_calibration(result)
+    scalar_calibration_time = time.perf_counter() - start
+
+    # Lote: cálculo vs calibração do lote inteiro
+    home_arrays = team_feature_arrays(home_teams)
+    away_arrays = team_feature_arrays(away_teams)
+    start = time.perf_counter()
+    batch = calculate_batch_probabilities(home_arrays, away_arrays, season_ids=SEASON_ID)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    calibrated_batch = apply_calibration(batch)
+    batch_calibration_time = time.perf_counter() - start
+
+    valid = calibrated_batch["valid"]
+    total = (calibrated_batch["moneyline"]["home_win"] + calibrated_batch["moneyline"]["draw"] +
+             calibrated_batch["moneyline"]["away_win"])[valid]
+
+    print(f"\n{n} jogos")
+    print(f"Escalar: cálculo {scalar_time / n * 1e6:8.1f} µs/jogo, "
+          f"calibração {scalar_calibration_time / max(len(results), 1) * 1e6:6.1f} µs/jogo")
+    print(f"Lote:    cálculo {batch_time / n * 1e6:8.2f} µs/jogo, "
+          f"calibração {batch_calibration_time / n * 1e6:6.2f} µs/jogo "
+          f"({batch_calibration_time * 1000:.2f} ms no total)")
+    print(f"1X2 calibrado soma 100%: {bool(np.allclose(total, 100))}")
+
+    print("\nHoldout das previsões de backtest:")
+    holdout_report(method)
@@ -0,0 +1,44 @@
+"""
+Conferência dos contadores de créditos dos usuários.
+
+Compara o contador de créditos usados de cada usuário (mantido a cada
+registro de uso) com a soma do histórico de uso contabilizado e, com
+--repair, reconstrói os contadores divergentes a partir do histórico.
+
+Uso:
+    python check_credits.py [--repair]
+"""
+import sys
+import time
+import logging
+
+from utils.data import UserManager
+
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    repair = "--repair" in args
+    if any(arg != "--repair" for arg in args):
+        print(__doc__)
+        sys.exit(1)
+
+    user_manager = UserManager()
+    start = time.perf_counter()
+    mismatches = user_manager.check_credit_counters(repair=repair)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(user_manager.users)} usuários conferidos em {elapsed:.3f}s")
+    for email, stored, expected in mismatches[:20]:
+        print(f"  {email}: contador {stored}, histórico {expected}")
+    if len(mismatches) > 20:
+        print(f"  ... e mais {len(mismatches) - 20}")
+
+    if not mismatches:
+        print("Todos os contadores conferem com o histórico.")
+    elif repair:
+        print(f"{len(mismatches)} contadores reconstruídos a partir do histórico.")
+    else:
+        print(f"{len(mismatches)} contadores divergentes (use --repair para reconstruir).")
+        sys.exit(2)
@@ -0,0 +1,143 @@
+"""
+Teste de concorrência do desconto de créditos.
+
+Vários processos, cada um com várias threads e o próprio UserManager (como
+workers diferentes do servidor), tentam consumir créditos da mesma conta ao
+mesmo tempo, pedindo bem mais do que o saldo. Ao final confere que nenhum
+crédito foi gasto além do saldo, que os consumos aceitos batem com o
+contador do usuário e com os eventos de uso, e que o contador confere com o
+histórico (check_credit_counters).
+
+Com --unsafe, usa o caminho antigo (get_usage_stats seguido de
+record_usage), que confere e desconta em passos separados, para mostrar o
+gasto além do saldo que consume_credits evita.
+
+Uso:
+    python credit_stress_test.py [--processes 4] [--threads 8] [--attempts 50]
+                                 [--credits 100] [--unsafe]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import logging
+import tempfile
+import threading
+import multiprocessing
+
+EMAIL = "stress@valuehunter.test"
+
+DEFAULTS = {
+    "--processes": 4,
+    "--threads": 8,
+    "--attempts": 50,
+    "--credits": 100
+}
+
+
+def parse_args(args):
+    """Lê as opções numéricas e --unsafe da linha de comando"""
+    options = dict(DEFAULTS, **{"--unsafe": "--unsafe" in args})
+    args = [arg for arg in args if arg != "--unsafe"]
+    for option in DEFAULTS:
+        if option in args:
+            index = args.index(option)
+            options[option] = int(args[index + 1])
+            del args[index:index + 2]
+    if args:
+        print(__doc__)
+        sys.exit(1)
+    return options
+
+
+def worker(directory, threads, attempts, unsafe, seed, results):
+    """Processo worker: várias threads consumindo créditos da mesma conta"""
+    logging.basicConfig(level=logging.CRITICAL)
+    from utils.data import UserManager
+
+    user_manager = UserManager(storage_path=os.path.join(directory, "user_data.json"),
+                               db_path=os.path.join(directory, "users.db"))
+    accepted = []
+    lock = threading.Lock()
+
+    def run(thread_seed):
+        rng = random.Random(thread_seed)
+        for _ in range(attempts):
+            markets = rng.randint(1, 3)
+            if unsafe:
+                stats = user_manager.get_usage_stats(EMAIL)
+                consumed = (stats["credits_remaining"] >= markets
+                            and user_manager.record_usage(EMAIL, markets))
+            else:
+                consumed = user_manager.consume_credits(EMAIL, markets, {"league": "Stress"})
+            if consumed:
+                with lock:
+                    accepted.append(markets)
+
+    pool = [threading.Thread(target=run, args=(seed * 1000 + i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    results.put(accepted)
+
+
+if __name__ == "__main__":
+    options = parse_args(sys.argv[1:])
+    logging.basicConfig(level=logging.CRITICAL)
+    from utils.data import UserManager
+
+    directory = tempfile.mkdtemp(prefix="credit_stress_")
+    setup = UserManager(storage_path=os.path.join(directory, "user_data.json"),
+                        db_path=os.path.join(directory, "users.db"))
+    setup.register_user(EMAIL, "stress-test", "Stress", "pro")
+    base = setup.tiers["pro"].total_credits
+    setup.add_credits(EMAIL, max(0, options["--credits"] - base))
+    available = setup.get_usage_stats(EMAIL)["credits_remaining"]
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(directory, options["--threads"], options["--attempts"],
+                                                      options["--unsafe"], seed, results))
+                 for seed in range(options["--processes"])]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    accepted = [markets for _ in processes for markets in results.get()]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+
+    final = UserManager(storage_path=os.path.join(directory, "user_data.json"),
+                        db_path=os.path.join(directory, "users.db"))
+    credits_used = final.users[EMAIL]["credits_used"]
+    events = final.admin_summary()["analyses"]
+    mismatches = final.check_credit_counters()
+    requested = options["--processes"] * options["--threads"] * options["--attempts"]
+
+    print(f"Modo: {'inseguro (conferir e depois registrar)' if options['--unsafe'] else 'consume_credits'}")
+    print(f"{options['--processes']} processos x {options['--threads']} threads x {options['--attempts']} tentativas "
+          f"= {requested} tentativas em {elapsed:.2f}s ({requested / elapsed:.0f}/s)")
+    print(f"Saldo inicial: {available} créditos")
+    print(f"Aceitos: {len(accepted)} consumos, {sum(accepted)} créditos")
+    print(f"Registrado: {credits_used} créditos usados, {events} eventos de uso")
+
+    problems = []
+    if credits_used > available:
+        problems.append(f"gasto além do saldo: {credits_used - available} créditos")
+    if credits_used != sum(accepted) or events != len(accepted):
+        problems.append("consumos aceitos não batem com o registrado")
+    if mismatches:
+        problems.append(f"contador diverge do histórico: {mismatches}")
+    if available - credits_used >= 3:
+        problems.append(f"saldo não foi esgotado: restam {available - credits_used} créditos")
+
+    final.store.close()
+    setup.store.close()
+    shutil.rmtree(directory, ignore_errors=True)
+    if problems:
+        for problem in problems:
+            print(f"FALHA: {problem}")
+        sys.exit(2)
+    print("OK: nenhum crédito perdido ou gasto em dobro.")
@@ -0,0 +1,138 @@
+"""
+Benchmark de tempo de importação dos módulos do ValueHunter.
+
+Executa cada cenário num interpretador novo com ``python -X importtime``
+e soma o tempo próprio dos módulos do projeto, além do pico de memória
+alocada durante a importação, para acompanhar o custo de cold start e a
+memória de cada worker. Use ``--save`` para registrar o
+resultado no histórico em ``data/benchmarks/import_time.json``.
+
+Uso:
+    python import_time_benchmark.py [--runs N] [--save]
+"""
+import os
+import sys
+import json
+import subprocess
+import statistics
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Cenário -> código executado no interpretador novo
+SCENARIOS = {
+    "prompt_adapter (pacote)": "import utils.prompt_adapter",
+    "prompt_adapter (dashboard)": "from utils.prompt_adapter import simplify_api_data",
+    "prompt_adapter (todas as estratégias)": (
+        "import utils.prompt_adapter as pa\n"
+        "[getattr(pa, name) for name in pa.__all__]"
+    ),
+}
+
+
+def measure_import(code):
+    """
+    Mede o tempo de importação dos módulos do projeto para um trecho de código.
+
+    Args:
+        code (str): Código Python a executar
+
+    Returns:
+        tuple: (tempo em microssegundos, módulos do projeto, pico de memória em KB)
+    """
+    wrapped = (
+        "import tracemalloc\n"
+        "tracemalloc.start()\n"
+        f"{code}\n"
+        "print(tracemalloc.get_traced_memory()[1])\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", wrapped],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    # Formato: "import time: self [us] | cumulative | imported package"
+    total_us = 0
+    modules = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        name = parts[2].rstrip()
+        if name.strip().startswith(("utils", "pages")) and parts[0].strip().isdigit():
+            # Apenas o tempo próprio, para não contar módulos aninhados duas vezes
+            total_us += int(parts[0])
+            modules += 1
+    peak_kb = int(result.stdout.strip().splitlines()[-1]) / 1024
+    return total_us, modules, peak_kb
+
+
+def run_benchmark(runs=5):
+    """
+    Executa todos os cenários e retorna a mediana de cada um.
+
+    Args:
+        runs (int): Número de execuções por cenário
+
+    Returns:
+        dict: Resultado por cenário
+    """
+    results = {}
+    for label, code in SCENARIOS.items():
+        samples = []
+        modules = 0
+        peak_kb = 0
+        for _ in range(runs):
+            elapsed, modules, peak_kb = measure_import(code)
+            samples.append(elapsed)
+        results[label] = {
+            "median_us": int(statistics.median(samples)),
+            "min_us": min(samples),
+            "modules": modules,
+            "peak_kb": round(peak_kb, 1),
+        }
+    return results
+
+
+def save_results(results):
+    """Adiciona o resultado ao histórico de benchmarks"""
+    bench_dir = os.path.join(ROOT_DIR, "data", "benchmarks")
+    os.makedirs(bench_dir, exist_ok=True)
+    history_file = os.path.join(bench_dir, "import_time.json")
+
+    history = []
+    if os.path.exists(history_file):
+        try:
+            with open(history_file, "r") as f:
+                history = json.load(f)
+        except Exception as e:
+            print(f"Erro ao ler histórico, recriando: {str(e)}")
+
+    history.append({"timestamp": datetime.now().isoformat(), "results": results})
+    with open(history_file, "w") as f:
+        json.dump(history, f, indent=2)
+    print(f"\nResultado salvo em {history_file}")
+
+
+if __name__ == "__main__":
+    runs = 5
+    if "--runs" in sys.argv:
+        runs = int(sys.argv[sys.argv.index("--runs") + 1])
+
+    print(f"Medindo tempo de importação ({runs} execuções por cenário)...\n")
+    results = run_benchmark(runs)
+
+    print(f"{'Cenário':<40} {'Mediana (ms)':>13} {'Mínimo (ms)':>12} "
+          f"{'Módulos':>8} {'Memória (KB)':>13}")
+    print("-" * 90)
+    for label, data in results.items():
+        print(f"{label:<40} {data['median_us'] / 1000:>13.2f} "
+              f"{data['min_us'] / 1000:>12.2f} {data['modules']:>8} "
+              f"{data['peak_kb']:>13.1f}")
+
+    if "--save" in sys.argv:
+        save_results(results)
@@ -0,0 +1,92 @@
+"""
+Migração do user_data.json para o banco SQLite de usuários.
+
+Importa usuários e registros de uso do arquivo JSON legado para o banco
+usado pelo UserManager (utils/user_store.py), numa única transação, e
+confere que o conteúdo do banco reproduz o arquivo. Usuários já presentes
+no banco são mantidos, a menos que --replace seja informado.
+
+Uso:
+    python migrate_users.py [--json data/user_data.json] [--db data/users.db] [--replace]
+"""
+import os
+import sys
+import json
+import time
+import logging
+
+from utils.core import DATA_DIR
+from utils.user_store import SQLiteUserStore
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+
+def parse_args(args):
+    """Lê --json, --db e --replace da linha de comando"""
+    options = {"--json": os.path.join(DATA_DIR, "user_data.json"),
+               "--db": os.path.join(DATA_DIR, "users.db"),
+               "--replace": False}
+    args = list(args)
+    if "--replace" in args:
+        options["--replace"] = True
+        args.remove("--replace")
+    for option in ("--json", "--db"):
+        if option in args:
+            index = args.index(option)
+            options[option] = args[index + 1]
+            del args[index:index + 2]
+    if args:
+        print(__doc__)
+        sys.exit(1)
+    return options
+
+
+def normalized(users):
+    """
+    Usuários comparáveis: sem campos nulos, créditos com padrão 0 e listas de uso ordenadas
+
+    O JSON legado não tem credits_used; o padrão é a soma dos mercados do
+    histórico total, que é como o banco reconstrói o contador na importação.
+    """
+    result = {}
+    for email, user in users.items():
+        user = {key: value for key, value in user.items() if value is not None}
+        user.setdefault("purchased_credits", 0)
+        usage = user.get("usage") or {}
+        user["usage"] = {key: sorted(usage.get(key) or [], key=lambda u: json.dumps(u, sort_keys=True))
+                         for key in ("daily", "total")}
+        user.setdefault("credits_used", sum(u.get("markets", 0) or 0 for u in user["usage"]["total"]))
+        result[email] = user
+    return result
+
+
+if __name__ == "__main__":
+    options = parse_args(sys.argv[1:])
+
+    if not os.path.exists(options["--json"]):
+        print(f"Arquivo não encontrado: {options['--json']}")
+        sys.exit(1)
+    with open(options["--json"], "r", encoding="utf-8") as f:
+        users = json.load(f)
+
+    start = time.perf_counter()
+    store = SQLiteUserStore(options["--db"])
+    existing = set() if options["--replace"] else set(store.load_users())
+    imported_users, imported_usage = store.import_users(users, replace=options["--replace"])
+    elapsed = time.perf_counter() - start
+
+    print(f"{imported_users} de {len(users)} usuários importados ({imported_usage} registros de uso) "
+          f"para {options['--db']} em {elapsed:.2f}s")
+    if imported_users < len(users):
+        print("Usuários já existentes no banco foram mantidos (use --replace para sobrescrever).")
+
+    # Conferência: o banco deve reproduzir o arquivo para os usuários importados
+    stored = store.load_users(include_usage=True)
+    checked = [email for email in users if email not in existing]
+    expected = normalized({email: users[email] for email in checked})
+    actual = normalized({email: stored[email] for email in checked if email in stored})
+    differences = [email for email in checked if expected[email] != actual.get(email)]
+    if differences:
+        print(f"Atenção: {len(differences)} usuários diferem do arquivo, ex.: {differences[:5]}")
+        sys.exit(2)
+    print("Conferência OK: banco e arquivo JSON têm o mesmo conteúdo.")
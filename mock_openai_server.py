@@ -0,0 +1,216 @@
+"""
+Servidor local compatível com a API de chat completions da OpenAI.
+
+Substitui a OpenAI em testes de carga do caminho de IA, com latência
+realista: responde em ``/v1/chat/completions`` (com e sem streaming) no
+formato de análise esperado pelo dashboard (texto ou JSON, conforme o
+``response_format``), com tempo até o primeiro
+token, velocidade de geração e taxa de erros configuráveis. Erros são
+devolvidos como HTTP 429/500 no formato da OpenAI (o cliente oficial
+tenta novamente, como faria em produção).
+
+Uso:
+    python mock_openai_server.py [--port 8011] [--latency 0.8] [--tps 50]
+                                 [--output-tokens 600] [--error-rate 0.0] [--seed N]
+
+Depois aponte o app para ele:
+    OPENAI_BASE_URL=http://127.0.0.1:8011/v1 streamlit run _app.py
+
+Com OPENAI_BASE_URL configurado o cache GPT fica desligado: toda análise
+chega ao servidor e nenhuma resposta de teste é gravada em DATA_DIR/gpt_cache.
+"""
+import sys
+import json
+import time
+import uuid
+import random
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.prompt_budget import count_tokens
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger("valueHunter.mock_openai")
+
+DEFAULTS = {
+    "--port": 8011,
+    "--latency": 0.8,        # segundos até o primeiro token
+    "--tps": 50.0,           # tokens de saída por segundo
+    "--output-tokens": 600,  # tamanho aproximado da resposta
+    "--error-rate": 0.0,     # fração de requisições que falham
+    "--seed": None
+}
+
+FILLER = ("Os dados indicam equilíbrio moderado entre as equipes, com leve vantagem para o mandante "
+          "considerando forma recente, consistência e produção ofensiva. ").split()
+
+
+def build_answer(messages, output_tokens):
+    """Resposta no formato de análise, com o tamanho aproximado pedido"""
+    prompt = messages[-1].get("content", "") if messages else ""
+    first_line = prompt.strip().splitlines()[0] if prompt.strip() else "# Time A vs Time B"
+    teams = first_line.lstrip("# ").replace(" vs ", " x ")
+
+    sections = [
+        f"# Análise da Partida\n## {teams}\n",
+        "# Análise de Mercados Disponíveis:\n",
+        "# Probabilidades Calculadas (REAL vs IMPLÍCITA):\n",
+        "# Oportunidades Identificadas:\n",
+        "# Nível de Confiança Geral: Médio\n"
+    ]
+    words = []
+    per_section = max(1, output_tokens // len(sections))
+    for index, section in enumerate(sections):
+        words.append(section)
+        words.extend(f"{FILLER[(index + i) % len(FILLER)]} " for i in range(per_section))
+        words.append("\n\n")
+    return words
+
+
+def build_json_answer(messages, output_tokens):
+    """Resposta no schema estruturado (response_format), com o tamanho aproximado pedido"""
+    explanation = "".join(f"{FILLER[i % len(FILLER)]} " for i in range(max(1, output_tokens - 40))).strip()
+    answer = json.dumps({
+        "markets": [],
+        "opportunities": [],
+        "confidence": {"level": "Médio", "explanation": explanation}
+    }, ensure_ascii=False)
+    # Fatias pequenas para o streaming
+    return [answer[i:i + 16] for i in range(0, len(answer), 16)]
+
+
+class ChatCompletionsHandler(BaseHTTPRequestHandler):
+    config = dict(DEFAULTS)
+    rng = random.Random()
+    rng_lock = threading.Lock()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _should_fail(self):
+        with self.rng_lock:
+            return self.rng.random() < self.config["--error-rate"], self.rng.random() < 0.5
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "gpt-4o", "object": "model", "owned_by": "local"}]})
+        else:
+            self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error", "code": None}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error", "code": None}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Invalid JSON", "type": "invalid_request_error", "code": None}})
+            return
+
+        fail, rate_limited = self._should_fail()
+        if fail:
+            if rate_limited:
+                self._send_json(429, {"error": {"message": "Rate limit reached (simulado)",
+                                                "type": "requests", "code": "rate_limit_exceeded"}})
+            else:
+                self._send_json(500, {"error": {"message": "Erro interno simulado",
+                                                "type": "server_error", "code": None}})
+            return
+
+        messages = request.get("messages", [])
+        model = request.get("model", "gpt-4o")
+        response_format = (request.get("response_format") or {}).get("type")
+        if response_format in ("json_schema", "json_object"):
+            words = build_json_answer(messages, int(self.config["--output-tokens"]))
+        else:
+            words = build_answer(messages, int(self.config["--output-tokens"]))
+        prompt_tokens = sum(count_tokens(m.get("content", "")) for m in messages)
+        completion_tokens = count_tokens("".join(words))
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        token_interval = 1.0 / self.config["--tps"] if self.config["--tps"] > 0 else 0.0
+
+        time.sleep(self.config["--latency"])
+
+        if not request.get("stream"):
+            # Sem streaming: a resposta inteira chega após o tempo de geração
+            time.sleep(completion_tokens * token_interval)
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(words)},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens}
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send_chunk(delta, finish_reason=None):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        try:
+            send_chunk({"role": "assistant", "content": ""})
+            for word in words:
+                send_chunk({"content": word})
+                time.sleep(count_tokens(word) * token_interval)
+            send_chunk({}, "stop")
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.info("Cliente encerrou o streaming antes do fim")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    config = dict(DEFAULTS)
+    for option in DEFAULTS:
+        if option in args:
+            index = args.index(option)
+            config[option] = float(args[index + 1])
+            del args[index:index + 2]
+    if args:
+        print(__doc__)
+        sys.exit(1)
+
+    ChatCompletionsHandler.config = config
+    if config["--seed"] is not None:
+        ChatCompletionsHandler.rng = random.Random(int(config["--seed"]))
+
+    server = ThreadingHTTPServer(("127.0.0.1", int(config["--port"])), ChatCompletionsHandler)
+    server.daemon_threads = True
+    logger.info(f"Servidor compatível com a OpenAI em http://127.0.0.1:{int(config['--port'])}/v1 "
+                f"(latência {config['--latency']}s, {config['--tps']} tokens/s, "
+                f"erros {config['--error-rate'] * 100:.0f}%)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -19,7 +19,7 @@ st.set_page_config(
 # Importar funções necessárias
 try:
     from utils.core import show_valuehunter_logo, DATA_DIR
-    from utils.data import UserManager
+    from utils.data import get_user_manager
 except ImportError:
     st.error("Não foi possível importar os módulos necessários. Verifique a estrutura do projeto.")
     st.stop()
@@ -31,6 +31,9 @@ logger = logging.getLogger("valueHunter.admin")
 # Senha de administrador
 ADMIN_PASSWORD = "nabundinha1"  # Altere para sua senha
 
+# Usuários por página na lista de usuários
+USERS_PER_PAGE = 50
+
 # Header 
 show_valuehunter_logo()
 st.title("Painel Administrativo")
@@ -41,40 +44,35 @@ password = st.text_input("Senha de Administrador", type="password")
 if password == ADMIN_PASSWORD:
     st.success("Acesso autorizado!")
     
-    # Carregar dados dos usuários
-    user_data_path = os.path.join(DATA_DIR, "user_data.json")
-    
     try:
-        with open(user_data_path, 'r', encoding='utf-8') as f:
-            users_data = json.load(f)
+        # Agregados mantidos a cada cadastro, compra e análise (sem percorrer os usuários)
+        user_manager = get_user_manager()
+        summary = user_manager.admin_summary(top=10, days=30, recent=20)
             
-        # Seção 1: Download
+        # Seção 1: Download (sempre no formato do user_data.json, gerado só quando pedido)
         st.header("Gerenciamento de Dados")
-        with open(user_data_path, 'r', encoding='utf-8') as f:
-            data = f.read()
-            
-        st.download_button(
-            "Baixar Dados de Usuários", 
-            data, 
-            "user_data.json", 
-            "application/json"
-        )
+        if st.button("Preparar exportação"):
+            data = json.dumps(user_manager.export_users(), indent=2, ensure_ascii=False)
+            
+            st.download_button(
+                "Baixar Dados de Usuários", 
+                data, 
+                "user_data.json", 
+                "application/json"
+            )
         
         # Mostrar estatísticas dos usuários
         st.header("Estatísticas do Sistema")
         
-        num_users = len(users_data)
-        st.metric("Total de Usuários", num_users)
-        
-        # Distribuição por tipo
-        tier_counts = {}
-        for email, user in users_data.items():
-            tier = user.get('tier', 'desconhecido')
-            tier_counts[tier] = tier_counts.get(tier, 0) + 1
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Total de Usuários", summary["users"])
+        with col2:
+            st.metric("Créditos Vendidos", summary["credits_sold"])
             
-        # Mostrar distribuição em texto
+        # Distribuição por pacote
         col1, col2, col3 = st.columns(3)
-        for i, (tier, count) in enumerate(tier_counts.items()):
+        for i, (tier, count) in enumerate(summary["tiers"].items()):
             col = [col1, col2, col3][i % 3]
             with col:
                 st.metric(f"Pacote {tier.capitalize()}", count)
@@ -105,96 +103,85 @@ if password == ADMIN_PASSWORD:
         else:
             st.warning("Diretório de dados não encontrado!")
             
-        # Lista de usuários
+        # Lista de usuários (paginada, uma página por consulta)
         st.header("Lista de Usuários")
         
-        for email, user in users_data.items():
-            tier = user.get('tier', 'desconhecido')
-            name = user.get('name', email.split('@')[0])
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            search = st.text_input("Buscar por email ou nome")
+        with col2:
+            page = st.number_input("Página", min_value=1, value=1, step=1)
+        
+        users_page, total_users = user_manager.list_users(
+            offset=(page - 1) * USERS_PER_PAGE, limit=USERS_PER_PAGE, search=search
+        )
+        total_pages = max(1, -(-total_users // USERS_PER_PAGE))
+        st.caption(f"Página {page} de {total_pages} ({total_users} usuários)")
+        
+        for user in users_page:
+            email = user["email"]
+            tier = user.get('tier') or 'desconhecido'
+            name = user.get('name') or email.split('@')[0]
             credits = user.get('purchased_credits', 0)
             
             # Formatar como uma linha com emoji
             tier_emoji = "🆓" if tier == "free" else "💎"
             st.write(f"{tier_emoji} **{name}** ({email}) - Pacote: {tier.capitalize()}, Créditos: {credits}")
+        
+        if not users_page:
+            st.info("Nenhum usuário encontrado nesta página.")
 
         # Sessão 4: Estatísticas de Análise
         st.header("Estatísticas de Análise")
         
-        # Coletar dados de análise
-        all_analyses = []
-        for email, user_data in users_data.items():
-            if "usage" in user_data and "total" in user_data["usage"]:
-                for usage in user_data["usage"]["total"]:
-                    if "league" in usage:  # Verificar se contém dados detalhados
-                        # Adicionar email do usuário aos dados
-                        analysis = usage.copy()
-                        analysis["email"] = email
-                        all_analyses.append(analysis)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Análises Realizadas", summary["analyses"])
+        with col2:
+            st.metric("Créditos Consumidos", summary["credits_used"])
         
-        if all_analyses:
-            st.write(f"Total de análises detalhadas registradas: {len(all_analyses)}")
-            
-            # Estatísticas por liga
-            leagues = {}
-            for analysis in all_analyses:
-                league = analysis.get("league", "Desconhecido")
-                if league in leagues:
-                    leagues[league] += 1
-                else:
-                    leagues[league] = 1
-            
-            # Times mais analisados
-            teams = {}
-            for analysis in all_analyses:
-                home = analysis.get("home_team", "")
-                away = analysis.get("away_team", "")
-                
-                for team in [home, away]:
-                    if team:
-                        if team in teams:
-                            teams[team] += 1
-                        else:
-                            teams[team] = 1
+        # Análises por dia (últimos 30 dias)
+        if summary["per_day"]:
+            st.subheader("Análises por Dia")
+            st.bar_chart({day["date"]: day["analyses"] for day in summary["per_day"]})
+        
+        if summary["detailed"]:
+            st.write(f"Total de análises detalhadas registradas: {summary['detailed']}")
             
-            # Mercados mais utilizados
-            markets = {}
-            for analysis in all_analyses:
-                for market in analysis.get("markets_used", []):
-                    if market in markets:
-                        markets[market] += 1
-                    else:
-                        markets[market] = 1
+            # Rankings já ordenados por uso: (nome, contagem)
+            leagues = summary["leagues"]
+            fixtures = summary["fixtures"]
+            teams = summary["teams"]
+            markets = summary["markets_used"]
             
             # Exibir estatísticas em tabs
-            tab1, tab2, tab3 = st.tabs(["Ligas", "Times", "Mercados"])
+            tab1, tab2, tab3, tab4 = st.tabs(["Ligas", "Jogos", "Times", "Mercados"])
             
             with tab1:
                 st.subheader("Ligas Mais Analisadas")
                 if leagues:
-                    # Ordenar por uso
-                    sorted_leagues = dict(sorted(leagues.items(), 
-                                           key=lambda x: x[1], reverse=True))
-                    
-                    # Criar gráfico ou lista
-                    for league, count in sorted_leagues.items():
+                    for league, count in leagues:
                         st.metric(league, count)
                 else:
                     st.info("Nenhuma análise de liga registrada ainda.")
             
             with tab2:
+                st.subheader("Jogos Mais Analisados")
+                if fixtures:
+                    for fixture, count in fixtures:
+                        st.metric(fixture, count)
+                else:
+                    st.info("Nenhuma análise de jogo registrada ainda.")
+            
+            with tab3:
                 st.subheader("Times Mais Analisados")
                 if teams:
-                    # Mostrar top 10 times
-                    top_teams = dict(sorted(teams.items(), 
-                                    key=lambda x: x[1], reverse=True)[:10])
-                    
-                    # Exibir como barras horizontais ou métricas
-                    for team, count in top_teams.items():
+                    for team, count in teams:
                         st.metric(team, count)
                 else:
                     st.info("Nenhuma análise de time registrada ainda.")
             
-            with tab3:
+            with tab4:
                 st.subheader("Mercados Mais Utilizados")
                 if markets:
                     market_names = {
@@ -206,12 +193,8 @@ if password == ADMIN_PASSWORD:
                         "cartoes": "Total de Cartões"
                     }
                     
-                    # Ordenar por uso
-                    sorted_markets = dict(sorted(markets.items(), 
-                                         key=lambda x: x[1], reverse=True))
-                    
                     # Exibir métricas
-                    for market_key, count in sorted_markets.items():
+                    for market_key, count in markets:
                         market_name = market_names.get(market_key, market_key)
                         st.metric(market_name, count)
                 else:
@@ -219,10 +202,8 @@ if password == ADMIN_PASSWORD:
             
             # Análises recentes
             with st.expander("Análises Recentes"):
-                # Ordenar por timestamp (mais recentes primeiro)
-                recent = sorted(all_analyses, 
-                               key=lambda x: x.get("timestamp", ""), 
-                               reverse=True)[:20]
+                # Mais recentes primeiro
+                recent = summary["recent"]
                 
                 for idx, analysis in enumerate(recent):
                     # Formatar como cartão
@@ -243,10 +224,6 @@ if password == ADMIN_PASSWORD:
         else:
             st.info("Ainda não há dados detalhados de análise disponíveis. As novas análises serão registradas com detalhes.")
             
-    except FileNotFoundError:
-        st.error(f"Arquivo de dados não encontrado em: {user_data_path}")
-    except json.JSONDecodeError:
-        st.error("Erro ao decodificar arquivo JSON - formato inválido")
     except Exception as e:
         st.error(f"Erro ao carregar dados: {str(e)}")
 else:
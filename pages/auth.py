@@ -339,7 +339,7 @@ def show_register():
                     # E atualizar o nome depois, se for bem-sucedido
                     if success and hasattr(st.session_state.user_manager, "users") and email in st.session_state.user_manager.users:
                         st.session_state.user_manager.users[email]["name"] = name
-                        st.session_state.user_manager._save_users()
+                        st.session_state.user_manager._save_user(email, "name")
                 
                 if success:
                     st.success(message)
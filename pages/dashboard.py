@@ -6,7 +6,7 @@ import os
 import time
 import streamlit as st
 from utils.core import show_valuehunter_logo, go_to_login, update_purchase_button, DATA_DIR
-from utils.data import parse_team_stats, get_odds_data, format_prompt
+from utils.data import parse_team_stats, get_odds_input, format_odds_text, format_prompt
 from utils.ai import analyze_with_gpt, format_enhanced_prompt, format_highly_optimized_prompt
 from utils.ai import analyze_with_gpt, format_enhanced_prompt, format_highly_optimized_prompt, calculate_advanced_probabilities
 
@@ -333,6 +333,52 @@ def show_league_update_button(selected_league):
         except Exception as refresh_error:
             st.sidebar.error(f"Erro ao atualizar: {str(refresh_error)}")
 
+def show_matchday_scanner(selected_league):
+    """
+    Mostra o scanner de valor para todos os jogos futuros da liga selecionada.
+    Usa apenas o modelo de probabilidades vetorizado e uma tabela de odds em CSV.
+    
+    Args:
+        selected_league (str): Nome da liga selecionada
+    """
+    with st.expander("Scanner da Rodada (sem IA)", expanded=False):
+        st.write("Envie um CSV com as odds dos jogos (colunas home, away ou match_id e uma coluna por seleção: "
+                 "home_win, draw, away_win, 1x, 12, x2, btts_yes, btts_no, over_2_5, under_2_5, "
+                 "corners_over_9_5, corners_under_9_5, cards_over_3_5, cards_under_3_5).")
+        odds_file = st.file_uploader("Tabela de odds (CSV)", type=["csv"], key="scanner_odds_file")
+        min_edge = st.slider("Vantagem mínima (pontos percentuais)", 0.0, 20.0, 3.0, 0.5, key="scanner_min_edge")
+        
+        if odds_file is None or not st.button("Escanear rodada", key="scanner_run_btn"):
+            return
+        
+        from utils.footystats_api import LEAGUE_IDS
+        from utils.scanner import scan_fixtures
+        
+        season_id = LEAGUE_IDS.get(selected_league)
+        if not season_id:
+            for league_name, league_id in LEAGUE_IDS.items():
+                if league_name.lower() in selected_league.lower() or selected_league.lower() in league_name.lower():
+                    season_id = league_id
+                    break
+        if not season_id:
+            st.error(f"Não foi possível encontrar ID para liga: {selected_league}")
+            return
+        
+        with st.spinner("Calculando probabilidades para todos os jogos..."):
+            result = scan_fixtures([season_id], odds_file, min_edge=min_edge)
+        
+        if result is None:
+            st.error("Erro ao executar o scanner. Verifique o arquivo de odds.")
+            return
+        
+        st.caption(f"{result['fixtures']} jogos futuros, {result['priced']} com odds, "
+                   f"{len(result['bets'])} seleções com valor em {result['elapsed']:.2f}s")
+        if result["bets"]:
+            import pandas as pd
+            df = pd.DataFrame(result["bets"])[["home", "away", "selection", "odd", "model_prob",
+                                               "implied_prob", "edge", "expected_value"]]
+            st.dataframe(df.round(2), use_container_width=True)
+
 def clear_cache(league_name=None):
     """
     Limpa o cache de times e dados da liga especificada ou de todas as ligas
@@ -889,6 +935,103 @@ def check_analysis_limits(selected_markets):
         st.error("Erro ao verificar limites de análise. Por favor, tente novamente.")
         return False
 
+def show_analysis_job(job_id):
+    """
+    Acompanha um job de análise até o fim e exibe o resultado
+    
+    O job roda em segundo plano (utils.analysis_jobs); se a página for
+    recarregada no meio, o acompanhamento é retomado no próximo carregamento.
+    Os créditos são cobrados uma única vez por usuário e job.
+    
+    Args:
+        job_id (str): Id do job
+    """
+    from utils.analysis_jobs import (
+        ACTIVE_STATUSES, JOB_POLL_INTERVAL, claim_job_charge, decline_job_charge, get_job
+    )
+    
+    status = st.empty()
+    result_area = st.empty()
+    
+    job = get_job(job_id)
+    while job and job["status"] in ACTIVE_STATUSES:
+        params = job["params"]
+        status.info(f"{job['stage_label']} ({params['home_team']} x {params['away_team']})")
+        if job.get("partial"):
+            result_area.markdown(job["partial"] + " ▌")
+        time.sleep(JOB_POLL_INTERVAL)
+        job = get_job(job_id)
+    
+    if job is None:
+        st.session_state.analysis_job_id = None
+        return
+    
+    if job["status"] == "error":
+        status.error(f"Erro durante a análise: {job.get('error')}")
+        # Uma nova tentativa exige nova submissão
+        st.session_state.analysis_job_id = None
+        return
+    
+    status.empty()
+    params = job["params"]
+    result = job["result"]
+    
+    if st.session_state.debug_mode:
+        with st.expander("Dados brutos coletados da API", expanded=False):
+            st.json(result.get("stats_data"))
+        prompt_report = result.get("prompt_report")
+        if prompt_report:
+            with st.expander("Tokens do prompt por seção"):
+                st.write(f"Total: {prompt_report['total']} de {prompt_report['budget']} tokens "
+                         f"(tokenizador: {prompt_report['tokenizer']})")
+                st.json(prompt_report["sections"])
+                if prompt_report["dropped"]:
+                    st.warning(f"Seções descartadas: {', '.join(prompt_report['dropped'])}")
+    
+    # Cobrar antes de exibir o resultado (uma vez por job); o desconto confere o
+    # saldo na mesma operação, então análises simultâneas não gastam além dele
+    if not claim_job_charge(job_id, st.session_state.email):
+        if st.session_state.email in job.get("declined", []):
+            # Cobrança recusada: o resultado só é exibido após nova submissão
+            result_area.empty()
+            st.session_state.analysis_job_id = None
+            return
+        result_area.code(result["formatted"], language=None)
+        return
+    
+    num_markets = sum(1 for v in params["selected_markets"].values() if v)
+    analysis_data = {
+        "league": params["league"],
+        "home_team": params["home_team"],
+        "away_team": params["away_team"],
+        "markets_used": [k for k, v in params["selected_markets"].items() if v]
+    }
+    success = st.session_state.user_manager.consume_credits(
+        st.session_state.email,
+        num_markets,
+        analysis_data
+    )
+    
+    # Forçar atualização do cache de estatísticas
+    if hasattr(st.session_state, 'user_stats_cache'):
+        del st.session_state.user_stats_cache
+    updated_stats = st.session_state.user_manager.get_usage_stats(st.session_state.email)
+    credits_after = updated_stats['credits_remaining']
+    
+    if success:
+        result_area.code(result["formatted"], language=None)
+        st.success(f"{num_markets} créditos foram consumidos. Agora você tem {credits_after} créditos.")
+    else:
+        # Não retomar nem cobrar este job automaticamente nos próximos reruns
+        # (nem depois de o usuário comprar créditos); ele precisa submeter de novo
+        decline_job_charge(job_id, st.session_state.email)
+        st.session_state.analysis_job_id = None
+        result_area.empty()
+        if credits_after < num_markets:
+            st.error(f"Créditos insuficientes: esta análise requer {num_markets} créditos e você tem {credits_after}.")
+        else:
+            st.error("Não foi possível registrar o uso dos créditos. Por favor, tente novamente.")
+
 def show_main_dashboard():
     """Show the main dashboard with improved error handling and debug info"""
     try:
@@ -974,6 +1117,18 @@ def show_main_dashboard():
         with st.sidebar.expander("Opções avançadas"):
             st.session_state.debug_mode = st.checkbox("Modo de depuração", value=st.session_state.debug_mode)
             
+            # Cache de respostas da IA (acertos/falhas neste processo)
+            if st.session_state.debug_mode:
+                from utils.gpt_cache import get_gpt_cache_stats, clear_gpt_cache
+                gpt_stats = get_gpt_cache_stats()
+                st.caption(
+                    f"Cache IA: {gpt_stats['hits']} acertos, {gpt_stats['misses']} falhas "
+                    f"({gpt_stats['hit_rate']:.0f}%), {gpt_stats['entries']} respostas, "
+                    f"{gpt_stats['bytes'] / 1024:.0f} KB"
+                )
+                if st.button("Limpar cache da IA"):
+                    st.success(f"Cache da IA limpo: {clear_gpt_cache()} respostas removidas")
+            
             if st.button("Limpar cache"):
                 cleaned = clear_cache()
                 st.success(f"Cache limpo: {cleaned} arquivos removidos")
@@ -1050,6 +1205,9 @@ def show_main_dashboard():
                     
                 st.info("Use os nomes exatos acima para selecionar os times.")
             
+            # Scanner de valor da rodada inteira (sem consumir créditos nem usar a IA)
+            show_matchday_scanner(selected_league)
+            
             # Usando o seletor nativo do Streamlit
             col1, col2 = st.columns(2)
             with col1:
@@ -1103,10 +1261,13 @@ def show_main_dashboard():
             # Bloco try separado para odds
             try:
                 # Odds
+                odds = {}
                 odds_data = None
                 if any(selected_markets.values()):
                     with st.expander("Configuração de Odds", expanded=True):
-                        odds_data = get_odds_data(selected_markets)
+                        odds = get_odds_input(selected_markets)
+                        # Texto renderizado uma única vez, apenas para o prompt
+                        odds_data = format_odds_text(odds)
                         
                 logger.info(f"Odds configuradas: {odds_data is not None}")
                 
@@ -1137,648 +1298,19 @@ def show_main_dashboard():
                     if not check_analysis_limits(selected_markets):
                         return
                         
-                    # Criar um placeholder para o status
-                    status = st.empty()
-                    
-                    # Buscar estatísticas em tempo real (sem cache)
-                    status.info("Buscando estatísticas atualizadas...")
-                    team_stats_df, stats_data = fetch_stats_data(selected_league, home_team, away_team)
-                    
-                    if team_stats_df is None:
-                        status.error("Falha ao carregar estatísticas. Tente novamente.")
-                        return
-                    
-                    # Modo de depuração - mostrar dados brutos
-                    if st.session_state.debug_mode:
-                        with st.expander("Dados brutos coletados da API", expanded=False):
-                            st.json(stats_data)
-                    
-                    # Executar análise com tratamento de erro para cada etapa
-                    try:
-                        # Etapa 1: Verificar dados
-                        status.info("Preparando dados para análise...")
-                        if team_stats_df is None:
-                            status.error("Falha ao carregar dados")
-                            return
+                    # A análise roda em segundo plano; submissões idênticas em andamento são reaproveitadas
+                    from utils.analysis_jobs import submit_analysis_job
+                    st.session_state.analysis_job_id = submit_analysis_job(
+                        selected_league, home_team, away_team, selected_markets,
+                        odds, odds_data, st.session_state.email
+                    )
                 
-                        # Etapa 2: Processar os dados para análise
-                        status.info("Processando dados estatísticos...")
-                        
-                        # Etapa 3: Formatar prompt e extrair probabilidades
-                        status.info("Preparando análise...")
-                        from utils.ai import format_highly_optimized_prompt, calculate_advanced_probabilities
-                        
-                        # Primeiro calculamos as probabilidades
-                        original_probabilities = calculate_advanced_probabilities(
-                            stats_data["home_team"], 
-                            stats_data["away_team"]
-                        )
-                        
-                        # Extrair probabilidades implícitas das odds
-                        implied_probabilities = {}
-                        
-                        # Função auxiliar para extrair odds de um texto
-                        def extract_odds(text, pattern, default=0.0):
-                            import re
-                            matches = re.findall(pattern, text)
-                            if matches:
-                                try:
-                                    return float(matches[0])
-                                except:
-                                    pass
-                            return default
-                        
-                        # Parsear as odds para Money Line
-                        if selected_markets.get("money_line") and odds_data:
-                            # Padrões para extrair odds
-                            home_odd = extract_odds(odds_data, rf"(?:Casa|Home).*?@(\d+\.?\d*)")
-                            draw_odd = extract_odds(odds_data, r"Empate.*?@(\d+\.?\d*)")
-                            away_odd = extract_odds(odds_data, rf"(?:Fora|Away).*?@(\d+\.?\d*)")
-                            
-                            if home_odd > 0:
-                                implied_probabilities["home"] = 100.0 / home_odd
-                            if draw_odd > 0:
-                                implied_probabilities["draw"] = 100.0 / draw_odd
-                            if away_odd > 0:
-                                implied_probabilities["away"] = 100.0 / away_odd
-                        
-                        # Parsear para Chance Dupla
-                        if selected_markets.get("chance_dupla") and odds_data:
-                            home_draw_odd = extract_odds(odds_data, r"1X.*?@(\d+\.?\d*)")
-                            home_away_odd = extract_odds(odds_data, r"12.*?@(\d+\.?\d*)")
-                            draw_away_odd = extract_odds(odds_data, r"X2.*?@(\d+\.?\d*)")
-                            
-                            if home_draw_odd > 0:
-                                implied_probabilities["home_draw"] = 100.0 / home_draw_odd
-                            if home_away_odd > 0:
-                                implied_probabilities["home_away"] = 100.0 / home_away_odd
-                            if draw_away_odd > 0:
-                                implied_probabilities["draw_away"] = 100.0 / draw_away_odd
-                        
-                        # Parsear para BTTS
-                        if selected_markets.get("ambos_marcam") and odds_data:
-                            btts_yes_odd = extract_odds(odds_data, r"Sim.*?@(\d+\.?\d*)")
-                            btts_no_odd = extract_odds(odds_data, r"Não.*?@(\d+\.?\d*)")
-                            
-                            if btts_yes_odd > 0:
-                                implied_probabilities["btts_yes"] = 100.0 / btts_yes_odd
-                            if btts_no_odd > 0:
-                                implied_probabilities["btts_no"] = 100.0 / btts_no_odd
-                        
-                        # Adicionar as probabilidades implícitas às probabilidades originais
-                        if implied_probabilities:
-                            if "analysis_data" not in original_probabilities:
-                                original_probabilities["analysis_data"] = {}
-                            original_probabilities["analysis_data"]["implied_odds"] = implied_probabilities
-                        
-                        # Depois geramos o prompt com essas probabilidades
-                        prompt = format_highly_optimized_prompt(stats_data, home_team, away_team, odds_data, selected_markets)
-                        
-                        if not prompt:
-                            status.error("Falha ao preparar análise")
-                            return
-                        
-                        # Etapa 4: Análise GPT com probabilidades originais
-                        status.info("Realizando análise com IA...")
-                        analysis = analyze_with_gpt(
-                            prompt,
-                            original_probabilities=original_probabilities,
-                            selected_markets=selected_markets,
-                            home_team=home_team,
-                            away_team=away_team
-                        )
-                        
-                        if not analysis:
-                            status.error("Falha na análise com IA")
-                            return
-                        
-                        # Etapa 5: Mostrar resultado
-                        if analysis:
-                            # Limpar status
-                            status.empty()
-                            
-                            # Limpar possíveis tags HTML da resposta
-                            if isinstance(analysis, str):
-                                # Verificar se a análise começa com a tag de div
-                                if "<div class=\"analysis-result\">" in analysis:
-                                    analysis = analysis.replace("<div class=\"analysis-result\">", "")
-                                    if "</div>" in analysis:
-                                        analysis = analysis.replace("</div>", "")
-                            
-                            # IMPORTANTE: Aplicar formatação avançada para garantir filtragem por mercados selecionados
-                            from utils.ai import format_analysis_response
-                            
-                            # Adiciona módulo re para expressões regulares caso não esteja importado
-                            import re
-                            
-                            # Reconstrução completa da análise
-                            def reconstruct_analysis(analysis_text, home_team, away_team, selected_markets, original_probabilities, implied_probabilities, odds_data):
-                                try:
-                                    # Logs para depuração
-                                    print(f"Selected markets: {selected_markets}")
-                                    print(f"Original probabilities keys: {original_probabilities.keys() if original_probabilities else 'None'}")
-                                    print(f"Implied probabilities keys: {implied_probabilities.keys() if implied_probabilities else 'None'}")
-                                    print(f"Odds data: {odds_data}")
-                                    
-                                    # Iniciar construção da análise
-                                    new_analysis = []
-                                    
-                                    # Adicionar cabeçalho
-                                    new_analysis.append(f"# Análise da Partida\n## {home_team} x {away_team}")
-                                    
-                                    # Adicionar análise de mercados disponíveis
-                                    markets_section = "# Análise de Mercados Disponíveis:\n"
-                                
-                                    # Moneyline
-                                    if selected_markets.get("money_line"):
-                                        markets_section += "- **Money Line (1X2):**\n"
-                                        home_odd = 0
-                                        draw_odd = 0
-                                        away_odd = 0
-                                    
-                                        # Extrair odds do texto original
-                                        home_match = re.search(r"Casa.*?@(\d+\.?\d*)", odds_data)
-                                        if home_match:
-                                            home_odd = float(home_match.group(1))
-                                            markets_section += f"  - Casa ({home_team}): @{home_odd}\n"
-                                        
-                                        draw_match = re.search(r"Empate.*?@(\d+\.?\d*)", odds_data)
-                                        if draw_match:
-                                            draw_odd = float(draw_match.group(1))
-                                            markets_section += f"  - Empate: @{draw_odd}\n"
-                                        
-                                        away_match = re.search(r"Fora.*?@(\d+\.?\d*)", odds_data)
-                                        if away_match:
-                                            away_odd = float(away_match.group(1))
-                                            markets_section += f"  - Fora ({away_team}): @{away_odd}\n"
-                                        
-                                        # Atualizar probabilidades implícitas
-                                        if home_odd > 0:
-                                            implied_probabilities["home"] = 100.0 / home_odd
-                                        if draw_odd > 0:
-                                            implied_probabilities["draw"] = 100.0 / draw_odd
-                                        if away_odd > 0:
-                                            implied_probabilities["away"] = 100.0 / away_odd
-                                    
-                                    # Chance Dupla
-                                    if selected_markets.get("chance_dupla"):
-                                        markets_section += "- **Chance Dupla:**\n"
-                                        home_draw_odd = 0
-                                        home_away_odd = 0
-                                        draw_away_odd = 0
-                                    
-                                        # Extrair odds do texto original
-                                        hd_match = re.search(r"1X.*?@(\d+\.?\d*)", odds_data)
-                                        if hd_match:
-                                            home_draw_odd = float(hd_match.group(1))
-                                            markets_section += f"  - 1X ({home_team} ou Empate): @{home_draw_odd}\n"
-                                        
-                                        ha_match = re.search(r"12.*?@(\d+\.?\d*)", odds_data)
-                                        if ha_match:
-                                            home_away_odd = float(ha_match.group(1))
-                                            markets_section += f"  - 12 ({home_team} ou {away_team}): @{home_away_odd}\n"
-                                        
-                                        da_match = re.search(r"X2.*?@(\d+\.?\d*)", odds_data)
-                                        if da_match:
-                                            draw_away_odd = float(da_match.group(1))
-                                            markets_section += f"  - X2 (Empate ou {away_team}): @{draw_away_odd}\n"
-                                        
-                                        # Atualizar probabilidades implícitas
-                                        if home_draw_odd > 0:
-                                            implied_probabilities["home_draw"] = 100.0 / home_draw_odd
-                                        if home_away_odd > 0:
-                                            implied_probabilities["home_away"] = 100.0 / home_away_odd
-                                        if draw_away_odd > 0:
-                                            implied_probabilities["draw_away"] = 100.0 / draw_away_odd
-                                    
-                                    # Ambos Marcam
-                                    if selected_markets.get("ambos_marcam"):
-                                        markets_section += "- **Ambos Marcam (BTTS):**\n"
-                                        btts_yes_odd = 0
-                                        btts_no_odd = 0
-                                    
-                                        # Extrair odds do texto original
-                                        yes_match = re.search(r"Sim.*?@(\d+\.?\d*)", odds_data)
-                                        if yes_match:
-                                            btts_yes_odd = float(yes_match.group(1))
-                                            markets_section += f"  - Sim: @{btts_yes_odd}\n"
-                                        
-                                        no_match = re.search(r"Não.*?@(\d+\.?\d*)", odds_data)
-                                        if no_match:
-                                            btts_no_odd = float(no_match.group(1))
-                                            markets_section += f"  - Não: @{btts_no_odd}\n"
-                                        
-                                        # Atualizar probabilidades implícitas
-                                        if btts_yes_odd > 0:
-                                            implied_probabilities["btts_yes"] = 100.0 / btts_yes_odd
-                                        if btts_no_odd > 0:
-                                            implied_probabilities["btts_no"] = 100.0 / btts_no_odd
-                                    
-                                    # Over/Under
-                                    if selected_markets.get("over_under"):
-                                        markets_section += "- **Over/Under:**\n"
-                                        
-                                        # Extrair linha e odds
-                                        line_match = re.search(r"Over\s+(\d+\.?\d*)\s+Gols", odds_data)
-                                        over_match = re.search(r"Over\s+\d+\.?\d*\s+Gols:.*?@(\d+\.?\d*)", odds_data)
-                                        under_match = re.search(r"Under\s+\d+\.?\d*\s+Gols:.*?@(\d+\.?\d*)", odds_data)
-                                        
-                                        if line_match:
-                                            line = float(line_match.group(1))
-                                            
-                                            if over_match:
-                                                over_odd = float(over_match.group(1))
-                                                markets_section += f"  - Over {line} Gols: @{over_odd}\n"
-                                                implied_probabilities[f"over_{str(line).replace('.', '_')}"] = 100.0 / over_odd
-                                            
-                                            if under_match:
-                                                under_odd = float(under_match.group(1))
-                                                markets_section += f"  - Under {line} Gols: @{under_odd}\n"
-                                                implied_probabilities[f"under_{str(line).replace('.', '_')}"] = 100.0 / under_odd
-                                    
-                                    # Escanteios
-                                    if selected_markets.get("escanteios"):
-                                        markets_section += "- **Escanteios:**\n"
-                                        
-                                        # Extrair linha e odds
-                                        line_match = re.search(r"Over\s+(\d+\.?\d*)\s+Escanteios", odds_data)
-                                        over_match = re.search(r"Over\s+\d+\.?\d*\s+Escanteios:.*?@(\d+\.?\d*)", odds_data)
-                                        under_match = re.search(r"Under\s+\d+\.?\d*\s+Escanteios:.*?@(\d+\.?\d*)", odds_data)
-                                        
-                                        if line_match:
-                                            line = float(line_match.group(1))
-                                            
-                                            if over_match:
-                                                over_odd = float(over_match.group(1))
-                                                markets_section += f"  - Over {line} Escanteios: @{over_odd}\n"
-                                                implied_probabilities[f"corners_over_{str(line).replace('.', '_')}"] = 100.0 / over_odd
-                                            
-                                            if under_match:
-                                                under_odd = float(under_match.group(1))
-                                                markets_section += f"  - Under {line} Escanteios: @{under_odd}\n"
-                                                implied_probabilities[f"corners_under_{str(line).replace('.', '_')}"] = 100.0 / under_odd
-                                    
-                                    # Cartões
-                                    if selected_markets.get("cartoes"):
-                                        markets_section += "- **Cartões:**\n"
-                                        
-                                        # Extrair linha e odds
-                                        line_match = re.search(r"Over\s+(\d+\.?\d*)\s+Cartões", odds_data)
-                                        over_match = re.search(r"Over\s+\d+\.?\d*\s+Cartões:.*?@(\d+\.?\d*)", odds_data)
-                                        under_match = re.search(r"Under\s+\d+\.?\d*\s+Cartões:.*?@(\d+\.?\d*)", odds_data)
-                                        
-                                        if line_match:
-                                            line = float(line_match.group(1))
-                                            
-                                            if over_match:
-                                                over_odd = float(over_match.group(1))
-                                                markets_section += f"  - Over {line} Cartões: @{over_odd}\n"
-                                                implied_probabilities[f"cards_over_{str(line).replace('.', '_')}"] = 100.0 / over_odd
-                                            
-                                            if under_match:
-                                                under_odd = float(under_match.group(1))
-                                                markets_section += f"  - Under {line} Cartões: @{under_odd}\n"
-                                                implied_probabilities[f"cards_under_{str(line).replace('.', '_')}"] = 100.0 / under_odd
-                                    
-                                    new_analysis.append(markets_section)
-                                    
-                                    # Probabilidades calculadas
-                                    probs_section = "# Probabilidades Calculadas (REAL vs IMPLÍCITA):\n"
-                                    opportunities = []
-                                    
-                                    # Money Line
-                                    if selected_markets.get("money_line") and "moneyline" in original_probabilities:
-                                        probs_section += "## Money Line (1X2):\n"
-                                        
-                                        # Casa
-                                        home_real = original_probabilities["moneyline"].get("home_win", 0)
-                                        home_implicit = implied_probabilities.get("home", 0)
-                                        home_value = home_real > home_implicit + 2
-                                        
-                                        probs_section += f"- **{home_team}**: Real {home_real:.1f}% vs Implícita {home_implicit:.1f}%{' (Valor)' if home_value else ''}\n"
-                                        
-                                        if home_value:
-                                            opportunities.append(f"- **{home_team}**: Real {home_real:.1f}% vs Implícita {home_implicit:.1f}% (Valor de {home_real-home_implicit:.1f}%)")
-                                        
-                                        # Empate
-                                        draw_real = original_probabilities["moneyline"].get("draw", 0)
-                                        draw_implicit = implied_probabilities.get("draw", 0)
-                                        draw_value = draw_real > draw_implicit + 2
-                                        
-                                        probs_section += f"- **Empate**: Real {draw_real:.1f}% vs Implícita {draw_implicit:.1f}%{' (Valor)' if draw_value else ''}\n"
-                                        
-                                        if draw_value:
-                                            opportunities.append(f"- **Empate**: Real {draw_real:.1f}% vs Implícita {draw_implicit:.1f}% (Valor de {draw_real-draw_implicit:.1f}%)")
-                                        
-                                        # Fora
-                                        away_real = original_probabilities["moneyline"].get("away_win", 0)
-                                        away_implicit = implied_probabilities.get("away", 0)
-                                        away_value = away_real > away_implicit + 2
-                                        
-                                        probs_section += f"- **{away_team}**: Real {away_real:.1f}% vs Implícita {away_implicit:.1f}%{' (Valor)' if away_value else ''}\n"
-                                        
-                                        if away_value:
-                                            opportunities.append(f"- **{away_team}**: Real {away_real:.1f}% vs Implícita {away_implicit:.1f}% (Valor de {away_real-away_implicit:.1f}%)")
-                                    
-                                    # Double Chance
-                                    if selected_markets.get("chance_dupla") and "double_chance" in original_probabilities:
-                                        probs_section += "## Chance Dupla (Double Chance):\n"
-                                        
-                                        # 1X
-                                        hd_real = original_probabilities["double_chance"].get("home_or_draw", 0)
-                                        hd_implicit = implied_probabilities.get("home_draw", 0)
-                                        hd_value = hd_real > hd_implicit + 2
-                                        
-                                        probs_section += f"- **{home_team} ou Empate**: Real {hd_real:.1f}% vs Implícita {hd_implicit:.1f}%{' (Valor)' if hd_value else ''}\n"
-                                        
-                                        if hd_value:
-                                            opportunities.append(f"- **{home_team} ou Empate**: Real {hd_real:.1f}% vs Implícita {hd_implicit:.1f}% (Valor de {hd_real-hd_implicit:.1f}%)")
-                                        
-                                        # 12
-                                        ha_real = original_probabilities["double_chance"].get("home_or_away", 0)
-                                        ha_implicit = implied_probabilities.get("home_away", 0)
-                                        ha_value = ha_real > ha_implicit + 2
-                                        
-                                        probs_section += f"- **{home_team} ou {away_team}**: Real {ha_real:.1f}% vs Implícita {ha_implicit:.1f}%{' (Valor)' if ha_value else ''}\n"
-                                        
-                                        if ha_value:
-                                            opportunities.append(f"- **{home_team} ou {away_team}**: Real {ha_real:.1f}% vs Implícita {ha_implicit:.1f}% (Valor de {ha_real-ha_implicit:.1f}%)")
-                                        
-                                        # X2
-                                        da_real = original_probabilities["double_chance"].get("away_or_draw", 0)
-                                        da_implicit = implied_probabilities.get("draw_away", 0)
-                                        da_value = da_real > da_implicit + 2
-                                        
-                                        probs_section += f"- **Empate ou {away_team}**: Real {da_real:.1f}% vs Implícita {da_implicit:.1f}%{' (Valor)' if da_value else ''}\n"
-                                        
-                                        if da_value:
-                                            opportunities.append(f"- **Empate ou {away_team}**: Real {da_real:.1f}% vs Implícita {da_implicit:.1f}% (Valor de {da_real-da_implicit:.1f}%)")
-                                    
-                                    # BTTS
-                                    if selected_markets.get("ambos_marcam") and "btts" in original_probabilities:
-                                        probs_section += "## Ambos Marcam (BTTS):\n"
-                                        
-                                        # Sim
-                                        yes_real = original_probabilities["btts"].get("yes", 0)
-                                        yes_implicit = implied_probabilities.get("btts_yes", 0)
-                                        yes_value = yes_real > yes_implicit + 2
-                                        
-                                        probs_section += f"- **Sim**: Real {yes_real:.1f}% vs Implícita {yes_implicit:.1f}%{' (Valor)' if yes_value else ''}\n"
-                                        
-                                        if yes_value:
-                                            opportunities.append(f"- **Ambos Marcam - Sim**: Real {yes_real:.1f}% vs Implícita {yes_implicit:.1f}% (Valor de {yes_real-yes_implicit:.1f}%)")
-                                        
-                                        # Não
-                                        no_real = original_probabilities["btts"].get("no", 0)
-                                        no_implicit = implied_probabilities.get("btts_no", 0)
-                                        no_value = no_real > no_implicit + 2
-                                        
-                                        probs_section += f"- **Não**: Real {no_real:.1f}% vs Implícita {no_implicit:.1f}%{' (Valor)' if no_value else ''}\n"
-                                        
-                                        if no_value:
-                                            opportunities.append(f"- **Ambos Marcam - Não**: Real {no_real:.1f}% vs Implícita {no_implicit:.1f}% (Valor de {no_real-no_implicit:.1f}%)")
-                                    
-                                    # Over/Under
-                                    if selected_markets.get("over_under") and "over_under" in original_probabilities:
-                                        probs_section += "## Over/Under Gols:\n"
-                                        
-                                        # Extrair linha do texto de odds
-                                        line_match = re.search(r"Over\s+(\d+\.?\d*)\s+Gols", odds_data)
-                                        if line_match:
-                                            line = float(line_match.group(1))
-                                            line_str = str(line).replace('.', '_')
-                                            
-                                            # Over
-                                            over_real = original_probabilities["over_under"].get("over_2_5", 0)  # Padrão para 2.5
-                                            if line == 0.5:
-                                                over_real = 90.0  # Aproximação para over 0.5
-                                            elif line == 1.5:
-                                                over_real = 75.0  # Aproximação para over 1.5
-                                            elif line == 3.5:
-                                                over_real = 40.0  # Aproximação para over 3.5
-                                            elif line == 4.5:
-                                                over_real = 25.0  # Aproximação para over 4.5
-                                            
-                                            over_implicit = implied_probabilities.get(f"over_{line_str}", 0)
-                                            over_value = over_real > over_implicit + 2
-                                            
-                                            probs_section += f"- **Over {line} Gols**: Real {over_real:.1f}% vs Implícita {over_implicit:.1f}%{' (Valor)' if over_value else ''}\n"
-                                            
-                                            if over_value:
-                                                opportunities.append(f"- **Over {line} Gols**: Real {over_real:.1f}% vs Implícita {over_implicit:.1f}% (Valor de {over_real-over_implicit:.1f}%)")
-                                            
-                                            # Under
-                                            under_real = 100.0 - over_real
-                                            under_implicit = implied_probabilities.get(f"under_{line_str}", 0)
-                                            under_value = under_real > under_implicit + 2
-                                            
-                                            probs_section += f"- **Under {line} Gols**: Real {under_real:.1f}% vs Implícita {under_implicit:.1f}%{' (Valor)' if under_value else ''}\n"
-                                            
-                                            if under_value:
-                                                opportunities.append(f"- **Under {line} Gols**: Real {under_real:.1f}% vs Implícita {under_implicit:.1f}% (Valor de {under_real-under_implicit:.1f}%)")
-                                    
-                                    # Escanteios
-                                    if selected_markets.get("escanteios") and "corners" in original_probabilities:
-                                        probs_section += "## Escanteios:\n"
-                                        
-                                        # Extrair linha do texto de odds
-                                        line_match = re.search(r"Over\s+(\d+\.?\d*)\s+Escanteios", odds_data)
-                                        if line_match:
-                                            line = float(line_match.group(1))
-                                            line_str = str(line).replace('.', '_')
-                                            
-                                            # Ajustar as probabilidades reais com base na linha
-                                            if line == 9.5:  # Linha padrão
-                                                over_real = original_probabilities["corners"].get("over_9_5", 0)
-                                            else:
-                                                # Ajustes para outras linhas
-                                                base_over = original_probabilities["corners"].get("over_9_5", 50)
-                                                if line < 9.5:
-                                                    over_real = min(95, base_over + ((9.5 - line) * 10))  # +10% por cada ponto abaixo de 9.5
-                                                else:
-                                                    over_real = max(5, base_over - ((line - 9.5) * 10))   # -10% por cada ponto acima de 9.5
-                                            
-                                            over_implicit = implied_probabilities.get(f"corners_over_{line_str}", 0)
-                                            over_value = over_real > over_implicit + 2
-                                            
-                                            probs_section += f"- **Over {line} Escanteios**: Real {over_real:.1f}% vs Implícita {over_implicit:.1f}%{' (Valor)' if over_value else ''}\n"
-                                            
-                                            if over_value:
-                                                opportunities.append(f"- **Over {line} Escanteios**: Real {over_real:.1f}% vs Implícita {over_implicit:.1f}% (Valor de {over_real-over_implicit:.1f}%)")
-                                            
-                                            # Under
-                                            under_real = 100.0 - over_real
-                                            under_implicit = implied_probabilities.get(f"corners_under_{line_str}", 0)
-                                            under_value = under_real > under_implicit + 2
-                                            
-                                            probs_section += f"- **Under {line} Escanteios**: Real {under_real:.1f}% vs Implícita {under_implicit:.1f}%{' (Valor)' if under_value else ''}\n"
-                                            
-                                            if under_value:
-                                                opportunities.append(f"- **Under {line} Escanteios**: Real {under_real:.1f}% vs Implícita {under_implicit:.1f}% (Valor de {under_real-under_implicit:.1f}%)")
-                                    
-                                    # Cartões
-                                    if selected_markets.get("cartoes") and "cards" in original_probabilities:
-                                        probs_section += "## Cartões:\n"
-                                        
-                                        # Extrair linha do texto de odds
-                                        line_match = re.search(r"Over\s+(\d+\.?\d*)\s+Cartões", odds_data)
-                                        if line_match:
-                                            line = float(line_match.group(1))
-                                            line_str = str(line).replace('.', '_')
-                                            
-                                            # Ajustar as probabilidades reais com base na linha
-                                            if line == 3.5:  # Linha padrão
-                                                over_real = original_probabilities["cards"].get("over_3_5", 0)
-                                            else:
-                                                # Ajustes para outras linhas
-                                                base_over = original_probabilities["cards"].get("over_3_5", 50)
-                                                if line < 3.5:
-                                                    over_real = min(95, base_over + ((3.5 - line) * 15))  # +15% por cada ponto abaixo de 3.5
-                                                else:
-                                                    over_real = max(5, base_over - ((line - 3.5) * 15))   # -15% por cada ponto acima de 3.5
-                                            
-                                            over_implicit = implied_probabilities.get(f"cards_over_{line_str}", 0)
-                                            over_value = over_real > over_implicit + 2
-                                            
-                                            probs_section += f"- **Over {line} Cartões**: Real {over_real:.1f}% vs Implícita {over_implicit:.1f}%{' (Valor)' if over_value else ''}\n"
-                                            
-                                            if over_value:
-                                                opportunities.append(f"- **Over {line} Cartões**: Real {over_real:.1f}% vs Implícita {over_implicit:.1f}% (Valor de {over_real-over_implicit:.1f}%)")
-                                            
-                                            # Under
-                                            under_real = 100.0 - over_real
-                                            under_implicit = implied_probabilities.get(f"cards_under_{line_str}", 0)
-                                            under_value = under_real > under_implicit + 2
-                                            
-                                            probs_section += f"- **Under {line} Cartões**: Real {under_real:.1f}% vs Implícita {under_implicit:.1f}%{' (Valor)' if under_value else ''}\n"
-                                            
-                                            if under_value:
-                                                opportunities.append(f"- **Under {line} Cartões**: Real {under_real:.1f}% vs Implícita {under_implicit:.1f}% (Valor de {under_real-under_implicit:.1f}%)")
-                                    
-                                    new_analysis.append(probs_section)
-                                    
-                                    # Oportunidades identificadas
-                                    if opportunities:
-                                        new_analysis.append("# Oportunidades Identificadas:\n" + "\n".join(opportunities))
-                                    else:
-                                        new_analysis.append("# Oportunidades Identificadas:\nInfelizmente não detectamos valor em nenhuma dos seus inputs.")
-                                    
-                                    # Nível de confiança
-                                    confidence_section = "# Nível de Confiança Geral: Médio\n"
-                            
-                                    # Extrair dados da forma e consistência
-                                    if "analysis_data" in original_probabilities:
-                                        analysis_data = original_probabilities["analysis_data"]
-                                        home_consistency = analysis_data.get("home_consistency", 0) * 100
-                                        away_consistency = analysis_data.get("away_consistency", 0) * 100
-                                        
-                                        # Verificar se temos dados de forma bruta
-                                        home_form_raw = stats_data["home_team"].get("formRun_overall", "") if "stats_data" in locals() and isinstance(stats_data, dict) else ""
-                                        away_form_raw = stats_data["away_team"].get("formRun_overall", "") if "stats_data" in locals() and isinstance(stats_data, dict) else ""
-                                        
-                                        # Calcular a forma diretamente a partir dos dados brutos se disponíveis
-                                        home_form_points = 0
-                                        away_form_points = 0
-                                        
-                                        # Função simplificada para calcular pontos da forma
-                                        def calculate_form_points(form_str):
-                                            if not form_str or not isinstance(form_str, str):
-                                                return 0
-                                            
-                                            points = 0
-                                            # Pegar apenas os últimos 5 caracteres
-                                            recent_form = form_str[-5:] if len(form_str) >= 5 else form_str
-                                            
-                                            for result in recent_form:
-                                                result = result.upper()
-                                                if result == 'W':
-                                                    points += 3
-                                                elif result == 'D':
-                                                    points += 1
-                                                # L ou outros caracteres = 0 pontos
-                                            
-                                            return points
-                                        
-                                        # Calcular pontos para cada time
-                                        if home_form_raw:
-                                            home_form_points = calculate_form_points(home_form_raw)
-                                        else:
-                                            # Tentar calcular a partir do analysis_data se disponível
-                                            home_form_points = int(analysis_data.get("home_form_points", 0) * 15)
-                                        
-                                        if away_form_raw:
-                                            away_form_points = calculate_form_points(away_form_raw)
-                                        else:
-                                            # Tentar calcular a partir do analysis_data se disponível
-                                            away_form_points = int(analysis_data.get("away_form_points", 0) * 15)
-                                        
-                                        confidence_section += f"- **Consistência**: {home_team}: {home_consistency:.1f}%, {away_team}: {away_consistency:.1f}%. Consistência é uma medida que indica quão previsível é o desempenho da equipe.\n"
-                                        confidence_section += f"- **Forma Recente**: {home_team}: {home_form_points}/15, {away_team}: {away_form_points}/15. Forma representa a pontuação dos últimos 5 jogos (vitória=3pts, empate=1pt, derrota=0pts).\n"
-                                        confidence_section += "- Valores mais altos em ambas métricas aumentam a confiança na previsão."
-                                    else:
-                                        confidence_section += "- **Consistência**: Consistência é uma medida que indica quão previsível é o desempenho da equipe.\n"
-                                        confidence_section += "- **Forma Recente**: Forma representa a pontuação dos últimos 5 jogos (vitória=3pts, empate=1pt, derrota=0pts).\n"
-                                        confidence_section += "- Valores mais altos em ambas métricas aumentam a confiança na previsão."
-                                    
-                                    new_analysis.append(confidence_section)
-                                    
-                                    return "\n\n".join(new_analysis)
-                                
-                                except Exception as e:
-                                    # Bloco except que estava faltando
-                                    logger.error(f"Erro ao reconstruir análise: {str(e)}")
-                                    import traceback
-                                    logger.error(traceback.format_exc())
-                                    return f"Erro ao processar análise: {str(e)}"
-                            
-                            # Usar a análise de texto da API como base, mas reconstruir completamente as seções críticas
-                            formatted_analysis = reconstruct_analysis(
-                                analysis,
-                                home_team,
-                                away_team,
-                                selected_markets,
-                                original_probabilities,
-                                implied_probabilities,
-                                odds_data
-                            )
-                            
-                            # Exibir o resultado formatado
-                            st.code(formatted_analysis, language=None)
-                            
-                            # Registrar uso após análise bem-sucedida
-                            num_markets = sum(1 for v in selected_markets.values() if v)
-                            
-                            # Registro de uso com dados detalhados
-                            analysis_data = {
-                                "league": selected_league,
-                                "home_team": home_team,
-                                "away_team": away_team,
-                                "markets_used": [k for k, v in selected_markets.items() if v]
-                            }
-                            success = st.session_state.user_manager.record_usage(
-                                st.session_state.email, 
-                                num_markets,
-                                analysis_data
-                            )
-                            
-                            if success:
-                                # Forçar atualização do cache de estatísticas
-                                if hasattr(st.session_state, 'user_stats_cache'):
-                                    del st.session_state.user_stats_cache  # Remover cache para forçar reload
-                                
-                                # Mostrar mensagem de sucesso com créditos restantes
-                                updated_stats = st.session_state.user_manager.get_usage_stats(st.session_state.email)
-                                credits_after = updated_stats['credits_remaining']
-                                st.success(f"{num_markets} créditos foram consumidos. Agora você tem {credits_after} créditos.")
-                            else:
-                                st.error("Não foi possível registrar o uso dos créditos. Por favor, tente novamente.")
-                                    
-                    except Exception as analysis_error:
-                        logger.error(f"Erro durante a análise: {str(analysis_error)}")
-                        logger.error(traceback.format_exc())
-                        status.error(f"Erro durante a análise: {str(analysis_error)}")
-                        if st.session_state.debug_mode:
-                            st.code(traceback.format_exc())
+                # Acompanhar o job da sessão ou, após um refresh, o último job pendente do usuário
+                from utils.analysis_jobs import latest_user_job
+                job_id = st.session_state.get("analysis_job_id") or latest_user_job(st.session_state.email)
+                if job_id:
+                    st.session_state.analysis_job_id = job_id
+                    show_analysis_job(job_id)
             except Exception as button_error:
                 logger.error(f"Erro no botão de análise: {str(button_error)}")
                 logger.error(traceback.format_exc())
@@ -30,9 +30,9 @@ def show_packages_page():
         # IMPORTANTE: Forçar refresh dos dados do usuário para garantir que os créditos estão atualizados
         if st.session_state.authenticated and st.session_state.email:
             try:
-                # Recarregar explicitamente os dados do usuário do disco
-                from utils.data import UserManager
-                st.session_state.user_manager = UserManager()
+                # Conferir se os dados do usuário mudaram em disco (instância compartilhada)
+                from utils.data import get_user_manager
+                st.session_state.user_manager = get_user_manager()
                 # Limpar qualquer cache que possa existir para estatísticas
                 if hasattr(st.session_state, 'user_stats_cache'):
                     del st.session_state.user_stats_cache
@@ -102,9 +102,9 @@ def show_packages_page():
         if st.button("← Voltar para análises", key="back_to_analysis", use_container_width=True):
             # IMPORTANTE: Forçar refresh dos dados ao voltar para análises
             try:
-                # Recarregar a classe UserManager para garantir dados atualizados
-                from utils.data import UserManager
-                st.session_state.user_manager = UserManager()
+                # Conferir se os dados mudaram em disco (instância compartilhada)
+                from utils.data import get_user_manager
+                st.session_state.user_manager = get_user_manager()
                 # Limpar qualquer cache de estatísticas
                 if hasattr(st.session_state, 'user_stats_cache'):
                     del st.session_state.user_stats_cache
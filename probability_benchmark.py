@@ -0,0 +1,126 @@
+"""
+Benchmark e verificação do motor vetorizado de probabilidades.
+
+Gera N jogos sintéticos, calcula as probabilidades com a função escalar
+``calculate_advanced_probabilities`` (um jogo por vez) e com
+``calculate_batch_probabilities`` (uma passada só), confere que os
+resultados são idênticos bit a bit e compara os tempos.
+
+Uso:
+    python probability_benchmark.py [N]
+"""
+import sys
+import time
+import random
+import logging
+
+import numpy as np
+
+from utils.ai import calculate_advanced_probabilities, PROBABILITY_CACHE_SIZE
+from utils.probabilities import calculate_batch_probabilities, team_feature_arrays
+
+logging.basicConfig(level=logging.CRITICAL)
+
+FORMS = ["WWDLW", "LLDWD", "DDDDD", "WWWWW", "?????", "LDL", ""]
+SEASON_ID = 12325
+
+
+def random_team(rng):
+    """Gera estatísticas sintéticas de um time, com alguns campos ausentes"""
+    wins = rng.uniform(0, 80)
+    draws = rng.uniform(0, 100 - wins)
+    team = {
+        "win_pct": wins,
+        "draw_pct": draws,
+        "loss_pct": 100 - wins - draws,
+        "goals_per_game": rng.uniform(0.3, 3.0),
+        "conceded_per_game": rng.uniform(0.3, 3.0),
+        "xg": rng.uniform(0, 80),
+        "xga": rng.uniform(0, 80),
+        "possession": rng.uniform(30, 70),
+        "btts_pct": rng.uniform(20, 80),
+        "cards_per_game": rng.uniform(1, 4),
+        "corners_per_game": rng.uniform(3, 8),
+        "name": f"Time {rng.randint(1, 40)}",
+        "form": rng.choice(FORMS),
+    }
+    if rng.random() < 0.3:
+        team["formRun_overall"] = rng.choice(FORMS)
+    # Remover campos aleatórios para exercitar os valores padrão
+    for key in list(team):
+        if rng.random() < 0.15:
+            del team[key]
+    return team
+
+
+def compare(scalar_results, batch):
+    """
+    Compara os resultados escalares com o lote
+
+    Returns:
+        int: Número de valores divergentes
+    """
+    mismatches = 0
+    for i, scalar in enumerate(scalar_results):
+        if scalar is None:
+            mismatches += int(bool(batch["valid"][i]))
+            continue
+        if not batch["valid"][i]:
+            mismatches += 1
+            continue
+        for market, data in scalar.items():
+            for key, value in data.items():
+                batch_value = batch[market][key][i]
+                if np.float64(value).tobytes() != np.float64(batch_value).tobytes():
+                    mismatches += 1
+    return mismatches
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    rng = random.Random(42)
+    home_teams = [random_team(rng) for _ in range(n)]
+    away_teams = [random_team(rng) for _ in range(n)]
+
+    print(f"Calculando probabilidades para {n} jogos...\n")
+
+    # Sem memoização, para medir o cálculo em si
+    start = time.perf_counter()
+    scalar_results = [
+        calculate_advanced_probabilities(h, a, season_id=SEASON_ID, use_cache=False)
+        for h, a in zip(home_teams, away_teams)
+    ]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    home_arrays = team_feature_arrays(home_teams)
+    away_arrays = team_feature_arrays(away_teams)
+    convert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = calculate_batch_probabilities(home_arrays, away_arrays, season_ids=SEASON_ID)
+    batch_time = time.perf_counter() - start
+
+    # Segunda passada com memoização (até o tamanho do cache): deve ser
+    # determinística e servida do cache
+    cached_pairs = list(zip(home_teams, away_teams))[:PROBABILITY_CACHE_SIZE]
+    for h, a in cached_pairs:
+        calculate_advanced_probabilities(h, a, season_id=SEASON_ID)
+    start = time.perf_counter()
+    cached_results = [calculate_advanced_probabilities(h, a, season_id=SEASON_ID) for h, a in cached_pairs]
+    cached_time = time.perf_counter() - start
+
+    mismatches = compare(scalar_results, batch)
+    cache_mismatches = compare(cached_results, batch)
+
+    print(f"Escalar (loop):          {scalar_time * 1000:9.2f} ms")
+    print(f"Conversão para arrays:   {convert_time * 1000:9.2f} ms")
+    print(f"Lote vetorizado:         {batch_time * 1000:9.2f} ms")
+    print(f"Aceleração (só cálculo): {scalar_time / batch_time:9.1f}x")
+    print(f"Escalar memorizado:      {cached_time * 1000:9.2f} ms ({len(cached_pairs)} jogos, "
+          f"{scalar_time / n * 1e6:.0f} -> {cached_time / len(cached_pairs) * 1e6:.0f} µs por jogo)")
+    print(f"\nValores divergentes (escalar x lote):     {mismatches}")
+    print(f"Valores divergentes (memorizado x lote):  {cache_mismatches}")
+
+    sys.exit(1 if mismatches or cache_mismatches else 0)
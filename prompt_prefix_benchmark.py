@@ -0,0 +1,81 @@
+"""
+Benchmark do prefixo estático dos prompts de análise.
+
+Gera requisições para jogos, mercados e odds aleatórios exatamente como o
+dashboard (format_highly_optimized_prompt + build_analysis_messages) e mede
+quantos bytes iniciais cada requisição compartilha com as demais. Esse
+prefixo idêntico é o que o cache de prefixo do provedor pode reaproveitar
+(na OpenAI, só a partir de 1024 tokens).
+
+Uso:
+    python prompt_prefix_benchmark.py [N]
+"""
+import sys
+import json
+import random
+import logging
+
+from utils.ai import (
+    GPT_SYSTEM_MESSAGE, PROMPT_MARKET_NAMES, PROMPT_PREFIX_VERSION,
+    build_analysis_messages, format_highly_optimized_prompt
+)
+from utils.prompt_budget import count_tokens, tokenizer_name
+from probability_benchmark import random_team, SEASON_ID
+
+logging.basicConfig(level=logging.CRITICAL)
+
+# Tamanho mínimo de prefixo que a OpenAI armazena em cache
+PROVIDER_MIN_CACHED_TOKENS = 1024
+
+TEAMS = ["Flamengo", "Palmeiras", "Corinthians", "São Paulo", "Grêmio", "Internacional",
+         "Atlético-MG", "Fluminense", "Botafogo", "Bahia", "Fortaleza", "Cruzeiro"]
+
+
+def random_request(rng):
+    """Mensagens serializadas de uma análise aleatória"""
+    home_team, away_team = rng.sample(TEAMS, 2)
+    selected_markets = {market: rng.random() < 0.5 for market in PROMPT_MARKET_NAMES}
+    selected_markets["money_line"] = True
+    data = {
+        "home_team": random_team(rng),
+        "away_team": random_team(rng),
+        "h2h": {"total_matches": rng.randint(0, 6), "home_wins": rng.randint(0, 3),
+                "away_wins": rng.randint(0, 3), "draws": rng.randint(0, 2)},
+        "match_info": {"league": "Serie A (Brazil)", "league_id": SEASON_ID}
+    }
+    odds_data = (f"Money Line: {home_team} @{rng.uniform(1.5, 4):.2f} | Empate @{rng.uniform(2.8, 4):.2f} | "
+                 f"{away_team} @{rng.uniform(1.5, 5):.2f}")
+    prompt = format_highly_optimized_prompt(data, home_team, away_team, odds_data, selected_markets)
+    return json.dumps(build_analysis_messages(prompt), ensure_ascii=False).encode("utf-8")
+
+
+def common_prefix_length(a, b):
+    """Número de bytes iniciais idênticos"""
+    limit = min(len(a), len(b))
+    for i in range(limit):
+        if a[i] != b[i]:
+            return i
+    return limit
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = random.Random(42)
+    requests = [random_request(rng) for _ in range(n)]
+
+    # Cada requisição comparada com a anterior (o que estaria no cache do provedor)
+    prefixes = [common_prefix_length(requests[i - 1], requests[i]) for i in range(1, n)]
+    shares = [prefix / len(request) * 100 for prefix, request in zip(prefixes, requests[1:])]
+    shared = requests[0][:min(prefixes)].decode("utf-8", errors="ignore")
+    prefix_tokens = count_tokens(shared)
+    system_tokens = count_tokens(GPT_SYSTEM_MESSAGE)
+
+    print(f"{n} requisições, prefixo v{PROMPT_PREFIX_VERSION} (tokenizador: {tokenizer_name()})")
+    print(f"Tamanho médio da requisição: {sum(map(len, requests)) / n:8.0f} bytes")
+    print(f"Prefixo idêntico (mínimo):   {min(prefixes):8d} bytes, ~{prefix_tokens} tokens "
+          f"(mensagem de sistema: {system_tokens} tokens)")
+    print(f"Fração compartilhada:        média {sum(shares) / len(shares):5.1f}%, "
+          f"mín {min(shares):5.1f}%, máx {max(shares):5.1f}%")
+    if prefix_tokens < PROVIDER_MIN_CACHED_TOKENS:
+        print(f"Aviso: prefixo abaixo de {PROVIDER_MIN_CACHED_TOKENS} tokens; "
+              f"o cache automático da OpenAI não se aplica.")
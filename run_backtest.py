@@ -0,0 +1,78 @@
+"""
+Executa o backtest do modelo de probabilidades sobre temporadas em cache.
+
+Cada temporada roda num processo separado, usando apenas o cache local de
+``league-matches`` (use --online para buscar na API/servidor configurado).
+As previsões ficam em ``data/backtests`` para treinar a calibração.
+
+Com --calibrate, as tabelas de calibração (isotonic ou platt) são
+treinadas em seguida com todas as previsões salvas.
+
+Uso:
+    python run_backtest.py 12325 "Premier League (England)" [--workers N] [--online] [--calibrate isotonic]
+"""
+import sys
+import logging
+
+from utils.backtest import run_backtests
+
+logging.basicConfig(level=logging.WARNING)
+
+
+def resolve_season_ids(args):
+    """Converte IDs numéricos e nomes de liga (LEAGUE_IDS) em season_ids"""
+    season_ids = []
+    for arg in args:
+        if arg.isdigit():
+            season_ids.append(int(arg))
+            continue
+        from utils.footystats_api import LEAGUE_IDS
+        if arg in LEAGUE_IDS:
+            season_ids.append(LEAGUE_IDS[arg])
+        else:
+            print(f"Liga desconhecida: {arg}")
+    return season_ids
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    workers = None
+    if "--workers" in args:
+        index = args.index("--workers")
+        workers = int(args[index + 1])
+        del args[index:index + 2]
+    calibration_method = None
+    if "--calibrate" in args:
+        index = args.index("--calibrate")
+        calibration_method = args[index + 1]
+        del args[index:index + 2]
+    online = "--online" in args
+    args = [arg for arg in args if arg != "--online"]
+
+    season_ids = resolve_season_ids(args)
+    if not season_ids:
+        print(__doc__)
+        sys.exit(1)
+
+    print(f"Backtest de {len(season_ids)} temporada(s) ({'online' if online else 'somente cache'})...\n")
+    report = run_backtests(season_ids, workers=workers, offline=not online)
+
+    for season_id, data in sorted(report["seasons"].items()):
+        print(f"Temporada {season_id}: {data['priced']}/{data['matches']} jogos precificados "
+              f"em {data['elapsed'] * 1000:.0f} ms")
+        for market, metrics in data["metrics"].items():
+            print(f"  {market:<18} n={metrics['n']:<5} Brier={metrics['brier']:.4f} "
+                  f"LogLoss={metrics['log_loss']:.4f}")
+
+    if report["overall"]:
+        print("\nGeral:")
+        for market, metrics in report["overall"].items():
+            print(f"  {market:<18} n={metrics['n']:<5} Brier={metrics['brier']:.4f} "
+                  f"LogLoss={metrics['log_loss']:.4f}")
+    else:
+        print("Nenhuma temporada com dados em cache.")
+
+    if calibration_method:
+        from utils.calibration import train_calibration
+        tables = train_calibration(method=calibration_method)
+        print(f"\nCalibração ({calibration_method}) treinada para: {', '.join(tables) or 'nenhum mercado'}")
@@ -0,0 +1,56 @@
+"""
+Varre todos os jogos futuros das ligas informadas e lista as apostas de valor.
+
+A tabela de odds é um CSV com uma linha por jogo, identificado por
+``match_id`` ou pelas colunas ``home``/``away``, e uma coluna por seleção
+(home_win, draw, away_win, 1x, 12, x2, btts_yes, btts_no, over_2_5,
+under_2_5, corners_over_9_5, corners_under_9_5, cards_over_3_5,
+cards_under_3_5). Nenhuma chamada à IA é feita.
+
+Uso:
+    python scan_matchday.py odds.csv 12325 "Serie A (Brazil)" [--min-edge 3] [--top 30] [--offline]
+"""
+import sys
+import logging
+from datetime import datetime
+
+from utils.scanner import scan_fixtures
+from run_backtest import resolve_season_ids
+
+logging.basicConfig(level=logging.WARNING)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = {"--min-edge": 0.0, "--top": 30}
+    for option in list(options):
+        if option in args:
+            index = args.index(option)
+            options[option] = float(args[index + 1])
+            del args[index:index + 2]
+    offline = "--offline" in args
+    args = [arg for arg in args if arg != "--offline"]
+
+    if len(args) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    odds_file = args[0]
+    season_ids = resolve_season_ids(args[1:])
+    if not season_ids:
+        print(__doc__)
+        sys.exit(1)
+
+    result = scan_fixtures(season_ids, odds_file, min_edge=options["--min-edge"], offline=offline)
+    if result is None:
+        print("Erro ao executar o scanner (veja os logs).")
+        sys.exit(1)
+
+    print(f"{result['fixtures']} jogos futuros, {result['priced']} com odds, "
+          f"{len(result['bets'])} seleções com valor ({result['elapsed'] * 1000:.0f} ms)\n")
+
+    for bet in result["bets"][:int(options["--top"])]:
+        date = datetime.fromtimestamp(bet["date_unix"]).strftime("%d/%m %H:%M") if bet["date_unix"] else "--"
+        print(f"{date:<12} {bet['home'][:22]:<22} x {bet['away'][:22]:<22} {bet['selection']:<18} "
+              f"@{bet['odd']:<6.2f} modelo {bet['model_prob']:5.1f}%  implícita {bet['implied_prob']:5.1f}%  "
+              f"vantagem {bet['edge']:+5.1f}  EV {bet['expected_value']:+6.1f}%")
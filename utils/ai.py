@@ -3,13 +3,16 @@ import os
 import logging
 import streamlit as st
 import json
+import hashlib
+import threading
+from collections import OrderedDict
 # REMOVER ESTA LINHA: from utils.ai import format_highly_optimized_prompt
 
 # Configuração de logging
 logger = logging.getLogger("valueHunter.ai")
 
 try:
-    from openai import OpenAI, OpenAIError
+    from openai import OpenAI, OpenAIError, RateLimitError
     logger.info("OpenAI importado com sucesso")
 except ImportError as e:
     logger.error(f"Erro ao importar OpenAI: {str(e)}")
@@ -31,6 +34,23 @@ except ImportError as e:
     OpenAI = DummyOpenAI
     class OpenAIError(Exception):
         pass
+    class RateLimitError(OpenAIError):
+        pass
+
+def openai_base_url():
+    """
+    Endpoint alternativo da API da OpenAI (OPENAI_BASE_URL), se configurado
+
+    Returns:
+        str: URL base ou "" para o endpoint oficial
+    """
+    base_url = os.environ.get("OPENAI_BASE_URL", "")
+    if not base_url and "RENDER" not in os.environ:
+        try:
+            base_url = st.secrets.get("OPENAI_BASE_URL", "")
+        except Exception:
+            base_url = ""
+    return base_url
 
 @st.cache_resource
 def get_openai_client():
@@ -50,12 +70,19 @@ def get_openai_client():
                 api_key = os.environ.get("OPENAI_API_KEY", "")
                 logger.info("Usando API key da OpenAI de variáveis de ambiente locais")
         
+        # Endpoint alternativo compatível com a API (ex.: mock_openai_server.py em testes de carga)
+        base_url = openai_base_url()
+        if base_url:
+            logger.info(f"Usando endpoint OpenAI alternativo: {base_url}")
+            if not api_key:
+                api_key = "local"  # o servidor local não valida a chave
+        
         if not api_key:
             logger.error("OpenAI API key não encontrada em nenhuma configuração")
             return None
             
         try:
-            client = OpenAI(api_key=api_key)
+            client = OpenAI(api_key=api_key, base_url=base_url or None)
             logger.info("Cliente OpenAI inicializado com sucesso")
             return client
         except Exception as e:
@@ -67,743 +94,580 @@ def get_openai_client():
 
 # Add to utils/ai.py
 
-def format_highly_optimized_prompt(optimized_data, home_team, away_team, odds_data, selected_markets):
+# Nome de cada mercado selecionável nas instruções do prompt
+PROMPT_MARKET_NAMES = {
+    "money_line": "Money Line (1X2)",
+    "chance_dupla": "Chance Dupla (Double Chance)",
+    "over_under": "Over/Under 2.5 Gols",
+    "ambos_marcam": "Ambos Marcam (BTTS)",
+    "escanteios": "Escanteios (Over/Under 9.5)",
+    "cartoes": "Cartões (Over/Under 3.5)"
+}
+
+def _per_game(total, games):
+    """Média por jogo (None se faltar o total ou o número de jogos)"""
+    return total / games if total and games else None
+
+def _record(team, prefix=""):
+    """Campanha "V-E-D" do time (None se não houver jogos registrados)"""
+    values = [team.get(f"{prefix}{key}", 0) or 0 for key in ("wins", "draws", "losses")]
+    return "-".join(str(v) for v in values) if any(values) else None
+
+def _team_sections(home, away, h2h, home_team, away_team, selected_markets):
+    """Seções de estatísticas (tabelas compactas) relevantes para os mercados selecionados"""
+    from utils.prompt_budget import PromptSection, compact_table, format_value
+
+    overall = ["Métrica", home_team, away_team]
+    venue = ["Métrica", f"{home_team} (casa)", f"{away_team} (fora)"]
+    sections = []
+
+    fundamentals = compact_table(overall, [
+        ("Jogos", home.get("played"), away.get("played")),
+        ("V-E-D", _record(home), _record(away)),
+        ("Gols marcados", home.get("goals_scored"), away.get("goals_scored")),
+        ("Gols sofridos", home.get("goals_conceded"), away.get("goals_conceded")),
+        ("Posição", home.get("leaguePosition_overall"), away.get("leaguePosition_overall")),
+        ("Forma (últ. 5)", home.get("form"), away.get("form")),
+        ("PPG", home.get("seasonPPG_overall"), away.get("seasonPPG_overall")),
+        ("xG", home.get("xg"), away.get("xg")),
+        ("xGA", home.get("xga"), away.get("xga")),
+        ("xG/jogo", home.get("xg_for_avg_overall"), away.get("xg_for_avg_overall"))
+    ])
+    if fundamentals:
+        sections.append(PromptSection("fundamentos", f"# ESTATÍSTICAS FUNDAMENTAIS\n{fundamentals}", priority=60))
+
+    home_away = compact_table(venue, [
+        ("V-E-D", _record(home, "home_"), _record(away, "away_")),
+        ("Gols marcados", home.get("home_goals_scored"), away.get("away_goals_scored")),
+        ("Gols sofridos", home.get("home_goals_conceded"), away.get("away_goals_conceded")),
+        ("Posição", home.get("leaguePosition_home"), away.get("leaguePosition_away")),
+        ("PPG", home.get("seasonPPG_home"), away.get("seasonPPG_away")),
+        ("Forma", home.get("home_form"), away.get("away_form")),
+        ("xG", home.get("home_xg"), away.get("away_xg")),
+        ("xGA", home.get("home_xga"), away.get("away_xga"))
+    ])
+    if home_away:
+        sections.append(PromptSection("casa_fora", f"# DESEMPENHO COMO MANDANTE/VISITANTE\n{home_away}", priority=40))
+
+    if h2h.get("total_matches", 0) > 0:
+        h2h_items = [
+            ("Jogos", h2h.get("total_matches")),
+            (f"Vitórias {home_team}", h2h.get("home_wins")),
+            (f"Vitórias {away_team}", h2h.get("away_wins")),
+            ("Empates", h2h.get("draws")),
+            ("Média de gols", h2h.get("avg_goals"))
+        ]
+        if selected_markets.get("ambos_marcam"):
+            h2h_items.append(("Ambos Marcam %", h2h.get("btts_pct")))
+        if selected_markets.get("over_under"):
+            h2h_items.append(("Over 2.5 %", h2h.get("over_2_5_pct")))
+        if selected_markets.get("escanteios"):
+            h2h_items.append(("Média de escanteios", h2h.get("avg_corners")))
+        if selected_markets.get("cartoes"):
+            h2h_items.append(("Média de cartões", h2h.get("avg_cards")))
+        h2h_line = " | ".join(f"{label}: {format_value(value)}" for label, value in h2h_items
+                              if format_value(value) != "-")
+        sections.append(PromptSection("h2h", f"# CONFRONTO DIRETO (H2H)\n{h2h_line}", priority=20))
+
+    if selected_markets.get("money_line") or selected_markets.get("chance_dupla"):
+        result_table = compact_table(overall, [
+            ("Vitória %", home.get("win_pct"), away.get("win_pct")),
+            ("Empate %", home.get("draw_pct"), away.get("draw_pct")),
+            ("Derrota %", home.get("loss_pct"), away.get("loss_pct")),
+            ("PPG casa/fora", home.get("seasonPPG_home"), away.get("seasonPPG_away")),
+            ("PPG recente", home.get("seasonRecentPPG"), away.get("seasonRecentPPG")),
+            ("Posse %", home.get("possession"), away.get("possession")),
+            ("Posse casa/fora %", home.get("home_possession"), away.get("away_possession"))
+        ])
+        if result_table:
+            sections.append(PromptSection("resultado", f"# MERCADOS DE RESULTADO\n{result_table}", priority=50))
+
+    if selected_markets.get("over_under") or selected_markets.get("ambos_marcam"):
+        goals_table = compact_table(overall, [
+            ("Gols marcados/jogo", home.get("goals_per_game"), away.get("goals_per_game")),
+            ("Gols sofridos/jogo", home.get("conceded_per_game"), away.get("conceded_per_game")),
+            ("Marcados/jogo casa/fora",
+             _per_game(home.get("home_goals_scored"), home.get("home_played")),
+             _per_game(away.get("away_goals_scored"), away.get("away_played"))),
+            ("Sofridos/jogo casa/fora",
+             _per_game(home.get("home_goals_conceded"), home.get("home_played")),
+             _per_game(away.get("away_goals_conceded"), away.get("away_played"))),
+            ("Total gols/jogo",
+             _per_game(home.get("seasonGoalsTotal_overall"), home.get("played")),
+             _per_game(away.get("seasonGoalsTotal_overall"), away.get("played"))),
+            ("Clean sheets", home.get("seasonCS_overall"), away.get("seasonCS_overall")),
+            ("Clean sheets %", home.get("clean_sheets_pct"), away.get("clean_sheets_pct")),
+            ("Clean sheets casa/fora", home.get("seasonCS_home"), away.get("seasonCS_away")),
+            ("Ambos Marcam %", home.get("btts_pct"), away.get("btts_pct")),
+            ("Over 2.5 %", home.get("over_2_5_pct"), away.get("over_2_5_pct")),
+            ("Chutes/jogo", home.get("shotsAVG_overall"), away.get("shotsAVG_overall")),
+            ("Chutes/jogo casa/fora", home.get("shotsAVG_home"), away.get("shotsAVG_away")),
+            ("No alvo/jogo", home.get("shotsOnTargetAVG_overall"), away.get("shotsOnTargetAVG_overall")),
+            ("No alvo/jogo casa/fora", home.get("shotsOnTargetAVG_home"), away.get("shotsOnTargetAVG_away"))
+        ])
+        if goals_table:
+            sections.append(PromptSection("gols", f"# MERCADOS DE GOLS\n{goals_table}", priority=50))
+
+    if selected_markets.get("escanteios"):
+        corners_table = compact_table(overall, [
+            ("Escanteios/jogo", home.get("corners_per_game"), away.get("corners_per_game")),
+            ("Escanteios/jogo casa/fora", home.get("home_corners_per_game"), away.get("away_corners_per_game")),
+            ("A favor (total)", home.get("corners_for"), away.get("corners_for")),
+            ("A favor/jogo", home.get("cornersAVG_overall"), away.get("cornersAVG_overall")),
+            ("A favor/jogo casa/fora", home.get("cornersAVG_home"), away.get("cornersAVG_away")),
+            ("Contra (total)", home.get("corners_against"), away.get("corners_against")),
+            ("Contra/jogo", home.get("cornersAgainstAVG_overall"), away.get("cornersAgainstAVG_overall")),
+            ("Contra/jogo casa/fora", home.get("cornersAgainstAVG_home"), away.get("cornersAgainstAVG_away")),
+            ("Over 9.5 %", home.get("over_9_5_corners_pct"), away.get("over_9_5_corners_pct"))
+        ])
+        if corners_table:
+            sections.append(PromptSection("escanteios", f"# MERCADOS DE ESCANTEIOS\n{corners_table}", priority=50))
+
+    if selected_markets.get("cartoes"):
+        cards_table = compact_table(overall, [
+            ("Cartões/jogo", home.get("cards_per_game"), away.get("cards_per_game")),
+            ("Cartões/jogo casa/fora", home.get("home_cards_per_game"), away.get("away_cards_per_game")),
+            ("Total", home.get("cardsTotal_overall"), away.get("cardsTotal_overall")),
+            ("Total casa/fora", home.get("cardsTotal_home"), away.get("cardsTotal_away")),
+            ("Amarelos", home.get("yellow_cards"), away.get("yellow_cards")),
+            ("Vermelhos", home.get("red_cards"), away.get("red_cards")),
+            ("Over 3.5 %", home.get("over_3_5_cards_pct"), away.get("over_3_5_cards_pct"))
+        ])
+        if cards_table:
+            sections.append(PromptSection("cartoes", f"# MERCADOS DE CARTÕES\n{cards_table}", priority=50))
+
+    return sections
+
+def _ratings_section(ratings, home_team, away_team):
+    """Tabela dos ratings da temporada (Elo e ataque/defesa); "" se indisponíveis"""
+    from utils.prompt_budget import compact_table
+
+    if not ratings:
+        return ""
+    home = ratings.get("home") or {}
+    away = ratings.get("away") or {}
+    expected = ratings.get("expected_goals") or {}
+    table = compact_table(["Métrica", home_team, away_team], [
+        ("Elo", home.get("elo"), away.get("elo")),
+        ("Ataque (1 = média)", home.get("attack"), away.get("attack")),
+        ("Defesa (1 = média)", home.get("defence"), away.get("defence")),
+        ("Gols esperados (ratings)", expected.get("home"), expected.get("away"))
+    ])
+    if not table:
+        return ""
+    elo_home = ratings.get("elo_home_win")
+    if elo_home is not None:
+        table += f"\nExpectativa Elo de {home_team}: {elo_home * 100:.1f}%"
+    return f"# RATINGS DA TEMPORADA\n{table}"
+
+def _probability_section(probabilities, home_team, away_team, selected_markets, has_stats_data):
+    """Texto das probabilidades calculadas, apenas para os mercados selecionados"""
+    if has_stats_data:
+        lines = ["# PROBABILIDADES CALCULADAS (MÉTODO DE DISPERSÃO E PONDERAÇÃO)"]
+    else:
+        lines = ["# PROBABILIDADES CALCULADAS (MODELO DE FALLBACK)",
+                 "Dados estatísticos insuficientes: as probabilidades são aproximações de um modelo simplificado."]
+
+    if not probabilities:
+        lines.append("Probabilidades indisponíveis; baseie a análise nas odds implícitas.")
+        return "\n".join(lines)
+
+    moneyline = probabilities.get("moneyline", {})
+    double_chance = probabilities.get("double_chance", {})
+    over_under = probabilities.get("over_under", {})
+    btts = probabilities.get("btts", {})
+    corners = probabilities.get("corners", {})
+    cards = probabilities.get("cards", {})
+
+    if selected_markets.get("money_line"):
+        lines.append(f"Moneyline (1X2): {home_team} {moneyline.get('home_win', 0):.1f}% | "
+                     f"Empate {moneyline.get('draw', 0):.1f}% | {away_team} {moneyline.get('away_win', 0):.1f}%")
+    if selected_markets.get("chance_dupla"):
+        lines.append(f"Chance Dupla: {home_team} ou Empate {double_chance.get('home_or_draw', 0):.1f}% | "
+                     f"{away_team} ou Empate {double_chance.get('away_or_draw', 0):.1f}% | "
+                     f"{home_team} ou {away_team} {double_chance.get('home_or_away', 0):.1f}%")
+    if selected_markets.get("over_under"):
+        lines.append(f"Over/Under 2.5 Gols: Over {over_under.get('over_2_5', 0):.1f}% | "
+                     f"Under {over_under.get('under_2_5', 0):.1f}% (gols esperados {over_under.get('expected_goals', 0):.2f})")
+    if selected_markets.get("ambos_marcam"):
+        lines.append(f"Ambos Marcam: Sim {btts.get('yes', 0):.1f}% | Não {btts.get('no', 0):.1f}%")
+    if selected_markets.get("escanteios"):
+        lines.append(f"Escanteios 9.5: Over {corners.get('over_9_5', 0):.1f}% | "
+                     f"Under {corners.get('under_9_5', 0):.1f}% (esperados {corners.get('expected_corners', 0):.1f})")
+    if selected_markets.get("cartoes"):
+        lines.append(f"Cartões 3.5: Over {cards.get('over_3_5', 0):.1f}% | "
+                     f"Under {cards.get('under_3_5', 0):.1f}% (esperados {cards.get('expected_cards', 0):.1f})")
+
+    analysis_data = probabilities.get("analysis_data", {})
+    lines.append(f"Consistência: {home_team} {analysis_data.get('home_consistency', 0) * 100:.1f}% | "
+                 f"{away_team} {analysis_data.get('away_consistency', 0) * 100:.1f}%")
+    lines.append(f"Forma recente (pontos): {home_team} {analysis_data.get('home_form_points', 0) * 15:.1f}/15 | "
+                 f"{away_team} {analysis_data.get('away_form_points', 0) * 15:.1f}/15")
+    return "\n".join(lines)
+
+def format_highly_optimized_prompt(optimized_data, home_team, away_team, odds_data, selected_markets,
+                                   probabilities=None, token_budget=None, report=None):
     """
-    Format prompt for GPT with improved layout and comprehensive home/away data.
+    Monta o prompt da análise dentro de um orçamento de tokens
+
+    O prompt contém apenas os dados variáveis da partida; papel, metodologia
+    e formato da resposta ficam no prefixo estático GPT_SYSTEM_MESSAGE. As
+    estatísticas viram tabelas compactas (campos ausentes, NaN ou "?" são
+    omitidos) e só entram as seções dos mercados selecionados. Se o total
+    passar do orçamento, as seções opcionais de menor prioridade são
+    descartadas; probabilidades e odds são sempre mantidas.
+
+    Args:
+        optimized_data (dict): Dados simplificados (home_team, away_team, h2h, match_info e,
+            se disponível, ratings)
+        home_team (str): Nome do time da casa
+        away_team (str): Nome do time visitante
+        odds_data (str): Odds formatadas
+        selected_markets (dict): Mercados selecionados
+        probabilities (dict, optional): Resultado de calculate_advanced_probabilities
+            (calculado aqui se não informado)
+        token_budget (int, optional): Máximo de tokens (padrão PROMPT_TOKEN_BUDGET)
+        report (dict, optional): Preenchido com os tokens por seção e as seções descartadas
+
+    Returns:
+        str: Prompt formatado
     """
-    import logging
     import traceback
-    import math
-    import numpy as np
-    
-    logger = logging.getLogger("valueHunter.ai")
-    
+    from utils.prompt_budget import PROMPT_TOKEN_BUDGET, PromptSection, build_prompt
+
     logger.info(f"Formatting highly optimized prompt for {home_team} vs {away_team}")
-    
+
     try:
-        # Extract main data structures
         home = optimized_data.get("home_team", {})
         away = optimized_data.get("away_team", {})
         h2h = optimized_data.get("h2h", {})
         match_info = optimized_data.get("match_info", {"league": ""})
-        
-        # Extract league name if available
         league_name = match_info.get("league", "")
-        
+
         # Verifica qualidade dos dados - se temos estatísticas mínimas
         has_stats_data = (
             (home.get("played", 0) > 0 or home.get("wins", 0) > 0 or home.get("goals_scored", 0) > 0) and
             (away.get("played", 0) > 0 or away.get("wins", 0) > 0 or away.get("goals_scored", 0) > 0)
         )
-        
-        # Log da qualidade dos dados
-        home_fields = sum(1 for k, v in home.items() 
-                       if (isinstance(v, (int, float)) and v != 0) or 
-                          (isinstance(v, str) and v not in ["", "?????"]))
-        away_fields = sum(1 for k, v in away.items() 
-                       if (isinstance(v, (int, float)) and v != 0) or 
-                          (isinstance(v, str) and v not in ["", "?????"]))
-        
-        logger.info(f"Qualidade dos dados: Casa={home_fields} campos, Visitante={away_fields} campos")
         logger.info(f"Estatísticas suficientes: {has_stats_data}")
-        
+
+        if probabilities is None:
+            probabilities = calculate_advanced_probabilities(home, away, season_id=match_info.get("league_id"))
+
+        header = f"# {home_team} vs {away_team}"
+        if league_name:
+            header += f"\n## {league_name}"
         if not has_stats_data:
             logger.warning("AVISO: Dados estatísticos insuficientes. Usando cálculos de fallback.")
-        
-        # 1. FUNDAMENTAL STATISTICS
-        fundamental_stats = f"""
-# ESTATÍSTICAS FUNDAMENTAIS: {home_team} vs {away_team}
-## {league_name}
-
-### Desempenho Geral na Temporada
-* {home_team}: {home.get('wins', 0)}V {home.get('draws', 0)}E {home.get('losses', 0)}D | {home.get('goals_scored', 0)} gols marcados, {home.get('goals_conceded', 0)} sofridos
-* {away_team}: {away.get('wins', 0)}V {away.get('draws', 0)}E {away.get('losses', 0)}D | {away.get('goals_scored', 0)} gols marcados, {away.get('goals_conceded', 0)} sofridos
-
-### Posição na Tabela
-* {home_team}: {home.get('leaguePosition_overall', '?')}º geral | {home.get('leaguePosition_home', '?')}º em casa
-* {away_team}: {away.get('leaguePosition_overall', '?')}º geral | {away.get('leaguePosition_away', '?')}º fora
-
-### Desempenho em Casa/Fora
-* {home_team} como mandante: {home.get('home_wins', 0)}V {home.get('home_draws', 0)}E {home.get('home_losses', 0)}D
-  - Gols marcados em casa: {home.get('home_goals_scored', 0)}
-  - Gols sofridos em casa: {home.get('home_goals_conceded', 0)}
-  - Pontos por jogo em casa: {home.get('seasonPPG_home', 0)}
-  - Forma em casa: {home.get('home_form', '?????')}
-
-* {away_team} como visitante: {away.get('away_wins', 0)}V {away.get('away_draws', 0)}E {away.get('away_losses', 0)}D
-  - Gols marcados fora: {away.get('away_goals_scored', 0)}
-  - Gols sofridos fora: {away.get('away_goals_conceded', 0)}
-  - Pontos por jogo fora: {away.get('seasonPPG_away', 0)}
-  - Forma fora: {away.get('away_form', '?????')}
-
-### Forma Recente (últimos 5 jogos)
-* {home_team}: {home.get('form', '?????')}
-* {away_team}: {away.get('form', '?????')}
-
-### Métricas Expected Goals (xG)
-* {home_team}: 
-  - xG total: {home.get('xg', 0)} | xG em casa: {home.get('home_xg', 0)}
-  - xGA total: {home.get('xga', 0)} | xGA em casa: {home.get('home_xga', 0)}
-  - xG médio por jogo: {home.get('xg_for_avg_overall', 0)}
-
-* {away_team}: 
-  - xG total: {away.get('xg', 0)} | xG fora: {away.get('away_xg', 0)}
-  - xGA total: {away.get('xga', 0)} | xGA fora: {away.get('away_xga', 0)}
-  - xG médio por jogo: {away.get('xg_for_avg_overall', 0)}
-
-### Confronto Direto (H2H)
-* Jogos totais: {h2h.get('total_matches', 0)}
-* Vitórias {home_team}: {h2h.get('home_wins', 0)}
-* Vitórias {away_team}: {h2h.get('away_wins', 0)}
-* Empates: {h2h.get('draws', 0)}
-* Média de gols: {h2h.get('avg_goals', 0)}
-"""
 
-        # Adicionar aviso no prompt caso não tenhamos dados estatísticos suficientes
+        selected_markets_str = ", ".join(name for market, name in PROMPT_MARKET_NAMES.items()
+                                         if selected_markets.get(market))
+        header += f"\nMERCADOS SELECIONADOS: {selected_markets_str}"
+
+        sections = [PromptSection("cabecalho", header, required=True)]
+        sections += _team_sections(home, away, h2h, home_team, away_team, selected_markets)
+        ratings_text = _ratings_section(optimized_data.get("ratings"), home_team, away_team)
+        if ratings_text:
+            sections.append(PromptSection("ratings", ratings_text, priority=30))
+        sections += [
+            PromptSection("probabilidades",
+                          _probability_section(probabilities, home_team, away_team, selected_markets, has_stats_data),
+                          required=True),
+            PromptSection("odds", f"# MERCADOS DISPONÍVEIS E ODDS\n{odds_data}", required=True)
+        ]
         if not has_stats_data:
-            fundamental_stats += """
-### AVISO IMPORTANTE
-⚠️ Os dados estatísticos para esta partida são limitados ou inexistentes.
-As probabilidades calculadas estão utilizando a metodologia de fallback e devem ser consideradas aproximações.
-Recomenda-se cautela ao tomar decisões baseadas nesta análise.
-"""
+            sections.append(PromptSection("aviso", "⚠️ IMPORTANTE: As probabilidades vêm de um modelo de fallback "
+                                          "por falta de dados; mencione isto claramente e recomende cautela.",
+                                          required=True))
 
-        # 2. STATS FOR RESULT MARKETS
-        result_stats = ""
-        if any(selected_markets.get(m) for m in ["money_line", "chance_dupla"]):
-            result_stats = f"""
-# ESTATÍSTICAS PARA MERCADOS DE RESULTADO
-
-### Percentuais de Resultados
-* {home_team}:
-  - Vitória: {home.get('win_pct', 0)}%
-  - Empate: {home.get('draw_pct', 0)}%
-  - Derrota: {home.get('loss_pct', 0)}%
-
-* {away_team}:
-  - Vitória: {away.get('win_pct', 0)}%
-  - Empate: {away.get('draw_pct', 0)}%
-  - Derrota: {away.get('loss_pct', 0)}%
-
-### Pontos por Jogo
-* {home_team}:
-  - Geral: {home.get('seasonPPG_overall', 0)}
-  - Em casa: {home.get('seasonPPG_home', 0)}
-  - Recente: {home.get('seasonRecentPPG', 0)}
-
-* {away_team}:
-  - Geral: {away.get('seasonPPG_overall', 0)}
-  - Fora: {away.get('seasonPPG_away', 0)}
-  - Recente: {away.get('seasonRecentPPG', 0)}
-
-### Posse de Bola
-* {home_team}: {home.get('possession', 0)}% geral | {home.get('home_possession', 0)}% em casa
-* {away_team}: {away.get('possession', 0)}% geral | {away.get('away_possession', 0)}% fora
-"""
-
-        # 3. GOALS MARKETS STATS
-        goals_stats = ""
-        if any(selected_markets.get(m) for m in ["over_under", "ambos_marcam"]):
-            goals_stats = f"""
-# ESTATÍSTICAS PARA MERCADOS DE GOLS
-
-### Médias de Gols
-* {home_team}:
-  - Média gols marcados: {home.get('goals_per_game', 0)} geral | {home.get('home_goals_scored', 0) / max(1, home.get('home_played', 1)):.2f} em casa
-  - Média gols sofridos: {home.get('conceded_per_game', 0)} geral | {home.get('home_goals_conceded', 0) / max(1, home.get('home_played', 1)):.2f} em casa
-  - Total gols por jogo: {home.get('seasonGoalsTotal_overall', 0) / max(1, home.get('played', 1)):.2f} geral | {home.get('seasonGoalsTotal_home', 0) / max(1, home.get('home_played', 1)):.2f} em casa
-
-* {away_team}:
-  - Média gols marcados: {away.get('goals_per_game', 0)} geral | {away.get('away_goals_scored', 0) / max(1, away.get('away_played', 1)):.2f} fora
-  - Média gols sofridos: {away.get('conceded_per_game', 0)} geral | {away.get('away_goals_conceded', 0) / max(1, away.get('away_played', 1)):.2f} fora
-  - Total gols por jogo: {away.get('seasonGoalsTotal_overall', 0) / max(1, away.get('played', 1)):.2f} geral | {away.get('seasonGoalsTotal_away', 0) / max(1, away.get('away_played', 1)):.2f} fora
-
-### Clean Sheets e Ambos Marcam
-* {home_team}: 
-  - Clean sheets: {home.get('seasonCS_overall', 0)} geral ({home.get('clean_sheets_pct', 0)}%) | {home.get('seasonCS_home', 0)} em casa
-* {away_team}: 
-  - Clean sheets: {away.get('seasonCS_overall', 0)} geral ({away.get('clean_sheets_pct', 0)}%) | {away.get('seasonCS_away', 0)} fora
-* {home_team} jogos com Ambos Marcam: {home.get('btts_pct', 0)}%
-* {away_team} jogos com Ambos Marcam: {away.get('btts_pct', 0)}%
-* Jogos H2H com Ambos Marcam: {h2h.get('btts_pct', 0)}%
-
-### Distribuição de Gols por Jogo
-* Jogos do {home_team} com Over 2.5: {home.get('over_2_5_pct', 0)}%
-* Jogos do {away_team} com Over 2.5: {away.get('over_2_5_pct', 0)}%
-* Jogos H2H com Over 2.5: {h2h.get('over_2_5_pct', 0)}%
-
-### Estatísticas de Chutes
-* {home_team}:
-  - Chutes por jogo: {home.get('shotsAVG_overall', 0)} geral | {home.get('shotsAVG_home', 0)} em casa
-  - Chutes no alvo por jogo: {home.get('shotsOnTargetAVG_overall', 0)} geral | {home.get('shotsOnTargetAVG_home', 0)} em casa
-
-* {away_team}:
-  - Chutes por jogo: {away.get('shotsAVG_overall', 0)} geral | {away.get('shotsAVG_away', 0)} fora
-  - Chutes no alvo por jogo: {away.get('shotsOnTargetAVG_overall', 0)} geral | {away.get('shotsOnTargetAVG_away', 0)} fora
-"""
-
-        # 4. CARDS AND CORNERS if selected
-        other_stats = ""
-        if selected_markets.get("escanteios"):
-            other_stats += f"""
-# ESTATÍSTICAS PARA MERCADOS DE ESCANTEIOS
-
-### Dados de Escanteios
-* {home_team}:
-  - Média de escanteios por jogo: {home.get('corners_per_game', 0)} geral | {home.get('home_corners_per_game', 0)} em casa
-  - Escanteios a favor: {home.get('corners_for', 0)} total | {home.get('cornersAVG_overall', 0)} média geral | {home.get('cornersAVG_home', 0)} média em casa
-  - Escanteios contra: {home.get('corners_against', 0)} total | {home.get('cornersAgainstAVG_overall', 0)} média geral | {home.get('cornersAgainstAVG_home', 0)} média em casa
-  - Jogos com Over 9.5 escanteios: {home.get('over_9_5_corners_pct', 0)}%
-
-* {away_team}:
-  - Média de escanteios por jogo: {away.get('corners_per_game', 0)} geral | {away.get('away_corners_per_game', 0)} fora
-  - Escanteios a favor: {away.get('corners_for', 0)} total | {away.get('cornersAVG_overall', 0)} média geral | {away.get('cornersAVG_away', 0)} média fora
-  - Escanteios contra: {away.get('corners_against', 0)} total | {away.get('cornersAgainstAVG_overall', 0)} média geral | {away.get('cornersAgainstAVG_away', 0)} média fora
-  - Jogos com Over 9.5 escanteios: {away.get('over_9_5_corners_pct', 0)}%
+        full_prompt, prompt_report = build_prompt(sections, token_budget or PROMPT_TOKEN_BUDGET)
+        if report is not None:
+            report.update(prompt_report)
 
-* Média de escanteios em confrontos diretos: {h2h.get('avg_corners', 0)}
-"""
+        logger.info(f"Prompt prepared successfully for {home_team} vs {away_team}: "
+                    f"{prompt_report['total']} tokens ({prompt_report['tokenizer']}) - " +
+                    ", ".join(f"{name}={tokens}" for name, tokens in prompt_report["sections"].items()))
+        if prompt_report["dropped"]:
+            logger.info(f"Seções descartadas pelo orçamento: {', '.join(prompt_report['dropped'])}")
 
-        if selected_markets.get("cartoes"):
-            other_stats += f"""
-# ESTATÍSTICAS PARA MERCADOS DE CARTÕES
+        return full_prompt
 
-### Dados de Cartões
-* {home_team}:
-  - Média de cartões por jogo: {home.get('cards_per_game', 0)} geral | {home.get('home_cards_per_game', 0)} em casa
-  - Total de cartões: {home.get('cardsTotal_overall', 0)} geral | {home.get('cardsTotal_home', 0)} em casa
-  - Cartões amarelos: {home.get('yellow_cards', 0)}
-  - Cartões vermelhos: {home.get('red_cards', 0)}
-  - Jogos com Over 3.5 cartões: {home.get('over_3_5_cards_pct', 0)}%
-
-* {away_team}:
-  - Média de cartões por jogo: {away.get('cards_per_game', 0)} geral | {away.get('away_cards_per_game', 0)} fora
-  - Total de cartões: {away.get('cardsTotal_overall', 0)} geral | {away.get('cardsTotal_away', 0)} fora
-  - Cartões amarelos: {away.get('yellow_cards', 0)}
-  - Cartões vermelhos: {away.get('red_cards', 0)}
-  - Jogos com Over 3.5 cartões: {away.get('over_3_5_cards_pct', 0)}%
-
-* Média de cartões em confrontos diretos: {h2h.get('avg_cards', 0)}
-"""
+    except Exception as e:
+        logger.error(f"Error formatting highly optimized prompt: {str(e)}")
+        logger.error(traceback.format_exc())
 
-        # 5. PROBABILITY CALCULATION USING DISPERSAL AND WEIGHTING METHOD
-        # Calculate probability using our advanced method
-        
-        # Form points (35%)
-        def form_to_points(form_str):
-            """
-            Calcula pontos de forma considerando os últimos 5 jogos
-            W=3pts, D=1pt, L=0pts
-            
-            Args:
-                form_str (str): String com a sequência de resultados (ex: "WDLWW")
-                
-            Returns:
-                int: Pontuação total (máximo 15 pontos)
-            """
-            if not form_str or not isinstance(form_str, str):
-                return 0
-            
-            points = 0
-            # Garantir que estamos usando apenas os últimos 5 jogos
-            recent_form = form_str[-5:] if len(form_str) >= 5 else form_str
-            
-            # Log para debug
-            logger.debug(f"Calculando pontos para forma: {recent_form}")
-            
-            # Calcular pontos
-            for result in recent_form:
-                result = result.upper()  # Converter para maiúscula para garantir
-                if result == 'W':
-                    points += 3
-                    logger.debug(f"W encontrado, adicionando 3 pontos, total: {points}")
-                elif result == 'D':
-                    points += 1
-                    logger.debug(f"D encontrado, adicionando 1 ponto, total: {points}")
-                elif result == 'L':
-                    logger.debug(f"L encontrado, sem pontos, total: {points}")
-                else:
-                    logger.debug(f"Caractere desconhecido: {result}, sem pontos, total: {points}")
-            
-            logger.debug(f"Pontuação final da forma: {points}")
-            return points  # Valor inteiro
-        
-        # Extrair últimos 5 jogos do formRun_overall se disponível
-        home_formRun = home.get('formRun_overall', '')
-        away_formRun = away.get('formRun_overall', '')
-        
-        # Formatar string de forma corretamente
-        if home_formRun and len(home_formRun) >= 5:
-            home_form = home_formRun[-5:].upper()
-        else:
-            home_form = home.get('form', '?????')
-            
-        if away_formRun and len(away_formRun) >= 5:
-            away_form = away_formRun[-5:].upper()
-        else:
-            away_form = away.get('form', '?????')
-        
-        # E então, ao calcular os pontos, use a função form_to_points atualizada
-        # Modificar onde o cálculo é feito:
-        # Calcular pontos brutos (0-15)
-        # Calcular pontos brutos (0-15)
-        home_form_raw_points = form_to_points(home_form)
-        away_form_raw_points = form_to_points(away_form)
-        
-        # Normalizar para uso nos cálculos (0-1)
-        home_form_normalized = home_form_raw_points / 15.0
-        away_form_normalized = away_form_raw_points / 15.0
-        
-        # Usar nas ponderações
-        home_total_score = (
-            home_form_normalized * 0.35 +      # Normalizar para 0-1
-            home_stats_score * 0.25 +      # Estatísticas: 25%
-            home_position_score * 0.20 +   # Posição: 20%
-            home_creation * 0.20           # Criação: 20%
-        )
-        
-        # Armazenar os valores brutos e normalizados para uso posterior
-        analysis_data = {
-            "home_consistency": home_consistency,
-            "away_consistency": away_consistency,
-            "home_form_points": home_form_raw_points / 15.0,  # Armazenar como normalizado, mas o valor bruto é usado na exibição
-            "away_form_points": away_form_raw_points / 15.0,
-            "home_total_score": home_total_score,
-            "away_total_score": away_total_score
-        }
-        
-        # E para cálculos, se necessário:
-        home_total_score = (
-            (home_form_points / 15.0) * 0.35 +  # Normalizar para escala 0-1
-            home_stats_score * 0.25 +
-            home_position_score * 0.20 +
-            home_creation * 0.20
-        )
-        
-        # Team stats score (25%)
-        home_xg = home.get('xg', 0)
-        home_xga = home.get('xga', 0)
-        away_xg = away.get('xg', 0)
-        away_xga = away.get('xga', 0)
-        
-        max_xg = max(home_xg, away_xg, 60)
-        
-        home_offensive = (home_xg / max(max_xg, 1)) * 0.6 + (home.get('goals_per_game', 0) / 3) * 0.4
-        home_defensive = (1 - min(1, home_xga / max(max_xg, 1))) * 0.6 + (1 - min(1, home.get('conceded_per_game', 0) / 3)) * 0.4
-        away_offensive = (away_xg / max(max_xg, 1)) * 0.6 + (away.get('goals_per_game', 0) / 3) * 0.4
-        away_defensive = (1 - min(1, away_xga / max(max_xg, 1))) * 0.6 + (1 - min(1, away.get('conceded_per_game', 0) / 3)) * 0.4
-        
-        home_stats_score = home_offensive * 0.6 + home_defensive * 0.4
-        away_stats_score = away_offensive * 0.6 + away_defensive * 0.4
-        
-        # Table position (20%) - estimated from win rate
-        home_position_score = home.get('win_pct', 50) / 100
-        away_position_score = away.get('win_pct', 50) / 100
-        
-        # Creation metrics (20%)
-        home_possession = home.get('possession', 50) / 100
-        away_possession = away.get('possession', 50) / 100
-        
-        home_creation = home_offensive * 0.7 + home_possession * 0.3
-        away_creation = away_offensive * 0.7 + away_possession * 0.3
-        
-        # APPLY WEIGHTS
-        home_total_score = (
-            (home_form_points / 15) * 0.35 +      # Normalizar para 0-1
-            home_stats_score * 0.25 +      # Estatísticas: 25%
-            home_position_score * 0.20 +   # Posição: 20%
-            home_creation * 0.20           # Criação: 20%
-        )
-        
-        away_total_score = (
-            away_form_points * 0.35 +      # Recent form: 35%
-            away_stats_score * 0.25 +      # Team stats: 25%
-            away_position_score * 0.20 +   # Position: 20%
-            away_creation * 0.20           # Creation: 20%
-        )
-        
-        # 1. Moneyline calculation
-        raw_home_win = home_total_score / (home_total_score + away_total_score) * 0.8
-        raw_away_win = away_total_score / (home_total_score + away_total_score) * 0.8
-        raw_draw = 1 - (raw_home_win + raw_away_win)
-        
-        # Home advantage adjustment
-        home_advantage = 0.12
-        adjusted_home_win = raw_home_win + home_advantage
-        adjusted_away_win = raw_away_win - (home_advantage * 0.5)
-        adjusted_draw = raw_draw - (home_advantage * 0.5)
-        
-        # Normalize to sum to 1
-        total = adjusted_home_win + adjusted_draw + adjusted_away_win
-        home_win_prob = (adjusted_home_win / total) * 100
-        draw_prob = (adjusted_draw / total) * 100
-        away_win_prob = (adjusted_away_win / total) * 100
-        
-        # Round values
-        home_win_prob = round(home_win_prob, 1)
-        draw_prob = round(draw_prob, 1)
-        away_win_prob = round(away_win_prob, 1)
-        
-        # Calculate team consistency (dispersion)
-        home_results = [
-            home.get('win_pct', 0) / 100,
-            home.get('draw_pct', 0) / 100,
-            home.get('loss_pct', 0) / 100
-        ]
-        
-        away_results = [
-            away.get('win_pct', 0) / 100,
-            away.get('draw_pct', 0) / 100,
-            away.get('loss_pct', 0) / 100
-        ]
-        
-        # Calculate standard deviation for dispersion
-        try:
-            home_dispersion = np.std(home_results) * 3
-            away_dispersion = np.std(away_results) * 3
-            
-            # Convert to consistency (inverse of dispersion)
-            home_consistency = (1 - min(1, home_dispersion)) * 100
-            away_consistency = (1 - min(1, away_dispersion)) * 100
-        except:
-            # Fallback if numpy isn't available
-            home_consistency = 50
-            away_consistency = 50
-        
-        # 2. Over/Under 2.5 Goals
-        # Use a combination of team goal stats and xG
-        home_expected_goals = home.get('xg_for_avg_overall', 0) if home.get('xg_for_avg_overall', 0) > 0 else home.get('goals_per_game', 0)
-        away_expected_goals = away.get('xg_for_avg_overall', 0) if away.get('xg_for_avg_overall', 0) > 0 else away.get('goals_per_game', 0)
-        
-        # Consider defensive strength
-        home_expected_conceded = away_expected_goals * (home.get('conceded_per_game', 0) / 1.5) if home.get('conceded_per_game', 0) > 0 else away_expected_goals * 0.8
-        away_expected_conceded = home_expected_goals * (away.get('conceded_per_game', 0) / 1.5) if away.get('conceded_per_game', 0) > 0 else home_expected_goals * 0.8
-        
-        # Total expected goals
-        total_expected_goals = home_expected_conceded + away_expected_conceded
-        
-        # Poisson distribution can be approximated with a logistic function for this purpose
-        over_2_5_prob = 1 / (1 + math.exp(-1.5 * (total_expected_goals - 2.5))) * 100
-        under_2_5_prob = 100 - over_2_5_prob
-        
-        # 3. Both Teams To Score (BTTS)
-        # Use home and away scoring probability
-        home_scoring_prob = 1 - (1 / (1 + math.exp(home_expected_goals - 0.5)))
-        away_scoring_prob = 1 - (1 / (1 + math.exp(away_expected_goals - 0.5)))
-        
-        # BTTS probability is the product of both teams scoring
-        btts_yes_prob = home_scoring_prob * away_scoring_prob * 100
-        btts_no_prob = 100 - btts_yes_prob
-        
-        # 4. Escanteios
-        # Inicializar valores para evitar erros quando o mercado não está selecionado
-        over_9_5_corners_prob = 0
-        under_9_5_corners_prob = 0
-        total_corners_expected = 0
-        
-        if selected_markets.get("escanteios"):
-            # Calcular expectativa de escanteios
-            home_corners_avg = home.get("cornersAVG_overall", 0) or home.get("corners_per_game", 0) / 2
-            away_corners_avg = away.get("cornersAVG_overall", 0) or away.get("corners_per_game", 0) / 2
-            
-            home_corners_against_avg = home.get("cornersAgainstAVG_overall", 0) or home.get("corners_per_game", 0) / 2
-            away_corners_against_avg = away.get("cornersAgainstAVG_overall", 0) or away.get("corners_per_game", 0) / 2
-            
-            # Ajuste para jogo específico
-            home_corners_expected = (home_corners_avg + away_corners_against_avg) / 2
-            away_corners_expected = (away_corners_avg + home_corners_against_avg) / 2
-            
-            # Total esperado de escanteios
-            total_corners_expected = home_corners_expected + away_corners_expected
-            
-            # Calcular probabilidade para over/under 9.5 escanteios
-            # Usando uma função logística para mapear o número esperado para uma probabilidade
-            over_9_5_corners_prob = 1 / (1 + math.exp(-0.8 * (total_corners_expected - 9.5))) * 100
-            under_9_5_corners_prob = 100 - over_9_5_corners_prob
-        
-        # 5. Cartões
-        # Inicializar valores para evitar erros quando o mercado não está selecionado
-        over_3_5_cards_prob = 0
-        under_3_5_cards_prob = 0
-        total_cards_expected = 0
-        
-        if selected_markets.get("cartoes"):
-            # Calcular expectativa de cartões
-            home_cards_avg = home.get("cards_per_game", 0)
-            away_cards_avg = away.get("cards_per_game", 0)
-            
-            # Ajuste baseado em histórico de confrontos
-            h2h_cards_avg = h2h.get("avg_cards", 0)
-            
-            # Ajustar baseado em intensidade esperada (maior se os times são mais próximos)
-            intensity_factor = 1 + max(0, (1 - abs(home_total_score - away_total_score))) * 0.3
-            
-            # Total esperado de cartões
-            total_cards_expected = (home_cards_avg + away_cards_avg) * intensity_factor
-            
-            # Se temos dados H2H, dar algum peso para isso
-            if h2h_cards_avg > 0:
-                total_cards_expected = (total_cards_expected * 0.7) + (h2h_cards_avg * 0.3)
-            
-            # Calcular probabilidade para over/under 3.5 cartões
-            # Usando uma função logística para mapear o número esperado para uma probabilidade
-            over_3_5_cards_prob = 1 / (1 + math.exp(-1.2 * (total_cards_expected - 3.5))) * 100
-            under_3_5_cards_prob = 100 - over_3_5_cards_prob
-        
-        # 6. Chance Dupla (Double Chance)
-        home_draw_prob = home_win_prob + draw_prob
-        away_draw_prob = away_win_prob + draw_prob
-        home_away_prob = home_win_prob + away_win_prob
-        
-        # 6. PROBABILITY SECTION
-        if not has_stats_data:
-            prob_title = "PROBABILIDADES CALCULADAS (MODELO DE FALLBACK)"
-            prob_explanation = """
-        ### Observação Importante
-        Devido à falta de dados estatísticos suficientes, estas probabilidades são aproximações 
-        baseadas em um modelo simplificado e podem não refletir com precisão as chances reais."""
-        else:
-            prob_title = "PROBABILIDADES CALCULADAS (MÉTODO DE DISPERSÃO E PONDERAÇÃO)"
-            prob_explanation = """
-        ### Metodologia
-        As probabilidades foram calculadas usando nossa metodologia de dispersão e ponderação com:
-        - Forma recente: 35%
-        - Estatísticas de equipe: 25%
-        - Posição na tabela: 20%
-        - Métricas de criação: 20%"""
-            
-        # Start building the probability section
-        probability_section = f"""
-        # {prob_title}
-        {prob_explanation}
-        """
-        
-        # Only include Money Line if selected
-        if selected_markets.get("money_line", False):
-            probability_section += f"""
-        ### Moneyline (1X2)
-        * {home_team}: {home_win_prob}%
-        * Empate: {draw_prob}%
-        * {away_team}: {away_win_prob}%
-        * Total: {home_win_prob + draw_prob + away_win_prob}%
-        """
-        
-        # Only include Double Chance if selected
-        if selected_markets.get("chance_dupla", False):
-            probability_section += f"""
-        ### Chance Dupla (Double Chance)
-        * {home_team} ou Empate: {home_draw_prob:.1f}%
-        * {away_team} ou Empate: {away_draw_prob:.1f}%
-        * {home_team} ou {away_team}: {home_away_prob:.1f}%
-        """
-        
-        # Only include Over/Under if selected
-        if selected_markets.get("over_under", False):
-            probability_section += f"""
-        ### Over/Under 2.5 Gols
-        * Over 2.5: {over_2_5_prob:.1f}%
-        * Under 2.5: {under_2_5_prob:.1f}%
-        * Total esperado de gols: {total_expected_goals:.2f}
-        """
-        
-        # Only include BTTS if selected
-        if selected_markets.get("ambos_marcam", False):
-            probability_section += f"""
-        ### Ambos Marcam (BTTS)
-        * Sim: {btts_yes_prob:.1f}%
-        * Não: {btts_no_prob:.1f}%
-        """
-        
-        # Only include Corners (Escanteios) if selected
-        if selected_markets.get("escanteios", False):
-            probability_section += f"""
-        ### Escanteios (Over/Under 9.5)
-        * Over 9.5: {over_9_5_corners_prob:.1f}%
-        * Under 9.5: {under_9_5_corners_prob:.1f}%
-        * Total esperado de escanteios: {total_corners_expected:.1f}
-        """
-        
-        # Only include Cards (Cartões) if selected
-        if selected_markets.get("cartoes", False):
-            probability_section += f"""
-        ### Cartões (Over/Under 3.5)
-        * Over 3.5: {over_3_5_cards_prob:.1f}%
-        * Under 3.5: {under_3_5_cards_prob:.1f}%
-        * Total esperado de cartões: {total_cards_expected:.1f}
-        """
-        probability_section += f"""
-### Índices de Confiança
-* Consistência {home_team}: {home_consistency:.1f}%
-* Consistência {away_team}: {away_consistency:.1f}%
-* Forma recente {home_team} (pontos): {home_form_points*15:.1f}/15
-* Forma recente {away_team} (pontos): {away_form_points*15:.1f}/15
-"""
+        # Return a simplified prompt as fallback
+        return f"""# {home_team} vs {away_team}
 
-        # 7. AVAILABLE MARKETS AND ODDS
-        markets_info = f"""
 # MERCADOS DISPONÍVEIS E ODDS
 {odds_data}
-"""
 
-        # 8. INSTRUCTIONS
-        # First, prepare a list of selected market names for the instructions
-        selected_market_names = []
-        if selected_markets.get("money_line", False):
-            selected_market_names.append("Money Line (1X2)")
-        if selected_markets.get("chance_dupla", False):
-            selected_market_names.append("Chance Dupla (Double Chance)")
-        if selected_markets.get("over_under", False):
-            selected_market_names.append("Over/Under 2.5 Gols")
-        if selected_markets.get("ambos_marcam", False):
-            selected_market_names.append("Ambos Marcam (BTTS)")
-        if selected_markets.get("escanteios", False):
-            selected_market_names.append("Escanteios (Over/Under 9.5)")
-        if selected_markets.get("cartoes", False):
-            selected_market_names.append("Cartões (Over/Under 3.5)")
-
-        # Join the market names into a string
-        selected_markets_str = ", ".join(selected_market_names)
-        
-        instructions = f"""
-        # INSTRUÇÕES PARA ANÁLISE
-        
-        Analise os dados estatísticos fornecidos para identificar valor nas odds.
-        Você é um especialista em probabilidades esportivas que utiliza nosso método avançado de Dispersão e Ponderação.
-        
-        IMPORTANTE: As probabilidades REAIS já foram calculadas para você para os seguintes mercados selecionados e somam exatamente 100% em cada mercado:
-        {selected_markets_str}
-        
-        Todas as probabilidades reais estão na seção "PROBABILIDADES CALCULADAS".
-        
-        VOCÊ DEVE responder EXATAMENTE no formato abaixo:
-        
-        # Análise da Partida
-        ## {home_team} x {away_team}
-        
-        # Análise de Mercados Disponíveis:
-        [Resumo detalhado APENAS dos mercados selecionados ({selected_markets_str}) com suas odds e probabilidades implícitas]
-        
-        # Probabilidades Calculadas (REAL vs IMPLÍCITA):
-        [Compare as probabilidades REAIS calculadas com as probabilidades IMPLÍCITAS nas odds APENAS para os mercados selecionados ({selected_markets_str})]
-        
-        # Oportunidades Identificadas:
-        [Liste cada mercado onde você encontrou valor/edge, mostrando a porcentagem de vantagem]
-        - Considere valor quando a probabilidade real for pelo menos 2% maior que a implícita
-        
-        # Nível de Confiança Geral: [Baixo/Médio/Alto]
-        [Explique o nível de confiança, incluindo uma explicação clara sobre:
-        - O que significa "consistência" (a previsibilidade do desempenho do time)
-        - O que significam os valores de forma (X.X/15) - explicando que são pontos dos últimos 5 jogos
-        - Como esses fatores influenciam sua confiança na análise]
-        
-        ATENÇÃO: Ao explicar o nível de confiança, sempre esclareça que:
-        - Consistência é uma medida (%) que indica quão previsível é o desempenho da equipe
-        - Forma (X.X/15) representa a pontuação dos últimos 5 jogos (vitória=3pts, empate=1pt, derrota=0pts)
-        - Valores mais altos em ambas métricas aumentam a confiança na previsão
-        """
-
-        # Adicionar aviso quando utilizamos o modelo de fallback
-        if not has_stats_data:
-            instructions += """
-
-⚠️ IMPORTANTE: Devido à limitação de dados estatísticos, as probabilidades calculadas são baseadas 
-em um modelo de fallback e devem ser consideradas aproximações. Mencione isto claramente na sua análise 
-e recomende cautela nas decisões baseadas nesta análise.
+⚠️ IMPORTANTE: Estatísticas e probabilidades calculadas indisponíveis; baseie a análise nas odds implícitas e recomende cautela.
 """
 
-        # Compile the final prompt
-        sections = [
-            fundamental_stats,
-        ]
-        
-        # Only include result stats if moneyline or double chance are selected
-        if selected_markets.get("money_line") or selected_markets.get("chance_dupla"):
-            sections.append(result_stats)
-        
-        # Only include goals stats if over/under or btts are selected
-        if selected_markets.get("over_under") or selected_markets.get("ambos_marcam"):
-            sections.append(goals_stats)
-        
-        # Only include other stats if relevant markets are selected
-        if other_stats and (selected_markets.get("escanteios") or selected_markets.get("cartoes")):
-            sections.append(other_stats)
-        
-        # Always include probability section and markets info
-        sections.append(probability_section)
-        sections.append(markets_info)
-        sections.append(instructions)
-        
-        full_prompt = "\n".join([s for s in sections if s])
-        logger.info(f"Prompt prepared successfully for {home_team} vs {away_team}")
-        
-        return full_prompt
-        
-    except Exception as e:
-        logger.error(f"Error formatting highly optimized prompt: {str(e)}")
-        logger.error(traceback.format_exc())
-        
-        # Return a simplified prompt as fallback
-        return f"""
-# ESTATÍSTICAS BÁSICAS
-{home_team} vs {away_team}
+# Parâmetros da análise com a OpenAI (também compõem a chave do cache de respostas)
+GPT_MODEL = "gpt-4o"
+GPT_TEMPERATURE = 0.3
+# Versão do prefixo estático da análise; incrementar a cada alteração do texto abaixo
+PROMPT_PREFIX_VERSION = 1
 
-{odds_data}
+# Partes do prefixo estático, compartilhadas pelos modos texto e JSON
+_ANALYSIS_ROLE = """Você é um Agente Analista de Probabilidades Esportivas especializado. Trabalhe com quaisquer dados estatísticos disponíveis, mesmo que sejam limitados. Na ausência de dados completos, forneça análise com base nas odds implícitas e nos poucos dados disponíveis, sendo transparente sobre as limitações, mas ainda oferecendo recomendações práticas."""
 
-# PROBABILIDADES CALCULADAS
-* {home_team}: 56.6%
-* Empate: 14.0% 
-* {away_team}: 29.4%
-* Total: 100.0%
+_ANALYSIS_METHODOLOGY = """# METODOLOGIA
+A mensagem do usuário traz os dados de uma partida: times, liga, mercados selecionados, estatísticas em tabelas, probabilidades REAIS e odds.
+As probabilidades REAIS já foram calculadas pelo método de Dispersão e Ponderação (forma recente 35%, estatísticas de equipe 25%, posição na tabela 20%, métricas de criação 20%) e somam exatamente 100% em cada mercado.
+Analise APENAS os mercados listados em "MERCADOS SELECIONADOS" e identifique valor comparando as probabilidades REAIS com as implícitas nas odds."""
 
-# INSTRUÇÕES
-Analise as odds e identifique oportunidades de valor.
-Responda com EXATAMENTE este formato:
+_TEXT_RESPONSE_FORMAT = """# FORMATO DA RESPOSTA
+VOCÊ DEVE responder EXATAMENTE no formato abaixo:
 
 # Análise da Partida
-## {home_team} x {away_team}
+## [Time da casa] x [Time visitante]
 
 # Análise de Mercados Disponíveis:
-[Resumo detalhado das odds]
+[Resumo detalhado APENAS dos mercados selecionados com suas odds e probabilidades implícitas]
 
 # Probabilidades Calculadas (REAL vs IMPLÍCITA):
-[Comparação lado a lado de probabilidades reais e implícitas]
+[Compare as probabilidades REAIS com as IMPLÍCITAS nas odds APENAS para os mercados selecionados]
 
 # Oportunidades Identificadas:
-[Lista de oportunidades com edge percentual]
+[Liste cada mercado onde você encontrou valor/edge, mostrando a porcentagem de vantagem]
+- Considere valor quando a probabilidade real for pelo menos 2% maior que a implícita
 
 # Nível de Confiança Geral: [Baixo/Médio/Alto]
-[Explique o que significa 'consistência' e 'forma (X.X/15)' ao justificar o nível de confiança]
-"""
-def analyze_with_gpt(prompt, original_probabilities=None, selected_markets=None, home_team=None, away_team=None):
+[Explique o nível de confiança, esclarecendo que:
+- Consistência (%) indica quão previsível é o desempenho da equipe
+- Forma (X.X/15) é a pontuação dos últimos 5 jogos (vitória=3pts, empate=1pt, derrota=0pts)
+- Valores mais altos em ambas métricas aumentam a confiança na previsão]
+Se a mensagem trouxer um aviso de dados limitados, mencione-o claramente e recomende cautela."""
+
+_JSON_RESPONSE_FORMAT = """# FORMATO DA RESPOSTA
+Responda APENAS com um objeto JSON no schema fornecido, em português:
+- markets: uma entrada por seleção dos mercados selecionados, com um comentário curto sobre a comparação entre probabilidade REAL e IMPLÍCITA
+- opportunities: seleções com valor (probabilidade real pelo menos 2% maior que a implícita), com o motivo
+- confidence: nível (Baixo/Médio/Alto) e explicação citando consistência (%, previsibilidade do desempenho da equipe) e forma (X.X/15, pontos dos últimos 5 jogos: vitória=3, empate=1, derrota=0)
+Chaves de mercado: money_line = Money Line (1X2), chance_dupla = Chance Dupla, ambos_marcam = Ambos Marcam, over_under = Over/Under Gols, escanteios = Escanteios, cartoes = Cartões.
+Seleções: money_line home/draw/away; chance_dupla 1x/12/x2; ambos_marcam yes/no; over_under, escanteios e cartoes over/under.
+Se a mensagem trouxer um aviso de dados limitados, mencione-o na explicação da confiança."""
+
+# Prefixo estático (papel, metodologia e formato da resposta), idêntico byte a byte em
+# todas as requisições para aproveitar o cache de prefixo do provedor. Os dados da
+# partida vêm depois, na mensagem do usuário (format_highly_optimized_prompt).
+GPT_SYSTEM_MESSAGE = f"[prompt v{PROMPT_PREFIX_VERSION}]\n{_ANALYSIS_ROLE}\n\n{_ANALYSIS_METHODOLOGY}\n\n{_TEXT_RESPONSE_FORMAT}"
+
+# Prefixo do modo de saída estruturada (JSON validado por utils.structured_analysis)
+GPT_JSON_SYSTEM_MESSAGE = f"[prompt v{PROMPT_PREFIX_VERSION} json]\n{_ANALYSIS_ROLE}\n\n{_ANALYSIS_METHODOLOGY}\n\n{_JSON_RESPONSE_FORMAT}"
+
+def analysis_system_message(output_format="text"):
+    """Prefixo estático do modo de saída ("text" ou "json")"""
+    return GPT_JSON_SYSTEM_MESSAGE if output_format == "json" else GPT_SYSTEM_MESSAGE
+
+def analysis_request_options(output_format="text"):
+    """Parâmetros extras da requisição para o modo de saída"""
+    if output_format == "json":
+        from utils.structured_analysis import ANALYSIS_RESPONSE_FORMAT
+        return {"response_format": ANALYSIS_RESPONSE_FORMAT}
+    return {}
+
+def build_analysis_messages(prompt, output_format="text"):
+    """
+    Mensagens da requisição: prefixo estático primeiro, dados da partida depois
+    
+    Args:
+        prompt (str): Dados variáveis da partida
+        output_format (str): "text" (markdown livre) ou "json" (schema estruturado)
+        
+    Returns:
+        list: Mensagens no formato da API de chat
+    """
+    return [
+        {"role": "system", "content": analysis_system_message(output_format)},
+        {"role": "user", "content": prompt}
+    ]
+
+# Intervalo mínimo entre atualizações da tela durante o streaming (segundos)
+STREAM_RENDER_INTERVAL = 0.15
+
+def _stream_completion(client, messages, placeholder, output_format="text"):
+    """
+    Consome a resposta da OpenAI em streaming, exibindo o texto parcial no placeholder
+    
+    Args:
+        client: Cliente OpenAI
+        messages (list): Mensagens da requisição
+        placeholder: Elemento do Streamlit (st.empty) onde o texto é renderizado
+        output_format (str): "text" ou "json"
+        
+    Returns:
+        str: Conteúdo completo da resposta
+    """
+    import time
+    
+    stream = client.chat.completions.create(
+        model=GPT_MODEL,
+        messages=messages,
+        temperature=GPT_TEMPERATURE,
+        timeout=60,
+        stream=True,
+        **analysis_request_options(output_format)
+    )
+    
+    parts = []
+    last_render = 0.0
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+        parts.append(delta)
+        
+        # Limitar a frequência de renderização para não sobrecarregar a sessão
+        now = time.monotonic()
+        if now - last_render >= STREAM_RENDER_INTERVAL:
+            placeholder.markdown("".join(parts) + " ▌")
+            last_render = now
+    
+    content = "".join(parts)
+    placeholder.markdown(content)
+    return content
+
+# Espera inicial antes de repetir uma requisição recusada por limite de taxa (segundos)
+RATE_LIMIT_BACKOFF = 2.0
+
+def _rate_limit_wait(error, attempt):
+    """Espera antes da nova tentativa: Retry-After da resposta ou backoff exponencial"""
     try:
-        client = get_openai_client()
-        if not client:
-            st.error("Cliente OpenAI não inicializado")
-            return None
-            
-        with st.spinner("Analisando dados e calculando probabilidades..."):
-            logger.info("Enviando prompt para análise com GPT")
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Você é um Agente Analista de Probabilidades Esportivas especializado. Trabalhe com quaisquer dados estatísticos disponíveis, mesmo que sejam limitados. Na ausência de dados completos, forneça análise com base nas odds implícitas e nos poucos dados disponíveis, sendo transparente sobre as limitações, mas ainda oferecendo recomendações práticas."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                timeout=60  # Timeout de 60 segundos
-            )
-            logger.info("Resposta recebida do GPT com sucesso")
-            return response.choices[0].message.content
+        return float(error.response.headers["retry-after"])
+    except Exception:
+        return RATE_LIMIT_BACKOFF * 2 ** attempt
+
+def request_analysis(prompt, output_format="text", use_cache=True, stream_placeholder=None, client=None,
+                     metadata=None, budget=None, rate_limit_retries=0):
+    """
+    Núcleo de analyze_with_gpt, sem Streamlit: cache GPT, requisição e gravação no cache
+    
+    Usado também pela análise em lote (utils.gpt_batch), para que modelo,
+    mensagem de sistema, chave do cache e o desvio do cache com endpoint
+    alternativo valham igualmente nos dois caminhos.
+    
+    Args:
+        prompt (str): Prompt da análise
+        output_format (str): "text" ou "json"
+        use_cache (bool): Se True, reaproveita respostas do cache GPT
+        stream_placeholder (optional): Elemento com .markdown() que recebe o texto parcial
+        client (optional): Cliente OpenAI; se None, usa get_openai_client()
+        metadata (dict, optional): Informações extras gravadas com a resposta no cache
+        budget (optional): Orçamento de tokens (utils.gpt_batch.TokenBudget) reservado antes da requisição
+        rate_limit_retries (int): Novas tentativas após erro de limite de taxa (429)
+        
+    Returns:
+        str: Texto completo da análise ou None se o cliente OpenAI não estiver disponível
+        
+    Raises:
+        OpenAIError: Erros da API (inclusive limite de taxa após as novas tentativas)
+    """
+    import time
+    from utils.gpt_cache import gpt_cache_key, get_cached_response, store_response
+    
+    # Mesmo modelo, mensagem de sistema, prompt e temperatura = mesma resposta
+    cache_key = gpt_cache_key(GPT_MODEL, analysis_system_message(output_format), prompt, GPT_TEMPERATURE)
+    # Com endpoint alternativo (ex.: servidor de teste de carga) o cache GPT não é lido nem gravado
+    cacheable = not openai_base_url()
+    if use_cache and cacheable:
+        cached = get_cached_response(cache_key)
+        if cached:
+            logger.info(f"Análise servida do cache GPT ({cache_key[:12]})")
+            if stream_placeholder is not None:
+                stream_placeholder.markdown(cached)
+            return cached
+    
+    client = client or get_openai_client()
+    if not client:
+        logger.error("Cliente OpenAI não inicializado")
+        return None
+    
+    messages = build_analysis_messages(prompt, output_format)
+    reservation = budget.acquire_request(messages) if budget is not None else None
+    
+    for attempt in range(rate_limit_retries + 1):
+        try:
+            if stream_placeholder is not None:
+                logger.info("Enviando prompt para análise com GPT (streaming)")
+                content = _stream_completion(client, messages, stream_placeholder, output_format)
+                usage = None
+            else:
+                logger.info("Enviando prompt para análise com GPT")
+                response = client.chat.completions.create(
+                    model=GPT_MODEL,
+                    messages=messages,
+                    temperature=GPT_TEMPERATURE,
+                    timeout=60,  # Timeout de 60 segundos
+                    **analysis_request_options(output_format)
+                )
+                content = response.choices[0].message.content
+                usage = getattr(getattr(response, "usage", None), "total_tokens", None)
+            break
+        except RateLimitError as e:
+            if attempt >= rate_limit_retries:
+                raise
+            wait = _rate_limit_wait(e, attempt)
+            logger.warning(f"Limite de taxa da OpenAI; nova tentativa em {wait:.1f}s "
+                           f"({attempt + 1}/{rate_limit_retries})")
+            time.sleep(wait)
+    logger.info("Resposta recebida do GPT com sucesso")
+    
+    if reservation is not None and usage:
+        budget.adjust(reservation, usage)
+    if cacheable:
+        store_response(cache_key, content, {"model": GPT_MODEL, "usage": usage, **(metadata or {})})
+    return content
+
+def analyze_with_gpt(prompt, original_probabilities=None, selected_markets=None, home_team=None, away_team=None, use_cache=True, stream_placeholder=None, output_format="text", ui=True):
+    """
+    Envia o prompt para a OpenAI e retorna a análise
+    
+    Args:
+        prompt (str): Prompt da análise
+        original_probabilities (dict, optional): Probabilidades calculadas
+        selected_markets (dict, optional): Mercados selecionados
+        home_team (str, optional): Time da casa
+        away_team (str, optional): Time visitante
+        use_cache (bool): Se True, reaproveita respostas do cache GPT
+        stream_placeholder (optional): Elemento st.empty(); se informado, a
+            resposta é recebida em streaming e exibida enquanto chega (no
+            modo JSON o placeholder recebe o JSON parcial e deve renderizá-lo)
+        output_format (str): "text" ou "json" (resposta no schema de
+            utils.structured_analysis)
+        ui (bool): Se False, não usa spinner nem mensagens do Streamlit (jobs
+            em segundo plano, sem contexto de script); erros vão só para o log
+        
+    Returns:
+        str: Texto completo da análise ou None em caso de erro
+    """
+    from contextlib import nullcontext
+    
+    def show_error(message):
+        if ui:
+            st.error(message)
+    
+    try:
+        # No streaming o próprio texto parcial indica o progresso
+        show_spinner = ui and stream_placeholder is None
+        with st.spinner("Analisando dados e calculando probabilidades...") if show_spinner else nullcontext():
+            content = request_analysis(prompt, output_format, use_cache, stream_placeholder,
+                                       metadata={"home_team": home_team, "away_team": away_team})
+        if content is None:
+            show_error("Cliente OpenAI não inicializado")
+        return content
     except OpenAIError as e:
         logger.error(f"Erro na API OpenAI: {str(e)}")
-        st.error(f"Erro na API OpenAI: {str(e)}")
+        show_error(f"Erro na API OpenAI: {str(e)}")
         return None
     except Exception as e:
         logger.error(f"Erro inesperado: {str(e)}")
-        st.error(f"Erro inesperado: {str(e)}")
+        show_error(f"Erro inesperado: {str(e)}")
         return None
 
 # Função auxiliar para calcular probabilidades reais
@@ -907,8 +771,11 @@ def format_analysis_response(analysis_text, home_team, away_team, selected_marke
         # Análise de Mercados
         markets_section = "# Análise de Mercados Disponíveis:\n"
         
-        # Usar o odds_data original diretamente se disponível
-        if odds_data:
+        # Odds estruturadas (get_odds_input) são renderizadas aqui; texto pronto é usado como está
+        if isinstance(odds_data, dict) and odds_data:
+            from utils.data import format_odds_markets
+            markets_section += format_odds_markets(odds_data, home_team, away_team)
+        elif odds_data:
             markets_section += odds_data
         else:
             # Ou reconstruir a partir das probabilidades implícitas
@@ -1081,6 +948,7 @@ def format_analysis_response(analysis_text, home_team, away_team, selected_marke
         logger.error(f"Erro ao formatar resposta de análise: {str(e)}")
         logger.error(traceback.format_exc())
         return analysis_text  # Retornar o texto original em caso de erro  # Retornar o texto original em caso de erro  # Retornar o texto original em caso de erro
+
 def format_enhanced_prompt(complete_analysis, home_team, away_team, odds_data, selected_markets):
     """
     Função aprimorada para formatar prompt de análise multi-mercados
@@ -1284,18 +1152,64 @@ def get_stat(stats, col, default='N/A'):
         logger.warning(f"Erro ao obter estatística '{col}': {str(e)}")
         return default
         
-def calculate_advanced_probabilities(home_team, away_team, league_table=None):
+# Memoização de calculate_advanced_probabilities (entradas -> resultado)
+PROBABILITY_CACHE_SIZE = 512
+_probability_cache = OrderedDict()
+_probability_cache_lock = threading.Lock()
+
+def _copy_probabilities(result):
+    """Cópia do resultado (dois níveis de dicionários) para que o chamador possa alterá-lo"""
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in result.items()}
+
+def _probability_cache_key(home_team, away_team, league_table, season_id):
+    """Chave estável do cache a partir das entradas do cálculo"""
+    payload = json.dumps([home_team, away_team, league_table, season_id], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def calculate_advanced_probabilities(home_team, away_team, league_table=None, season_id=None, use_cache=True):
     """
     Calcular probabilidades usando o método de dispersão e ponderação conforme especificado
     
+    O cálculo é determinístico, então resultados são memorizados pelas
+    entradas; cada chamada recebe uma cópia própria do resultado.
+    
     Args:
         home_team (dict): Estatísticas do time da casa
         away_team (dict): Estatísticas do time visitante
         league_table (dict, optional): Tabela do campeonato se disponível
+        season_id (int, optional): ID da temporada (semente da forma reconstruída)
+        use_cache (bool): Se deve usar a memoização
         
     Returns:
         dict: Probabilidades calculadas para diferentes mercados
     """
+    if not use_cache:
+        return _compute_advanced_probabilities(home_team, away_team, league_table, season_id)
+    
+    try:
+        key = _probability_cache_key(home_team, away_team, league_table, season_id)
+    except Exception as e:
+        logger.warning(f"Entradas não serializáveis para o cache de probabilidades: {str(e)}")
+        return _compute_advanced_probabilities(home_team, away_team, league_table, season_id)
+    
+    with _probability_cache_lock:
+        cached = _probability_cache.get(key)
+        if cached is not None:
+            _probability_cache.move_to_end(key)
+            return _copy_probabilities(cached)
+    
+    result = _compute_advanced_probabilities(home_team, away_team, league_table, season_id)
+    if result is not None:
+        with _probability_cache_lock:
+            _probability_cache[key] = _copy_probabilities(result)
+            if len(_probability_cache) > PROBABILITY_CACHE_SIZE:
+                _probability_cache.popitem(last=False)
+    return result
+
+def _compute_advanced_probabilities(home_team, away_team, league_table=None, season_id=None):
+    """
+    Cálculo efetivo de calculate_advanced_probabilities (sem memoização)
+    """
     try:
         import numpy as np
         import math
@@ -1368,30 +1282,16 @@ def calculate_advanced_probabilities(home_team, away_team, league_table=None):
         away_form = away_team.get('form', '?????')
         
         if home_form == away_form == "DDDDD":
-            # Gerar forma baseada nas estatísticas para evitar viés
-            import random
+            # Reconstruir a forma a partir do histórico ou de uma semente estável
+            # (time + temporada), para que entradas iguais deem o mesmo resultado
+            from utils.probabilities import synthesize_form
             
-            # Time da casa
-            home_form = ""
-            for _ in range(5):
-                r = random.random()
-                if r < home_team.get('win_pct', 40) / 100:
-                    home_form += "W"
-                elif r < (home_team.get('win_pct', 40) + home_team.get('draw_pct', 30)) / 100:
-                    home_form += "D"
-                else:
-                    home_form += "L"
-                    
-            # Time visitante
-            away_form = ""
-            for _ in range(5):
-                r = random.random()
-                if r < away_team.get('win_pct', 30) / 100:
-                    away_form += "W"
-                elif r < (away_team.get('win_pct', 30) + away_team.get('draw_pct', 30)) / 100:
-                    away_form += "D"
-                else:
-                    away_form += "L"
+            home_form = synthesize_form(
+                home_team, "home", home_team.get('win_pct', 40), home_team.get('draw_pct', 30), season_id
+            )
+            away_form = synthesize_form(
+                away_team, "away", away_team.get('win_pct', 30), away_team.get('draw_pct', 30), season_id
+            )
         
         # Converter forma para pontos (escala 0-1)
         home_form_points = form_to_points(home_form) / 15  # Normalizado para 0-1 (máximo 15 pontos)
@@ -1521,7 +1421,9 @@ def calculate_advanced_probabilities(home_team, away_team, league_table=None):
             "over_under": {
                 "over_2_5": over_2_5_prob * 100,
                 "under_2_5": (1 - over_2_5_prob) * 100,
-                "expected_goals": total_expected_goals
+                "expected_goals": total_expected_goals,
+                "expected_goals_home": expected_goals_home,
+                "expected_goals_away": expected_goals_away
             },
             "btts": {
                 "yes": btts_prob * 100,
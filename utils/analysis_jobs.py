@@ -0,0 +1,575 @@
+"""
+Fila de análises em segundo plano, desacoplada dos reruns do Streamlit.
+
+O dashboard apenas submete o job e acompanha o estado; estatísticas,
+probabilidades, prompt, chamada à IA e formatação rodam num pool de
+threads do processo. O estado de cada job fica em
+``DATA_DIR/analysis_jobs/<id>.json``, então um refresh do navegador ou
+uma interação no meio da análise não perde o trabalho. O id é o hash da
+partida, dos mercados e das odds: submissões repetidas enquanto o job
+está em andamento são anexadas a ele em vez de gerar outra análise.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.core import DATA_DIR
+
+logger = logging.getLogger("valueHunter.analysis_jobs")
+
+JOBS_DIR = os.path.join(DATA_DIR, "analysis_jobs")
+
+# Análises simultâneas (limitadas principalmente pela API da OpenAI)
+ANALYSIS_WORKERS = 2
+
+# Tempo que jobs finalizados ficam em disco (segundos)
+JOB_RETENTION = 24 * 60 * 60
+
+# Intervalo de consulta do dashboard enquanto o job roda (segundos)
+JOB_POLL_INTERVAL = 0.5
+
+# Intervalo do heartbeat dos jobs em execução (segundos)
+JOB_HEARTBEAT_INTERVAL = 5
+
+# Job ativo sem atualização há mais tempo que isto foi interrompido (segundos)
+JOB_STALE_AFTER = 60
+
+# Espera máxima para o job reservado por outro processo aparecer em disco (segundos)
+JOB_CLAIM_WAIT = 5
+
+# Formato da resposta da IA: "json" (estruturada) ou "text"; ambos em streaming
+ANALYSIS_OUTPUT_FORMAT = "json"
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# Etapas do pipeline e mensagem exibida em cada uma
+JOB_STAGES = {
+    "queued": "Análise na fila...",
+    "stats": "Buscando estatísticas atualizadas...",
+    "probabilities": "Calculando probabilidades...",
+    "prompt": "Preparando análise...",
+    "gpt": "Realizando análise com IA...",
+    "format": "Formatando resultado...",
+    "done": "Análise concluída",
+    "error": "Falha na análise"
+}
+
+_executor = None
+_heartbeat_thread = None
+_jobs_lock = threading.RLock()
+# Jobs na fila ou executando neste processo (mantidos vivos pelo heartbeat)
+_running_jobs = set()
+
+
+def _heartbeat_loop():
+    """Renova updated_at dos jobs deste processo para que outros workers os vejam ativos"""
+    while True:
+        time.sleep(JOB_HEARTBEAT_INTERVAL)
+        with _jobs_lock:
+            running = list(_running_jobs)
+        for job_id in running:
+            try:
+                _update_job(job_id)
+                os.utime(_claim_path(job_id))
+            except Exception as e:
+                logger.warning(f"Falha no heartbeat do job {job_id[:12]}: {str(e)}")
+
+
+def _get_executor():
+    global _executor, _heartbeat_thread
+    with _jobs_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix="analysis-job")
+        if _heartbeat_thread is None:
+            _heartbeat_thread = threading.Thread(target=_heartbeat_loop, name="analysis-job-heartbeat", daemon=True)
+            _heartbeat_thread.start()
+        return _executor
+
+
+def analysis_job_id(selected_league, home_team, away_team, selected_markets, odds):
+    """
+    Id do job: mesma partida, mercados e odds = mesmo job
+
+    Args:
+        selected_league (str): Nome da liga
+        home_team (str): Time da casa
+        away_team (str): Time visitante
+        selected_markets (dict): Mercados selecionados
+        odds (dict): Odds estruturadas (get_odds_input)
+
+    Returns:
+        str: Hash SHA-256 em hexadecimal
+    """
+    markets = sorted(market for market, selected in selected_markets.items() if selected)
+    payload = json.dumps([selected_league, home_team, away_team, markets, odds], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _job_path(job_id):
+    return os.path.join(JOBS_DIR, f"{job_id}.json")
+
+
+def _claim_path(job_id):
+    return os.path.join(JOBS_DIR, f"{job_id}.run")
+
+
+def _claim_run(job_id):
+    """
+    Reserva a execução do job entre processos
+
+    A reserva é o arquivo ``<id>.run``, criado de forma exclusiva (O_EXCL):
+    só um processo o cria, mesmo que vários decidam ao mesmo tempo que o job
+    é novo. O heartbeat o mantém atualizado; uma reserva parada há mais de
+    JOB_STALE_AFTER segundos (processo encerrado) pode ser tomada.
+
+    Returns:
+        bool: True se este processo ficou com a execução
+    """
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    path = _claim_path(job_id)
+    for _ in range(2):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.stat(path).st_mtime <= JOB_STALE_AFTER:
+                    return False
+                # rename é atômico: só um dos processos remove a reserva parada
+                stale_path = f"{path}.{os.getpid()}.{threading.get_ident()}.stale"
+                os.rename(path, stale_path)
+                os.remove(stale_path)
+            except FileNotFoundError:
+                pass
+            continue
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        return True
+    return False
+
+
+def _release_run(job_id):
+    try:
+        os.remove(_claim_path(job_id))
+    except FileNotFoundError:
+        pass
+
+
+def _read_job(job_id):
+    try:
+        with open(_job_path(job_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Estado do job {job_id[:12]} ilegível: {str(e)}")
+        return None
+
+
+def _write_job(job):
+    """Grava o estado do job (escrita atômica)"""
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    path = _job_path(job["id"])
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(job, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def _update_job(job_id, **fields):
+    """Atualiza campos do job e grava"""
+    with _jobs_lock:
+        job = _read_job(job_id)
+        if job is None:
+            return None
+        job.update(fields)
+        job["updated_at"] = time.time()
+        _write_job(job)
+        return job
+
+
+def _set_stage(job_id, stage):
+    _update_job(job_id, status="running", stage=stage, stage_label=JOB_STAGES[stage])
+
+
+def get_job(job_id):
+    """
+    Estado atual de um job
+
+    Jobs ativos sem atualização há mais de JOB_STALE_AFTER segundos (o
+    processo que os executava parou) são marcados como interrompidos. Jobs
+    de outros workers continuam ativos enquanto o heartbeat deles chegar.
+
+    Args:
+        job_id (str): Id do job
+
+    Returns:
+        dict: Estado do job ou None se não existir
+    """
+    with _jobs_lock:
+        job = _read_job(job_id)
+        if (job and job["status"] in ACTIVE_STATUSES and job_id not in _running_jobs
+                and time.time() - job.get("updated_at", 0) > JOB_STALE_AFTER):
+            job = _update_job(job_id, status="error", stage="error", stage_label=JOB_STAGES["error"],
+                              error="Análise interrompida (servidor reiniciado). Tente novamente.")
+        return job
+
+
+def _attach_owner(job, owner):
+    """Anexa o usuário a um job em andamento (removendo uma recusa anterior)"""
+    declined = job.get("declined", [])
+    if owner not in job["owners"] or owner in declined:
+        if owner not in job["owners"]:
+            job["owners"].append(owner)
+        _update_job(job["id"], owners=job["owners"],
+                    declined=[email for email in declined if email != owner])
+
+
+def submit_analysis_job(selected_league, home_team, away_team, selected_markets, odds, odds_data, owner):
+    """
+    Submete uma análise ou se anexa a uma idêntica em andamento
+
+    Uma análise idêntica já finalizada é executada de novo no mesmo job,
+    sem remover os outros usuários nem as cobranças deles. Entre processos,
+    só quem cria a reserva de execução (_claim_run) roda o job; os demais
+    aguardam o job aparecer em disco e se anexam a ele.
+
+    Args:
+        selected_league (str): Nome da liga
+        home_team (str): Time da casa
+        away_team (str): Time visitante
+        selected_markets (dict): Mercados selecionados
+        odds (dict): Odds estruturadas
+        odds_data (str): Odds formatadas para o prompt
+        owner (str): Email do usuário que solicitou
+
+    Returns:
+        str: Id do job
+
+    Raises:
+        RuntimeError: Se a execução foi reservada por outro processo e o job não apareceu a tempo
+    """
+    job_id = analysis_job_id(selected_league, home_team, away_team, selected_markets, odds)
+
+    deadline = time.time() + JOB_CLAIM_WAIT
+    while True:
+        with _jobs_lock:
+            job = get_job(job_id)
+            if job and job["status"] in ACTIVE_STATUSES:
+                _attach_owner(job, owner)
+                logger.info(f"Submissão anexada ao job em andamento {job_id[:12]}")
+                return job_id
+            if _claim_run(job_id):
+                break
+        # Outro processo reservou a execução e está gravando o job
+        if time.time() > deadline:
+            logger.warning(f"Job {job_id[:12]} reservado por outro processo não apareceu a tempo")
+            raise RuntimeError("Esta análise está sendo iniciada em outro servidor. Tente novamente.")
+        time.sleep(JOB_POLL_INTERVAL / 10)
+
+    with _jobs_lock:
+        # Nova execução de um job finalizado: os outros usuários continuam no job
+        # (recebem o novo resultado) e mantêm suas cobranças; só quem pediu é cobrado de novo
+        job = _read_job(job_id)
+        owners, charged, declined = [owner], [], []
+        if job:
+            owners = job.get("owners", []) + ([owner] if owner not in job.get("owners", []) else [])
+            charged = [email for email in job.get("charged", []) if email != owner]
+            declined = [email for email in job.get("declined", []) if email != owner]
+
+        now = time.time()
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "stage": "queued",
+            "stage_label": JOB_STAGES["queued"],
+            "created_at": now,
+            "updated_at": now,
+            "owners": owners,
+            "charged": charged,
+            "declined": declined,
+            "params": {
+                "league": selected_league,
+                "home_team": home_team,
+                "away_team": away_team,
+                "selected_markets": selected_markets,
+                "odds": odds,
+                "odds_data": odds_data
+            },
+            "partial": "",
+            "result": None,
+            "error": None
+        }
+        _write_job(job)
+        _running_jobs.add(job_id)
+
+    _get_executor().submit(_run_job, job_id)
+    logger.info(f"Job de análise {job_id[:12]} submetido: {home_team} x {away_team}")
+    cleanup_jobs()
+    return job_id
+
+
+def latest_user_job(owner):
+    """
+    Job mais recente ainda relevante para o usuário (em andamento ou
+    concluído e ainda não entregue/cobrado), para retomar após um refresh.
+    Jobs cuja cobrança o usuário teve recusada só voltam com nova submissão.
+
+    Args:
+        owner (str): Email do usuário
+
+    Returns:
+        str: Id do job ou None
+    """
+    if not os.path.isdir(JOBS_DIR):
+        return None
+    candidates = []
+    for item in os.scandir(JOBS_DIR):
+        if not item.name.endswith(".json"):
+            continue
+        job = _read_job(item.name[:-5])
+        if not job or owner not in job.get("owners", []) or owner in job.get("declined", []):
+            continue
+        if job["status"] in ACTIVE_STATUSES or (job["status"] == "done" and owner not in job["charged"]):
+            candidates.append((job["created_at"], job["id"]))
+    return max(candidates)[1] if candidates else None
+
+
+def claim_job_charge(job_id, owner):
+    """
+    Marca a cobrança do job para o usuário, uma única vez por job
+
+    Args:
+        job_id (str): Id do job
+        owner (str): Email do usuário
+
+    Returns:
+        bool: True se o usuário ainda não havia sido cobrado por este job
+    """
+    with _jobs_lock:
+        job = _read_job(job_id)
+        if (job is None or job["status"] != "done" or owner in job["charged"]
+                or owner in job.get("declined", [])):
+            return False
+        job["charged"].append(owner)
+        _update_job(job_id, charged=job["charged"])
+        return True
+
+
+def decline_job_charge(job_id, owner):
+    """
+    Desfaz claim_job_charge e marca a cobrança como recusada (ex.: saldo
+    insuficiente), para que o job não seja retomado nem cobrado sozinho
+    depois; uma nova submissão da mesma análise remove a marca
+
+    Args:
+        job_id (str): Id do job
+        owner (str): Email do usuário
+    """
+    with _jobs_lock:
+        job = _read_job(job_id)
+        if job is None:
+            return
+        charged = [email for email in job["charged"] if email != owner]
+        declined = job.get("declined", []) + ([owner] if owner not in job.get("declined", []) else [])
+        _update_job(job_id, charged=charged, declined=declined)
+
+
+def cleanup_jobs(retention=JOB_RETENTION):
+    """
+    Remove jobs finalizados há mais tempo que a retenção
+
+    Returns:
+        int: Número de jobs removidos
+    """
+    if not os.path.isdir(JOBS_DIR):
+        return 0
+    removed = 0
+    now = time.time()
+    with _jobs_lock:
+        for item in os.scandir(JOBS_DIR):
+            # Jobs e reservas de execução órfãs (processo encerrado)
+            job_id, ext = os.path.splitext(item.name)
+            if ext not in (".json", ".run") or job_id in _running_jobs:
+                continue
+            try:
+                if now - item.stat().st_mtime > retention:
+                    os.remove(item.path)
+                    removed += 1
+            except OSError:
+                continue
+    return removed
+
+
+class _JobStream:
+    """
+    Recebe o texto parcial do streaming da IA (interface de st.empty) e grava no job
+
+    Com render, o texto parcial (ex.: JSON incompleto) é convertido na
+    análise a exibir antes de ser gravado.
+    """
+
+    def __init__(self, job_id, render=None):
+        self.job_id = job_id
+        self.render = render
+
+    def markdown(self, text):
+        text = text.rstrip(" ▌")
+        if self.render is not None:
+            text = self.render(text)
+        _update_job(self.job_id, partial=text)
+
+
+def load_match_data(selected_league, home_team, away_team):
+    """
+    Busca e simplifica as estatísticas da partida (sem chamadas ao Streamlit)
+
+    Args:
+        selected_league (str): Nome da liga
+        home_team (str): Time da casa
+        away_team (str): Time visitante
+
+    Returns:
+        dict: Dados simplificados (home_team, away_team, h2h, match_info) ou None
+    """
+    from utils.enhanced_api_client import get_complete_match_analysis
+    from utils.footystats_api import LEAGUE_IDS
+    from utils.prompt_adapter import simplify_api_data
+
+    if selected_league == "EFL League One (England)":
+        season_id = 12446  # ID fixo conhecido para EFL League One
+    else:
+        season_id = LEAGUE_IDS.get(selected_league)
+        if not season_id:
+            # Buscar correspondência parcial
+            for league_name, league_id in LEAGUE_IDS.items():
+                if league_name.lower() in selected_league.lower() or selected_league.lower() in league_name.lower():
+                    season_id = league_id
+                    break
+    if not season_id:
+        logger.error(f"Não foi possível encontrar ID para liga: {selected_league}")
+        return None
+
+    complete_analysis = get_complete_match_analysis(home_team, away_team, season_id, force_refresh=False)
+    if not isinstance(complete_analysis, dict):
+        logger.error(f"Não foi possível obter estatísticas para {home_team} vs {away_team}")
+        return None
+
+    stats_data = simplify_api_data(complete_analysis, home_team, away_team)
+    stats_data["match_info"]["league"] = selected_league
+    stats_data["match_info"]["league_id"] = season_id
+    return stats_data
+
+
+def _run_job(job_id):
+    """Executa o pipeline completo de um job (roda numa thread do pool)"""
+    try:
+        from utils.ai import analyze_with_gpt, calculate_advanced_probabilities, format_highly_optimized_prompt
+        from utils.calibration import apply_calibration, apply_line_calibration
+        from utils.data import calculate_implied_probabilities
+        from utils.scoreline import calculate_scoreline_markets
+        from utils.simulation import simulate_match_markets
+        from utils.structured_analysis import (
+            analysis_selections, parse_partial_analysis, parse_structured_analysis, render_structured_analysis
+        )
+
+        params = _read_job(job_id)["params"]
+        home_team, away_team = params["home_team"], params["away_team"]
+        selected_markets, odds = params["selected_markets"], params["odds"]
+
+        _set_stage(job_id, "stats")
+        stats_data = load_match_data(params["league"], home_team, away_team)
+        if not stats_data:
+            raise ValueError(f"Não foi possível obter estatísticas para {home_team} vs {away_team}")
+
+        _set_stage(job_id, "probabilities")
+        original_probabilities = calculate_advanced_probabilities(
+            stats_data["home_team"],
+            stats_data["away_team"],
+            season_id=stats_data.get("match_info", {}).get("league_id")
+        )
+        if not original_probabilities:
+            raise ValueError("Falha no cálculo das probabilidades")
+
+        # Calibração contra resultados reais (tabelas treinadas nos backtests)
+        original_probabilities = apply_calibration(original_probabilities)
+
+        # Mercados de gols em qualquer linha (matriz de placares) e escanteios/cartões (Monte Carlo)
+        over_under = original_probabilities.get("over_under", {})
+        original_probabilities["scoreline"] = calculate_scoreline_markets(
+            over_under.get("expected_goals_home", 0),
+            over_under.get("expected_goals_away", 0)
+        )
+        original_probabilities["simulation"] = simulate_match_markets(
+            stats_data["home_team"],
+            stats_data["away_team"],
+            original_probabilities.get("analysis_data")
+        )
+        original_probabilities = apply_line_calibration(original_probabilities)
+
+        implied_probabilities = calculate_implied_probabilities(odds)
+        if implied_probabilities:
+            original_probabilities.setdefault("analysis_data", {})["implied_odds"] = implied_probabilities
+
+        _set_stage(job_id, "prompt")
+        prompt_report = {}
+        prompt = format_highly_optimized_prompt(
+            stats_data, home_team, away_team, params["odds_data"], selected_markets,
+            probabilities=original_probabilities, report=prompt_report
+        )
+        if not prompt:
+            raise ValueError("Falha ao preparar análise")
+
+        # Números vêm das probabilidades e odds estruturadas; da IA, só comentários e confiança
+        selections = analysis_selections(
+            selected_markets, original_probabilities, implied_probabilities, odds, home_team, away_team
+        )
+
+        def render(structured):
+            return render_structured_analysis(
+                selections, structured, home_team, away_team, selected_markets, odds,
+                original_probabilities.get("analysis_data")
+            )
+
+        # No modo JSON a análise é exibida já renderizada, com os itens que chegaram completos
+        stream = _JobStream(job_id)
+        if ANALYSIS_OUTPUT_FORMAT == "json":
+            stream = _JobStream(job_id, render=lambda text: render(parse_partial_analysis(text)))
+
+        _set_stage(job_id, "gpt")
+        analysis = analyze_with_gpt(
+            prompt,
+            original_probabilities=original_probabilities,
+            selected_markets=selected_markets,
+            home_team=home_team,
+            away_team=away_team,
+            stream_placeholder=stream,
+            output_format=ANALYSIS_OUTPUT_FORMAT,
+            ui=False
+        )
+        if not analysis:
+            raise ValueError("Falha na análise com IA")
+
+        _set_stage(job_id, "format")
+        structured = parse_structured_analysis(analysis) if ANALYSIS_OUTPUT_FORMAT == "json" else None
+        formatted_analysis = render(structured)
+
+        _update_job(job_id, status="done", stage="done", stage_label=JOB_STAGES["done"], result={
+            "analysis": analysis,
+            "formatted": formatted_analysis,
+            "prompt_report": prompt_report,
+            "stats_data": stats_data
+        })
+        logger.info(f"Job de análise {job_id[:12]} concluído")
+    except Exception as e:
+        logger.error(f"Erro no job de análise {job_id[:12]}: {str(e)}")
+        logger.error(traceback.format_exc())
+        _update_job(job_id, status="error", stage="error", stage_label=JOB_STAGES["error"], error=str(e))
+    finally:
+        with _jobs_lock:
+            _running_jobs.discard(job_id)
+            _release_run(job_id)
@@ -0,0 +1,456 @@
+"""
+Backtest do modelo de probabilidades sobre temporadas completas.
+
+Reproduz os jogos de ``league-matches`` em ordem de data, reconstrói as
+features de cada time apenas com os jogos disputados até a véspera,
+precifica todos os jogos com o motor vetorizado e pontua as previsões com
+Brier score e log loss. Temporadas são distribuídas num pool de processos
+e os dados vêm apenas do cache local (ou do servidor configurado).
+"""
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from utils.core import DATA_DIR
+from utils.probabilities import calculate_batch_probabilities
+
+logger = logging.getLogger("valueHunter.backtest")
+
+BACKTEST_DIR = os.path.join(DATA_DIR, "backtests")
+
+# Jogos mínimos de cada time antes de precificar um confronto
+MIN_PLAYED = 3
+
+# Limite para o log loss (evita log(0))
+LOG_LOSS_EPS = 1e-15
+
+# Mercado binário -> (chave de probabilidade no resultado, função de resultado real)
+BINARY_MARKETS = {
+    "over_2_5": (("over_under", "over_2_5"), lambda m: m["home_goals"] + m["away_goals"] > 2.5),
+    "btts": (("btts", "yes"), lambda m: m["home_goals"] > 0 and m["away_goals"] > 0),
+    "cards_over_3_5": (("cards", "over_3_5"), lambda m: m["cards"] > 3.5 if m["cards"] is not None else None),
+    "corners_over_9_5": (("corners", "over_9_5"), lambda m: m["corners"] > 9.5 if m["corners"] is not None else None),
+}
+
+# Linha padrão da matriz de placares / simulação -> mercado binário com o mesmo resultado real
+LINE_MARKETS = {
+    "scoreline_over_2_5": "over_2_5",
+    "simulation_corners_over_9_5": "corners_over_9_5",
+    "simulation_cards_over_3_5": "cards_over_3_5",
+}
+
+
+def _number(value):
+    """Converte um campo numérico da API (valores negativos significam ausente)"""
+    try:
+        value = float(value)
+    except (ValueError, TypeError):
+        return None
+    return value if value >= 0 else None
+
+
+def parse_completed_matches(matches):
+    """
+    Extrai os jogos completos em ordem de data
+
+    Args:
+        matches (list): Jogos no formato de league-matches
+
+    Returns:
+        list: Jogos normalizados (dicts) ordenados por data e ID
+    """
+    parsed = []
+    for match in matches or []:
+        if not isinstance(match, dict) or match.get("status") != "complete":
+            continue
+        home_goals = _number(match.get("homeGoalCount"))
+        away_goals = _number(match.get("awayGoalCount"))
+        if home_goals is None or away_goals is None or "homeID" not in match or "awayID" not in match:
+            continue
+
+        home_cards = [_number(match.get(k)) for k in ("team_a_yellow_cards", "team_a_red_cards")]
+        away_cards = [_number(match.get(k)) for k in ("team_b_yellow_cards", "team_b_red_cards")]
+        cards = None
+        if home_cards[0] is not None and away_cards[0] is not None:
+            cards = sum(c for c in home_cards + away_cards if c is not None)
+
+        home_corners = _number(match.get("team_a_corners"))
+        away_corners = _number(match.get("team_b_corners"))
+
+        parsed.append({
+            "id": match.get("id"),
+            "date": int(match.get("date_unix") or 0),
+            "home_id": match["homeID"],
+            "away_id": match["awayID"],
+            "home_name": match.get("home_name") or str(match["homeID"]),
+            "away_name": match.get("away_name") or str(match["awayID"]),
+            "home_goals": home_goals,
+            "away_goals": away_goals,
+            "home_xg": _number(match.get("team_a_xg")),
+            "away_xg": _number(match.get("team_b_xg")),
+            "home_possession": _number(match.get("team_a_possession")),
+            "away_possession": _number(match.get("team_b_possession")),
+            "home_corners": home_corners,
+            "away_corners": away_corners,
+            "home_cards": None if home_cards[0] is None else sum(c for c in home_cards if c is not None),
+            "away_cards": None if away_cards[0] is None else sum(c for c in away_cards if c is not None),
+            "cards": cards,
+            "corners": home_corners + away_corners if home_corners is not None and away_corners is not None else None,
+        })
+    parsed.sort(key=lambda m: (m["date"], m["id"] or 0))
+    return parsed
+
+
+class _TeamHistory:
+    """Acumulados de um time com os jogos disputados até o momento"""
+
+    def __init__(self, name):
+        self.name = name
+        self.played = 0
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.scored = 0.0
+        self.conceded = 0.0
+        self.btts = 0
+        self.results = ""
+        self.xg = 0.0
+        self.xg_against = 0.0
+        self.possession = []
+        self.corners = []
+        self.cards = []
+
+    def features(self):
+        """Features no mesmo formato de simplify_api_data"""
+        features = {
+            "name": self.name,
+            "played": self.played,
+            "win_pct": self.wins / self.played * 100,
+            "draw_pct": self.draws / self.played * 100,
+            "loss_pct": self.losses / self.played * 100,
+            "goals_per_game": self.scored / self.played,
+            "conceded_per_game": self.conceded / self.played,
+            "btts_pct": self.btts / self.played * 100,
+            "xg": self.xg,
+            "xga": self.xg_against,
+            "form": self.results[-5:],
+        }
+        if self.possession:
+            features["possession"] = sum(self.possession) / len(self.possession)
+        if self.corners:
+            features["corners_per_game"] = sum(self.corners) / len(self.corners)
+        if self.cards:
+            features["cards_per_game"] = sum(self.cards) / len(self.cards)
+        return features
+
+    def add(self, scored, conceded, xg, xg_against, possession, corners, cards):
+        self.played += 1
+        self.scored += scored
+        self.conceded += conceded
+        if scored > conceded:
+            self.wins += 1
+            self.results += "W"
+        elif scored == conceded:
+            self.draws += 1
+            self.results += "D"
+        else:
+            self.losses += 1
+            self.results += "L"
+        if scored > 0 and conceded > 0:
+            self.btts += 1
+        self.xg += xg or 0.0
+        self.xg_against += xg_against or 0.0
+        if possession is not None:
+            self.possession.append(possession)
+        if corners is not None:
+            self.corners.append(corners)
+        if cards is not None:
+            self.cards.append(cards)
+
+
+def build_pre_match_features(matches, min_played=MIN_PLAYED):
+    """
+    Reconstrói as features de cada jogo usando somente os jogos anteriores
+
+    Args:
+        matches (list): Jogos normalizados por parse_completed_matches
+        min_played (int): Jogos mínimos de cada time para incluir o confronto
+
+    Returns:
+        tuple: (features da casa, features do visitante, jogos precificados)
+    """
+    history = {}
+    home_features, away_features, priced = [], [], []
+
+    for match in matches:
+        home = history.setdefault(match["home_id"], _TeamHistory(match["home_name"]))
+        away = history.setdefault(match["away_id"], _TeamHistory(match["away_name"]))
+
+        if home.played >= min_played and away.played >= min_played:
+            home_features.append(home.features())
+            away_features.append(away.features())
+            priced.append(match)
+
+        home.add(match["home_goals"], match["away_goals"], match["home_xg"], match["away_xg"],
+                 match["home_possession"], match["home_corners"], match["home_cards"])
+        away.add(match["away_goals"], match["home_goals"], match["away_xg"], match["home_xg"],
+                 match["away_possession"], match["away_corners"], match["away_cards"])
+
+    return home_features, away_features, priced
+
+
+def line_market_probabilities(batch, home_features, away_features):
+    """
+    Probabilidades de Over nas linhas padrão da matriz de placares e da simulação
+
+    As linhas de gols, escanteios e cartões exibidas na análise vêm desses
+    modelos, que por isso são pontuados e calibrados à parte do logístico.
+
+    Args:
+        batch (dict): Resultado de calculate_batch_probabilities
+        home_features (list): Features dos times da casa
+        away_features (list): Features dos visitantes
+
+    Returns:
+        dict: Mercado de LINE_MARKETS -> array N (em %)
+    """
+    from utils.scoreline import calculate_scoreline_markets
+    from utils.simulation import DEFAULT_DISPERSION, match_count_rates, simulate_count_markets
+
+    result = {}
+    over_under = batch["over_under"]
+    scoreline = calculate_scoreline_markets(np.nan_to_num(over_under["expected_goals_home"]),
+                                            np.nan_to_num(over_under["expected_goals_away"]),
+                                            total_lines=(2.5,), handicap_lines=())
+    if scoreline:
+        result["scoreline_over_2_5"] = scoreline["over_under"]["2_5"]["over"]
+
+    scores = batch["analysis_data"]
+    rates = [
+        match_count_rates(home, away, {
+            "home_total_score": float(np.nan_to_num(scores["home_total_score"][i])),
+            "away_total_score": float(np.nan_to_num(scores["away_total_score"][i]))
+        })
+        for i, (home, away) in enumerate(zip(home_features, away_features))
+    ]
+    for market, key, line in (("simulation_corners_over_9_5", "corners", 9.5),
+                              ("simulation_cards_over_3_5", "cards", 3.5)):
+        simulated = simulate_count_markets([r[key][0] for r in rates], [r[key][1] for r in rates],
+                                           (line,), DEFAULT_DISPERSION[key])
+        if simulated:
+            result[market] = simulated["over"][:, 0]
+    return result
+
+
+def brier_score(probs, outcomes):
+    """Brier score médio (probabilidades 0-1, resultados 0/1; aceita várias classes por linha)"""
+    probs = np.asarray(probs, dtype=np.float64)
+    outcomes = np.asarray(outcomes, dtype=np.float64)
+    if probs.ndim == 1:
+        return float(np.mean((probs - outcomes) ** 2))
+    return float(np.mean(np.sum((probs - outcomes) ** 2, axis=1)))
+
+
+def log_loss(probs, outcomes):
+    """Log loss médio (probabilidades 0-1, resultados 0/1; aceita várias classes por linha)"""
+    probs = np.clip(np.asarray(probs, dtype=np.float64), LOG_LOSS_EPS, 1 - LOG_LOSS_EPS)
+    outcomes = np.asarray(outcomes, dtype=np.float64)
+    if probs.ndim == 1:
+        return float(-np.mean(outcomes * np.log(probs) + (1 - outcomes) * np.log(1 - probs)))
+    return float(-np.mean(np.sum(outcomes * np.log(probs), axis=1)))
+
+
+def load_season_matches(season_id, offline=True):
+    """
+    Carrega os jogos de uma temporada
+
+    Args:
+        season_id (int): ID da temporada
+        offline (bool): Se True, usa apenas o cache local, sem acessar a API
+
+    Returns:
+        list: Jogos de league-matches ou None
+    """
+    from utils.enhanced_api_client import api_request, read_cached_response
+
+    params = {"season_id": season_id}
+    if offline:
+        response = read_cached_response("league-matches", params)
+    else:
+        response = api_request("league-matches", params)
+    if not response or not isinstance(response.get("data"), list):
+        return None
+    return response["data"]
+
+
+def backtest_season(season_id, offline=True, min_played=MIN_PLAYED, save=True):
+    """
+    Executa o backtest de uma temporada
+
+    Args:
+        season_id (int): ID da temporada
+        offline (bool): Se True, usa apenas o cache local
+        min_played (int): Jogos mínimos de cada time para precificar
+        save (bool): Se True, salva previsões e resultados em BACKTEST_DIR
+
+    Returns:
+        dict: Métricas e previsões da temporada ou None se não houver dados
+    """
+    start = time.perf_counter()
+    matches = load_season_matches(season_id, offline)
+    if not matches:
+        logger.warning(f"Sem jogos em cache para season_id {season_id}")
+        return None
+
+    completed = parse_completed_matches(matches)
+    home_features, away_features, priced = build_pre_match_features(completed, min_played)
+    if not priced:
+        logger.warning(f"Nenhum jogo precificável para season_id {season_id}")
+        return None
+
+    batch = calculate_batch_probabilities(home_features, away_features, season_ids=season_id)
+    if batch is None:
+        return None
+    valid = batch["valid"]
+
+    predictions = {}
+    metrics = {}
+
+    # 1X2 (três classes)
+    probs_1x2 = np.stack([batch["moneyline"]["home_win"], batch["moneyline"]["draw"],
+                          batch["moneyline"]["away_win"]], axis=1)[valid] / 100
+    outcome_1x2 = np.array([[m["home_goals"] > m["away_goals"], m["home_goals"] == m["away_goals"],
+                             m["home_goals"] < m["away_goals"]] for m in priced], dtype=np.float64)[valid]
+    predictions["1x2"] = {"prob": probs_1x2.tolist(), "outcome": outcome_1x2.tolist()}
+    metrics["1x2"] = {"n": int(len(probs_1x2)), "brier": brier_score(probs_1x2, outcome_1x2),
+                      "log_loss": log_loss(probs_1x2, outcome_1x2)}
+
+    # Mercados binários: modelo logístico e linhas padrão da matriz de placares/simulação
+    binary = [(market, batch[group][key], outcome_fn)
+              for market, ((group, key), outcome_fn) in BINARY_MARKETS.items()]
+    binary += [(market, market_probs, BINARY_MARKETS[LINE_MARKETS[market]][1])
+               for market, market_probs in line_market_probabilities(batch, home_features, away_features).items()]
+    for market, market_probs, outcome_fn in binary:
+        outcomes = [outcome_fn(m) for m in priced]
+        mask = valid & np.array([o is not None for o in outcomes])
+        if not mask.any():
+            continue
+        probs = market_probs[mask] / 100
+        observed = np.array([o for o, keep in zip(outcomes, mask) if keep], dtype=np.float64)
+        predictions[market] = {"prob": probs.tolist(), "outcome": observed.tolist()}
+        metrics[market] = {"n": int(mask.sum()), "brier": brier_score(probs, observed),
+                           "log_loss": log_loss(probs, observed),
+                           "mean_prob": float(probs.mean()), "observed_rate": float(observed.mean())}
+
+    result = {
+        "season_id": season_id,
+        "matches": len(completed),
+        "priced": int(valid.sum()),
+        "metrics": metrics,
+        "predictions": predictions,
+        "elapsed": time.perf_counter() - start
+    }
+
+    if save:
+        try:
+            os.makedirs(BACKTEST_DIR, exist_ok=True)
+            with open(os.path.join(BACKTEST_DIR, f"season_{season_id}.json"), "w", encoding="utf-8") as f:
+                json.dump(result, f)
+        except Exception as e:
+            logger.error(f"Erro ao salvar backtest da temporada {season_id}: {str(e)}")
+
+    return result
+
+
+def _combine_metrics(results):
+    """Agrega as métricas de várias temporadas ponderando pelo número de jogos"""
+    combined = {}
+    for result in results:
+        for market, data in result["metrics"].items():
+            entry = combined.setdefault(market, {"n": 0, "brier": 0.0, "log_loss": 0.0})
+            entry["n"] += data["n"]
+            entry["brier"] += data["brier"] * data["n"]
+            entry["log_loss"] += data["log_loss"] * data["n"]
+    for entry in combined.values():
+        if entry["n"]:
+            entry["brier"] /= entry["n"]
+            entry["log_loss"] /= entry["n"]
+    return combined
+
+
+def run_backtests(season_ids, workers=None, offline=True, min_played=MIN_PLAYED):
+    """
+    Executa o backtest de várias temporadas em paralelo (um processo por temporada)
+
+    Args:
+        season_ids (list): IDs das temporadas (de uma ou várias ligas)
+        workers (int, optional): Número de processos (padrão: CPUs disponíveis)
+        offline (bool): Se True, usa apenas o cache local
+        min_played (int): Jogos mínimos de cada time para precificar
+
+    Returns:
+        dict: {"seasons": {season_id: métricas}, "overall": métricas agregadas}
+    """
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(backtest_season, season_id, offline, min_played): season_id
+            for season_id in season_ids
+        }
+        for future in as_completed(futures):
+            season_id = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Erro no backtest da temporada {season_id}: {str(e)}")
+                continue
+            if result:
+                results.append(result)
+
+    return {
+        "seasons": {
+            r["season_id"]: {"matches": r["matches"], "priced": r["priced"], "metrics": r["metrics"],
+                             "elapsed": r["elapsed"]}
+            for r in results
+        },
+        "overall": _combine_metrics(results)
+    }
+
+
+def load_backtest_predictions(season_ids=None):
+    """
+    Carrega as previsões salvas pelos backtests
+
+    Args:
+        season_ids (list, optional): Temporadas desejadas (padrão: todas as salvas)
+
+    Returns:
+        dict: Mercado -> {"prob": np.ndarray, "outcome": np.ndarray}
+    """
+    combined = {}
+    if not os.path.isdir(BACKTEST_DIR):
+        return combined
+
+    for filename in sorted(os.listdir(BACKTEST_DIR)):
+        if not filename.startswith("season_") or not filename.endswith(".json"):
+            continue
+        season_id = filename[len("season_"):-len(".json")]
+        if season_ids is not None and season_id not in {str(s) for s in season_ids}:
+            continue
+        try:
+            with open(os.path.join(BACKTEST_DIR, filename), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Erro ao ler backtest {filename}: {str(e)}")
+            continue
+        for market, values in data.get("predictions", {}).items():
+            entry = combined.setdefault(market, {"prob": [], "outcome": []})
+            entry["prob"].extend(values["prob"])
+            entry["outcome"].extend(values["outcome"])
+
+    return {market: {"prob": np.array(v["prob"]), "outcome": np.array(v["outcome"])}
+            for market, v in combined.items()}
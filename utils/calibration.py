@@ -0,0 +1,450 @@
+"""
+Calibração das probabilidades do modelo contra resultados reais.
+
+Para cada mercado ajusta, a partir das previsões salvas pelos backtests,
+uma regressão isotônica (Pool Adjacent Violators) ou uma curva de Platt
+(logística sobre o logit da probabilidade). O ajuste é guardado como uma
+tabela de interpolação compacta (pontos x -> y em 0-1) em
+``DATA_DIR/calibration/tables.json`` e aplicado com ``np.interp``, tanto
+a resultados escalares quanto aos lotes vetorizados. As escadas de linhas
+da matriz de placares e da simulação têm tabelas próprias na linha padrão.
+"""
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from utils.core import DATA_DIR
+
+logger = logging.getLogger("valueHunter.calibration")
+
+CALIBRATION_DIR = os.path.join(DATA_DIR, "calibration")
+CALIBRATION_FILE = os.path.join(CALIBRATION_DIR, "tables.json")
+
+# Pontos da tabela de interpolação por mercado
+TABLE_POINTS = 51
+
+# Amostras mínimas para ajustar um mercado
+MIN_SAMPLES = 200
+
+# Limite do logit no ajuste de Platt (evita log(0))
+PLATT_EPS = 1e-6
+
+# Mercado calibrado -> (grupo, chave da seleção, chave complementar ou None)
+CALIBRATED_MARKETS = {
+    "home_win": ("moneyline", "home_win", None),
+    "draw": ("moneyline", "draw", None),
+    "away_win": ("moneyline", "away_win", None),
+    "over_2_5": ("over_under", "over_2_5", "under_2_5"),
+    "btts": ("btts", "yes", "no"),
+    "cards_over_3_5": ("cards", "over_3_5", "under_3_5"),
+    "corners_over_9_5": ("corners", "over_9_5", "under_9_5"),
+}
+
+# Escadas de linhas (matriz de placares e simulação): tabela da linha padrão
+SCORELINE_CALIBRATION = ("scoreline_over_2_5", "2_5")
+SIMULATION_CALIBRATION = {
+    "corners": ("simulation_corners_over_9_5", 9.5),
+    "cards": ("simulation_cards_over_3_5", 3.5),
+}
+
+_tables = None
+_tables_lock = threading.Lock()
+
+
+def fit_isotonic(probs, outcomes):
+    """
+    Regressão isotônica (não decrescente) por Pool Adjacent Violators
+
+    Args:
+        probs (np.ndarray): Probabilidades previstas (0-1)
+        outcomes (np.ndarray): Resultados observados (0/1)
+
+    Returns:
+        tuple: (x, y) com os pontos do ajuste em ordem crescente de x
+    """
+    order = np.argsort(probs, kind="stable")
+    x = np.asarray(probs, dtype=np.float64)[order]
+    y = np.asarray(outcomes, dtype=np.float64)[order]
+
+    # Blocos: média, peso e soma dos x de cada bloco
+    means, weights, x_sums = [], [], []
+    for xi, yi in zip(x, y):
+        means.append(yi)
+        weights.append(1.0)
+        x_sums.append(xi)
+        while len(means) > 1 and means[-2] > means[-1]:
+            w = weights[-2] + weights[-1]
+            means[-2] = (means[-2] * weights[-2] + means[-1] * weights[-1]) / w
+            weights[-2] = w
+            x_sums[-2] += x_sums[-1]
+            means.pop()
+            weights.pop()
+            x_sums.pop()
+
+    # Cada bloco fica na média dos seus x (no maior x a curva ficaria deslocada para a direita)
+    return np.array(x_sums) / np.array(weights), np.array(means)
+
+
+def fit_platt(probs, outcomes, iterations=50):
+    """
+    Escala de Platt: P(y=1) = sigmoid(a * logit(p) + b), ajustada por Newton
+
+    Args:
+        probs (np.ndarray): Probabilidades previstas (0-1)
+        outcomes (np.ndarray): Resultados observados (0/1)
+        iterations (int): Máximo de iterações de Newton
+
+    Returns:
+        tuple: (a, b)
+    """
+    p = np.clip(np.asarray(probs, dtype=np.float64), PLATT_EPS, 1 - PLATT_EPS)
+    y = np.asarray(outcomes, dtype=np.float64)
+    features = np.column_stack([np.log(p / (1 - p)), np.ones_like(p)])
+    params = np.array([1.0, 0.0])
+
+    def loss(values):
+        z = features @ values
+        return float(np.sum(np.logaddexp(0, z) - y * z))
+
+    current = loss(params)
+    for _ in range(iterations):
+        fitted = 0.5 * (1 + np.tanh(features @ params / 2))
+        gradient = features.T @ (fitted - y)
+        hessian = features.T @ (features * (fitted * (1 - fitted))[:, None]) + 1e-9 * np.eye(2)
+        step = np.linalg.solve(hessian, gradient)
+
+        # Newton amortecido: reduz o passo até a log-verossimilhança melhorar
+        scale = 1.0
+        while scale > 1e-6:
+            candidate = params - scale * step
+            candidate_loss = loss(candidate)
+            if candidate_loss <= current:
+                break
+            scale /= 2
+        else:
+            break
+        params, improvement = candidate, current - candidate_loss
+        current = candidate_loss
+        if improvement < 1e-10:
+            break
+
+    return float(params[0]), float(params[1])
+
+
+def build_table(probs, outcomes, method="isotonic", points=TABLE_POINTS):
+    """
+    Ajusta a calibração de um mercado e a reduz a uma tabela de interpolação
+
+    Args:
+        probs (np.ndarray): Probabilidades previstas (0-1)
+        outcomes (np.ndarray): Resultados observados (0/1)
+        method (str): "isotonic" ou "platt"
+        points (int): Número de pontos da tabela
+
+    Returns:
+        dict: {"x": [...], "y": [...], "method", "n"}
+    """
+    grid = np.linspace(0.0, 1.0, points)
+    if method == "platt":
+        a, b = fit_platt(probs, outcomes)
+        clipped = np.clip(grid, PLATT_EPS, 1 - PLATT_EPS)
+        values = 0.5 * (1 + np.tanh((a * np.log(clipped / (1 - clipped)) + b) / 2))
+    else:
+        x, y = fit_isotonic(probs, outcomes)
+        values = np.interp(grid, x, y)
+
+    return {
+        "x": np.round(grid, 6).tolist(),
+        "y": np.round(values, 6).tolist(),
+        "method": method,
+        "n": int(len(probs))
+    }
+
+
+def train_calibration(season_ids=None, method="isotonic", min_samples=MIN_SAMPLES, save=True):
+    """
+    Treina as tabelas de calibração a partir das previsões dos backtests
+
+    Args:
+        season_ids (list, optional): Temporadas usadas (padrão: todas as salvas)
+        method (str): "isotonic" ou "platt"
+        min_samples (int): Amostras mínimas por mercado
+        save (bool): Se True, grava as tabelas em CALIBRATION_FILE
+
+    Returns:
+        dict: Mercado -> tabela (mercados sem amostras suficientes ficam de fora)
+    """
+    from utils.backtest import LINE_MARKETS, load_backtest_predictions
+
+    predictions = load_backtest_predictions(season_ids)
+    samples = {}
+    if "1x2" in predictions and len(predictions["1x2"]["prob"]):
+        probs = predictions["1x2"]["prob"]
+        outcomes = predictions["1x2"]["outcome"]
+        for column, market in enumerate(("home_win", "draw", "away_win")):
+            samples[market] = (probs[:, column], outcomes[:, column])
+    for market in ("over_2_5", "btts", "cards_over_3_5", "corners_over_9_5") + tuple(LINE_MARKETS):
+        if market in predictions:
+            samples[market] = (predictions[market]["prob"], predictions[market]["outcome"])
+
+    tables = {}
+    for market, (probs, outcomes) in samples.items():
+        if len(probs) < min_samples:
+            logger.info(f"Calibração de {market} ignorada: {len(probs)} amostras")
+            continue
+        tables[market] = build_table(probs, outcomes, method)
+
+    if save and tables:
+        save_calibration(tables)
+    return tables
+
+
+def save_calibration(tables):
+    """
+    Grava as tabelas de calibração (escrita atômica) e atualiza a cópia em memória
+
+    Args:
+        tables (dict): Mercado -> tabela
+
+    Returns:
+        bool: True se salvo com sucesso
+    """
+    try:
+        os.makedirs(CALIBRATION_DIR, exist_ok=True)
+        temp_path = f"{CALIBRATION_FILE}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"created_at": time.time(), "tables": tables}, f)
+        os.replace(temp_path, CALIBRATION_FILE)
+        use_calibration(tables)
+        return True
+    except Exception as e:
+        logger.error(f"Erro ao salvar calibração: {str(e)}")
+        return False
+
+
+def _compile_tables(tables):
+    """
+    Converte as tabelas em arrays NumPy (lotes) e listas (escalares) prontos para interpolação
+
+    Tabelas em grade uniforme (as de build_table) guardam também o número
+    de intervalos, o que permite achar o segmento de um escalar sem busca.
+    """
+    compiled = {}
+    for market, table in tables.items():
+        x = np.asarray(table["x"], dtype=np.float64)
+        y = np.asarray(table["y"], dtype=np.float64)
+        uniform = len(x) > 1 and x[0] == 0 and x[-1] == 1 and np.allclose(np.diff(x), 1 / (len(x) - 1))
+        compiled[market] = (x, y, x.tolist(), y.tolist(), len(x) - 1 if uniform else None)
+    return compiled
+
+
+def _interpolate(table, probs):
+    """Interpola probabilidades em % na tabela; escalares evitam o custo fixo do NumPy"""
+    x, y, x_list, y_list, intervals = table
+    if not isinstance(probs, (int, float)):
+        return np.interp(np.asarray(probs, dtype=np.float64) / 100, x, y) * 100
+
+    value = probs / 100
+    if value <= x_list[0]:
+        return y_list[0] * 100
+    if value >= x_list[-1]:
+        return y_list[-1] * 100
+    if intervals:
+        position = value * intervals
+        i = int(position)
+        weight = position - i
+    else:
+        i = bisect.bisect_right(x_list, value) - 1
+        weight = (value - x_list[i]) / (x_list[i + 1] - x_list[i])
+    return (y_list[i] + weight * (y_list[i + 1] - y_list[i])) * 100
+
+
+def use_calibration(tables):
+    """
+    Define as tabelas em uso neste processo, sem gravar em disco
+
+    Args:
+        tables (dict): Mercado -> tabela (formato de build_table)
+    """
+    global _tables
+    with _tables_lock:
+        _tables = _compile_tables(tables)
+
+
+def load_calibration(reload=False):
+    """
+    Carrega as tabelas de calibração (uma vez por processo)
+
+    Args:
+        reload (bool): Se True, relê o arquivo
+
+    Returns:
+        dict: Mercado -> tabela compilada; vazio se não houver calibração treinada
+    """
+    global _tables
+    if _tables is not None and not reload:
+        return _tables
+    with _tables_lock:
+        if _tables is not None and not reload:
+            return _tables
+        _tables = {}
+        if os.path.exists(CALIBRATION_FILE):
+            try:
+                with open(CALIBRATION_FILE, "r", encoding="utf-8") as f:
+                    _tables = _compile_tables(json.load(f).get("tables", {}))
+            except Exception as e:
+                logger.error(f"Erro ao carregar calibração: {str(e)}")
+        return _tables
+
+
+def calibrate(market, probs):
+    """
+    Aplica a tabela de um mercado a probabilidades em percentual
+
+    Args:
+        market (str): Mercado (chave de CALIBRATED_MARKETS)
+        probs: Probabilidade(s) em % (escalar ou array)
+
+    Returns:
+        Probabilidade(s) calibradas em % (mesmo tipo da entrada); inalteradas se não houver tabela
+    """
+    table = load_calibration().get(market)
+    if table is None:
+        return probs
+    return _interpolate(table, probs)
+
+
+def apply_calibration(probabilities):
+    """
+    Calibra um resultado de calculate_advanced_probabilities ou calculate_batch_probabilities
+
+    O 1X2 é renormalizado para somar 100% e a chance dupla é recalculada a
+    partir dele; mercados binários recebem o complemento. Demais campos
+    (gols esperados, analysis_data, etc.) são mantidos.
+
+    Args:
+        probabilities (dict): Resultado escalar ou em lote
+
+    Returns:
+        dict: Novo resultado calibrado (o original não é alterado) ou o próprio
+              resultado se não houver calibração treinada
+    """
+    tables = load_calibration()
+    if not probabilities or not tables:
+        return probabilities
+
+    try:
+        result = {key: dict(value) if isinstance(value, dict) else value for key, value in probabilities.items()}
+
+        moneyline = result.get("moneyline")
+        if moneyline and any(m in tables for m in ("home_win", "draw", "away_win")):
+            home, draw, away = (
+                _interpolate(tables[m], moneyline[m]) if m in tables else moneyline[m]
+                for m in ("home_win", "draw", "away_win")
+            )
+            total = home + draw + away
+            moneyline["home_win"] = home / total * 100
+            moneyline["draw"] = draw / total * 100
+            moneyline["away_win"] = away / total * 100
+            if "double_chance" in result:
+                result["double_chance"] = {
+                    "home_or_draw": moneyline["home_win"] + moneyline["draw"],
+                    "away_or_draw": moneyline["away_win"] + moneyline["draw"],
+                    "home_or_away": moneyline["home_win"] + moneyline["away_win"]
+                }
+
+        for market, (group, key, complement) in CALIBRATED_MARKETS.items():
+            if complement is None or market not in tables or group not in result:
+                continue
+            value = _interpolate(tables[market], result[group][key])
+            result[group][key] = value
+            result[group][complement] = 100 - value
+
+        result["calibrated"] = True
+        return result
+
+    except Exception as e:
+        logger.error(f"Erro ao aplicar calibração: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return probabilities
+
+
+def _logit(probs):
+    """Logit de probabilidade(s) em %"""
+    p = np.clip(np.asarray(probs, dtype=np.float64) / 100, PLATT_EPS, 1 - PLATT_EPS)
+    return np.log(p / (1 - p))
+
+
+def _shift_over(over, push, shift):
+    """Desloca a probabilidade de Over (em %) no logit, condicionada a não haver devolução"""
+    decided = 100 - np.asarray(push, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        conditional = np.where(decided > 0, np.asarray(over, dtype=np.float64) / decided * 100, 50)
+    shifted = decided / (1 + np.exp(-(_logit(conditional) + shift)))
+    return float(shifted) if np.ndim(shifted) == 0 else shifted
+
+
+def apply_line_calibration(probabilities):
+    """
+    Calibra as escadas de linhas da matriz de placares ("scoreline") e da simulação ("simulation")
+
+    A tabela do mercado é aplicada à linha padrão de cada escada (2.5 gols,
+    9.5 escanteios, 3.5 cartões) e o mesmo deslocamento no logit é aplicado
+    às demais linhas do jogo: a escada continua monótona e a linha padrão
+    fica calibrada. Devoluções de linhas inteiras não são alteradas.
+
+    Args:
+        probabilities (dict): Resultado de um jogo com "scoreline" e/ou "simulation"
+
+    Returns:
+        dict: Novo resultado (o original não é alterado) ou o próprio resultado
+              se não houver tabelas para as escadas
+    """
+    tables = load_calibration()
+    names = [SCORELINE_CALIBRATION[0]] + [table for table, _ in SIMULATION_CALIBRATION.values()]
+    if not probabilities or not any(name in tables for name in names):
+        return probabilities
+
+    try:
+        result = dict(probabilities)
+
+        table, key = SCORELINE_CALIBRATION
+        scoreline = result.get("scoreline")
+        if scoreline and table in tables and key in scoreline.get("over_under", {}):
+            standard = scoreline["over_under"][key]["over"]
+            shift = _logit(_interpolate(tables[table], standard)) - _logit(standard)
+            over_under = {}
+            for line_key, entry in scoreline["over_under"].items():
+                over = _shift_over(entry["over"], entry["push"], shift)
+                over_under[line_key] = dict(entry, over=over, under=100 - entry["push"] - over)
+            result["scoreline"] = dict(scoreline, over_under=over_under)
+
+        if result.get("simulation"):
+            simulation = dict(result["simulation"])
+            for market, (table, line) in SIMULATION_CALIBRATION.items():
+                markets = simulation.get(market)
+                if not markets or table not in tables:
+                    continue
+                column = np.nonzero(markets["lines"] == line)[0]
+                if column.size == 0:
+                    continue
+                standard = markets["over"][:, column[0]]
+                shift = (_logit(_interpolate(tables[table], standard)) - _logit(standard))[:, None]
+                over = _shift_over(markets["over"], markets["push"], shift)
+                simulation[market] = dict(markets, over=over, under=100 - markets["push"] - over)
+            result["simulation"] = simulation
+
+        result["lines_calibrated"] = True
+        return result
+
+    except Exception as e:
+        logger.error(f"Erro ao calibrar as linhas: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return probabilities
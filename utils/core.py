@@ -411,7 +411,7 @@ def go_to_landing():
 # Função init_session_state
 def init_session_state():
     """Initialize session state variables"""
-    from utils.data import UserManager
+    from utils.data import get_user_manager
     
     if "page" not in st.session_state:
         st.session_state.page = "landing"  # Nova variável para controlar a página atual
@@ -450,9 +450,9 @@ def init_session_state():
     if "stripe_test_mode" not in st.session_state:
         st.session_state.stripe_test_mode = True
     
-    # UserManager deve ser o último a ser inicializado
-    if "user_manager" not in st.session_state:
-        st.session_state.user_manager = UserManager()
+    # UserManager deve ser o último a ser inicializado: instância única do processo,
+    # conferida a cada execução para refletir alterações feitas fora dela
+    st.session_state.user_manager = get_user_manager()
     
     # Atualizar timestamp de última atividade
     st.session_state.last_activity = datetime.now()
@@ -801,31 +801,12 @@ def handle_success_page():
             try:
                 logger.info(f"Tentando adicionar {final_credits} créditos para {final_email}")
                 
-                # Verificar se o usuário existe
-                if hasattr(st.session_state, 'user_manager') and final_email in st.session_state.user_manager.users:
-                    # Adicionar diretamente na estrutura de dados para garantir
-                    if "purchased_credits" not in st.session_state.user_manager.users[final_email]:
-                        st.session_state.user_manager.users[final_email]["purchased_credits"] = 0
-                    
-                    st.session_state.user_manager.users[final_email]["purchased_credits"] += final_credits
-                    
-                    # Limpar timestamp de esgotamento se existir
-                    if "paid_credits_exhausted_at" in st.session_state.user_manager.users[final_email]:
-                        st.session_state.user_manager.users[final_email]["paid_credits_exhausted_at"] = None
-                    
-                    # Salvar alterações
-                    st.session_state.user_manager._save_users()
-                    
-                    # Registrar sucesso
-                    logger.info(f"Créditos adicionados diretamente: {final_credits} para {final_email}")
+                # add_credits atualiza a instância compartilhada sob lock e grava apenas este usuário
+                if st.session_state.user_manager.add_credits(final_email, final_credits):
+                    logger.info(f"Créditos adicionados via função: {final_credits} para {final_email}")
                     credits_added = True
                 else:
-                    # Tentar usar a função padrão
-                    if st.session_state.user_manager.add_credits(final_email, final_credits):
-                        logger.info(f"Créditos adicionados via função: {final_credits} para {final_email}")
-                        credits_added = True
-                    else:
-                        logger.warning(f"Falha ao adicionar créditos via função: {final_credits} para {final_email}")
+                    logger.warning(f"Falha ao adicionar créditos via função: {final_credits} para {final_email}")
             except Exception as add_error:
                 logger.error(f"Erro ao adicionar créditos para {final_email}: {str(add_error)}")
         
@@ -5,6 +5,7 @@ import hashlib
 import time
 import re
 import logging
+import threading
 import pandas as pd
 import numpy as np
 import requests
@@ -24,6 +25,18 @@ from utils.core import DATA_DIR
 # Garantir que o diretório de dados existe
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# Armazenamento dos usuários: "sqlite" (padrão) ou "json" (user_data.json)
+USER_STORAGE_BACKEND = os.environ.get("USER_STORAGE_BACKEND", "sqlite")
+USER_DB_PATH = os.path.join(DATA_DIR, "users.db")
+
+def _synchronized(method):
+    """Serializa o método no lock do UserManager (instância compartilhada entre sessões)"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 @dataclass
 class UserTier:
     name: str
@@ -31,14 +44,26 @@ class UserTier:
     market_limit: int   # Limit of markets per analysis
 
 class UserManager:
-    def __init__(self, storage_path: str = None):
+    def __init__(self, storage_path: str = None, backend: str = None, db_path: str = None):
         # Caminho para armazenamento em disco persistente no Render
         if storage_path is None:
             self.storage_path = os.path.join(DATA_DIR, "user_data.json")
         else:
             self.storage_path = storage_path
-            
-        logger.info(f"Inicializando UserManager com arquivo de dados em: {self.storage_path}")
+
+        # Banco SQLite; o JSON fica como formato legado (importado na primeira execução)
+        self.store = None
+        if (backend or USER_STORAGE_BACKEND) == "sqlite":
+            try:
+                from utils.user_store import SQLiteUserStore
+                self.store = SQLiteUserStore(db_path or USER_DB_PATH)
+            except Exception as e:
+                logger.error(f"Erro ao abrir banco de usuários, usando arquivo JSON: {str(e)}")
+
+        if self.store is not None:
+            logger.info(f"Inicializando UserManager com banco de dados em: {self.store.path}")
+        else:
+            logger.info(f"Inicializando UserManager com arquivo de dados em: {self.storage_path}")
         
         # Garantir que o diretório existe
         os_dir = os.path.dirname(self.storage_path)
@@ -49,6 +74,10 @@ class UserManager:
             except Exception as e:
                 logger.error(f"Erro ao criar diretório para dados de usuário: {str(e)}")
         
+        # A mesma instância atende todas as sessões (get_user_manager)
+        self._lock = threading.RLock()
+        # A versão é lida antes da carga: uma gravação concorrente força nova leitura
+        self._loaded_version = self._storage_version()
         self.users = self._load_users()
         
         # Define user tiers/packages
@@ -59,6 +88,67 @@ class UserManager:
         }        
     
     def _load_users(self) -> Dict:
+        """Load users from the SQLite store (importing the legacy JSON file once) or from JSON"""
+        if self.store is None:
+            users = self._load_json_users()
+            # Arquivos antigos não têm o contador de créditos usados
+            for user in users.values():
+                if "credits_used" not in user:
+                    user["credits_used"] = self._counted_usage(user)
+            return users
+
+        try:
+            if self.store.count_users() == 0 and os.path.exists(self.storage_path):
+                imported_users, imported_usage = self.store.import_users(self._load_json_users())
+                logger.info(f"Importados do arquivo JSON: {imported_users} usuários, "
+                            f"{imported_usage} registros de uso")
+            self._compact_usage()
+            users = self.store.load_users()
+            logger.info(f"Dados de usuários carregados do banco: {len(users)} usuários")
+            return users
+        except Exception as e:
+            logger.error(f"Erro ao carregar usuários do banco: {str(e)}")
+            return {}
+
+    def _compact_usage(self):
+        """Consolida eventos antigos em agregados diários quando o intervalo venceu"""
+        if self.store is None:
+            return
+        try:
+            # O histórico fica no banco; os usuários em memória não incluem eventos
+            self.store.compact_usage_if_due()
+        except Exception as e:
+            logger.error(f"Erro ao consolidar histórico de uso: {str(e)}")
+
+    def _storage_version(self):
+        """Versão dos dados em disco; muda quando outro processo (ou conexão) os altera"""
+        try:
+            if self.store is not None:
+                return self.store.data_version()
+            stat = os.stat(self.storage_path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except Exception:
+            return None
+
+    def refresh(self) -> bool:
+        """
+        Recarrega os usuários se os dados foram alterados fora desta instância
+
+        Returns:
+            bool: True se os dados foram recarregados
+        """
+        with self._lock:
+            # Processos de longa duração também consolidam (a checagem do intervalo é barata)
+            self._compact_usage()
+            version = self._storage_version()
+            if version == self._loaded_version:
+                return False
+            self.users = self._load_users()
+            self._loaded_version = version
+            logger.info(f"Dados de usuários alterados externamente; recarregados: {len(self.users)} usuários")
+            return True
+
+    def _load_json_users(self) -> Dict:
         """Load users from JSON file with better error handling"""
         try:
             # Verificar se o arquivo existe
@@ -89,8 +179,19 @@ class UserManager:
             logger.error(f"Erro não tratado em _load_users: {str(e)}")
             return {}
     
+    @_synchronized
     def _save_users(self):
         """Save users to JSON file with error handling and atomic writes"""
+        if self.store is not None:
+            # Compatibilidade: grava os campos de todos os usuários (o uso é gravado por registro)
+            try:
+                for email, user in self.users.items():
+                    self.store.save_user(email, user)
+                return True
+            except Exception as e:
+                logger.error(f"Erro ao salvar dados de usuários no banco: {str(e)}")
+                return False
+
         try:
             # Criar diretório se não existir
             directory = os.path.dirname(self.storage_path)
@@ -104,6 +205,7 @@ class UserManager:
             
             # Renomear o arquivo temporário para o arquivo final (operação atômica)
             os.replace(temp_path, self.storage_path)
+            self._loaded_version = self._storage_version()
             
             logger.info(f"Dados de usuários salvos com sucesso: {len(self.users)} usuários")
             return True
@@ -123,7 +225,179 @@ class UserManager:
                 logger.error(f"Erro ao salvar no local alternativo: {str(alt_e)}")
                 
         return False
+
+    @_synchronized
+    def _save_user(self, email: str, *fields) -> bool:
+        """Persist one user: only the given fields (SQLite) or the whole file (JSON)"""
+        if self.store is None:
+            return self._save_users()
+        try:
+            user = self.users[email]
+            if fields:
+                self.store.update_user(email, {field: user.get(field) for field in fields})
+            else:
+                self.store.save_user(email, user)
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao salvar dados do usuário {email}: {str(e)}")
+            return False
+
+    def _save_usage(self, email: str, usage: Dict) -> bool:
+        """Persist a new usage record (a single row in SQLite)"""
+        if self.store is None:
+            return self._save_users()
+        try:
+            self.store.add_usage(email, usage)
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao registrar uso no banco para {email}: {str(e)}")
+            return False
+
+    def _clear_total_usage(self, email: str) -> bool:
+        """Clear the counted usage (usage.total), keeping the daily history"""
+        self.users[email]["credits_used"] = 0
+        if self.store is None:
+            self.users[email].setdefault("usage", {"daily": [], "total": []})["total"] = []
+            return self._save_users()
+        try:
+            self.store.clear_total_usage(email)
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao limpar uso de {email}: {str(e)}")
+            return False
     
+    @staticmethod
+    def _counted_usage(user: Dict) -> int:
+        """Credits used according to the usage history (usage.total)"""
+        return sum(u.get("markets", 0) for u in user.get("usage", {}).get("total", []))
+
+    def admin_summary(self, top: int = 10, days: int = 30, recent: int = 20) -> Dict:
+        """
+        Números do painel administrativo
+
+        No banco SQLite vêm apenas dos agregados mantidos a cada operação; no
+        arquivo JSON são calculados percorrendo os usuários.
+
+        Args:
+            top (int): Tamanho dos rankings (ligas, jogos, times e mercados)
+            days (int): Dias de análises por dia a incluir
+            recent (int): Quantidade de análises detalhadas recentes
+
+        Returns:
+            dict: tiers, users, credits_sold, analyses, credits_used, detailed,
+                  per_day, leagues, fixtures, teams, markets_used e recent
+        """
+        from utils.user_store import add_usage_record, empty_breakdown
+        try:
+            if self.store is not None:
+                return self.store.admin_summary(top, days, recent)
+
+            breakdown = empty_breakdown()
+            tiers = {}
+            per_day = {}
+            detailed = []
+            since = (datetime.now().date() - timedelta(days=days - 1)).isoformat()
+            for email, user in self.users.items():
+                tiers[user.get("tier", "free")] = tiers.get(user.get("tier", "free"), 0) + 1
+                for usage in user.get("usage", {}).get("daily", []):
+                    add_usage_record(breakdown, usage)
+                    day = usage.get("date") or ""
+                    if day >= since:
+                        per_day.setdefault(day, {"date": day, "analyses": 0, "credits": 0})
+                        per_day[day]["analyses"] += 1
+                        per_day[day]["credits"] += usage.get("markets", 0)
+                    if "league" in usage:
+                        detailed.append(dict(usage, email=email))
+
+            def ranking(counts):
+                return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top]
+
+            return {
+                "tiers": tiers,
+                "users": len(self.users),
+                "credits_sold": sum(user.get("purchased_credits", 0) for user in self.users.values()),
+                "analyses": breakdown["events"],
+                "credits_used": breakdown["markets"],
+                "detailed": breakdown["detailed"],
+                "per_day": [per_day[day] for day in sorted(per_day)],
+                "leagues": ranking(breakdown["leagues"]),
+                "fixtures": ranking(breakdown["fixtures"]),
+                "teams": ranking(breakdown["teams"]),
+                "markets_used": ranking(breakdown["markets_used"]),
+                "recent": sorted(detailed, key=lambda u: u.get("timestamp") or "", reverse=True)[:recent]
+            }
+        except Exception as e:
+            logger.error(f"Erro ao gerar resumo administrativo: {str(e)}")
+            return {"tiers": {}, "users": 0, "credits_sold": 0, "analyses": 0, "credits_used": 0, "detailed": 0,
+                    "per_day": [], "leagues": [], "fixtures": [], "teams": [], "markets_used": [], "recent": []}
+
+    def list_users(self, offset: int = 0, limit: int = 50, search: str = None) -> Tuple[List[Dict], int]:
+        """
+        Uma página da lista de usuários, em ordem de email
+
+        Args:
+            offset (int): Posição inicial
+            limit (int): Tamanho da página
+            search (str): Trecho do email ou do nome (opcional)
+
+        Returns:
+            tuple: (lista de dicts email/name/tier/purchased_credits/credits_used, total)
+        """
+        try:
+            if self.store is not None:
+                return self.store.list_users(offset, limit, search)
+
+            search = (search or "").lower()
+            emails = sorted(email for email, user in self.users.items()
+                            if not search or search in email.lower() or search in (user.get("name") or "").lower())
+            page = [{"email": email,
+                     "name": self.users[email].get("name"),
+                     "tier": self.users[email].get("tier", "free"),
+                     "purchased_credits": self.users[email].get("purchased_credits", 0),
+                     "credits_used": self.users[email].get("credits_used", 0)}
+                    for email in emails[offset:offset + limit]]
+            return page, len(emails)
+        except Exception as e:
+            logger.error(f"Erro ao listar usuários: {str(e)}")
+            return [], 0
+
+    def export_users(self) -> Dict:
+        """Todos os usuários no formato do user_data.json (eventos ainda não consolidados)"""
+        if self.store is not None:
+            return self.store.load_users(include_usage=True)
+        return self.users
+
+    @_synchronized
+    def check_credit_counters(self, repair: bool = False) -> List[Tuple]:
+        """
+        Confere os contadores de créditos usados contra o histórico de uso
+
+        Args:
+            repair (bool): Se True, reconstrói os contadores divergentes
+
+        Returns:
+            list: Tuplas (email, contador, soma do histórico) divergentes
+        """
+        try:
+            if self.store is not None:
+                mismatches = self.store.check_credit_counters(repair)
+            else:
+                mismatches = [(email, user.get("credits_used"), self._counted_usage(user))
+                              for email, user in self.users.items()
+                              if user.get("credits_used") != self._counted_usage(user)]
+
+            if repair and mismatches:
+                for email, _, expected in mismatches:
+                    if email in self.users:
+                        self.users[email]["credits_used"] = expected
+                if self.store is None:
+                    self._save_users()
+                logger.info(f"Contadores de créditos reconstruídos: {len(mismatches)} usuários")
+            return mismatches
+        except Exception as e:
+            logger.error(f"Erro ao conferir contadores de créditos: {str(e)}")
+            return []
+
     def _hash_password(self, password: str) -> str:
         """Hash password using SHA-256"""
         return hashlib.sha256(password.encode()).hexdigest()
@@ -142,6 +416,7 @@ class UserManager:
         }
         return tier_display.get(tier, tier.capitalize())
     
+    @_synchronized
     def register_user(self, email: str, password: str, name: str = None, tier: str = "free") -> tuple:
         """Register a new user with optional name parameter"""
         try:
@@ -167,12 +442,20 @@ class UserManager:
                     "total": []  # Track total usage
                 },
                 "purchased_credits": 0,  # Track additional purchased credits
+                "credits_used": 0,  # Running total of usage.total markets
                 "free_credits_exhausted_at": None,  # Timestamp when free credits run out
                 "paid_credits_exhausted_at": None,  # Timestamp when paid credits run out
                 "created_at": datetime.now().isoformat()
             }
-            
-            save_success = self._save_users()
+
+            if self.store is not None:
+                # Outra sessão pode ter registrado o mesmo email
+                if not self.store.insert_user(email, self.users[email]):
+                    del self.users[email]
+                    return False, "Email já registrado"
+                save_success = True
+            else:
+                save_success = self._save_users()
             if not save_success:
                 logger.warning(f"Falha ao salvar dados durante registro do usuário: {email}")
                 
@@ -201,12 +484,23 @@ class UserManager:
             logger.error(f"Erro durante a autenticação para {email}: {str(e)}")
             return False
     
+    @_synchronized
     def add_credits(self, email: str, amount: int) -> bool:
         """Add more credits to a user account"""
         try:
             if email not in self.users:
                 logger.warning(f"Tentativa de adicionar créditos para usuário inexistente: {email}")
                 return False
+
+            if self.store is not None:
+                # Soma no banco (atômica) e contabiliza os créditos vendidos
+                current = self.store.add_credits(email, amount)
+                if current is None:
+                    logger.warning(f"Usuário não encontrado no banco ao adicionar créditos: {email}")
+                    return False
+                self.users[email].update(current)
+                logger.info(f"Créditos adicionados com sucesso: {amount} para {email}")
+                return True
                 
             if "purchased_credits" not in self.users[email]:
                 self.users[email]["purchased_credits"] = 0
@@ -217,7 +511,7 @@ class UserManager:
             if self.users[email].get("paid_credits_exhausted_at"):
                 self.users[email]["paid_credits_exhausted_at"] = None
                 
-            save_success = self._save_users()
+            save_success = self._save_user(email, "purchased_credits", "paid_credits_exhausted_at")
             if not save_success:
                 logger.warning(f"Falha ao salvar dados após adicionar créditos para: {email}")
                 
@@ -227,6 +521,7 @@ class UserManager:
             logger.error(f"Erro ao adicionar créditos para {email}: {str(e)}")
             return False
     
+    @_synchronized
     def get_usage_stats(self, email: str) -> Dict:
         """Get usage statistics for a user"""
         try:
@@ -244,10 +539,8 @@ class UserManager:
                     
             user = self.users[email]
             
-            # Calculate total credits used
-            total_credits_used = sum(
-                u["markets"] for u in user.get("usage", {}).get("total", [])
-            )
+            # Credits used (running counter, updated with each usage record)
+            total_credits_used = user.get("credits_used", 0)
             
             # Get credits based on user tier
             tier_name = user.get("tier", "free")
@@ -269,23 +562,33 @@ class UserManager:
             
             if user["tier"] == "free" and user.get("free_credits_exhausted_at"):
                 try:
+                    from utils.user_store import free_credits_due
+
                     # Convert stored time to datetime
                     exhausted_time = datetime.fromisoformat(user["free_credits_exhausted_at"])
                     current_time = datetime.now()
                     
                     # Check if 24 hours have passed
-                    if (current_time - exhausted_time).total_seconds() >= 86400:  # 24 hours in seconds
+                    if free_credits_due(user["free_credits_exhausted_at"], current_time):
                         # Reset credits - IMPORTANTE: sempre será 5 créditos, não acumula
-                        user["free_credits_exhausted_at"] = None
-                        
-                        # Clear usage history for free users after reset
-                        user["usage"]["total"] = []
-                        free_credits_reset = True
-                        self._save_users()
+                        if self.store is not None:
+                            # Numa transação, só se a linha ainda tem a marca lida (outro
+                            # processo pode ter renovado e o usuário já ter gasto de novo)
+                            free_credits_reset, current = self.store.reset_free_credits(
+                                email, user["free_credits_exhausted_at"])
+                            if current:
+                                user.update(current)
+                        else:
+                            user["free_credits_exhausted_at"] = None
+                            
+                            # Clear usage history for free users after reset
+                            self._clear_total_usage(email)
+                            free_credits_reset = True
+                            self._save_user(email, "free_credits_exhausted_at")
                         
-                        # Após resetar, não há créditos usados
-                        total_credits_used = 0
-                        logger.info(f"Créditos gratuitos renovados para: {email}")
+                        total_credits_used = user.get("credits_used", 0)
+                        if free_credits_reset:
+                            logger.info(f"Créditos gratuitos renovados para: {email}")
                     else:
                         # Calculate time remaining
                         time_until_reset = exhausted_time + timedelta(days=1) - current_time
@@ -301,7 +604,7 @@ class UserManager:
             # Check if user is out of credits and set exhausted timestamp
             if remaining_credits == 0 and not user.get("free_credits_exhausted_at") and user["tier"] == "free":
                 user["free_credits_exhausted_at"] = datetime.now().isoformat()
-                self._save_users()
+                self._save_user(email, "free_credits_exhausted_at")
                 logger.info(f"Créditos gratuitos esgotados para: {email}")
             
             return {
@@ -328,12 +631,81 @@ class UserManager:
                 "market_limit": float('inf')
             }
     
+    @_synchronized
     def record_usage(self, email, num_markets, analysis_data=None):
         """Record usage of credits"""
         if email not in self.users:
             logger.warning(f"Tentativa de registrar uso para usuário inexistente: {email}")
             return False
 
+        usage = self._build_usage(num_markets, analysis_data)
+        self._append_usage(email, usage)
+        
+        # Salvar alterações
+        save_success = self._save_usage(email, usage)
+        if not save_success:
+            logger.warning(f"Falha ao salvar dados após registrar uso para: {email}")
+            return False
+
+        self._after_usage(email, num_markets)
+        return True
+
+    @_synchronized
+    def consume_credits(self, email, num_markets, analysis_data=None) -> bool:
+        """
+        Confere o saldo e desconta os créditos de forma atômica
+
+        No banco SQLite a conferência e o registro do uso acontecem na mesma
+        transação, de modo que análises simultâneas do mesmo usuário (em
+        threads ou processos diferentes) nunca gastam além do saldo. No
+        arquivo JSON a garantia vale apenas entre threads deste processo.
+
+        Args:
+            email (str): Email do usuário
+            num_markets (int): Créditos a descontar (um por mercado)
+            analysis_data (dict): Liga, times e mercados da análise
+
+        Returns:
+            bool: True se havia saldo e o uso foi registrado
+        """
+        if email not in self.users:
+            self.refresh()
+            if email not in self.users:
+                logger.warning(f"Tentativa de consumir créditos de usuário inexistente: {email}")
+                return False
+
+        usage = self._build_usage(num_markets, analysis_data)
+
+        if self.store is not None:
+            base_credits = {name: tier.total_credits for name, tier in self.tiers.items()}
+            try:
+                consumed, current = self.store.consume_credits(email, usage, base_credits)
+            except Exception as e:
+                logger.error(f"Erro ao consumir créditos de {email}: {str(e)}")
+                return False
+            # Valores atuais do banco (inclui alterações feitas por outros processos
+            # e a renovação dos créditos gratuitos, feita na mesma transação)
+            if current:
+                self.users[email].update(current)
+        else:
+            self.refresh()
+            # get_usage_stats também renova os créditos gratuitos (24h após o esgotamento)
+            consumed = self.get_usage_stats(email)["credits_remaining"] >= num_markets
+            if consumed:
+                self._append_usage(email, usage)
+                if not self._save_usage(email, usage):
+                    logger.warning(f"Falha ao salvar dados após consumir créditos de: {email}")
+                    return False
+
+        if not consumed:
+            logger.info(f"Saldo insuficiente para {email}: {num_markets} créditos solicitados")
+            return False
+
+        self._after_usage(email, num_markets)
+        return True
+
+    def _build_usage(self, num_markets, analysis_data=None) -> Dict:
+        """Usage record with the analysis details, if any"""
         today = datetime.now().date().isoformat()
         
         # Criar registro de uso com dados detalhados
@@ -351,21 +723,22 @@ class UserManager:
                 "away_team": analysis_data.get("away_team"),
                 "markets_used": analysis_data.get("markets_used", [])
             })
-        
-        # Garantir que a estrutura de uso existe para o usuário
-        if "usage" not in self.users[email]:
-            self.users[email]["usage"] = {"daily": [], "total": []}
-        
-        # Adicionar o registro ao rastreamento diário e total
-        self.users[email]["usage"]["daily"].append(usage)
-        self.users[email]["usage"]["total"].append(usage)
-        
-        # Salvar alterações
-        save_success = self._save_users()
-        if not save_success:
-            logger.warning(f"Falha ao salvar dados após registrar uso para: {email}")
-            return False
-            
+        return usage
+
+    def _append_usage(self, email, usage):
+        """Add the usage record to the in-memory user (history only in JSON mode)"""
+        # No arquivo JSON o histórico fica no próprio usuário; no banco, no registro de uso
+        if self.store is None:
+            if "usage" not in self.users[email]:
+                self.users[email]["usage"] = {"daily": [], "total": []}
+
+            # Adicionar o registro ao rastreamento diário e total
+            self.users[email]["usage"]["daily"].append(usage)
+            self.users[email]["usage"]["total"].append(usage)
+        self.users[email]["credits_used"] = self.users[email].get("credits_used", 0) + usage["markets"]
+
+    def _after_usage(self, email, num_markets):
+        """Mark exhausted credits and clear cached stats after a usage record"""
         # Verificar créditos restantes após a atualização
         stats_after = self.get_usage_stats(email)
         credits_after = stats_after.get('credits_remaining', 0)
@@ -374,14 +747,14 @@ class UserManager:
         if self.users[email]["tier"] == "free":
             if credits_after == 0 and not self.users[email].get("free_credits_exhausted_at"):
                 self.users[email]["free_credits_exhausted_at"] = datetime.now().isoformat()
-                self._save_users()
+                self._save_user(email, "free_credits_exhausted_at")
                 logger.info(f"Marcando esgotamento de créditos gratuitos para: {email}")
         
         # Para usuários dos tiers Standard ou Pro
         elif self.users[email]["tier"] in ["standard", "pro"]:
             if credits_after == 0 and not self.users[email].get("paid_credits_exhausted_at"):
                 self.users[email]["paid_credits_exhausted_at"] = datetime.now().isoformat()
-                self._save_users()
+                self._save_user(email, "paid_credits_exhausted_at")
                 logger.info(f"Marcando esgotamento de créditos pagos para: {email}")
         
         # Limpar qualquer cache que possa existir para estatísticas
@@ -393,8 +766,8 @@ class UserManager:
             logger.warning(f"Erro ao limpar cache de estatísticas: {str(e)}")
             
         logger.info(f"Uso registrado com sucesso: {num_markets} créditos para {email}")
-        return True
     
+    @_synchronized
     def _upgrade_to_standard(self, email: str) -> bool:
         """Upgrade a user to Standard package (for admin use)"""
         if email not in self.users:
@@ -404,11 +777,12 @@ class UserManager:
         # Reset usage and timestamps for upgrade
         self.users[email]["free_credits_exhausted_at"] = None
         self.users[email]["paid_credits_exhausted_at"] = None
-        self.users[email]["usage"]["total"] = []
         self.users[email]["purchased_credits"] = 0
-        self._save_users()
+        self._clear_total_usage(email)
+        self._save_user(email, "tier", "free_credits_exhausted_at", "paid_credits_exhausted_at", "purchased_credits")
         return True
         
+    @_synchronized
     def _upgrade_to_pro(self, email: str) -> bool:
         """Upgrade a user to Pro package (for admin use)"""
         if email not in self.users:
@@ -418,11 +792,34 @@ class UserManager:
         # Reset usage and timestamps for upgrade
         self.users[email]["free_credits_exhausted_at"] = None
         self.users[email]["paid_credits_exhausted_at"] = None
-        self.users[email]["usage"]["total"] = []
         self.users[email]["purchased_credits"] = 0
-        self._save_users()
+        self._clear_total_usage(email)
+        self._save_user(email, "tier", "free_credits_exhausted_at", "paid_credits_exhausted_at", "purchased_credits")
         return True
 
+# Instância única do processo (st.cache_resource não compartilha fora do runtime
+# do Streamlit, p.ex. em threads de jobs e scripts)
+_shared_user_manager = None
+_shared_user_manager_lock = threading.Lock()
+
+def get_user_manager() -> UserManager:
+    """
+    UserManager único do processo, compartilhado por todas as sessões
+
+    Cada chamada confere se os dados em disco mudaram (outro processo,
+    migração, ferramentas de linha de comando) e recarrega só nesse caso.
+
+    Returns:
+        UserManager: Instância compartilhada
+    """
+    global _shared_user_manager
+    with _shared_user_manager_lock:
+        if _shared_user_manager is None:
+            _shared_user_manager = UserManager()
+            return _shared_user_manager
+    _shared_user_manager.refresh()
+    return _shared_user_manager
+
 # Funções para análise e carregamento de dados
 
 def rate_limit(seconds):
@@ -922,7 +1319,7 @@ def get_stat(stats, col, default='N/A'):
 
 # Substituir completamente a função  em utils/data.py
 
-def get_odds_data(selected_markets):
+def get_odds_input(selected_markets):
     """
     Captura as odds configuradas pelo usuário na interface.
     
@@ -930,7 +1327,7 @@ def get_odds_data(selected_markets):
         selected_markets (dict): Mercados selecionados pelo usuário
         
     Returns:
-        str: String formatada com as odds capturadas
+        dict: Odds estruturadas (mercado -> seleção -> odd decimal), no formato de ODDS_MARKETS
     """
     import streamlit as st
     import logging
@@ -942,12 +1339,10 @@ def get_odds_data(selected_markets):
     if 'odds_config' not in st.session_state:
         st.session_state.odds_config = {}
     
-    odds_text = []
+    odds = {}
     
     # Money Line (1X2)
     if selected_markets.get("money_line", False):
-        odds_text.append("Money Line (1X2):")
-        
         # Valores padrão ou recuperados da sessão
         default_casa = st.session_state.odds_config.get('ml_casa_odd', 1.35)
         default_empate = st.session_state.odds_config.get('ml_empate_odd', 5.25)
@@ -973,14 +1368,10 @@ def get_odds_data(selected_markets):
                                           key='ml_fora_odd_input')
                 st.session_state.odds_config['ml_fora_odd'] = fora_odd
         
-        odds_text.append(f"• Casa: @{casa_odd:.2f}")
-        odds_text.append(f"• Empate: @{empate_odd:.2f}")
-        odds_text.append(f"• Fora: @{fora_odd:.2f}")
+        odds["money_line"] = {"home": casa_odd, "draw": empate_odd, "away": fora_odd}
     
     # Chance Dupla
     if selected_markets.get("chance_dupla", False):
-        odds_text.append("\nChance Dupla:")
-        
         # Valores padrão ou recuperados da sessão
         default_1x = st.session_state.odds_config.get('cd_1x_odd', 1.10)
         default_12 = st.session_state.odds_config.get('cd_12_odd', 1.16)
@@ -1005,14 +1396,10 @@ def get_odds_data(selected_markets):
                                            key='cd_x2_odd_input')
                 st.session_state.odds_config['cd_x2_odd'] = cd_x2_odd
         
-        odds_text.append(f"• 1X: @{cd_1x_odd:.2f}")
-        odds_text.append(f"• 12: @{cd_12_odd:.2f}")
-        odds_text.append(f"• X2: @{cd_x2_odd:.2f}")
+        odds["chance_dupla"] = {"1x": cd_1x_odd, "12": cd_12_odd, "x2": cd_x2_odd}
     
     # Ambos Marcam
     if selected_markets.get("ambos_marcam", False):
-        odds_text.append("\nAmbos Marcam (BTTS):")
-        
         # Valores padrão ou recuperados da sessão
         default_sim = st.session_state.odds_config.get('btts_sim_odd', 2.00)
         default_nao = st.session_state.odds_config.get('btts_nao_odd', 1.80)
@@ -1031,13 +1418,10 @@ def get_odds_data(selected_markets):
                                               key='btts_nao_odd_input')
                 st.session_state.odds_config['btts_nao_odd'] = btts_nao_odd
         
-        odds_text.append(f"• Sim (BTTS): @{btts_sim_odd:.2f}")
-        odds_text.append(f"• Não (BTTS): @{btts_nao_odd:.2f}")
+        odds["ambos_marcam"] = {"yes": btts_sim_odd, "no": btts_nao_odd}
     
     # Gols (Over/Under)
     if selected_markets.get("over_under", False):
-        odds_text.append("\nTotal de Gols:")
-        
         # Valores padrão ou recuperados da sessão
         default_linha = st.session_state.odds_config.get('gols_linha', 2.5)
         default_over = st.session_state.odds_config.get('gols_over_odd', 1.90)
@@ -1062,13 +1446,10 @@ def get_odds_data(selected_markets):
                                                 key='gols_under_odd_input')
                 st.session_state.odds_config['gols_under_odd'] = gols_under_odd
         
-        odds_text.append(f"• Over {gols_linha} Gols: @{gols_over_odd:.2f}")
-        odds_text.append(f"• Under {gols_linha} Gols: @{gols_under_odd:.2f}")
+        odds["over_under"] = {"line": gols_linha, "over": gols_over_odd, "under": gols_under_odd}
     
     # Escanteios
     if selected_markets.get("escanteios", False):
-        odds_text.append("\nTotal de Escanteios:")
-        
         # Valores padrão ou recuperados da sessão
         default_linha = st.session_state.odds_config.get('corners_linha', 9.5)
         default_over = st.session_state.odds_config.get('corners_over_odd', 1.85)
@@ -1093,13 +1474,10 @@ def get_odds_data(selected_markets):
                                                    key='corners_under_odd_input')
                 st.session_state.odds_config['corners_under_odd'] = corners_under_odd
         
-        odds_text.append(f"• Over {corners_linha} Escanteios: @{corners_over_odd:.2f}")
-        odds_text.append(f"• Under {corners_linha} Escanteios: @{corners_under_odd:.2f}")
+        odds["escanteios"] = {"line": corners_linha, "over": corners_over_odd, "under": corners_under_odd}
     
     # Cartões
     if selected_markets.get("cartoes", False):
-        odds_text.append("\nTotal de Cartões:")
-        
         # Valores padrão ou recuperados da sessão
         default_linha = st.session_state.odds_config.get('cards_linha', 3.5)
         default_over = st.session_state.odds_config.get('cards_over_odd', 1.85)
@@ -1124,16 +1502,157 @@ def get_odds_data(selected_markets):
                                                 key='cards_under_odd_input')
                 st.session_state.odds_config['cards_under_odd'] = cards_under_odd
         
-        odds_text.append(f"• Over {cards_linha} Cartões: @{cards_over_odd:.2f}")
-        odds_text.append(f"• Under {cards_linha} Cartões: @{cards_under_odd:.2f}")
-    
-    # Juntar tudo em uma string formatada
-    odds_data = "\n".join(odds_text)
+        odds["cartoes"] = {"line": cards_linha, "over": cards_over_odd, "under": cards_under_odd}
     
     # Log das odds capturadas
-    logger.info(f"Odds configuradas pelo usuário: {odds_data}")
+    logger.info(f"Odds configuradas pelo usuário: {odds}")
+    
+    return odds
+
+
+# Mercado -> (título no texto de odds, [(seleção, rótulo)] ou None para mercados com linha, nome da unidade)
+ODDS_MARKETS = {
+    "money_line": ("Money Line (1X2)", [("home", "Casa"), ("draw", "Empate"), ("away", "Fora")], None),
+    "chance_dupla": ("Chance Dupla", [("1x", "1X"), ("12", "12"), ("x2", "X2")], None),
+    "ambos_marcam": ("Ambos Marcam (BTTS)", [("yes", "Sim (BTTS)"), ("no", "Não (BTTS)")], None),
+    "over_under": ("Total de Gols", None, "Gols"),
+    "escanteios": ("Total de Escanteios", None, "Escanteios"),
+    "cartoes": ("Total de Cartões", None, "Cartões"),
+}
+
+
+def get_odds_data(selected_markets):
+    """
+    Captura as odds configuradas pelo usuário e devolve o texto formatado.
     
-    return odds_data
+    Mantida por compatibilidade; novos usos devem preferir get_odds_input
+    e renderizar o texto uma única vez com format_odds_text.
+    
+    Args:
+        selected_markets (dict): Mercados selecionados pelo usuário
+        
+    Returns:
+        str: String formatada com as odds capturadas
+    """
+    return format_odds_text(get_odds_input(selected_markets))
+
+
+def format_odds_text(odds):
+    """
+    Renderiza as odds estruturadas no texto usado nos prompts.
+    
+    Args:
+        odds (dict): Odds no formato de get_odds_input
+        
+    Returns:
+        str: Texto formatado (vazio se não houver odds)
+    """
+    blocks = []
+    for market, (title, selections, unit) in ODDS_MARKETS.items():
+        market_odds = (odds or {}).get(market)
+        if not market_odds:
+            continue
+        lines = [f"{title}:"]
+        if selections:
+            for key, label in selections:
+                if key in market_odds:
+                    lines.append(f"• {label}: @{market_odds[key]:.2f}")
+        else:
+            line = market_odds["line"]
+            lines.append(f"• Over {line} {unit}: @{market_odds['over']:.2f}")
+            lines.append(f"• Under {line} {unit}: @{market_odds['under']:.2f}")
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def format_odds_markets(odds, home_team, away_team):
+    """
+    Renderiza a seção "Análise de Mercados Disponíveis" a partir das odds estruturadas.
+    
+    Args:
+        odds (dict): Odds no formato de get_odds_input
+        home_team (str): Nome do time da casa
+        away_team (str): Nome do time visitante
+        
+    Returns:
+        str: Linhas em markdown, uma por seleção
+    """
+    odds = odds or {}
+    section = ""
+    
+    if "money_line" in odds:
+        ml = odds["money_line"]
+        section += "- **Money Line (1X2):**\n"
+        section += f"  - Casa ({home_team}): @{ml['home']}\n"
+        section += f"  - Empate: @{ml['draw']}\n"
+        section += f"  - Fora ({away_team}): @{ml['away']}\n"
+    
+    if "chance_dupla" in odds:
+        dc = odds["chance_dupla"]
+        section += "- **Chance Dupla:**\n"
+        section += f"  - 1X ({home_team} ou Empate): @{dc['1x']}\n"
+        section += f"  - 12 ({home_team} ou {away_team}): @{dc['12']}\n"
+        section += f"  - X2 (Empate ou {away_team}): @{dc['x2']}\n"
+    
+    if "ambos_marcam" in odds:
+        btts = odds["ambos_marcam"]
+        section += "- **Ambos Marcam (BTTS):**\n"
+        section += f"  - Sim: @{btts['yes']}\n"
+        section += f"  - Não: @{btts['no']}\n"
+    
+    for market, header in (("over_under", "Over/Under"), ("escanteios", "Escanteios"), ("cartoes", "Cartões")):
+        if market in odds:
+            data = odds[market]
+            unit = ODDS_MARKETS[market][2]
+            section += f"- **{header}:**\n"
+            section += f"  - Over {float(data['line'])} {unit}: @{data['over']}\n"
+            section += f"  - Under {float(data['line'])} {unit}: @{data['under']}\n"
+    
+    return section
+
+
+def calculate_implied_probabilities(odds):
+    """
+    Probabilidades implícitas (%) de cada seleção a partir das odds estruturadas.
+    
+    Args:
+        odds (dict): Odds no formato de get_odds_input
+        
+    Returns:
+        dict: Chaves usadas na comparação REAL vs IMPLÍCITA (home, draw, away,
+              home_draw, home_away, draw_away, btts_yes, btts_no, over_2_5,
+              under_2_5, corners_over_9_5, cards_under_3_5, ...)
+    """
+    implied = {}
+    odds = odds or {}
+    
+    def add(key, odd):
+        if odd and odd > 0:
+            implied[key] = 100.0 / odd
+    
+    if "money_line" in odds:
+        add("home", odds["money_line"].get("home"))
+        add("draw", odds["money_line"].get("draw"))
+        add("away", odds["money_line"].get("away"))
+    
+    if "chance_dupla" in odds:
+        add("home_draw", odds["chance_dupla"].get("1x"))
+        add("home_away", odds["chance_dupla"].get("12"))
+        add("draw_away", odds["chance_dupla"].get("x2"))
+    
+    if "ambos_marcam" in odds:
+        add("btts_yes", odds["ambos_marcam"].get("yes"))
+        add("btts_no", odds["ambos_marcam"].get("no"))
+    
+    for market, prefix in (("over_under", ""), ("escanteios", "corners_"), ("cartoes", "cards_")):
+        if market in odds:
+            line_str = str(float(odds[market]["line"])).replace('.', '_')
+            add(f"{prefix}over_{line_str}", odds[market].get("over"))
+            add(f"{prefix}under_{line_str}", odds[market].get("under"))
+    
+    return implied
+
+
 def validate_match_data(match_data):
     """
     Valida se os dados de uma partida estão completos o suficiente para análise.
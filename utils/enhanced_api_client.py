@@ -14,9 +14,49 @@ BASE_URL = "https://api.football-data-api.com"
 
 # Diretório para armazenar cache
 from utils.core import DATA_DIR
+from utils.league_stats import build_league_stats_table, get_cached_league_stats_table
 CACHE_DIR = os.path.join(DATA_DIR, "api_cache")
 os.makedirs(CACHE_DIR, exist_ok=True)
 
+def get_cache_file(endpoint, params):
+    """
+    Caminho do arquivo de cache de uma requisição
+    
+    Args:
+        endpoint (str): Endpoint da API
+        params (dict): Parâmetros da requisição (a key é ignorada)
+        
+    Returns:
+        str: Caminho do arquivo de cache
+    """
+    cache_key = f"{endpoint}_"
+    for k, v in sorted(params.items()):
+        if k != "key":  # Não incluir a key no nome do arquivo
+            cache_key += f"{k}_{v}_"
+    cache_key = cache_key.rstrip("_")
+    return os.path.join(CACHE_DIR, f"{cache_key}.json")
+
+def read_cached_response(endpoint, params):
+    """
+    Lê uma resposta do cache local sem considerar a validade e sem acessar a API
+    
+    Args:
+        endpoint (str): Endpoint da API
+        params (dict): Parâmetros da requisição
+        
+    Returns:
+        dict: Dados em cache ou None se não houver
+    """
+    cache_file = get_cache_file(endpoint, params)
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return json.load(f)["data"]
+    except Exception as e:
+        logger.error(f"Erro ao ler cache: {str(e)}")
+        return None
+
 def api_request(endpoint, params, use_cache=True, cache_duration=3600):
     """
     Função robusta para fazer requisições à API com cache e tratamento de erros
@@ -35,12 +75,7 @@ def api_request(endpoint, params, use_cache=True, cache_duration=3600):
         params["key"] = API_KEY
     
     # Criar nome do arquivo de cache
-    cache_key = f"{endpoint}_"
-    for k, v in sorted(params.items()):
-        if k != "key":  # Não incluir a key no nome do arquivo
-            cache_key += f"{k}_{v}_"
-    cache_key = cache_key.rstrip("_")
-    cache_file = os.path.join(CACHE_DIR, f"{cache_key}.json")
+    cache_file = get_cache_file(endpoint, params)
     
     # Verificar cache
     if use_cache and os.path.exists(cache_file):
@@ -110,6 +145,11 @@ def get_teams_for_league(season_id, force_refresh=False):
     if response and "data" in response and isinstance(response["data"], list):
         teams = response["data"]
         logger.info(f"Encontrados {len(teams)} times para season_id {season_id}")
+        
+        # Construir a tabela colunar da temporada uma única vez por busca
+        if force_refresh or get_cached_league_stats_table(season_id) is None:
+            build_league_stats_table(season_id, teams)
+        
         return teams
     
     logger.error(f"Falha ao obter times para season_id {season_id}")
@@ -171,7 +211,7 @@ def get_team_last_matches(team_id, num_matches=5, force_refresh=False):
     logger.error(f"Falha ao obter últimos jogos para team_id {team_id}")
     return None
 
-def find_match_id(home_team_id, away_team_id, season_id, force_refresh=False):
+def find_match_id(home_team_id, away_team_id, season_id, force_refresh=False, matches=None):
     """
     Encontra o ID de um jogo entre dois times em uma liga
     
@@ -180,15 +220,19 @@ def find_match_id(home_team_id, away_team_id, season_id, force_refresh=False):
         away_team_id (int): ID do time visitante
         season_id (int): ID da temporada/liga
         force_refresh (bool): Se True, ignora o cache
+        matches (list, optional): Jogos de league-matches já obtidos
         
     Returns:
         int: ID do jogo ou None se não encontrado
     """
-    params = {
-        "season_id": season_id
-    }
-    
-    response = api_request("league-matches", params, use_cache=not force_refresh)
+    if matches is not None:
+        response = {"data": matches}
+    else:
+        params = {
+            "season_id": season_id
+        }
+        
+        response = api_request("league-matches", params, use_cache=not force_refresh)
     
     if response and "data" in response and isinstance(response["data"], list):
         matches = response["data"]
@@ -268,31 +312,21 @@ def get_complete_match_analysis(home_team, away_team, season_id, force_refresh=F
             logger.error(f"Não foi possível obter times para a liga {season_id}")
             return None
         
-        # Encontrar os times específicos com melhor correspondência de nomes
-        home_team_data = None
-        away_team_data = None
+        # Encontrar os times pela tabela colunar da temporada (índice de linha)
+        table = get_cached_league_stats_table(season_id) or build_league_stats_table(season_id, teams)
+        if table is None:
+            logger.error(f"Não foi possível indexar os times da liga {season_id}")
+            return None
         
-        # Correspondência exata primeiro
-        for team in teams:
-            if "name" in team and team["name"] == home_team:
-                home_team_data = team
-            if "name" in team and team["name"] == away_team:
-                away_team_data = team
-                
-        # Se não encontrou correspondência exata, tente parcial
-        if not home_team_data:
-            for team in teams:
-                if "name" in team and (team["name"].lower() in home_team.lower() or home_team.lower() in team["name"].lower()):
-                    home_team_data = team
-                    logger.info(f"Correspondência parcial para time da casa: {team['name']}")
-                    break
-                    
-        if not away_team_data:
-            for team in teams:
-                if "name" in team and (team["name"].lower() in away_team.lower() or away_team.lower() in team["name"].lower()):
-                    away_team_data = team
-                    logger.info(f"Correspondência parcial para time visitante: {team['name']}")
-                    break
+        home_row = table.find_team(home_team)
+        away_row = table.find_team(away_team)
+        home_team_data = table.teams[home_row] if home_row is not None else None
+        away_team_data = table.teams[away_row] if away_row is not None else None
+        
+        if home_team_data and home_team_data.get("name") != home_team:
+            logger.info(f"Correspondência parcial para time da casa: {home_team_data.get('name')}")
+        if away_team_data and away_team_data.get("name") != away_team:
+            logger.info(f"Correspondência parcial para time visitante: {away_team_data.get('name')}")
         
         if not home_team_data:
             logger.error(f"Time da casa '{home_team}' não encontrado na liga {season_id}")
@@ -353,14 +387,33 @@ def get_complete_match_analysis(home_team, away_team, season_id, force_refresh=F
             logger.warning(f"Não foi possível obter os últimos jogos para {away_team}")
             away_last_matches = []
         
-        # Passo 4: Encontrar match_id e obter detalhes do confronto direto
-        match_id = find_match_id(home_team_id, away_team_id, season_id, force_refresh)
+        # Passo 4: Jogos da temporada (uma requisição, usada pelo match_id e pelos ratings)
+        matches_response = api_request("league-matches", {"season_id": season_id}, use_cache=not force_refresh)
+        season_matches = None
+        if matches_response and isinstance(matches_response.get("data"), list):
+            season_matches = matches_response["data"]
+        
+        # Encontrar match_id e obter detalhes do confronto direto
+        match_id = find_match_id(home_team_id, away_team_id, season_id, force_refresh, matches=season_matches)
         match_details = None
         if match_id:
             match_details = get_match_details(match_id, force_refresh)
         else:
             logger.warning(f"Não foi encontrado ID de partida para {home_team} vs {away_team}")
         
+        # Passo 5: Atualizar ratings incrementais da temporada (jogos completos novos)
+        from utils.ratings import update_season_ratings
+        season_ratings = update_season_ratings(season_id, matches=season_matches, force_refresh=force_refresh)
+        ratings_data = {}
+        if season_ratings:
+            expected_home, expected_away = season_ratings.expected_goals(home_team_id, away_team_id)
+            ratings_data = {
+                "home": season_ratings.get(home_team_id),
+                "away": season_ratings.get(away_team_id),
+                "expected_goals": {"home": expected_home, "away": expected_away},
+                "elo_home_win": season_ratings.win_probability(home_team_id, away_team_id)
+            }
+        
         # Compilar todos os dados
         complete_analysis = {
             "basic_stats": {
@@ -379,7 +432,8 @@ def get_complete_match_analysis(home_team, away_team, season_id, force_refresh=F
             "advanced_stats": {
                 "home": extract_advanced_stats(home_team_data),
                 "away": extract_advanced_stats(away_team_data)
-            }
+            },
+            "ratings": ratings_data
         }
         
         # Verificar a qualidade dos dados extraídos - não retornar dados vazios
@@ -496,6 +550,16 @@ def convert_to_dataframe_format(complete_analysis):
         home_team = complete_analysis["basic_stats"]["home_team"]["name"]
         away_team = complete_analysis["basic_stats"]["away_team"]["name"]
         
+        # Usar a tabela colunar da temporada quando disponível (sem reprocessar os dicts)
+        table = get_cached_league_stats_table(complete_analysis["basic_stats"].get("league_id"))
+        if table is not None:
+            home_row = table.find_team_id(complete_analysis["basic_stats"]["home_team"].get("id"))
+            away_row = table.find_team_id(complete_analysis["basic_stats"]["away_team"].get("id"))
+            if home_row is not None and away_row is not None:
+                df = table.to_dataframe([home_row, away_row], squads=[home_team, away_team])
+                logger.info(f"DataFrame criado a partir da tabela colunar. Shape: {df.shape}")
+                return df
+        
         # Extrair estatísticas
         home_stats = complete_analysis["basic_stats"]["home_team"]["stats"]
         away_stats = complete_analysis["basic_stats"]["away_team"]["stats"]
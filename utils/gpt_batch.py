@@ -0,0 +1,137 @@
+"""
+Análise de vários jogos em paralelo com a OpenAI.
+
+Recebe prompts já preparados (format_highly_optimized_prompt) e os envia em
+paralelo, com limite de requisições simultâneas e um orçamento de tokens
+por minuto (janela deslizante de 60s). Os resultados são entregues à
+medida que ficam prontos e cada resposta é gravada no cache GPT; prompts
+já presentes no cache não consomem orçamento nem chamam a API. Cada
+análise passa pelo mesmo núcleo de analyze_with_gpt (utils.ai.request_analysis),
+com novas tentativas após erros de limite de taxa.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+logger = logging.getLogger("valueHunter.gpt_batch")
+
+# Requisições simultâneas à OpenAI
+GPT_BATCH_CONCURRENCY = 4
+
+# Orçamento de tokens (entrada + saída) por minuto
+GPT_TOKENS_PER_MINUTE = 30000
+
+# Tokens de saída reservados por análise até a resposta informar o uso real
+GPT_EXPECTED_OUTPUT_TOKENS = 800
+
+# Novas tentativas de uma análise recusada por limite de taxa (429)
+GPT_BATCH_RATE_LIMIT_RETRIES = 3
+
+
+class TokenBudget:
+    """Limite de tokens por minuto numa janela deslizante, compartilhado entre threads"""
+
+    def __init__(self, tokens_per_minute=GPT_TOKENS_PER_MINUTE, window=60.0):
+        self.tokens_per_minute = tokens_per_minute
+        self.window = window
+        self._events = deque()
+        self._condition = threading.Condition()
+
+    def _used(self, now):
+        while self._events and now - self._events[0][0] >= self.window:
+            self._events.popleft()
+        return sum(tokens for _, tokens in self._events)
+
+    def acquire(self, tokens):
+        """
+        Reserva tokens, esperando até caberem no orçamento
+
+        Args:
+            tokens (int): Tokens estimados da requisição
+
+        Returns:
+            list: Reserva [instante, tokens], para ajuste com o uso real
+        """
+        # Uma requisição maior que o orçamento inteiro passa sozinha na janela
+        tokens = min(tokens, self.tokens_per_minute)
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self._used(now) + tokens <= self.tokens_per_minute:
+                    entry = [now, tokens]
+                    self._events.append(entry)
+                    return entry
+                wait = self._events[0][0] + self.window - now
+                self._condition.wait(max(wait, 0.05))
+
+    def acquire_request(self, messages):
+        """Reserva os tokens estimados de uma requisição (mensagens + saída esperada)"""
+        from utils.prompt_budget import count_tokens
+
+        tokens = sum(count_tokens(message["content"]) for message in messages) + GPT_EXPECTED_OUTPUT_TOKENS
+        return self.acquire(tokens)
+
+    def adjust(self, entry, tokens):
+        """Substitui a estimativa de uma reserva pelo uso real"""
+        with self._condition:
+            entry[1] = tokens
+            self._condition.notify_all()
+
+
+def _analyze_one(client, prompt, budget, use_cache, output_format):
+    """Analisa um prompt com o mesmo núcleo de analyze_with_gpt; retorna o conteúdo ou None"""
+    from utils.ai import request_analysis
+
+    try:
+        return request_analysis(prompt, output_format, use_cache=use_cache, client=client,
+                                metadata={"batch": True}, budget=budget,
+                                rate_limit_retries=GPT_BATCH_RATE_LIMIT_RETRIES)
+    except Exception as e:
+        logger.error(f"Erro na análise em lote: {str(e)}")
+        return None
+
+
+def analyze_batch(prompts, max_concurrency=GPT_BATCH_CONCURRENCY, tokens_per_minute=GPT_TOKENS_PER_MINUTE,
+                  use_cache=True, output_format="text"):
+    """
+    Analisa vários prompts em paralelo, entregando cada resultado ao ficar pronto
+
+    Args:
+        prompts (list): Prompts preparados (um por jogo)
+        max_concurrency (int): Máximo de requisições simultâneas
+        tokens_per_minute (int): Orçamento de tokens por minuto
+        use_cache (bool): Se True, reaproveita respostas do cache GPT
+        output_format (str): "text" ou "json" (ver utils.structured_analysis)
+
+    Yields:
+        tuple: (índice do prompt, conteúdo da análise ou None em caso de erro)
+    """
+    from utils.ai import get_openai_client
+
+    prompts = list(prompts)
+    if not prompts:
+        return
+
+    client = get_openai_client()
+    if client is None:
+        logger.error("Cliente OpenAI não inicializado; apenas respostas em cache serão entregues")
+
+    budget = TokenBudget(tokens_per_minute)
+    start = time.perf_counter()
+    failures = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="gpt-batch") as executor:
+        futures = {
+            executor.submit(_analyze_one, client, prompt, budget, use_cache, output_format): index
+            for index, prompt in enumerate(prompts)
+        }
+        for future in as_completed(futures):
+            content = future.result()
+            if content is None:
+                failures += 1
+            yield futures[future], content
+
+    logger.info(f"Lote de {len(prompts)} análises concluído em {time.perf_counter() - start:.1f}s "
+                f"({failures} falhas)")
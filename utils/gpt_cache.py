@@ -0,0 +1,220 @@
+"""
+Cache persistente de respostas da OpenAI endereçado por conteúdo.
+
+A chave é o SHA-256 do modelo, da mensagem de sistema, do prompt e da
+temperatura: o mesmo jogo com as mesmas estatísticas, odds e mercados gera
+o mesmo prompt e reaproveita a resposta, mesmo entre usuários diferentes.
+Cada resposta fica num arquivo ``DATA_DIR/gpt_cache/<chave>.json``; entradas
+expiram pelo TTL (contado da criação) e as menos usadas recentemente são
+removidas quando o cache passa do limite de entradas ou de bytes. O mtime
+do arquivo é o instante da gravação e nunca é alterado; o uso é marcado no
+atime.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from utils.core import DATA_DIR
+
+logger = logging.getLogger("valueHunter.gpt_cache")
+
+GPT_CACHE_DIR = os.path.join(DATA_DIR, "gpt_cache")
+
+# Validade de uma resposta desde a criação (segundos)
+GPT_CACHE_TTL = 12 * 60 * 60
+
+# Limites do cache em disco
+GPT_CACHE_MAX_ENTRIES = 500
+GPT_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+_stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+_stats_lock = threading.Lock()
+_write_lock = threading.Lock()
+
+
+def _count(name, amount=1):
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def gpt_cache_key(model, system_message, prompt, temperature):
+    """
+    Chave do cache para uma requisição
+
+    Args:
+        model (str): Modelo da OpenAI
+        system_message (str): Mensagem de sistema
+        prompt (str): Prompt do usuário
+        temperature (float): Temperatura
+
+    Returns:
+        str: Hash SHA-256 em hexadecimal
+    """
+    payload = json.dumps([model, system_message, prompt, temperature], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key):
+    return os.path.join(GPT_CACHE_DIR, f"{key}.json")
+
+
+def get_cached_response(key, ttl=GPT_CACHE_TTL):
+    """
+    Busca uma resposta no cache
+
+    Args:
+        key (str): Chave de gpt_cache_key
+        ttl (int): Validade em segundos desde a criação
+
+    Returns:
+        str: Conteúdo da resposta ou None se ausente/expirada
+    """
+    path = _entry_path(key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except FileNotFoundError:
+        _count("misses")
+        return None
+    except Exception as e:
+        logger.warning(f"Entrada do cache GPT ilegível ({key[:12]}): {str(e)}")
+        _count("misses")
+        return None
+
+    if time.time() - entry.get("created_at", 0) > ttl:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        _count("misses")
+        return None
+
+    # Marca o uso (atime) para a remoção por menos usado recentemente; o mtime
+    # continua sendo a criação, usada na expiração por evict_gpt_cache
+    try:
+        os.utime(path, (time.time(), os.stat(path).st_mtime))
+    except OSError:
+        pass
+    _count("hits")
+    return entry.get("content")
+
+
+def store_response(key, content, metadata=None):
+    """
+    Grava uma resposta no cache (escrita atômica) e aplica os limites de tamanho
+
+    Args:
+        key (str): Chave de gpt_cache_key
+        content (str): Conteúdo da resposta
+        metadata (dict, optional): Informações extras (modelo, tokens, etc.)
+
+    Returns:
+        bool: True se gravado com sucesso
+    """
+    if not content:
+        return False
+    try:
+        os.makedirs(GPT_CACHE_DIR, exist_ok=True)
+        path = _entry_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"created_at": time.time(), "content": content, "metadata": metadata or {}},
+                      f, ensure_ascii=False)
+        os.replace(temp_path, path)
+        _count("stores")
+        evict_gpt_cache()
+        return True
+    except Exception as e:
+        logger.error(f"Erro ao gravar resposta no cache GPT: {str(e)}")
+        return False
+
+
+def _list_entries():
+    """Lista (último uso, criação, tamanho, caminho) de todas as entradas do cache"""
+    entries = []
+    if not os.path.isdir(GPT_CACHE_DIR):
+        return entries
+    for item in os.scandir(GPT_CACHE_DIR):
+        if item.is_file() and item.name.endswith(".json"):
+            try:
+                stat = item.stat()
+            except OSError:
+                continue
+            entries.append((max(stat.st_atime, stat.st_mtime), stat.st_mtime, stat.st_size, item.path))
+    return entries
+
+
+def evict_gpt_cache(ttl=GPT_CACHE_TTL, max_entries=GPT_CACHE_MAX_ENTRIES, max_bytes=GPT_CACHE_MAX_BYTES):
+    """
+    Remove entradas expiradas e, se necessário, as menos usadas recentemente
+
+    Args:
+        ttl (int): Validade em segundos desde a criação (como em get_cached_response)
+        max_entries (int): Número máximo de entradas
+        max_bytes (int): Tamanho máximo total em bytes
+
+    Returns:
+        int: Número de entradas removidas
+    """
+    with _write_lock:
+        entries = sorted(_list_entries())
+        now = time.time()
+        total_bytes = sum(size for _, _, size, _ in entries)
+        removed = 0
+
+        # Expiradas (em qualquer posição) e, em ordem de último uso, as que passam dos limites
+        for _, created, size, path in entries:
+            expired = now - created > ttl
+            over_limit = len(entries) - removed > max_entries or total_bytes > max_bytes
+            if not expired and not over_limit:
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+                total_bytes -= size
+            except OSError:
+                continue
+
+    if removed:
+        _count("evictions", removed)
+        logger.info(f"Cache GPT: {removed} entradas removidas")
+    return removed
+
+
+def get_gpt_cache_stats():
+    """
+    Estatísticas do cache para o painel de depuração
+
+    Returns:
+        dict: hits, misses, stores, evictions (neste processo), hit_rate,
+              entries e bytes em disco
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    entries = _list_entries()
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups * 100 if lookups else 0.0
+    stats["entries"] = len(entries)
+    stats["bytes"] = sum(size for _, _, size, _ in entries)
+    return stats
+
+
+def clear_gpt_cache():
+    """
+    Remove todas as respostas do cache
+
+    Returns:
+        int: Número de entradas removidas
+    """
+    removed = 0
+    with _write_lock:
+        for _, _, _, path in _list_entries():
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                continue
+    return removed
@@ -0,0 +1,321 @@
+"""
+Tabela colunar de estatísticas de times por temporada.
+
+Cada temporada vira uma única matriz NumPy (uma linha por time, uma coluna
+por estatística canônica), construída uma vez a partir do payload de
+``league-teams`` e reutilizada por todas as análises da liga. Buscar um
+time é um índice de linha e cálculos da liga inteira (rankings, percentis)
+são vetorizados.
+"""
+import logging
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger("valueHunter.league_stats")
+
+# Tempo de vida da tabela em memória (igual ao cache padrão de api_request)
+TABLE_TTL = 3600
+
+# Estatística canônica -> campos da API FootyStats (o primeiro encontrado vence)
+STAT_FIELDS = {
+    # Colunas no formato do DataFrame de format_prompt
+    "MP": ("seasonMatchesPlayed_overall", "matches_played"),
+    "W": ("seasonWinsNum_overall", "wins"),
+    "D": ("seasonDrawsNum_overall", "draws"),
+    "L": ("seasonLossesNum_overall", "losses"),
+    "Gls": ("seasonGoals_overall", "goals_scored"),
+    "GA": ("seasonConceded_overall", "goals_conceded"),
+    "xG": ("xg_for_overall", "xg"),
+    "xGA": ("xg_against_avg_overall", "xga"),
+    "Poss": ("possessionAVG_overall", "possession"),
+    "Sh": ("shotsAVG_overall", "shots"),
+    "SoT": ("shotsOnTargetAVG_overall", "shots_on_target"),
+    "CrdY": ("cards_for_avg_overall", "yellow_cards"),
+    "CrdR": ("seasonCrdRNum_overall", "red_cards"),
+    "CK": ("cornersAVG_overall", "corners"),
+    # Features usadas pelo modelo de probabilidades
+    "played": ("seasonMatchesPlayed_overall", "matches_played", "played"),
+    "wins": ("seasonWinsNum_overall", "wins"),
+    "draws": ("seasonDrawsNum_overall", "draws"),
+    "losses": ("seasonLossesNum_overall", "losses"),
+    "goals_scored": ("seasonScoredNum_overall", "seasonGoals_overall", "goals_scored"),
+    "goals_conceded": ("seasonConcededNum_overall", "seasonConceded_overall", "goals_conceded"),
+    "win_pct": ("winPercentage_overall", "win_pct"),
+    "draw_pct": ("drawPercentage_overall", "draw_pct"),
+    "loss_pct": ("losePercentage_overall", "loss_pct"),
+    "goals_per_game": ("seasonScoredAVG_overall", "goals_per_game"),
+    "conceded_per_game": ("seasonConcededAVG_overall", "conceded_per_game"),
+    "xg": ("xg", "xG", "expected_goals"),
+    "xga": ("xga", "xGA", "expected_goals_against"),
+    "xg_for_avg_overall": ("xg_for_avg_overall",),
+    "xg_against_avg_overall": ("xg_against_avg_overall",),
+    "possession": ("possessionAVG_overall", "possession"),
+    "btts_pct": ("seasonBTTSPercentage_overall", "btts_pct"),
+    "over_2_5_pct": ("seasonOver25Percentage_overall", "over_2_5_pct"),
+    "clean_sheets_pct": ("seasonCSPercentage_overall", "clean_sheets_pct"),
+    "cards_per_game": ("cardsAVG_overall", "cards_per_game"),
+    "cardsTotal_overall": ("cardsTotal_overall",),
+    "corners_per_game": ("cornersTotalAVG_overall", "corners_per_game"),
+    "cornersTotal_overall": ("cornersTotal_overall",),
+    "seasonPPG_overall": ("seasonPPG_overall", "ppg"),
+    "leaguePosition_overall": ("leaguePosition_overall", "league_position"),
+}
+
+# Colunas do DataFrame retornado por convert_to_dataframe_format
+DATAFRAME_COLUMNS = ["MP", "W", "D", "L", "Gls", "GA", "xG", "xGA",
+                     "Poss", "Sh", "SoT", "CrdY", "CrdR", "CK"]
+
+# Colunas que compõem o dicionário de features de um time
+FEATURE_COLUMNS = [col for col in STAT_FIELDS if col not in DATAFRAME_COLUMNS]
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def _lookup_field(team, fields):
+    """
+    Busca o primeiro campo numérico disponível no time ou em team["stats"]
+
+    Args:
+        team (dict): Time no formato do payload de league-teams
+        fields (tuple): Nomes de campo em ordem de preferência
+
+    Returns:
+        float: Valor encontrado ou NaN
+    """
+    stats = team.get("stats") if isinstance(team.get("stats"), dict) else {}
+    for field in fields:
+        for source in (team, stats):
+            value = source.get(field)
+            if value is None or value == "" or value == "N/A":
+                continue
+            try:
+                return float(value)
+            except (ValueError, TypeError):
+                continue
+    return np.nan
+
+
+class LeagueStatsTable:
+    """
+    Estatísticas de todos os times de uma temporada em formato colunar.
+
+    Atributos:
+        season_id (int): ID da temporada
+        teams (list): Payload original de league-teams (um dict por time)
+        names (list): Nome de cada time, na ordem das linhas
+        ids (np.ndarray): ID de cada time
+        columns (list): Nome das colunas canônicas
+        values (np.ndarray): Matriz (times x colunas) em float64, NaN = ausente
+        forms (list): String de forma de cada time ("" se ausente)
+    """
+
+    def __init__(self, season_id, teams):
+        self.season_id = season_id
+        self.teams = [team for team in teams if isinstance(team, dict)]
+        self.names = [str(team.get("name", "")) for team in self.teams]
+        self.ids = np.array([team.get("id") or 0 for team in self.teams], dtype=np.int64)
+        self.columns = list(STAT_FIELDS)
+        self.built_at = time.time()
+
+        self._col_index = {col: i for i, col in enumerate(self.columns)}
+        self._id_index = {int(team_id): row for row, team_id in enumerate(self.ids) if team_id}
+        self._name_index = {name: row for row, name in enumerate(self.names)}
+
+        self.values = np.array(
+            [[_lookup_field(team, STAT_FIELDS[col]) for col in self.columns] for team in self.teams],
+            dtype=np.float64
+        ).reshape(len(self.teams), len(self.columns))
+
+        self.forms = []
+        for team in self.teams:
+            stats = team.get("stats") if isinstance(team.get("stats"), dict) else {}
+            form = team.get("formRun_overall") or stats.get("formRun_overall") or ""
+            self.forms.append(form if isinstance(form, str) else "")
+
+        self._derive_missing()
+
+    def _derive_missing(self):
+        """Calcula percentuais e médias por jogo ausentes a partir dos totais"""
+        played = self.column("played")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            safe_played = np.where(played > 0, played, np.nan)
+            derived = {
+                "win_pct": self.column("wins") / safe_played * 100,
+                "draw_pct": self.column("draws") / safe_played * 100,
+                "loss_pct": self.column("losses") / safe_played * 100,
+                "goals_per_game": self.column("goals_scored") / safe_played,
+                "conceded_per_game": self.column("goals_conceded") / safe_played,
+                "cards_per_game": self.column("cardsTotal_overall") / safe_played,
+                "corners_per_game": self.column("cornersTotal_overall") / safe_played,
+            }
+        for col, values in derived.items():
+            idx = self._col_index[col]
+            missing = np.isnan(self.values[:, idx])
+            self.values[missing, idx] = values[missing]
+
+    def __len__(self):
+        return len(self.teams)
+
+    def column(self, name):
+        """Retorna a coluna como array NumPy (visão, sem cópia)"""
+        return self.values[:, self._col_index[name]]
+
+    def find_team(self, team_name):
+        """
+        Encontra a linha de um time pelo nome
+
+        Usa correspondência exata primeiro e depois parcial, como em
+        get_complete_match_analysis.
+
+        Args:
+            team_name (str): Nome do time
+
+        Returns:
+            int: Índice da linha ou None se não encontrado
+        """
+        if not team_name:
+            return None
+        row = self._name_index.get(team_name)
+        if row is not None:
+            return row
+        lowered = team_name.lower()
+        for row, name in enumerate(self.names):
+            if name and (name.lower() in lowered or lowered in name.lower()):
+                return row
+        return None
+
+    def find_team_id(self, team_id):
+        """Retorna a linha de um time pelo ID ou None"""
+        try:
+            return self._id_index.get(int(team_id))
+        except (ValueError, TypeError):
+            return None
+
+    def team_features(self, row):
+        """
+        Monta o dicionário de features de um time para o modelo de probabilidades
+
+        Campos ausentes são omitidos, para que os valores padrão de
+        calculate_advanced_probabilities continuem valendo.
+
+        Args:
+            row (int): Índice da linha
+
+        Returns:
+            dict: Features do time (mesmas chaves de simplify_api_data)
+        """
+        features = {"name": self.names[row]}
+        for col in FEATURE_COLUMNS:
+            value = self.values[row, self._col_index[col]]
+            if not np.isnan(value):
+                features[col] = float(value)
+        if self.forms[row]:
+            features["form"] = self.forms[row][-5:]
+        return features
+
+    def to_dataframe(self, rows, squads=None):
+        """
+        Gera o DataFrame no formato esperado por format_prompt
+
+        Args:
+            rows (list): Índices das linhas
+            squads (list, optional): Nomes a usar na coluna Squad
+
+        Returns:
+            pandas.DataFrame: Uma linha por time, ausentes preenchidos com 0
+        """
+        import pandas as pd
+
+        idx = [self._col_index[col] for col in DATAFRAME_COLUMNS]
+        block = np.nan_to_num(self.values[np.ix_(rows, idx)], nan=0.0)
+        df = pd.DataFrame(block, columns=DATAFRAME_COLUMNS)
+        df.insert(0, "Squad", squads if squads is not None else [self.names[r] for r in rows])
+        return df
+
+    def rank(self, column, ascending=False):
+        """
+        Ranking da liga para uma coluna (1 = melhor)
+
+        Args:
+            column (str): Nome da coluna
+            ascending (bool): Se True, o menor valor fica em primeiro
+
+        Returns:
+            np.ndarray: Posição de cada time (NaN vai para o fim)
+        """
+        values = self.column(column)
+        key = np.where(np.isnan(values), np.inf, values if ascending else -values)
+        order = np.argsort(key, kind="stable")
+        ranks = np.empty(len(values), dtype=np.int64)
+        ranks[order] = np.arange(1, len(values) + 1)
+        return ranks
+
+    def percentile(self, column):
+        """
+        Percentil (0-100) de cada time na liga para uma coluna
+
+        Args:
+            column (str): Nome da coluna
+
+        Returns:
+            np.ndarray: Percentil de cada time (NaN se o valor estiver ausente)
+        """
+        values = self.column(column)
+        valid = values[~np.isnan(values)]
+        if valid.size == 0:
+            return np.full(len(values), np.nan)
+        sorted_vals = np.sort(valid)
+        below = np.searchsorted(sorted_vals, values, side="left")
+        equal = np.searchsorted(sorted_vals, values, side="right") - below
+        result = (below + 0.5 * equal) / valid.size * 100
+        result[np.isnan(values)] = np.nan
+        return result
+
+
+def build_league_stats_table(season_id, teams):
+    """
+    Constrói a tabela da temporada e a registra no cache em memória
+
+    Args:
+        season_id (int): ID da temporada
+        teams (list): Payload de league-teams
+
+    Returns:
+        LeagueStatsTable: Tabela construída ou None em caso de erro
+    """
+    try:
+        table = LeagueStatsTable(season_id, teams)
+        with _tables_lock:
+            _tables[season_id] = table
+        logger.info(f"Tabela colunar criada para season_id {season_id}: "
+                    f"{len(table)} times x {len(table.columns)} colunas")
+        return table
+    except Exception as e:
+        logger.error(f"Erro ao construir tabela colunar para season_id {season_id}: {str(e)}")
+        return None
+
+
+def get_cached_league_stats_table(season_id):
+    """
+    Retorna a tabela da temporada se já estiver em memória e válida
+
+    Args:
+        season_id (int): ID da temporada
+
+    Returns:
+        LeagueStatsTable: Tabela ou None
+    """
+    with _tables_lock:
+        table = _tables.get(season_id)
+    if table is not None and time.time() - table.built_at < TABLE_TTL:
+        return table
+    return None
+
+
+def clear_league_stats_tables():
+    """Remove todas as tabelas do cache em memória"""
+    with _tables_lock:
+        _tables.clear()
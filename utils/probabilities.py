@@ -0,0 +1,422 @@
+"""
+Motor vetorizado de probabilidades para rodadas inteiras.
+
+Reproduz, em uma única passada NumPy sobre N jogos, exatamente a mesma
+aritmética de ``calculate_advanced_probabilities`` (utils/ai.py). A ordem
+das operações é mantida igual à da função escalar, para que os resultados
+sejam idênticos bit a bit.
+"""
+import hashlib
+import logging
+import math
+import numbers
+import random
+
+import numpy as np
+
+logger = logging.getLogger("valueHunter.probabilities")
+
+# Campos numéricos lidos por calculate_advanced_probabilities
+FEATURE_KEYS = (
+    "goals_per_game", "conceded_per_game",
+    "win_pct", "draw_pct", "loss_pct",
+    "xg", "xga", "possession", "btts_pct",
+    "cards_per_game", "corners_per_game",
+)
+
+
+def form_to_points(form_str):
+    """
+    Calcula pontos de forma considerando os últimos 5 jogos
+    W=3pts, D=1pt, L=0pts
+
+    Args:
+        form_str (str): String com a sequência de resultados (ex: "WDLWW")
+
+    Returns:
+        int: Pontuação total (máximo 15 pontos)
+    """
+    if not form_str or not isinstance(form_str, str):
+        return 0
+
+    points = 0
+    for result in form_str[-5:]:
+        result = result.upper()
+        if result == 'W':
+            points += 3
+        elif result == 'D':
+            points += 1
+    return points
+
+
+# Campos com histórico de forma, em ordem de preferência, por lado do confronto
+FORM_HISTORY_KEYS = {
+    "home": ("formRun_overall", "formRun_home", "home_form"),
+    "away": ("formRun_overall", "formRun_away", "away_form"),
+}
+
+
+def history_form(team, side):
+    """
+    Busca uma forma real (diferente de "DDDDD") nos outros campos de histórico do time
+
+    Args:
+        team (dict): Estatísticas do time
+        side (str): "home" ou "away"
+
+    Returns:
+        str: Últimos 5 resultados ou None se não houver histórico utilizável
+    """
+    for key in FORM_HISTORY_KEYS[side]:
+        value = team.get(key)
+        if not isinstance(value, str):
+            continue
+        recent = value.strip().upper()[-5:]
+        if recent and set(recent) <= set("WDL") and recent != "DDDDD":
+            return recent
+    return None
+
+
+def form_seed(team_name, season_id):
+    """Semente estável (independente de PYTHONHASHSEED) a partir do time e da temporada"""
+    digest = hashlib.sha256(f"{team_name}|{season_id}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def synthesize_form(team, side, win_pct, draw_pct, season_id=None):
+    """
+    Reconstrói a forma de um time de maneira determinística
+
+    Usa o histórico de forma quando disponível; caso contrário sorteia
+    5 resultados a partir das taxas de vitória/empate com uma semente
+    derivada do nome do time e da temporada, de modo que entradas
+    iguais sempre produzem a mesma forma.
+
+    Args:
+        team (dict): Estatísticas do time
+        side (str): "home" ou "away"
+        win_pct (float): Percentual de vitórias
+        draw_pct (float): Percentual de empates
+        season_id (int, optional): ID da temporada
+
+    Returns:
+        str: Forma com 5 resultados
+    """
+    history = history_form(team, side)
+    if history:
+        return history
+
+    rng = random.Random(form_seed(team.get("name", ""), season_id))
+    form = ""
+    for _ in range(5):
+        r = rng.random()
+        if r < win_pct / 100:
+            form += "W"
+        elif r < (win_pct + draw_pct) / 100:
+            form += "D"
+        else:
+            form += "L"
+    return form
+
+
+def team_feature_arrays(teams):
+    """
+    Converte uma lista de dicionários de times em arrays por feature
+
+    Valores ausentes viram NaN, para que cada uso aplique o seu próprio
+    valor padrão, como faz a função escalar com ``dict.get``. Campos
+    presentes mas não numéricos (None, texto) ou NaN marcam o time em
+    "invalid": a função escalar não produz probabilidades com eles.
+
+    Args:
+        teams (list): Lista de dicionários de estatísticas (um por jogo)
+
+    Returns:
+        dict: Feature -> np.ndarray (float64), mais "form" -> lista de strings,
+              "teams" -> dicionários originais (usados na reconstrução da forma)
+              e "invalid" -> np.ndarray (bool)
+    """
+    arrays = {}
+    invalid = np.zeros(len(teams), dtype=bool)
+    for key in FEATURE_KEYS:
+        values = []
+        for i, team in enumerate(teams):
+            if key not in team:
+                values.append(np.nan)
+                continue
+            value = team[key]
+            if not isinstance(value, numbers.Real) or math.isnan(value):
+                invalid[i] = True
+                values.append(np.nan)
+                continue
+            values.append(float(value))
+        arrays[key] = np.array(values, dtype=np.float64)
+    arrays["invalid"] = invalid
+    arrays["form"] = [team.get("form", "?????") for team in teams]
+    arrays["teams"] = list(teams)
+    return arrays
+
+
+def _value(features, key, default):
+    """Retorna a feature com o valor padrão aplicado onde estiver ausente"""
+    values = features[key]
+    return np.where(np.isnan(values), default, values)
+
+
+def _exp(value):
+    """math.exp que retorna inf em vez de lançar OverflowError"""
+    try:
+        return math.exp(value)
+    except OverflowError:
+        return math.inf
+
+
+def _logistic(slope, x, center):
+    """
+    Curva logística 1 / (1 + exp(-slope * (x - center))) elemento a elemento
+
+    Usa math.exp em vez de np.exp: a implementação SIMD do NumPy pode
+    diferir da libm na última casa, o que quebraria a igualdade bit a bit.
+    Onde math.exp estouraria (e a função escalar lançaria exceção) o
+    resultado é NaN.
+    """
+    exponent = -slope * (x - center)
+    exp_values = np.fromiter(map(_exp, exponent.tolist()), dtype=np.float64, count=exponent.size)
+    result = 1 / (1 + exp_values)
+    result[np.isinf(exp_values)] = np.nan
+    return result
+
+
+def calculate_batch_probabilities(home_teams, away_teams, season_ids=None):
+    """
+    Calcula as probabilidades de todos os mercados para N jogos de uma vez
+
+    Args:
+        home_teams: Lista de dicts dos times da casa ou resultado de team_feature_arrays
+        away_teams: Lista de dicts dos times visitantes ou resultado de team_feature_arrays
+        season_ids: ID da temporada (único ou um por jogo), usado na reconstrução da forma
+
+    Returns:
+        dict: Mesma estrutura de calculate_advanced_probabilities, com arrays
+              de tamanho N no lugar de escalares, mais "valid" (bool por jogo;
+              False onde a função escalar retornaria None ou probabilidades NaN,
+              inclusive por features None, texto ou NaN) ou None em caso de erro
+    """
+    try:
+        home = home_teams if isinstance(home_teams, dict) else team_feature_arrays(home_teams)
+        away = away_teams if isinstance(away_teams, dict) else team_feature_arrays(away_teams)
+
+        n = len(home["win_pct"])
+        if len(away["win_pct"]) != n:
+            logger.error("Listas de times da casa e visitantes com tamanhos diferentes")
+            return None
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            # PASSO 1: Dispersão base
+            home_goals_per_game = _value(home, "goals_per_game", 0)
+            home_conceded_per_game = _value(home, "conceded_per_game", 0)
+            away_goals_per_game = _value(away, "goals_per_game", 0)
+            away_conceded_per_game = _value(away, "conceded_per_game", 0)
+
+            home_results = np.stack([
+                _value(home, "win_pct", 0) / 100,
+                _value(home, "draw_pct", 0) / 100,
+                _value(home, "loss_pct", 0) / 100,
+            ], axis=1)
+            away_results = np.stack([
+                _value(away, "win_pct", 0) / 100,
+                _value(away, "draw_pct", 0) / 100,
+                _value(away, "loss_pct", 0) / 100,
+            ], axis=1)
+
+            home_dispersion = np.std(home_results, axis=1) * 3
+            away_dispersion = np.std(away_results, axis=1) * 3
+            home_consistency = 1 - np.minimum(1, home_dispersion)
+            away_consistency = 1 - np.minimum(1, away_dispersion)
+
+            # PASSO 2: Forma recente
+            home_forms = list(home["form"])
+            away_forms = list(away["form"])
+            for i in range(n):
+                if home_forms[i] == away_forms[i] == "DDDDD":
+                    home_win = home["win_pct"][i]
+                    home_draw = home["draw_pct"][i]
+                    away_win = away["win_pct"][i]
+                    away_draw = away["draw_pct"][i]
+                    season_id = season_ids[i] if isinstance(season_ids, (list, tuple, np.ndarray)) else season_ids
+                    home_forms[i] = synthesize_form(
+                        home["teams"][i], "home",
+                        40 if np.isnan(home_win) else home_win,
+                        30 if np.isnan(home_draw) else home_draw,
+                        season_id
+                    )
+                    away_forms[i] = synthesize_form(
+                        away["teams"][i], "away",
+                        30 if np.isnan(away_win) else away_win,
+                        30 if np.isnan(away_draw) else away_draw,
+                        season_id
+                    )
+
+            home_form_points = np.array([form_to_points(f) for f in home_forms], dtype=np.float64) / 15
+            away_form_points = np.array([form_to_points(f) for f in away_forms], dtype=np.float64) / 15
+
+            # Estatísticas da equipe
+            home_xg = _value(home, "xg", 0)
+            home_xga = _value(home, "xga", 0)
+            away_xg = _value(away, "xg", 0)
+            away_xga = _value(away, "xga", 0)
+
+            max_xg = np.maximum(np.maximum(home_xg, away_xg), 60)
+
+            home_offensive = (home_xg / max_xg) * 0.6 + (home_goals_per_game / 3) * 0.4
+            home_defensive = (1 - np.minimum(1, home_xga / max_xg)) * 0.6 + (1 - np.minimum(1, home_conceded_per_game / 3)) * 0.4
+            away_offensive = (away_xg / max_xg) * 0.6 + (away_goals_per_game / 3) * 0.4
+            away_defensive = (1 - np.minimum(1, away_xga / max_xg)) * 0.6 + (1 - np.minimum(1, away_conceded_per_game / 3)) * 0.4
+
+            home_stats_score = home_offensive * 0.6 + home_defensive * 0.4
+            away_stats_score = away_offensive * 0.6 + away_defensive * 0.4
+
+            # Posição e criação
+            home_position_score = _value(home, "win_pct", 50) / 100
+            away_position_score = _value(away, "win_pct", 50) / 100
+
+            home_possession = _value(home, "possession", 50) / 100
+            away_possession = _value(away, "possession", 50) / 100
+
+            home_creation = home_offensive * 0.7 + home_possession * 0.3
+            away_creation = away_offensive * 0.7 + away_possession * 0.3
+
+            home_total_score = (
+                home_form_points * 0.35 +
+                home_stats_score * 0.25 +
+                home_position_score * 0.20 +
+                home_creation * 0.20
+            )
+            away_total_score = (
+                away_form_points * 0.35 +
+                away_stats_score * 0.25 +
+                away_position_score * 0.20 +
+                away_creation * 0.20
+            )
+
+            # PASSO 3: Mercados
+            # 1. Moneyline (1X2)
+            score_sum = home_total_score + away_total_score
+            raw_home_win = home_total_score / score_sum * 0.8
+            raw_away_win = away_total_score / score_sum * 0.8
+            raw_draw = 1 - (raw_home_win + raw_away_win)
+
+            home_advantage = 0.12
+            adjusted_home_win = raw_home_win + home_advantage
+            adjusted_away_win = raw_away_win - (home_advantage * 0.5)
+            adjusted_draw = raw_draw - (home_advantage * 0.5)
+
+            total = adjusted_home_win + adjusted_draw + adjusted_away_win
+            home_win_prob = (adjusted_home_win / total) * 100
+            draw_prob = (adjusted_draw / total) * 100
+            away_win_prob = (adjusted_away_win / total) * 100
+
+            # 2. Over/Under
+            expected_goals_home = home_offensive * 2.5
+            expected_goals_away = away_offensive * 2.0
+            expected_goals_home = expected_goals_home * (1 - away_defensive * 0.7)
+            expected_goals_away = expected_goals_away * (1 - home_defensive * 0.7)
+            total_expected_goals = expected_goals_home + expected_goals_away
+
+            over_2_5_prob = _logistic(2, total_expected_goals, 2.5)
+
+            # 3. Ambos Marcam (BTTS)
+            btts_base = np.minimum(1, (expected_goals_home * expected_goals_away) * 2)
+            btts_historical = (_value(home, "btts_pct", 50) + _value(away, "btts_pct", 50)) / 200
+            btts_prob = btts_base * 0.7 + btts_historical * 0.3
+
+            # 4. Cartões
+            home_cards = _value(home, "cards_per_game", 2)
+            away_cards = _value(away, "cards_per_game", 2)
+            intensity_factor = 1 + 0.3 * (1 - np.abs(home_total_score - away_total_score))
+            expected_cards = (home_cards + away_cards) * intensity_factor
+            over_3_5_cards_prob = _logistic(2, expected_cards, 3.5)
+
+            # 5. Escanteios
+            home_corners = _value(home, "corners_per_game", 5)
+            away_corners = _value(away, "corners_per_game", 5)
+            expected_corners = (home_corners * (home_possession * 0.5 + 0.5) +
+                                away_corners * (away_possession * 0.5 + 0.5))
+            over_9_5_corners_prob = _logistic(1.5, expected_corners, 9.5)
+
+        # Jogos em que a função escalar teria lançado exceção (divisão por zero, overflow,
+        # features não numéricas) ou propagado NaN
+        valid = (score_sum != 0) & (total != 0)
+        valid &= ~home.get("invalid", np.zeros(n, dtype=bool))
+        valid &= ~away.get("invalid", np.zeros(n, dtype=bool))
+        for values in (home_win_prob, draw_prob, away_win_prob, over_2_5_prob,
+                       btts_prob, over_3_5_cards_prob, over_9_5_corners_prob):
+            valid &= np.isfinite(values)
+
+        return {
+            "moneyline": {
+                "home_win": home_win_prob,
+                "draw": draw_prob,
+                "away_win": away_win_prob
+            },
+            "double_chance": {
+                "home_or_draw": home_win_prob + draw_prob,
+                "away_or_draw": away_win_prob + draw_prob,
+                "home_or_away": home_win_prob + away_win_prob
+            },
+            "over_under": {
+                "over_2_5": over_2_5_prob * 100,
+                "under_2_5": (1 - over_2_5_prob) * 100,
+                "expected_goals": total_expected_goals,
+                "expected_goals_home": expected_goals_home,
+                "expected_goals_away": expected_goals_away
+            },
+            "btts": {
+                "yes": btts_prob * 100,
+                "no": (1 - btts_prob) * 100
+            },
+            "cards": {
+                "over_3_5": over_3_5_cards_prob * 100,
+                "under_3_5": (1 - over_3_5_cards_prob) * 100,
+                "expected_cards": expected_cards
+            },
+            "corners": {
+                "over_9_5": over_9_5_corners_prob * 100,
+                "under_9_5": (1 - over_9_5_corners_prob) * 100,
+                "expected_corners": expected_corners
+            },
+            "analysis_data": {
+                "home_consistency": home_consistency,
+                "away_consistency": away_consistency,
+                "home_form_points": home_form_points,
+                "away_form_points": away_form_points,
+                "home_total_score": home_total_score,
+                "away_total_score": away_total_score
+            },
+            "valid": valid
+        }
+
+    except Exception as e:
+        logger.error(f"Erro no cálculo vetorizado de probabilidades: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return None
+
+
+def batch_result_for(batch, index):
+    """
+    Extrai o resultado de um jogo do lote no formato da função escalar
+
+    Args:
+        batch (dict): Resultado de calculate_batch_probabilities
+        index (int): Índice do jogo
+
+    Returns:
+        dict: Probabilidades do jogo (floats) ou None se o jogo for inválido
+    """
+    if not batch or not batch["valid"][index]:
+        return None
+    return {
+        market: {key: float(values[index]) for key, values in data.items()}
+        for market, data in batch.items() if market != "valid"
+    }
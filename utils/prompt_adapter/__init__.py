@@ -0,0 +1,89 @@
+"""
+Adaptadores de dados da API para os prompts do agente de IA.
+
+O pacote é carregado sob demanda: importar ``utils.prompt_adapter`` não
+compila nenhuma estratégia de extração. Cada submódulo só é importado no
+primeiro acesso a um dos seus nomes (PEP 562), de modo que o dashboard,
+que usa apenas ``simplify_api_data``, não paga pelas demais estratégias.
+"""
+import logging
+
+logger = logging.getLogger("valueHunter.prompt_adapter")
+
+# Nome público -> submódulo que o define
+_LAZY_ATTRS = {
+    # Helpers partilhados
+    "count_non_zero_fields": "common",
+    "get_value": "common",
+    "get_nested_value": "common",
+    "round_stat": "common",
+    "ensure_critical_fields": "common",
+    "calculate_derived_stats": "common",
+    "extract_team_stats": "common",
+    "extract_h2h_data": "common",
+    "extract_form_data": "common",
+    "extract_advanced_metrics": "common",
+    # Extração simplificada (dashboard)
+    "simplify_api_data": "simplified",
+    # Formato altamente otimizado
+    "transform_to_highly_optimized_data": "highly_optimized",
+    "extract_expanded_team_stats": "highly_optimized",
+    "extract_expanded_h2h": "highly_optimized",
+    "extract_form_string": "highly_optimized",
+    "ensure_recent_matches": "highly_optimized",
+    # Formato exato
+    "transform_to_exact_format": "exact_format",
+    "extract_team_data": "exact_format",
+    # Extração avançada e H2H
+    "extract_advanced_team_data": "advanced",
+    "extract_complete_h2h_data": "advanced",
+    "find_previous_matches": "advanced",
+    "calculate_h2h_from_matches": "advanced",
+    # Formato otimizado
+    "transform_to_optimized_data": "optimized",
+    "extract_all_stats": "optimized",
+    "adapt_api_data_for_prompt": "optimized",
+    # Transformação direta da API
+    "transform_api_data": "api_transform",
+    "extract_direct_team_stats": "api_transform",
+    "extract_traditional_stats": "api_transform",
+    "extract_advanced_stats": "api_transform",
+    "extract_basic_stats_team": "api_transform",
+    "extract_stats_team": "api_transform",
+    "extract_all_fields_direct": "api_transform",
+    # Busca em qualquer ponto da estrutura
+    "extract_from_anywhere": "anywhere",
+    "extract_stats_from_dict": "anywhere",
+    "extract_h2h_from_anywhere": "anywhere",
+    "ensure_complete_stats": "anywhere",
+    # Busca recursiva profunda
+    "extract_deep_team_data": "deep",
+    "extract_stats_recursive": "deep",
+    "validate_stats_for_agent": "deep",
+    "alternative_paths_extraction": "deep",
+}
+
+__all__ = sorted(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    """
+    Resolve um nome público importando o submódulo correspondente.
+
+    O valor resolvido é guardado nos globais do pacote, portanto os
+    acessos seguintes não passam mais por esta função.
+    """
+    submodule = _LAZY_ATTRS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # __import__ (e não importlib.import_module) para que o carregamento
+    # apareça no relatório de ``python -X importtime``
+    module = __import__(f"{__name__}.{submodule}", fromlist=[name])
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -0,0 +1,516 @@
+"""
+Extração avançada de dados de times e confrontos diretos.
+"""
+import logging
+
+from utils.prompt_adapter.common import (
+    calculate_derived_stats,
+    extract_advanced_metrics,
+    extract_form_data,
+    extract_h2h_data,
+    extract_team_stats,
+)
+
+logger = logging.getLogger("valueHunter.prompt_adapter")
+
+
+def extract_advanced_team_data(api_data, home_team_name, away_team_name):
+    """
+    Versão aprimorada para extrair dados do time com estrutura exata necessária
+    para análise ótima de IA. Lida com múltiplos formatos de API e garante que todos
+    os campos estatísticos necessários estejam incluídos.
+    
+    Args:
+        api_data (dict): Dados originais da API FootyStats
+        home_team_name (str): Nome do time da casa
+        away_team_name (str): Nome do time visitante
+        
+    Returns:
+        dict: Dados formatados com a estrutura exata necessária para análise de IA
+    """
+    import logging
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    # Inicializa a estrutura completa com todos os campos
+    formatted_data = {
+        "match_info": {
+            "home_team": home_team_name,
+            "away_team": away_team_name,
+            "league": "",
+            "league_id": None
+        },
+        "home_team": {
+            # Estatísticas básicas
+            "played": 0, "wins": 0, "draws": 0, "losses": 0,
+            "goals_scored": 0, "goals_conceded": 0, "clean_sheets_pct": 0,
+            "btts_pct": 0, "over_2_5_pct": 0,
+            # Específicas para casa
+            "home_played": 0, "home_wins": 0, "home_draws": 0, "home_losses": 0,
+            "home_goals_scored": 0, "home_goals_conceded": 0,
+            # Avançadas
+            "xg": 0, "xga": 0, "ppda": 0, "possession": 0,
+            # Estatísticas de cartões
+            "cards_total": 0, "cards_per_game": 0, "yellow_cards": 0, "red_cards": 0,
+            "over_3_5_cards_pct": 0, "home_cards_per_game": 0, "away_cards_per_game": 0,
+            # Estatísticas de escanteios
+            "corners_total": 0, "corners_per_game": 0, "corners_for": 0, "corners_against": 0,
+            "over_9_5_corners_pct": 0, "home_corners_per_game": 0, "away_corners_per_game": 0,
+            # Forma (simplificada)
+            "form": "", "recent_matches": []
+        },
+        "away_team": {
+            # Mesma estrutura para o time visitante
+            "played": 0, "wins": 0, "draws": 0, "losses": 0,
+            "goals_scored": 0, "goals_conceded": 0, "clean_sheets_pct": 0,
+            "btts_pct": 0, "over_2_5_pct": 0,
+            # Específicas para fora
+            "away_played": 0, "away_wins": 0, "away_draws": 0, "away_losses": 0,
+            "away_goals_scored": 0, "away_goals_conceded": 0,
+            # Avançadas
+            "xg": 0, "xga": 0, "ppda": 0, "possession": 0,
+            # Estatísticas de cartões
+            "cards_total": 0, "cards_per_game": 0, "yellow_cards": 0, "red_cards": 0,
+            "over_3_5_cards_pct": 0, "home_cards_per_game": 0, "away_cards_per_game": 0,
+            # Estatísticas de escanteios
+            "corners_total": 0, "corners_per_game": 0, "corners_for": 0, "corners_against": 0,
+            "over_9_5_corners_pct": 0, "home_corners_per_game": 0, "away_corners_per_game": 0,
+            # Forma (simplificada)
+            "form": "", "recent_matches": []
+        },
+        "h2h": {
+            "total_matches": 0, "home_wins": 0, "away_wins": 0, "draws": 0,
+            "over_2_5_pct": 0, "btts_pct": 0, "avg_cards": 0, "avg_corners": 0,
+            "recent_matches": []
+        }
+    }
+    
+    # Sair antecipadamente se não houver dados válidos
+    if not api_data or not isinstance(api_data, dict):
+        logger.error("Dados de API inválidos fornecidos")
+        return formatted_data
+    
+    # Obter informações da liga
+    if "basic_stats" in api_data:
+        # Obter ID da liga
+        if "league_id" in api_data["basic_stats"]:
+            formatted_data["match_info"]["league_id"] = api_data["basic_stats"]["league_id"]
+        
+        # Tentar obter nome da liga
+        if "league" in api_data:
+            formatted_data["match_info"]["league"] = api_data["league"].get("name", "")
+        elif "league_name" in api_data["basic_stats"]:
+            formatted_data["match_info"]["league"] = api_data["basic_stats"]["league_name"]
+    
+    # IMPORTANTE: Buscar dados em MÚLTIPLOS caminhos possíveis da API
+    
+    # Processar dados do time da casa
+    if "basic_stats" in api_data and "home_team" in api_data["basic_stats"]:
+        home_team = api_data["basic_stats"]["home_team"]
+        
+        # NOVO: Verificar múltiplos caminhos para estatísticas
+        home_stats = {}
+        
+        # Caminho 1: stats direto no time
+        if "stats" in home_team and isinstance(home_team["stats"], dict):
+            home_stats = home_team["stats"]
+        
+        # Caminho 2: stats aninhado mais profundo
+        if not home_stats and "stats" in home_team:
+            if isinstance(home_team["stats"], dict) and "stats" in home_team["stats"]:
+                home_stats = home_team["stats"]["stats"]
+        
+        # Caminho 3: stats direto no objeto time
+        for key in ["seasonMatchesPlayed_overall", "wins", "goals_scored"]:
+            if key in home_team:
+                # Se encontrarmos estatísticas diretamente no objeto time, use-as
+                home_stats = home_team
+                break
+                
+        # NOVO: Melhor extração com múltiplos nomes alternativos para campos importantes
+        extract_team_stats(formatted_data["home_team"], home_stats, home_team, "home")
+        
+        # NOVO: Buscar também no advanced_stats
+        if "advanced_stats" in api_data and "home" in api_data["advanced_stats"]:
+            extract_advanced_metrics(formatted_data["home_team"], api_data["advanced_stats"]["home"])
+    
+    # Processar dados do time visitante (mesma lógica)
+    if "basic_stats" in api_data and "away_team" in api_data["basic_stats"]:
+        away_team = api_data["basic_stats"]["away_team"]
+        
+        away_stats = {}
+        
+        if "stats" in away_team and isinstance(away_team["stats"], dict):
+            away_stats = away_team["stats"]
+        
+        if not away_stats and "stats" in away_team:
+            if isinstance(away_team["stats"], dict) and "stats" in away_team["stats"]:
+                away_stats = away_team["stats"]["stats"]
+        
+        for key in ["seasonMatchesPlayed_overall", "wins", "goals_scored"]:
+            if key in away_team:
+                away_stats = away_team
+                break
+                
+        extract_team_stats(formatted_data["away_team"], away_stats, away_team, "away")
+        
+        if "advanced_stats" in api_data and "away" in api_data["advanced_stats"]:
+            extract_advanced_metrics(formatted_data["away_team"], api_data["advanced_stats"]["away"])
+    
+    # NOVO: Extração melhorada de H2H com múltiplos caminhos
+    extract_h2h_data(api_data, formatted_data)
+    
+    # NOVO: Extração melhorada de dados de forma
+    extract_form_data(api_data, formatted_data, home_team_name, away_team_name)
+    
+    # Calcular estatísticas derivadas
+    calculate_derived_stats(formatted_data["home_team"])
+    calculate_derived_stats(formatted_data["away_team"])
+    
+    logger.info(f"Extração de dados completa para {home_team_name} vs {away_team_name}")
+    return formatted_data
+
+
+def extract_complete_h2h_data(api_data, formatted_data, home_team_name, away_team_name):
+    """
+    Função abrangente para garantir que dados H2H sejam extraídos ou calculados.
+    Esta função garante que NUNCA teremos H2H zerado.
+    """
+    import logging
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    # 1. FASE 1: Tentar extrair dados H2H normalmente
+    extract_h2h_data(api_data, formatted_data)
+    
+    # Verificar se conseguimos extrair algo
+    h2h = formatted_data["h2h"]
+    has_basic_data = h2h.get("total_matches", 0) > 0
+    logger.info(f"Dados básicos H2H encontrados: {has_basic_data}")
+    
+    # Se já temos dados básicos, mas estatísticas zeradas, completar elas
+    if has_basic_data:
+        # Verificar se os campos estatísticos estão vazios
+        if h2h.get("avg_goals", 0) == 0 or h2h.get("over_2_5_pct", 0) == 0 or h2h.get("btts_pct", 0) == 0:
+            logger.info("Completando campos estatísticos H2H com base nos dados básicos...")
+            
+            # Obter estatísticas gerais dos times
+            home_team = formatted_data["home_team"]
+            away_team = formatted_data["away_team"]
+            
+            # 1. Média de gols - calcular se zero
+            if h2h.get("avg_goals", 0) == 0:
+                # Calcular com base nas médias dos times
+                home_goals_pg = home_team.get("goals_per_game", 1.4)
+                away_goals_pg = away_team.get("goals_per_game", 1.1)
+                # Ajuste para confronto direto (ligeiramente menor)
+                h2h["avg_goals"] = max(1.5, (home_goals_pg + away_goals_pg) * 0.8)
+                logger.info(f"H2H: Calculada média de gols = {h2h['avg_goals']}")
+            
+            # 2. Over 2.5 gols - calcular se zero
+            if h2h.get("over_2_5_pct", 0) == 0:
+                # Estimar baseado na média de gols
+                avg_goals = h2h.get("avg_goals", 2.5)
+                if avg_goals >= 2.7:
+                    h2h["over_2_5_pct"] = 65
+                elif avg_goals >= 2.2:
+                    h2h["over_2_5_pct"] = 50
+                else:
+                    h2h["over_2_5_pct"] = 40
+                logger.info(f"H2H: Calculado over 2.5 = {h2h['over_2_5_pct']}%")
+            
+            # 3. BTTS - calcular se zero
+            if h2h.get("btts_pct", 0) == 0:
+                # Estimar baseado na média de gols e equilíbrio de vitórias
+                balance = 1 - abs((h2h.get("home_wins", 0) - h2h.get("away_wins", 0)) / max(1, h2h.get("total_matches", 1)))
+                avg_goals = h2h.get("avg_goals", 2.5)
+                h2h["btts_pct"] = min(85, max(35, int(avg_goals * 20 * balance)))
+                logger.info(f"H2H: Calculado BTTS = {h2h['btts_pct']}%")
+            
+            # 4. Cartões - calcular se zero
+            if h2h.get("avg_cards", 0) == 0:
+                # Estimar baseado na rivalidade (deduzida pela quantidade de partidas)
+                rivalry = min(1, h2h.get("total_matches", 1) / 10)  # 0-1 escala
+                base_cards = 3.8  # média base
+                h2h["avg_cards"] = base_cards + (rivalry * 1.2)  # mais rivalidade = mais cartões
+                logger.info(f"H2H: Calculada média de cartões = {h2h['avg_cards']}")
+            
+            # 5. Escanteios - calcular se zero
+            if h2h.get("avg_corners", 0) == 0:
+                # Estimar baseado na média dos times
+                home_corners = home_team.get("corners_per_game", 10)
+                away_corners = away_team.get("corners_per_game", 9)
+                h2h["avg_corners"] = (home_corners + away_corners) / 2
+                logger.info(f"H2H: Calculada média de escanteios = {h2h['avg_corners']}")
+    
+    # Se ainda não temos dados suficientes, GERAR valores completos
+    if not has_basic_data:
+        # [o restante da função como já estava]
+        logger.warning("Dados H2H básicos não encontrados. Gerando dados sintéticos...")
+        
+        # Obter estatísticas de cada time para gerar valores H2H plausíveis
+        home_team = formatted_data["home_team"]
+        away_team = formatted_data["away_team"]
+        
+        # Total de partidas - com base no histórico dos times ou valor fixo
+        home_played = home_team.get("played", 0)
+        away_played = away_team.get("played", 0)
+        
+        # Se os times não têm histórico, usar valores padrão
+        if home_played == 0 and away_played == 0:
+            # Apenas estimar 2-4 partidas entre os times
+            estimated_matches = 3
+        else:
+            # Estimar quantas partidas eles jogaram entre si (10-20% do total)
+            estimated_matches = max(2, int((home_played + away_played) * 0.1))
+        
+        h2h["total_matches"] = estimated_matches
+        
+        # Distribuir vitórias com base na força relativa
+        home_win_pct = home_team.get("win_pct", 40)
+        away_win_pct = away_team.get("win_pct", 30)
+        
+        # Ajustar para vantagem de jogar em casa
+        if home_win_pct == 0 and away_win_pct == 0:
+            home_win_pct = 45  # Valores padrão se não tivermos dados
+            away_win_pct = 25
+            
+        # Calcular distribuição de resultados
+        total_str = home_win_pct + away_win_pct
+        home_ratio = home_win_pct / total_str if total_str > 0 else 0.6
+        away_ratio = away_win_pct / total_str if total_str > 0 else 0.4
+        
+        # Aplicar vantagem de casa (adicional de 10%)
+        home_ratio += 0.1
+        
+        # Normalizar para soma = 0.8 (deixando 0.2 para empates)
+        ratio_sum = home_ratio + away_ratio
+        home_ratio = (home_ratio / ratio_sum) * 0.8 if ratio_sum > 0 else 0.5
+        away_ratio = (away_ratio / ratio_sum) * 0.8 if ratio_sum > 0 else 0.3
+        draw_ratio = 1.0 - (home_ratio + away_ratio)
+        
+        # Calcular números de jogos
+        home_wins = int(estimated_matches * home_ratio)
+        away_wins = int(estimated_matches * away_ratio)
+        draws = estimated_matches - home_wins - away_wins
+        
+        # Armazenar valores
+        h2h["home_wins"] = home_wins
+        h2h["away_wins"] = away_wins
+        h2h["draws"] = draws
+        
+        # Gerar estatísticas derivadas
+        
+        # Média de gols
+        home_goals_pg = home_team.get("goals_per_game", 1.5)
+        away_goals_pg = away_team.get("goals_per_game", 1.2)
+        h2h_avg_goals = (home_goals_pg + away_goals_pg) * 0.8  # Jogos H2H tendem a ter menos gols
+        h2h["avg_goals"] = max(1.5, h2h_avg_goals)  # Garantir pelo menos 1.5 gols/jogo
+        
+        # Over 2.5
+        home_over25 = home_team.get("over_2_5_pct", 45)
+        away_over25 = away_team.get("over_2_5_pct", 40)
+        h2h_over25 = (home_over25 + away_over25) * 0.9 / 2  # Ajuste para H2H
+        h2h["over_2_5_pct"] = max(35, h2h_over25)  # Pelo menos 35%
+        
+        
+        # Cartões - jogos H2H tendem a ter mais cartões
+        home_cards = home_team.get("cards_per_game", 3.5)
+        away_cards = away_team.get("cards_per_game", 3.2)
+        h2h_cards = (home_cards + away_cards) * 1.2  # Aumento de 20% para H2H
+        h2h["avg_cards"] = max(3.5, h2h_cards)  # Pelo menos 3.5 cartões
+        
+        # Escanteios
+        home_corners = home_team.get("corners_per_game", 9.5)
+        away_corners = away_team.get("corners_per_game", 8.5)
+        h2h_corners = (home_corners + away_corners) / 2  # Média simples
+        h2h["avg_corners"] = max(8, h2h_corners)  # Pelo menos 8 escanteios
+        
+        logger.info(f"Gerados dados sintéticos H2H: {estimated_matches} partidas, " +
+                  f"{home_wins} vitórias casa, {away_wins} vitórias fora, {draws} empates")
+
+
+def find_previous_matches(api_data):
+    """
+    Busca arrays de partidas anteriores que possam ser usados para calcular estatísticas H2H
+    
+    Args:
+        api_data (dict): Dados originais da API
+        
+    Returns:
+        list: Lista de partidas encontradas ou lista vazia
+    """
+    import logging
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    # Função de busca recursiva
+    def search_for_matches(obj, path=""):
+        matches_arrays = []
+        
+        if isinstance(obj, dict):
+            # Verificar chaves que provavelmente contêm partidas anteriores
+            match_keys = ["previous_matches", "matches", "h2h_matches", "past_matches", "history"]
+            
+            for key in match_keys:
+                if key in obj and isinstance(obj[key], list) and len(obj[key]) > 0:
+                    # Verificar se parece um array de partidas
+                    if all(isinstance(m, dict) for m in obj[key]):
+                        # Verificar se contém campos típicos de partida
+                        sample = obj[key][0]
+                        has_match_fields = any(f in sample for f in [
+                            "home_team", "away_team", "score", "result", "date", "home_score", "away_score"
+                        ])
+                        
+                        if has_match_fields:
+                            matches_arrays.append((obj[key], f"{path}.{key}"))
+                            logger.info(f"Encontrado array de partidas em {path}.{key}")
+            
+            # Continuar busca em subchaves
+            for key, value in obj.items():
+                new_path = f"{path}.{key}" if path else key
+                matches_arrays.extend(search_for_matches(value, new_path))
+                
+        elif isinstance(obj, list):
+            # Verificar se a própria lista parece um array de partidas
+            if len(obj) > 0 and all(isinstance(m, dict) for m in obj):
+                sample = obj[0]
+                has_match_fields = any(f in sample for f in [
+                    "home_team", "away_team", "score", "result", "date", "home_score", "away_score"
+                ])
+                
+                if has_match_fields:
+                    matches_arrays.append((obj, path))
+                    logger.info(f"Encontrado array de partidas em {path}")
+            
+            # Continuar busca em cada item
+            for i, item in enumerate(obj):
+                new_path = f"{path}[{i}]"
+                matches_arrays.extend(search_for_matches(item, new_path))
+                
+        return matches_arrays
+    
+    # Buscar em todo o objeto
+    match_arrays = search_for_matches(api_data)
+    
+    # Retornar o primeiro array encontrado (geralmente o mais relevante)
+    if match_arrays:
+        logger.info(f"Encontrados {len(match_arrays)} arrays de partidas")
+        return match_arrays[0][0]  # Retorna o primeiro array
+    else:
+        logger.warning("Nenhum array de partidas encontrado")
+        return []
+
+
+def calculate_h2h_from_matches(matches, h2h_dict, home_team_name, away_team_name):
+    """
+    Calcula estatísticas H2H a partir de um array de partidas anteriores
+    
+    Args:
+        matches (list): Lista de partidas
+        h2h_dict (dict): Dicionário H2H para preencher
+        home_team_name (str): Nome do time da casa
+        away_team_name (str): Nome do time visitante
+    """
+    import logging
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    if not matches:
+        return
+    
+    # Inicializar contadores
+    total_matches = 0
+    home_wins = 0
+    away_wins = 0
+    draws = 0
+    total_goals = 0
+    over_2_5_count = 0
+    btts_count = 0
+    
+    # Processar cada partida
+    for match in matches:
+        # Verificar se contém os times que estamos analisando
+        contains_home_team = False
+        contains_away_team = False
+        
+        # Verificar vários formatos possíveis
+        if "home_team" in match and isinstance(match["home_team"], str):
+            if home_team_name.lower() in match["home_team"].lower() or match["home_team"].lower() in home_team_name.lower():
+                contains_home_team = True
+            elif away_team_name.lower() in match["home_team"].lower() or match["home_team"].lower() in away_team_name.lower():
+                contains_away_team = True
+                
+        if "away_team" in match and isinstance(match["away_team"], str):
+            if home_team_name.lower() in match["away_team"].lower() or match["away_team"].lower() in home_team_name.lower():
+                contains_home_team = True
+            elif away_team_name.lower() in match["away_team"].lower() or match["away_team"].lower() in away_team_name.lower():
+                contains_away_team = True
+        
+        # Verificar se a partida é entre os times que estamos analisando
+        if contains_home_team and contains_away_team:
+            total_matches += 1
+            
+            # Tentar determinar o resultado
+            home_score = None
+            away_score = None
+            
+            # Buscar resultado em vários formatos
+            if "score" in match and isinstance(match["score"], str):
+                # Formato "2-1"
+                score_parts = match["score"].split("-")
+                if len(score_parts) == 2:
+                    try:
+                        home_score = int(score_parts[0].strip())
+                        away_score = int(score_parts[1].strip())
+                    except ValueError:
+                        pass
+            
+            # Buscar em outros campos
+            if home_score is None and "home_score" in match:
+                try:
+                    home_score = int(match["home_score"])
+                except ValueError:
+                    pass
+                    
+            if away_score is None and "away_score" in match:
+                try:
+                    away_score = int(match["away_score"])
+                except ValueError:
+                    pass
+            
+            # Verificar se temos um resultado válido
+            if home_score is not None and away_score is not None:
+                # Determinar vencedor
+                if home_score > away_score:
+                    # Verificar qual time estava em casa nesta partida
+                    if "home_team" in match and home_team_name.lower() in match["home_team"].lower():
+                        home_wins += 1
+                    else:
+                        away_wins += 1
+                elif away_score > home_score:
+                    if "home_team" in match and away_team_name.lower() in match["home_team"].lower():
+                        away_wins += 1
+                    else:
+                        home_wins += 1
+                else:
+                    draws += 1
+                
+                # Calcular gols
+                total_goals += home_score + away_score
+                
+                # Verificar over 2.5
+                if home_score + away_score > 2.5:
+                    over_2_5_count += 1
+                
+                # Verificar ambos marcam
+                if home_score > 0 and away_score > 0:
+                    btts_count += 1
+    
+    # Preencher o dicionário H2H se tivermos partidas válidas
+    if total_matches > 0:
+        h2h_dict["total_matches"] = total_matches
+        h2h_dict["home_wins"] = home_wins
+        h2h_dict["away_wins"] = away_wins
+        h2h_dict["draws"] = draws
+        h2h_dict["avg_goals"] = total_goals / total_matches
+        h2h_dict["over_2_5_pct"] = (over_2_5_count / total_matches) * 100
+        h2h_dict["btts_pct"] = (btts_count / total_matches) * 100
+        
+        logger.info(f"Calculadas estatísticas H2H a partir de {total_matches} partidas anteriores")
@@ -0,0 +1,349 @@
+"""
+Busca de estatísticas em qualquer ponto da estrutura da API.
+"""
+import logging
+
+from utils.prompt_adapter.common import count_non_zero_fields, extract_h2h_data
+
+logger = logging.getLogger("valueHunter.prompt_adapter")
+
+
+def extract_from_anywhere(api_data, result, home_team_name, away_team_name):
+    """Busca estatísticas em qualquer lugar da estrutura de dados"""
+    # Importações necessárias
+    import logging
+    logger = logging.getLogger("valueHunter.api_adapter")
+    
+    logger.info("Executando busca agressiva de estatísticas em toda a estrutura de dados")
+    
+    # Função para buscar estatísticas recursivamente
+    def search_stats(obj, path="", home_stats=None, away_stats=None):
+        if home_stats is None:
+            home_stats = {}
+        if away_stats is None:
+            away_stats = {}
+            
+        if isinstance(obj, dict):
+            # Verificar se este objeto pode conter estatísticas de um time
+            has_stats = False
+            for key in ["played", "matches_played", "wins", "goals_scored", "xg"]:
+                if key in obj:
+                    has_stats = True
+                    break
+            
+            if has_stats:
+                # Tentar determinar a qual time pertencem estas estatísticas
+                is_home = False
+                is_away = False
+                
+                # Verificar pelo nome do time
+                if "name" in obj and isinstance(obj["name"], str):
+                    if obj["name"] == home_team_name or home_team_name in obj["name"]:
+                        is_home = True
+                    elif obj["name"] == away_team_name or away_team_name in obj["name"]:
+                        is_away = True
+                
+                # Verificar pelo caminho
+                if not (is_home or is_away):
+                    if "home" in path.lower():
+                        is_home = True
+                    elif "away" in path.lower() or "visit" in path.lower():
+                        is_away = True
+                
+                # Se determinamos o time, extrair estatísticas
+                if is_home:
+                    logger.info(f"Encontradas possíveis estatísticas do time da casa em {path}")
+                    extract_stats_from_dict(obj, home_stats)
+                elif is_away:
+                    logger.info(f"Encontradas possíveis estatísticas do time visitante em {path}")
+                    extract_stats_from_dict(obj, away_stats)
+                else:
+                    # Se não conseguimos determinar, mas parece estatística, fazer log
+                    logger.info(f"Encontrado objeto com possíveis estatísticas (time indeterminado) em {path}")
+            
+            # Continuando a busca em todas as chaves
+            for k, v in obj.items():
+                new_path = f"{path}.{k}" if path else k
+                search_stats(v, new_path, home_stats, away_stats)
+                
+        elif isinstance(obj, list):
+            # Buscar em listas também
+            for i, item in enumerate(obj):
+                new_path = f"{path}[{i}]"
+                search_stats(item, new_path, home_stats, away_stats)
+        
+        return home_stats, away_stats
+    
+    # Executar busca
+    home_found, away_found = search_stats(api_data)
+    
+    # Verificar se encontramos algo útil
+    home_found_count = count_non_zero_fields(home_found)
+    away_found_count = count_non_zero_fields(away_found)
+    
+    logger.info(f"Busca agressiva encontrou: {home_found_count} campos para casa, {away_found_count} para visitante")
+    
+    # Atualizar apenas se encontramos mais dados do que já temos
+    current_home_count = count_non_zero_fields(result["home_team"])
+    current_away_count = count_non_zero_fields(result["away_team"])
+    
+    if home_found_count > current_home_count:
+        # Mesclar com dados existentes, sem substituir valores não-zero
+        for k, v in home_found.items():
+            if k not in result["home_team"] or result["home_team"][k] == 0:
+                result["home_team"][k] = v
+        logger.info(f"Atualizados {home_found_count} campos para o time da casa")
+    
+    if away_found_count > current_away_count:
+        # Mesclar com dados existentes, sem substituir valores não-zero
+        for k, v in away_found.items():
+            if k not in result["away_team"] or result["away_team"][k] == 0:
+                result["away_team"][k] = v
+        logger.info(f"Atualizados {away_found_count} campos para o time visitante")
+
+
+def extract_stats_from_dict(source_dict, target_dict):
+    """Extrai estatísticas de um dicionário para outro usando mapeamento de campos"""
+    if not isinstance(source_dict, dict):
+        return
+    
+    # Mapeamento de campos comuns
+    field_mapping = {
+        "played": ["played", "matches_played", "games_played", "MP", "PJ", "matches"],
+        "wins": ["wins", "W", "team_wins", "won"],
+        "draws": ["draws", "D", "team_draws"],
+        "losses": ["losses", "L", "defeats", "lost"],
+        "goals_scored": ["goals_scored", "goals_for", "scored", "GF", "goals"],
+        "goals_conceded": ["goals_conceded", "goals_against", "conceded", "GA"],
+        "xg": ["xg", "xG", "expected_goals"],
+        "xga": ["xga", "xGA", "expected_goals_against"],
+        "possession": ["possession", "possessionAVG", "avg_possession", "posesion"],
+        "clean_sheets_pct": ["clean_sheets_pct", "clean_sheet_percentage", "cs_pct"],
+        "btts_pct": ["btts_pct", "btts_percentage", "both_teams_scored_pct"],
+        "over_2_5_pct": ["over_2_5_pct", "over_2_5_percentage", "o25_pct"],
+        "yellow_cards": ["yellow_cards", "yellows", "cards_yellow"],
+        "red_cards": ["red_cards", "reds", "cards_red"]
+    }
+    
+    # Extrair cada campo
+    for target_field, source_fields in field_mapping.items():
+        for field in source_fields:
+            if field in source_dict:
+                value = source_dict[field]
+                try:
+                    if value is not None and value != 'N/A':
+                        float_val = float(value)
+                        if float_val != 0:  # Ignorar valores zero
+                            target_dict[target_field] = float_val
+                            break
+                except (ValueError, TypeError):
+                    pass
+
+
+def extract_h2h_from_anywhere(api_data, result):
+    """Busca dados de H2H em qualquer lugar da estrutura"""
+    # Importações necessárias
+    import logging
+    logger = logging.getLogger("valueHunter.api_adapter")
+    
+    # Primeiro, procurar estruturas específicas de H2H
+    h2h_objects = []
+    
+    def find_h2h_objects(obj, path=""):
+        if isinstance(obj, dict):
+            # Verificar se parece ser um objeto H2H
+            is_h2h = False
+            h2h_indicators = ["h2h", "head_to_head", "previous_matches", "confrontos"]
+            
+            # Verificar pelo nome da chave
+            for indicator in h2h_indicators:
+                if indicator in path.lower():
+                    is_h2h = True
+                    break
+            
+            # Verificar pelo conteúdo típico de H2H
+            if not is_h2h:
+                h2h_fields = ["total_matches", "home_wins", "away_wins", "draws"]
+                field_count = sum(1 for field in h2h_fields if field in obj)
+                if field_count >= 2:  # Se tem pelo menos 2 campos típicos de H2H
+                    is_h2h = True
+            
+            if is_h2h:
+                logger.info(f"Possível objeto H2H encontrado em {path}")
+                h2h_objects.append(obj)
+            
+            # Continuar buscando recursivamente
+            for k, v in obj.items():
+                new_path = f"{path}.{k}" if path else k
+                find_h2h_objects(v, new_path)
+                
+        elif isinstance(obj, list):
+            # Buscar em listas também
+            for i, item in enumerate(obj):
+                new_path = f"{path}[{i}]"
+                find_h2h_objects(item, new_path)
+    
+    # Iniciar busca
+    find_h2h_objects(api_data)
+    
+    # Processar objetos H2H encontrados
+    for h2h_obj in h2h_objects:
+        extract_h2h_data(h2h_obj, result["h2h"])
+    
+    # Log dos resultados
+    h2h_fields = count_non_zero_fields(result["h2h"])
+    logger.info(f"Extraídos {h2h_fields} campos de H2H após busca completa")
+
+
+def ensure_complete_stats(result, home_team_name, away_team_name):
+    """Garante que temos um conjunto mínimo de estatísticas para análise"""
+    import random  # Adicionar importação para randomização
+    import logging
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    home_team = result["home_team"]
+    away_team = result["away_team"]
+    h2h = result["h2h"]
+    
+    # Preencher campos de jogos disputados se missing
+    if home_team.get("played", 0) == 0:
+        # Tentar inferir de wins + draws + losses
+        played = home_team.get("wins", 0) + home_team.get("draws", 0) + home_team.get("losses", 0)
+        if played > 0:
+            home_team["played"] = played
+            logger.info(f"Calculado played={played} para time da casa")
+    
+    if away_team.get("played", 0) == 0:
+        # Tentar inferir de wins + draws + losses
+        played = away_team.get("wins", 0) + away_team.get("draws", 0) + away_team.get("losses", 0)
+        if played > 0:
+            away_team["played"] = played
+            logger.info(f"Calculado played={played} para time visitante")
+    
+    # Se h2h total_matches está faltando, tentar inferir
+    if h2h.get("total_matches", 0) == 0:
+        total = h2h.get("home_wins", 0) + h2h.get("away_wins", 0) + h2h.get("draws", 0)
+        if total > 0:
+            h2h["total_matches"] = total
+            logger.info(f"Calculado total_matches={total} para H2H")
+    
+    # Garantir que temos pelo menos um histórico recente (mesmo que genérico)
+    # Para permitir análise de tendências
+    if "form" not in home_team or home_team["form"] == "?????":
+        # Criar um histórico baseado nas tendências gerais
+        wins_pct = home_team.get("win_pct", 0) if "win_pct" in home_team else (home_team.get("wins", 0) / max(1, home_team.get("played", 1))) * 100
+        draws_pct = home_team.get("draw_pct", 0) if "draw_pct" in home_team else (home_team.get("draws", 0) / max(1, home_team.get("played", 1))) * 100
+        losses_pct = home_team.get("loss_pct", 0) if "loss_pct" in home_team else (home_team.get("losses", 0) / max(1, home_team.get("played", 1))) * 100
+        
+        # Normalizar para suma 100%
+        total = wins_pct + draws_pct + losses_pct
+        if total > 0:
+            wins_pct = (wins_pct / total) * 100
+            draws_pct = (draws_pct / total) * 100
+            losses_pct = (losses_pct / total) * 100
+        
+        form = ""
+        logger.info(f"Gerando forma sintética para {home_team_name}: W={wins_pct:.1f}%, D={draws_pct:.1f}%, L={losses_pct:.1f}%")
+        
+        for _ in range(5):
+            # Usar distribuição real baseada nas estatísticas com randomização
+            r = random.random() * 100  # Valor entre 0 e 100
+            if r < wins_pct:
+                form += "W"
+            elif r < (wins_pct + draws_pct):
+                form += "D"
+            else:
+                form += "L"
+        
+        home_team["form"] = form
+        logger.info(f"Forma gerada para {home_team_name}: {form}")
+    
+    # Mesmo para o time visitante (usando randomização adequada)
+    if "form" not in away_team or away_team["form"] == "?????":
+        wins_pct = away_team.get("win_pct", 0) if "win_pct" in away_team else (away_team.get("wins", 0) / max(1, away_team.get("played", 1))) * 100
+        draws_pct = away_team.get("draw_pct", 0) if "draw_pct" in away_team else (away_team.get("draws", 0) / max(1, away_team.get("played", 1))) * 100
+        losses_pct = away_team.get("loss_pct", 0) if "loss_pct" in away_team else (away_team.get("losses", 0) / max(1, away_team.get("played", 1))) * 100
+        
+        # Normalizar para suma 100%
+        total = wins_pct + draws_pct + losses_pct
+        if total > 0:
+            wins_pct = (wins_pct / total) * 100
+            draws_pct = (draws_pct / total) * 100
+            losses_pct = (losses_pct / total) * 100
+        
+        form = ""
+        logger.info(f"Gerando forma sintética para {away_team_name}: W={wins_pct:.1f}%, D={draws_pct:.1f}%, L={losses_pct:.1f}%")
+        
+        for _ in range(5):
+            # Usar distribuição real baseada nas estatísticas com randomização
+            r = random.random() * 100  # Valor entre 0 e 100
+            if r < wins_pct:
+                form += "W" 
+            elif r < (wins_pct + draws_pct):
+                form += "D"
+            else:
+                form += "L"
+        
+        away_team["form"] = form
+        logger.info(f"Forma gerada para {away_team_name}: {form}")
+    
+    # Calcular win/draw/loss percentages se temos jogos disputados
+    home_played = home_team.get("played", 0)
+    if home_played > 0:
+        if "wins" in home_team and "win_pct" not in home_team:
+            home_team["win_pct"] = round((home_team["wins"] / home_played) * 100, 1)
+            
+        if "draws" in home_team and "draw_pct" not in home_team:
+            home_team["draw_pct"] = round((home_team["draws"] / home_played) * 100, 1)
+            
+        if "losses" in home_team and "loss_pct" not in home_team:
+            home_team["loss_pct"] = round((home_team["losses"] / home_played) * 100, 1)
+            
+        # Calcular médias por jogo
+        if "goals_scored" in home_team and "goals_per_game" not in home_team:
+            home_team["goals_per_game"] = round(home_team["goals_scored"] / home_played, 2)
+            
+        if "goals_conceded" in home_team and "conceded_per_game" not in home_team:
+            home_team["conceded_per_game"] = round(home_team["goals_conceded"] / home_played, 2)
+    
+    # Mesmos cálculos para time visitante
+    away_played = away_team.get("played", 0)
+    if away_played > 0:
+        if "wins" in away_team and "win_pct" not in away_team:
+            away_team["win_pct"] = round((away_team["wins"] / away_played) * 100, 1)
+            
+        if "draws" in away_team and "draw_pct" not in away_team:
+            away_team["draw_pct"] = round((away_team["draws"] / away_played) * 100, 1)
+            
+        if "losses" in away_team and "loss_pct" not in away_team:
+            away_team["loss_pct"] = round((away_team["losses"] / away_played) * 100, 1)
+            
+        if "goals_scored" in away_team and "goals_per_game" not in away_team:
+            away_team["goals_per_game"] = round(away_team["goals_scored"] / away_played, 2)
+            
+        if "goals_conceded" in away_team and "conceded_per_game" not in away_team:
+            away_team["conceded_per_game"] = round(away_team["goals_conceded"] / away_played, 2)
+    
+    # Cartões
+    for team in [home_team, away_team]:
+        yellow = team.get("yellow_cards", 0)
+        red = team.get("red_cards", 0)
+        played = team.get("played", 0)
+        
+        if "cards_total" not in team and (yellow > 0 or red > 0):
+            team["cards_total"] = yellow + red
+            
+        if "cards_per_game" not in team and played > 0 and team.get("cards_total", 0) > 0:
+            team["cards_per_game"] = round(team["cards_total"] / played, 2)
+    
+    # Escanteios
+    for team in [home_team, away_team]:
+        corners_for = team.get("corners_for", 0)
+        corners_against = team.get("corners_against", 0)
+        played = team.get("played", 0)
+        
+        if "corners_total" not in team and (corners_for > 0 or corners_against > 0):
+            team["corners_total"] = corners_for + corners_against
+            
+        if "corners_per_game" not in team and played > 0 and team.get("corners_total", 0) > 0:
+            team["corners_per_game"] = round(team["corners_total"] / played, 2)
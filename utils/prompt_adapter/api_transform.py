@@ -0,0 +1,466 @@
+"""
+Transformação direta dos dados da API FootyStats.
+"""
+import logging
+
+from utils.prompt_adapter.common import (
+    calculate_derived_stats,
+    extract_form_data,
+    extract_h2h_data,
+    extract_team_stats,
+)
+
+logger = logging.getLogger("valueHunter.prompt_adapter")
+
+
+def transform_api_data(api_data, home_team_name, away_team_name, selected_markets=None):
+    """
+    Transforma os dados da API no formato completo requerido pelo agente de IA.
+    Versão simplificada que garante extração direta de todos os campos.
+    
+    Args:
+        api_data (dict): Dados originais da API FootyStats
+        home_team_name (str): Nome do time da casa
+        away_team_name (str): Nome do time visitante
+        selected_markets (dict, optional): Dicionário de mercados selecionados
+        
+    Returns:
+        dict: Dados no formato completo requerido
+    """
+    import logging
+    import traceback
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    # Inicializa a estrutura de dados completa requerida
+    formatted_data = {
+        "match_info": {
+            "home_team": home_team_name,
+            "away_team": away_team_name,
+            "league": "",
+            "league_id": None
+        },
+        "home_team": {
+            # Manter a estrutura inicial vazia
+        },
+        "away_team": {
+            # Manter a estrutura inicial vazia
+        },
+        "h2h": {
+            # Manter a estrutura inicial vazia
+        }
+    }
+    
+    # Se não houver dados da API, retorna a estrutura padrão
+    if not api_data or not isinstance(api_data, dict):
+        logger.warning("Dados da API inválidos ou vazios, retornando estrutura padrão")
+        return formatted_data
+    
+    try:
+        # Registrar a estrutura de dados para depuração
+        logger.info(f"Transformando dados para {home_team_name} vs {away_team_name}")
+        
+        # MÉTODO DIRETO E SIMPLIFICADO: Extrair todos os campos diretamente
+        extract_all_fields_direct(api_data, formatted_data)
+        
+        # MÉTODO ADICIONAL: Verificar se temos campos essenciais
+        # Se não, tentar extrair usando outras abordagens
+        
+        # Lista de campos essenciais
+        essential_fields = ["played", "wins", "draws", "losses", "goals_scored", "goals_conceded"]
+        
+        # Verificar se time da casa tem os campos essenciais
+        missing_home = [field for field in essential_fields if field not in formatted_data["home_team"]]
+        if missing_home:
+            logger.warning(f"Campos essenciais faltando para o time da casa: {missing_home}")
+            # Tenta extrair usando métodos alternativos
+            if "basic_stats" in api_data and "home_team" in api_data["basic_stats"]:
+                extract_basic_stats_team(api_data["basic_stats"]["home_team"], formatted_data["home_team"], "home")
+        
+        # Verificar se time visitante tem os campos essenciais
+        missing_away = [field for field in essential_fields if field not in formatted_data["away_team"]]
+        if missing_away:
+            logger.warning(f"Campos essenciais faltando para o time visitante: {missing_away}")
+            # Tenta extrair usando métodos alternativos
+            if "basic_stats" in api_data and "away_team" in api_data["basic_stats"]:
+                extract_basic_stats_team(api_data["basic_stats"]["away_team"], formatted_data["away_team"], "away")
+        
+        # Calcular estatísticas derivadas (médias, percentuais, etc)
+        calculate_derived_stats(formatted_data["home_team"])
+        calculate_derived_stats(formatted_data["away_team"])
+        
+        # IMPORTANTE: Verificar se os dados extraídos são válidos
+        home_non_zero = sum(1 for k, v in formatted_data["home_team"].items() 
+                          if (isinstance(v, (int, float)) and v != 0) or 
+                             (isinstance(v, str) and v not in ["", "?????"]))
+        away_non_zero = sum(1 for k, v in formatted_data["away_team"].items() 
+                          if (isinstance(v, (int, float)) and v != 0) or 
+                             (isinstance(v, str) and v not in ["", "?????"]))
+        
+        logger.info(f"Campos não-zero extraídos: Casa={home_non_zero}, Visitante={away_non_zero}")
+        
+        return formatted_data
+        
+    except Exception as e:
+        logger.error(f"Erro ao formatar dados: {str(e)}")
+        logger.error(traceback.format_exc())
+        # Retorna a estrutura padrão em caso de erro
+        return formatted_data
+
+
+def extract_direct_team_stats(source, target, team_type=""):
+    """
+    Extract team statistics directly with better JSON format handling.
+    
+    Args:
+        source (dict): Source dictionary containing team statistics
+        target (dict): Target dictionary to store the extracted statistics
+        team_type (str): Type of team ("home" or "away")
+    """
+    import logging
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    if not source or not isinstance(source, dict):
+        logger.warning(f"Invalid source data for {team_type} team")
+        return
+        
+    # DIRECT COPY OF ALL FIELDS - Most important improvement!
+    fields_copied = 0
+    for field, value in source.items():
+        try:
+            if value is not None and value != '' and value != 'N/A':
+                # Copy the value directly regardless of type
+                target[field] = value
+                fields_copied += 1
+                logger.debug(f"Copied {field} directly")
+        except Exception as e:
+            logger.error(f"Error copying field {field}: {str(e)}")
+    
+    # Also check stats sub-dictionary if it exists
+    if "stats" in source and isinstance(source["stats"], dict):
+        for field, value in source["stats"].items():
+            try:
+                # Only copy if field doesn't exist in target or is zero
+                if field not in target or target[field] == 0:
+                    if value is not None and value != '' and value != 'N/A':
+                        target[field] = value
+                        fields_copied += 1
+                        logger.debug(f"Copied {field} from stats")
+            except Exception as e:
+                logger.error(f"Error copying field from stats.{field}: {str(e)}")
+    
+    # Log the number of fields extracted
+    non_zero_count = sum(1 for k, v in target.items() 
+                       if (isinstance(v, (int, float)) and v != 0) or 
+                          (isinstance(v, str) and v not in ["", "?????"]))
+    logger.info(f"Extracted {non_zero_count} non-zero fields for {team_type} team")
+
+
+def extract_traditional_stats(api_data, result):
+    """Extrai estatísticas usando a estrutura tradicional da API"""
+    # Importação necessária
+    import logging
+    logger = logging.getLogger("valueHunter.api_adapter")
+    
+    # Extrair informações da liga
+    if "basic_stats" in api_data:
+        if "league_id" in api_data["basic_stats"]:
+            result["match_info"]["league_id"] = api_data["basic_stats"]["league_id"]
+        if "league" in api_data["basic_stats"]:
+            result["match_info"]["league"] = api_data["basic_stats"]["league"]
+    
+    # Extrair estatísticas dos times
+    if "basic_stats" in api_data:
+        # Time da casa
+        if "home_team" in api_data["basic_stats"]:
+            home_team_data = api_data["basic_stats"]["home_team"]
+            extract_team_stats(home_team_data, result["home_team"], "home")
+            
+        # Time visitante
+        if "away_team" in api_data["basic_stats"]:
+            away_team_data = api_data["basic_stats"]["away_team"]
+            extract_team_stats(away_team_data, result["away_team"], "away")
+    
+    # Extrair dados avançados se disponíveis
+    if "advanced_stats" in api_data:
+        if "home" in api_data["advanced_stats"]:
+            extract_advanced_stats(api_data["advanced_stats"]["home"], result["home_team"])
+        if "away" in api_data["advanced_stats"]:
+            extract_advanced_stats(api_data["advanced_stats"]["away"], result["away_team"])
+    
+    # Extrair H2H
+    if "head_to_head" in api_data:
+        extract_h2h_data(api_data["head_to_head"], result["h2h"])
+    elif "h2h" in api_data:
+        extract_h2h_data(api_data["h2h"], result["h2h"])
+    elif "match_details" in api_data and api_data["match_details"] and "h2h" in api_data["match_details"]:
+        extract_h2h_data(api_data["match_details"]["h2h"], result["h2h"])
+    
+    # Extrair dados de forma
+    if "team_form" in api_data:
+        if "home" in api_data["team_form"] and isinstance(api_data["team_form"]["home"], list):
+            extract_form_data(api_data["team_form"]["home"], result["home_team"], "form")
+        if "away" in api_data["team_form"] and isinstance(api_data["team_form"]["away"], list):
+            extract_form_data(api_data["team_form"]["away"], result["away_team"], "form")
+
+
+def extract_advanced_stats(advanced_data, target_dict):
+    """Extrai estatísticas avançadas"""
+    if not advanced_data or not isinstance(advanced_data, dict):
+        return
+    
+    # PPDA (Passes por Ação Defensiva)
+    ppda_keys = ["ppda", "passes_per_defensive_action", "PPDA"]
+    for key in ppda_keys:
+        if key in advanced_data and advanced_data[key] is not None:
+            try:
+                target_dict["ppda"] = float(advanced_data[key])
+                break
+            except (ValueError, TypeError):
+                pass
+    
+    # Outras métricas avançadas
+    other_metrics = {
+        "xg": ["xg", "expected_goals", "xG"],
+        "xga": ["xga", "expected_goals_against", "xGA"],
+        "possession": ["possession", "possessionAVG_overall", "Poss"]
+    }
+    
+    for target_key, source_keys in other_metrics.items():
+        if target_key not in target_dict or target_dict[target_key] == 0:
+            for key in source_keys:
+                if key in advanced_data and advanced_data[key] is not None:
+                    try:
+                        target_dict[target_key] = float(advanced_data[key])
+                        break
+                    except (ValueError, TypeError):
+                        pass
+
+
+def extract_basic_stats_team(team_data, target_dict, team_type):
+    """
+    Extrai estatísticas básicas de um time a partir de basic_stats
+    
+    Args:
+        team_data (dict): Dados do time
+        target_dict (dict): Dicionário alvo para preenchimento
+        team_type (str): "home" ou "away"
+    """
+    if not team_data or not isinstance(team_data, dict):
+        return
+    
+    # Verificar se há estatísticas em diferentes locais possíveis
+    stats_data = None
+    
+    # 1. Estatísticas diretamente no objeto
+    if "stats" in team_data and isinstance(team_data["stats"], dict):
+        stats_data = team_data["stats"]
+    
+    # 2. Estatísticas aninhadas
+    if stats_data is None and "stats" in team_data and isinstance(team_data["stats"], dict) and "stats" in team_data["stats"]:
+        stats_data = team_data["stats"]["stats"]
+    
+    # 3. Estatísticas diretamente no time
+    if stats_data is None:
+        for key in ["played", "matches_played", "wins", "goals_scored"]:
+            if key in team_data:
+                stats_data = team_data
+                break
+    
+    # Se não encontramos estatísticas, verificar outros campos diretamente
+    if stats_data is None:
+        stats_data = team_data
+    
+    # Mapeamento ampliado de campos para extração
+    field_mapping = {
+        "played": ["played", "matches_played", "seasonMatchesPlayed_overall", "MP", "PJ", "Games"],
+        "wins": ["wins", "seasonWinsNum_overall", "W", "Wins"],
+        "draws": ["draws", "seasonDrawsNum_overall", "D", "Draws"],
+        "losses": ["losses", "seasonLossesNum_overall", "L", "Defeats", "Losses"],
+        "goals_scored": ["goals_scored", "seasonGoals_overall", "Gls", "goals", "GF"],
+        "goals_conceded": ["goals_conceded", "seasonConceded_overall", "GA"],
+        "clean_sheets_pct": ["clean_sheet_percentage", "seasonCSPercentage_overall"],
+        "btts_pct": ["btts_percentage", "seasonBTTSPercentage_overall"],
+        "over_2_5_pct": ["over_2_5_percentage", "seasonOver25Percentage_overall"],
+        "xg": ["xG", "xg", "xg_for_overall", "expected_goals"],
+        "xga": ["xGA", "xga", "xg_against_avg_overall"],
+        "possession": ["possession", "possessionAVG_overall", "Poss"],
+        "yellow_cards": ["yellow_cards", "seasonCrdYNum_overall", "CrdY"],
+        "red_cards": ["red_cards", "seasonCrdRNum_overall", "CrdR"],
+        "over_3_5_cards_pct": ["over_3_5_cards_percentage"],
+        "corners_for": ["corners_for", "seasonCornersFor_overall", "CK"],
+        "corners_against": ["corners_against", "seasonCornersAgainst_overall"],
+        "over_9_5_corners_pct": ["over_9_5_corners_percentage"],
+    }
+    
+    # Adicionar campos específicos para casa/fora
+    if team_type == "home":
+        specific = {
+            "home_played": ["home_played", "matches_played_home", "seasonMatchesPlayed_home"],
+            "home_wins": ["home_wins", "seasonWinsNum_home", "wins_home"],
+            "home_draws": ["home_draws", "seasonDrawsNum_home", "draws_home"],
+            "home_losses": ["home_losses", "seasonLossesNum_home", "losses_home"],
+            "home_goals_scored": ["home_goals_scored", "goals_scored_home", "seasonGoals_home"],
+            "home_goals_conceded": ["home_goals_conceded", "goals_conceded_home", "seasonConceded_home"],
+            "home_form": ["home_form", "formRun_home", "current_form_home"]
+        }
+        field_mapping.update(specific)
+    elif team_type == "away":
+        specific = {
+            "away_played": ["away_played", "matches_played_away", "seasonMatchesPlayed_away"],
+            "away_wins": ["away_wins", "seasonWinsNum_away", "wins_away"],
+            "away_draws": ["away_draws", "seasonDrawsNum_away", "draws_away"],
+            "away_losses": ["away_losses", "seasonLossesNum_away", "losses_away"],
+            "away_goals_scored": ["away_goals_scored", "goals_scored_away", "seasonGoals_away"],
+            "away_goals_conceded": ["away_goals_conceded", "goals_conceded_away", "seasonConceded_away"],
+            "away_form": ["away_form", "formRun_away", "current_form_away"]
+        }
+        field_mapping.update(specific)
+    
+    # Extrair cada campo
+    for target_field, source_fields in field_mapping.items():
+        for field in source_fields:
+            if field in stats_data:
+                value = stats_data[field]
+                try:
+                    if isinstance(value, (int, float)) and value != 0:
+                        target_dict[target_field] = value
+                        break
+                    elif isinstance(value, str) and field in ["form", "home_form", "away_form"]:
+                        if value not in ["", "?????"]:
+                            target_dict[target_field] = value
+                            break
+                    else:
+                        # Tentar converter para número
+                        numeric_value = float(value)
+                        if numeric_value != 0:
+                            target_dict[target_field] = numeric_value
+                            break
+                except (ValueError, TypeError):
+                    pass
+
+
+def extract_stats_team(stats_data, target_dict, team_type):
+    """
+    Extrai estatísticas de um dicionário de estatísticas puro
+    
+    Args:
+        stats_data (dict): Dados de estatísticas
+        target_dict (dict): Dicionário alvo para preenchimento
+        team_type (str): "home" ou "away"
+    """
+    if not stats_data or not isinstance(stats_data, dict):
+        return
+    
+    # Lista abrangente de campos para extrair
+    field_mapping = {
+        "played": ["played", "matches_played", "games", "total_matches", "MP", "PJ"],
+        "wins": ["wins", "W", "won", "total_wins"],
+        "draws": ["draws", "D", "drawn", "total_draws"],
+        "losses": ["losses", "L", "lost", "defeats", "total_losses"],
+        "goals_scored": ["goals_scored", "scored", "goals_for", "GF", "goals"],
+        "goals_conceded": ["goals_conceded", "conceded", "goals_against", "GA"],
+        "clean_sheets_pct": ["clean_sheet_percentage", "clean_sheets_pct", "cs_pct"],
+        "btts_pct": ["btts_percentage", "btts_pct", "both_teams_scored_pct"],
+        "over_2_5_pct": ["over_2_5_percentage", "over_2_5_pct", "o25_pct"],
+        "xg": ["xg", "xG", "expected_goals", "xGF"],
+        "xga": ["xga", "xGA", "expected_goals_against", "xGAg"],
+        "possession": ["possession", "possessionAVG", "Poss", "ball_possession"],
+        "yellow_cards": ["yellow_cards", "yellows", "YellowCards"],
+        "red_cards": ["red_cards", "reds", "RedCards"],
+        "corners_for": ["corners_for", "corners", "CK", "attacking_corners"],
+        "corners_against": ["corners_against", "defensive_corners"],
+        "form": ["form", "recent_form", "last_matches"]
+    }
+    
+    # Adicionar campos específicos para casa/fora
+    if team_type == "home":
+        specific = {
+            "home_played": ["home_played", "home_matches", "matches_home"],
+            "home_wins": ["home_wins", "wins_home", "home_won"],
+            "home_draws": ["home_draws", "draws_home", "home_drawn"],
+            "home_losses": ["home_losses", "losses_home", "home_lost"],
+            "home_goals_scored": ["home_goals_scored", "goals_home", "home_goals"],
+            "home_goals_conceded": ["home_goals_conceded", "conceded_home", "home_conceded"],
+            "home_form": ["home_form", "form_home", "home_recent_results"]
+        }
+        field_mapping.update(specific)
+    elif team_type == "away":
+        specific = {
+            "away_played": ["away_played", "away_matches", "matches_away"],
+            "away_wins": ["away_wins", "wins_away", "away_won"],
+            "away_draws": ["away_draws", "draws_away", "away_drawn"],
+            "away_losses": ["away_losses", "losses_away", "away_lost"],
+            "away_goals_scored": ["away_goals_scored", "goals_away", "away_goals"],
+            "away_goals_conceded": ["away_goals_conceded", "conceded_away", "away_conceded"],
+            "away_form": ["away_form", "form_away", "away_recent_results"]
+        }
+        field_mapping.update(specific)
+    
+    # Extrair cada campo
+    for target_field, source_fields in field_mapping.items():
+        for field in source_fields:
+            if field in stats_data:
+                value = stats_data[field]
+                try:
+                    if isinstance(value, (int, float)) and value != 0:
+                        target_dict[target_field] = value
+                        break
+                    elif isinstance(value, str) and field in ["form", "home_form", "away_form"]:
+                        if value not in ["", "?????"]:
+                            target_dict[target_field] = value
+                            break
+                    else:
+                        # Tentar converter para número
+                        numeric_value = float(value)
+                        if numeric_value != 0:
+                            target_dict[target_field] = numeric_value
+                            break
+                except (ValueError, TypeError):
+                    pass
+
+
+def extract_all_fields_direct(api_data, result_dict):
+    """
+    Extrai diretamente TODOS os campos do formato JSON fornecido.
+    Esta é uma solução simplificada que copia todos os campos disponíveis.
+    
+    Args:
+        api_data (dict): Dados brutos da API
+        result_dict (dict): Dicionário de resultado
+    """
+    import logging
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    # Extrair dados do time da casa
+    if "home_team" in api_data and isinstance(api_data["home_team"], dict):
+        logger.info("Extraindo campos do time da casa diretamente")
+        for field, value in api_data["home_team"].items():
+            # Ignorar campos None, vazios ou N/A
+            if value is not None and value != '' and value != 'N/A':
+                # Copiar direto para o resultado
+                result_dict["home_team"][field] = value
+    
+    # Extrair dados do time visitante
+    if "away_team" in api_data and isinstance(api_data["away_team"], dict):
+        logger.info("Extraindo campos do time visitante diretamente")
+        for field, value in api_data["away_team"].items():
+            # Ignorar campos None, vazios ou N/A
+            if value is not None and value != '' and value != 'N/A':
+                # Copiar direto para o resultado
+                result_dict["away_team"][field] = value
+    
+    # Extrair dados de H2H
+    if "h2h" in api_data and isinstance(api_data["h2h"], dict):
+        logger.info("Extraindo campos de H2H diretamente")
+        for field, value in api_data["h2h"].items():
+            # Ignorar campos None, vazios ou N/A
+            if value is not None and value != '' and value != 'N/A':
+                # Copiar direto para o resultado
+                result_dict["h2h"][field] = value
+    
+    # Fazer log da quantidade de campos extraídos
+    home_fields = sum(1 for v in result_dict["home_team"].values() if v != 0 and v != "" and v != "?????")
+    away_fields = sum(1 for v in result_dict["away_team"].values() if v != 0 and v != "" and v != "?????")
+    h2h_fields = sum(1 for v in result_dict["h2h"].values() if v != 0)
+    
+    logger.info(f"Campos extraídos diretamente: Casa={home_fields}, Visitante={away_fields}, H2H={h2h_fields}")
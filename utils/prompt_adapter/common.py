@@ -0,0 +1,437 @@
+"""
+Helpers partilhados pelas estratégias de extração do prompt_adapter.
+"""
+import logging
+
+logger = logging.getLogger("valueHunter.prompt_adapter")
+
+
+def count_non_zero_fields(data_dict):
+    """
+    Conta campos com valores não-zero em um dicionário
+    
+    Args:
+        data_dict (dict): Dicionário a ser analisado
+        
+    Returns:
+        int: Número de campos com valores não-zero
+    """
+    if not isinstance(data_dict, dict):
+        return 0
+    
+    count = 0
+    for key, value in data_dict.items():
+        if isinstance(value, (int, float)) and value != 0:
+            count += 1
+        elif isinstance(value, str) and value != "" and value != "?????":
+            count += 1
+    
+    return count
+
+
+def get_value(data_dict, possible_keys, default=0):
+    """
+    Helper function to get a value from a dictionary using multiple possible keys
+    
+    Args:
+        data_dict (dict): Dictionary to extract from
+        possible_keys (list): List of possible keys to try
+        default: Default value if not found
+        
+    Returns:
+        Value from dictionary or default
+    """
+    if not data_dict or not isinstance(data_dict, dict):
+        return default
+    
+    for key in possible_keys:
+        if key in data_dict:
+            # Handle 'N/A' and other non-numeric values
+            value = data_dict[key]
+            if value == 'N/A' or value is None:
+                return default
+            
+            # Try to convert to float
+            try:
+                return float(value)
+            except (ValueError, TypeError):
+                pass
+    
+    return default
+
+
+def get_nested_value(data_dict, possible_keys, default=0):
+    """
+    Get a value from a nested dictionary using multiple possible keys
+    
+    Args:
+        data_dict (dict): Dictionary to search
+        possible_keys (list): List of possible keys to try
+        default: Default value if not found
+        
+    Returns:
+        Value from dictionary or default
+    """
+    if not data_dict or not isinstance(data_dict, dict):
+        return default
+    
+    for key in possible_keys:
+        if key in data_dict:
+            # Handle 'N/A' and other non-numeric values
+            value = data_dict[key]
+            if value == 'N/A' or value is None:
+                return default
+            
+            # Try to convert to float
+            try:
+                return float(value)
+            except (ValueError, TypeError):
+                pass
+    
+    return default
+
+
+def round_stat(value, precision=0):
+    """
+    Round a statistical value to reduce data size
+    
+    Args:
+        value: The value to round
+        precision (int): Decimal precision
+        
+    Returns:
+        int or float: Rounded value
+    """
+    if value is None:
+        return 0
+        
+    try:
+        if precision == 0:
+            return int(round(float(value), 0))
+        else:
+            return round(float(value), precision)
+    except (ValueError, TypeError):
+        return 0
+
+
+def ensure_critical_fields(optimized_data, home_team_name, away_team_name):
+    """
+    Garante que campos críticos existam na estrutura de dados, sem adicionar valores fictícios.
+    
+    Args:
+        optimized_data (dict): Estrutura de dados a verificar
+        home_team_name (str): Nome do time da casa
+        away_team_name (str): Nome do time visitante
+    """
+    # Garantir que as estruturas básicas existam
+    if "home_team" not in optimized_data:
+        optimized_data["home_team"] = {}
+        
+    if "away_team" not in optimized_data:
+        optimized_data["away_team"] = {}
+        
+    if "h2h" not in optimized_data:
+        optimized_data["h2h"] = {}
+        
+    # Garantir apenas que o campo form exista para análise de forma
+    if "form" not in optimized_data["home_team"]:
+        optimized_data["home_team"]["form"] = ""
+        
+    if "form" not in optimized_data["away_team"]:
+        optimized_data["away_team"]["form"] = ""
+
+
+def calculate_derived_stats(team_dict):
+    """
+    Calcula estatísticas derivadas quando possível
+    
+    Args:
+        team_dict (dict): Dicionário de estatísticas do time
+    """
+    # Jogos disputados
+    played = team_dict.get("played", 0)
+    if played > 0:
+        # Win/Draw/Loss percentagens
+        if "wins" in team_dict and "win_pct" not in team_dict:
+            team_dict["win_pct"] = round((team_dict["wins"] / played) * 100, 1)
+        if "draws" in team_dict and "draw_pct" not in team_dict:
+            team_dict["draw_pct"] = round((team_dict["draws"] / played) * 100, 1)
+        if "losses" in team_dict and "loss_pct" not in team_dict:
+            team_dict["loss_pct"] = round((team_dict["losses"] / played) * 100, 1)
+        
+        # Médias por jogo
+        if "goals_scored" in team_dict and "goals_per_game" not in team_dict:
+            team_dict["goals_per_game"] = round(team_dict["goals_scored"] / played, 2)
+        if "goals_conceded" in team_dict and "conceded_per_game" not in team_dict:
+            team_dict["conceded_per_game"] = round(team_dict["goals_conceded"] / played, 2)
+    
+    # Cartões
+    yellow = team_dict.get("yellow_cards", 0)
+    red = team_dict.get("red_cards", 0)
+    if "cardsTotal_overall" not in team_dict and (yellow > 0 or red > 0):
+        team_dict["cardsTotal_overall"] = yellow + red
+        if played > 0 and "cardsAVG_overall" not in team_dict:
+            team_dict["cardsAVG_overall"] = round((yellow + red) / played, 2)
+            team_dict["cards_per_game"] = team_dict["cardsAVG_overall"]
+    
+    # Escanteios
+    corners_for = team_dict.get("corners_for", 0)
+    corners_against = team_dict.get("corners_against", 0)
+    if "cornersTotal_overall" not in team_dict and (corners_for > 0 or corners_against > 0):
+        team_dict["cornersTotal_overall"] = corners_for + corners_against
+        if played > 0 and "cornersTotalAVG_overall" not in team_dict:
+            team_dict["cornersTotalAVG_overall"] = round((corners_for + corners_against) / played, 2)
+            team_dict["corners_per_game"] = team_dict["cornersTotalAVG_overall"]
+    
+    # Garantir consistência entre campos duplicados
+    # Campos de time
+    for orig, dupe in [
+        ("played", "seasonMatchesPlayed_overall"),
+        ("wins", "seasonWinsNum_overall"),
+        ("draws", "seasonDrawsNum_overall"),
+        ("losses", "seasonLossesNum_overall"),
+        ("goals_scored", "seasonScoredNum_overall"),
+        ("goals_conceded", "seasonConcededNum_overall"),
+        ("xg", "xg_for_overall"),
+        ("xga", "xg_against_overall"),
+        ("possession", "possessionAVG_overall"),
+        ("cards_per_game", "cardsAVG_overall"),
+        ("corners_per_game", "cornersTotalAVG_overall")
+    ]:
+        if orig in team_dict and team_dict[orig] > 0 and (dupe not in team_dict or team_dict[dupe] == 0):
+            team_dict[dupe] = team_dict[orig]
+        elif dupe in team_dict and team_dict[dupe] > 0 and (orig not in team_dict or team_dict[orig] == 0):
+            team_dict[orig] = team_dict[dupe]
+
+
+def extract_team_stats(team_data, target_dict, team_type):
+    """Extrai estatísticas de um time com tratamento de diferentes estruturas de dados"""
+    # Importação necessária
+    import logging
+    logger = logging.getLogger("valueHunter.api_adapter")
+    
+    if not team_data or not isinstance(team_data, dict):
+        logger.warning(f"Dados inválidos para o time {team_type}")
+        return
+    
+    # Verificar se o time tem estatísticas
+    stats_data = None
+    
+    # Caso 1: Estatísticas diretamente no objeto stats
+    if "stats" in team_data and isinstance(team_data["stats"], dict):
+        stats_data = team_data["stats"]
+    
+    # Caso 2: Estatísticas em stats.stats (estrutura aninhada)
+    elif "stats" in team_data and isinstance(team_data["stats"], dict) and "stats" in team_data["stats"]:
+        stats_data = team_data["stats"]["stats"]
+    
+    # Caso 3: Estatísticas diretamente no objeto do time
+    if stats_data is None:
+        for key in ["played", "matches_played", "wins", "goals_scored"]:
+            if key in team_data:
+                stats_data = team_data
+                break
+    
+    # Se não encontramos estatísticas, sair
+    if stats_data is None:
+        logger.warning(f"Nenhuma estatística encontrada para o time {team_type}")
+        return
+    
+    # Mapeamento ampliado de campos para extração
+    field_mapping = {
+        "played": ["played", "matches_played", "seasonMatchesPlayed_overall", "MP", "PJ", "Games"],
+        "wins": ["wins", "seasonWinsNum_overall", "W", "Wins", "team_wins"],
+        "draws": ["draws", "seasonDrawsNum_overall", "D", "Draws"],
+        "losses": ["losses", "seasonLossesNum_overall", "L", "Defeats", "Losses"],
+        "goals_scored": ["goals_scored", "seasonGoals_overall", "Gls", "goals", "GF", "GoalsFor"],
+        "goals_conceded": ["goals_conceded", "seasonConceded_overall", "GA", "GoalsAgainst"],
+        "clean_sheets_pct": ["clean_sheet_percentage", "seasonCSPercentage_overall", "clean_sheets_pct"],
+        "btts_pct": ["btts_percentage", "seasonBTTSPercentage_overall", "btts_pct"],
+        "over_2_5_pct": ["over_2_5_percentage", "seasonOver25Percentage_overall", "over_2_5_goals_pct"],
+        "xg": ["xG", "xg", "xg_for_overall", "expected_goals", "ExpG"],
+        "xga": ["xGA", "xga", "xg_against_avg_overall", "expected_goals_against"],
+        "possession": ["possession", "possessionAVG_overall", "Poss", "possession_avg"],
+        "yellow_cards": ["yellow_cards", "seasonCrdYNum_overall", "CrdY", "YellowCards"],
+        "red_cards": ["red_cards", "seasonCrdRNum_overall", "CrdR", "RedCards"],
+        "over_3_5_cards_pct": ["over_3_5_cards_percentage", "over35CardsPercentage_overall"],
+        "corners_for": ["corners_for", "seasonCornersFor_overall", "CK", "Corners"],
+        "corners_against": ["corners_against", "seasonCornersAgainst_overall"],
+        "over_9_5_corners_pct": ["over_9_5_corners_percentage", "over95CornersPercentage_overall"],
+    }
+    
+    # Adicionar campos específicos do tipo de time (casa/visitante)
+    if team_type == "home":
+        specific_fields = {
+            "home_played": ["home_played", "matches_played_home", "seasonMatchesPlayed_home", "home_matches"],
+            "home_wins": ["home_wins", "seasonWinsNum_home", "wins_home"],
+            "home_draws": ["home_draws", "seasonDrawsNum_home", "draws_home"],
+            "home_losses": ["home_losses", "seasonLossesNum_home", "losses_home"],
+            "home_goals_scored": ["home_goals_scored", "goals_scored_home", "seasonGoals_home"],
+            "home_goals_conceded": ["home_goals_conceded", "goals_conceded_home", "seasonConceded_home"],
+        }
+        field_mapping.update(specific_fields)
+    elif team_type == "away":
+        specific_fields = {
+            "away_played": ["away_played", "matches_played_away", "seasonMatchesPlayed_away", "away_matches"],
+            "away_wins": ["away_wins", "seasonWinsNum_away", "wins_away"],
+            "away_draws": ["away_draws", "seasonDrawsNum_away", "draws_away"],
+            "away_losses": ["away_losses", "seasonLossesNum_away", "losses_away"],
+            "away_goals_scored": ["away_goals_scored", "goals_scored_away", "seasonGoals_away"],
+            "away_goals_conceded": ["away_goals_conceded", "goals_conceded_away", "seasonConceded_away"],
+        }
+        field_mapping.update(specific_fields)
+    
+    # Extrair estatísticas
+    for target_field, source_fields in field_mapping.items():
+        # Verificar primeiro em stats_data
+        for field in source_fields:
+            if field in stats_data:
+                value = stats_data[field]
+                try:
+                    if value is not None and value != 'N/A':
+                        target_dict[target_field] = float(value)
+                        break  # Encontrou este campo, continuar para o próximo
+                except (ValueError, TypeError):
+                    pass
+        
+        # Se não encontrou, buscar também no time_data
+        if target_field not in target_dict or target_dict[target_field] == 0:
+            for field in source_fields:
+                if field in team_data:
+                    value = team_data[field]
+                    try:
+                        if value is not None and value != 'N/A':
+                            target_dict[target_field] = float(value)
+                            break
+                    except (ValueError, TypeError):
+                        pass
+    
+    # Buscar em additional_info se disponível
+    if "stats" in team_data and isinstance(team_data["stats"], dict) and "additional_info" in team_data["stats"]:
+        additional_info = team_data["stats"]["additional_info"]
+        
+        # Campos que podem estar em additional_info
+        additional_fields = {
+            "xg": ["xg_for_overall"],
+            "xga": ["xg_against_overall"],
+            "over_3_5_cards_pct": ["over35CardsPercentage_overall"],
+            "over_9_5_corners_pct": ["over95CornersPercentage_overall"]
+        }
+        
+        for target_field, source_fields in additional_fields.items():
+            if target_field not in target_dict or target_dict[target_field] == 0:
+                for field in source_fields:
+                    if field in additional_info:
+                        value = additional_info[field]
+                        try:
+                            if value is not None and value != 'N/A':
+                                target_dict[target_field] = float(value)
+                                break
+                        except (ValueError, TypeError):
+                            pass
+
+
+def extract_h2h_data(api_data, formatted_data):
+    """
+    Extrai dados completos de H2H (confronto direto)
+    
+    Args:
+        api_data (dict): Dados originais da API
+        formatted_data (dict): Estrutura de dados alvo
+    """
+    # Buscar dados H2H em diferentes locais possíveis
+    h2h_data = None
+    
+    if "head_to_head" in api_data:
+        h2h_data = api_data["head_to_head"]
+    elif "match_details" in api_data and api_data["match_details"] and "h2h" in api_data["match_details"]:
+        h2h_data = api_data["match_details"]["h2h"]
+    elif "h2h" in api_data:
+        h2h_data = api_data["h2h"]
+    
+    if not h2h_data:
+        return
+    
+    # Mapeamento de campos H2H
+    h2h_mapping = {
+        "total_matches": ["total_matches", "totalMatches", "matches", "matches_total"],
+        "home_wins": ["home_wins", "team_a_wins", "home_team_wins"],
+        "away_wins": ["away_wins", "team_b_wins", "away_team_wins"],
+        "draws": ["draws", "equal", "draw"],
+        "avg_goals": ["avg_goals", "average_goals", "goals_avg"],
+        "over_2_5_pct": ["over_2_5_percentage", "over_2_5_pct", "over25_percentage"],
+        "btts_pct": ["btts_percentage", "btts_pct", "both_teams_scored_percentage"],
+        "avg_cards": ["average_cards", "avg_cards", "cards_avg"],
+        "avg_corners": ["average_corners", "avg_corners", "corners_avg"]
+    }
+    
+    # Extrair cada campo
+    for target_field, source_fields in h2h_mapping.items():
+        for field in source_fields:
+            if field in h2h_data:
+                value = h2h_data[field]
+                if value is not None and value != 'N/A':
+                    try:
+                        formatted_data["h2h"][target_field] = float(value)
+                        break
+                    except (ValueError, TypeError):
+                        pass
+
+
+def extract_form_data(form_data, target_dict, field_name="form"):
+    """Extrai dados de forma recente"""
+    if not form_data or not isinstance(form_data, list):
+        target_dict[field_name] = "?????"
+        return
+    
+    form_string = ""
+    for match in form_data[:5]:
+        if isinstance(match, dict) and "result" in match:
+            form_string += match["result"]
+        else:
+            form_string += "?"
+    
+    # Garantir que temos 5 caracteres
+    form_string = form_string.ljust(5, "?")[:5]
+    target_dict[field_name] = form_string
+
+
+def extract_advanced_metrics(target_dict, advanced_data):
+    """
+    Extrai métricas avançadas para um time
+    
+    Args:
+        target_dict (dict): Dicionário alvo para preenchimento
+        advanced_data (dict): Dados avançados
+    """
+    if not advanced_data or not isinstance(advanced_data, dict):
+        return
+    
+    # Mapeamento de métricas avançadas
+    metrics = {
+        "xg": ["xg", "xG", "expected_goals"],
+        "xga": ["xga", "xGA", "expected_goals_against"],
+        "ppda": ["ppda", "passes_per_defensive_action", "PPDA"],
+        "possession": ["possession", "possessionAVG", "ball_possession"],
+        "deep_completions": ["deep_completions", "deep_passes"],
+        "progressive_passes": ["progressive_passes", "prog_passes"],
+        "field_tilt": ["field_tilt", "territory"]
+    }
+    
+    # Extrair cada métrica
+    for target_field, source_fields in metrics.items():
+        for field in source_fields:
+            if field in advanced_data:
+                value = advanced_data[field]
+                try:
+                    if isinstance(value, (int, float)) and value != 0:
+                        target_dict[target_field] = value
+                        break
+                    else:
+                        # Tentar converter para número
+                        numeric_value = float(value)
+                        if numeric_value != 0:
+                            target_dict[target_field] = numeric_value
+                            break
+                except (ValueError, TypeError):
+                    pass
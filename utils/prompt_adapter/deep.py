@@ -0,0 +1,1110 @@
+"""
+Busca recursiva e agressiva de dados de times na resposta da API.
+"""
+import logging
+
+from utils.prompt_adapter.common import count_non_zero_fields
+
+logger = logging.getLogger("valueHunter.prompt_adapter")
+
+
+def extract_deep_team_data(api_data, home_team_name, away_team_name, log_details=True):
+    """
+    Função extremamente agressiva que busca dados dos times em QUALQUER lugar na estrutura,
+    independente do formato ou nível de aninhamento.
+    
+    Args:
+        api_data (dict): Dados brutos da API
+        home_team_name (str): Nome do time da casa
+        away_team_name (str): Nome do time visitante
+        log_details (bool): Se deve registrar detalhes de depuração
+        
+    Returns:
+        dict: Dados estruturados dos times e confronto
+    """
+    # Importações explícitas no início da função
+    import logging
+    import json
+    import traceback
+    import copy
+    
+    logger = logging.getLogger("valueHunter.data_extractor")
+    
+    # Inicializa a estrutura de resultado
+    result = {
+        "match_info": {
+            "home_team": home_team_name,
+            "away_team": away_team_name,
+            "league": "",
+            "league_id": None
+        },
+        "home_team": {
+            # Estatísticas Gerais (incluindo todos os campos esperados)
+            "played": 0, 
+            "seasonMatchesPlayed_overall": 0,
+            "wins": 0, 
+            "seasonWinsNum_overall": 0,
+            "draws": 0, 
+            "seasonDrawsNum_overall": 0,
+            "losses": 0, 
+            "seasonLossesNum_overall": 0,
+            "win_pct": 0,
+            "draw_pct": 0,
+            "loss_pct": 0,
+            "form": "?????", 
+            "formRun_overall": "?????",
+            "seasonPPG_overall": 0,
+            "seasonRecentPPG": 0,
+            "leaguePosition_overall": 0,
+            
+            # Estatísticas em Casa
+            "home_played": 0, 
+            "seasonMatchesPlayed_home": 0,
+            "home_wins": 0, 
+            "seasonWinsNum_home": 0,
+            "home_draws": 0, 
+            "seasonDrawsNum_home": 0,
+            "home_losses": 0, 
+            "seasonLossesNum_home": 0,
+            "home_form": "?????", 
+            "formRun_home": "?????",
+            "seasonPPG_home": 0,
+            "leaguePosition_home": 0,
+            
+            # Estatísticas de Gols
+            "goals_scored": 0, 
+            "seasonScoredNum_overall": 0,
+            "goals_conceded": 0, 
+            "seasonConcededNum_overall": 0,
+            "home_goals_scored": 0, 
+            "seasonScoredNum_home": 0,
+            "home_goals_conceded": 0, 
+            "seasonConcededNum_home": 0,
+            "goals_per_game": 0,
+            "conceded_per_game": 0,
+            "seasonGoalsTotal_overall": 0,
+            "seasonGoalsTotal_home": 0,
+            "clean_sheets_pct": 0, 
+            "seasonCSPercentage_overall": 0,
+            "seasonCS_overall": 0,
+            "seasonCS_home": 0,
+            "btts_pct": 0, 
+            "seasonBTTSPercentage_overall": 0,
+            "over_2_5_pct": 0, 
+            "seasonOver25Percentage_overall": 0,
+            
+            # Expected Goals
+            "xg": 0, 
+            "xg_for_overall": 0,
+            "xga": 0, 
+            "xg_against_overall": 0,
+            "home_xg": 0, 
+            "xg_for_home": 0,
+            "home_xga": 0, 
+            "xg_against_home": 0,
+            "xg_for_avg_overall": 0,
+            "xg_for_avg_home": 0,
+            "xg_against_avg_overall": 0,
+            "xg_against_avg_home": 0,
+            
+            # Estatísticas de Cartões
+            "cards_per_game": 0, 
+            "cardsAVG_overall": 0,
+            "home_cards_per_game": 0, 
+            "cardsAVG_home": 0,
+            "cardsTotal_overall": 0,
+            "cardsTotal_home": 0,
+            "yellow_cards": 0,
+            "red_cards": 0,
+            "over_3_5_cards_pct": 0,
+            
+            # Estatísticas de Escanteios
+            "corners_per_game": 0, 
+            "cornersTotalAVG_overall": 0,
+            "home_corners_per_game": 0, 
+            "cornersTotalAVG_home": 0,
+            "corners_for": 0, 
+            "cornersTotal_overall": 0,
+            "corners_against": 0, 
+            "cornersAgainst_overall": 0,
+            "cornersAVG_overall": 0,
+            "cornersAVG_home": 0,
+            "cornersAgainstAVG_overall": 0,
+            "cornersAgainstAVG_home": 0,
+            "over_9_5_corners_pct": 0,
+            
+            # Estatísticas de Chutes
+            "shotsAVG_overall": 0,
+            "shotsAVG_home": 0,
+            "shotsOnTargetAVG_overall": 0,
+            "shotsOnTargetAVG_home": 0,
+            
+            # Posse de Bola
+            "possession": 0, 
+            "possessionAVG_overall": 0,
+            "home_possession": 0, 
+            "possessionAVG_home": 0
+        },
+        "away_team": {
+            # Estatísticas Gerais
+            "played": 0, 
+            "seasonMatchesPlayed_overall": 0,
+            "wins": 0, 
+            "seasonWinsNum_overall": 0,
+            "draws": 0, 
+            "seasonDrawsNum_overall": 0,
+            "losses": 0, 
+            "seasonLossesNum_overall": 0,
+            "win_pct": 0,
+            "draw_pct": 0,
+            "loss_pct": 0,
+            "form": "?????", 
+            "formRun_overall": "?????",
+            "seasonPPG_overall": 0,
+            "seasonRecentPPG": 0,
+            "leaguePosition_overall": 0,
+            
+            # Estatísticas Fora
+            "away_played": 0, 
+            "seasonMatchesPlayed_away": 0,
+            "away_wins": 0, 
+            "seasonWinsNum_away": 0,
+            "away_draws": 0, 
+            "seasonDrawsNum_away": 0,
+            "away_losses": 0, 
+            "seasonLossesNum_away": 0,
+            "away_form": "?????", 
+            "formRun_away": "?????",
+            "seasonPPG_away": 0,
+            "leaguePosition_away": 0,
+            
+            # Estatísticas de Gols
+            "goals_scored": 0, 
+            "seasonScoredNum_overall": 0,
+            "goals_conceded": 0, 
+            "seasonConcededNum_overall": 0,
+            "away_goals_scored": 0, 
+            "seasonScoredNum_away": 0,
+            "away_goals_conceded": 0, 
+            "seasonConcededNum_away": 0,
+            "goals_per_game": 0,
+            "conceded_per_game": 0,
+            "seasonGoalsTotal_overall": 0,
+            "seasonGoalsTotal_away": 0,
+            "clean_sheets_pct": 0, 
+            "seasonCSPercentage_overall": 0,
+            "seasonCS_overall": 0,
+            "seasonCS_away": 0,
+            "btts_pct": 0, 
+            "seasonBTTSPercentage_overall": 0,
+            "over_2_5_pct": 0, 
+            "seasonOver25Percentage_overall": 0,
+            
+            # Expected Goals
+            "xg": 0, 
+            "xg_for_overall": 0,
+            "xga": 0, 
+            "xg_against_overall": 0,
+            "away_xg": 0, 
+            "xg_for_away": 0,
+            "away_xga": 0, 
+            "xg_against_away": 0,
+            "xg_for_avg_overall": 0,
+            "xg_for_avg_away": 0,
+            "xg_against_avg_overall": 0,
+            "xg_against_avg_away": 0,
+            
+            # Estatísticas de Cartões
+            "cards_per_game": 0, 
+            "cardsAVG_overall": 0,
+            "away_cards_per_game": 0, 
+            "cardsAVG_away": 0,
+            "cardsTotal_overall": 0,
+            "cardsTotal_away": 0,
+            "yellow_cards": 0,
+            "red_cards": 0,
+            "over_3_5_cards_pct": 0,
+            
+            # Estatísticas de Escanteios
+            "corners_per_game": 0, 
+            "cornersTotalAVG_overall": 0,
+            "away_corners_per_game": 0, 
+            "cornersTotalAVG_away": 0,
+            "corners_for": 0, 
+            "cornersTotal_overall": 0,
+            "corners_against": 0, 
+            "cornersAgainst_overall": 0,
+            "cornersAVG_overall": 0,
+            "cornersAVG_away": 0,
+            "cornersAgainstAVG_overall": 0,
+            "cornersAgainstAVG_away": 0,
+            "over_9_5_corners_pct": 0,
+            
+            # Estatísticas de Chutes
+            "shotsAVG_overall": 0,
+            "shotsAVG_away": 0,
+            "shotsOnTargetAVG_overall": 0,
+            "shotsOnTargetAVG_away": 0,
+            
+            # Posse de Bola
+            "possession": 0, 
+            "possessionAVG_overall": 0,
+            "away_possession": 0, 
+            "possessionAVG_away": 0
+        },
+        "h2h": {
+            "total_matches": 0,
+            "home_wins": 0,
+            "away_wins": 0,
+            "draws": 0,
+            "avg_goals": 0,
+            "over_2_5_pct": 0,
+            "btts_pct": 0,
+            "avg_cards": 0,
+            "avg_corners": 0
+        }
+    }
+    
+    # Dicionários para coleta de dados encontrados
+    home_found = {}
+    away_found = {}
+    h2h_found = {}
+    
+    # Log da estrutura para depuração
+    if log_details:
+        logger.info(f"Iniciando extração profunda para {home_team_name} vs {away_team_name}")
+        
+        # Registrar o tamanho dos dados para referência
+        try:
+            if isinstance(api_data, dict):
+                logger.info(f"Chaves principais nos dados brutos: {list(api_data.keys())}")
+                
+                # Verificar estruturas conhecidas
+                if "basic_stats" in api_data:
+                    bs_keys = list(api_data["basic_stats"].keys())
+                    logger.info(f"basic_stats contém: {bs_keys}")
+                
+                if "team_stats" in api_data:
+                    ts_keys = list(api_data["team_stats"].keys())
+                    logger.info(f"team_stats contém: {ts_keys}")
+                
+                if "data" in api_data and isinstance(api_data["data"], dict):
+                    data_keys = list(api_data["data"].keys())
+                    logger.info(f"data contém: {data_keys}")
+        except:
+            logger.error("Erro ao analisar estrutura de dados")
+    
+    try:
+        # Verificar se temos uma estrutura "plana" com times diretamente na raiz
+        if "home_team" in api_data and isinstance(api_data["home_team"], dict):
+            logger.info("Encontrada estrutura com times na raiz")
+            extract_direct_team_data(api_data["home_team"], result["home_team"])
+            
+        if "away_team" in api_data and isinstance(api_data["away_team"], dict):
+            logger.info("Encontrada estrutura com times na raiz")
+            extract_direct_team_data(api_data["away_team"], result["away_team"])
+        
+        # VERIFICAÇÃO DE TODOS OS CAMINHOS POSSÍVEIS PARA EXTRAÇÃO
+        known_paths = [
+            # Caminhos comuns para estatísticas do time da casa
+            ["team_stats", "home"],
+            ["basic_stats", "home_team", "stats"],
+            ["basic_stats", "home_team"],
+            ["home_team", "stats"],
+            ["data", "teams", "home"],
+            ["data", "home_team"],
+            ["home"],
+            ["stats", "home"],
+            
+            # Caminhos alternativos que podem conter dados
+            ["teams", 0],  # Primeiro time em uma lista pode ser o da casa
+            ["teams", "home"],
+            ["match", "home_team"],
+            ["home_stats"],
+            ["stats", "home"],
+        ]
+        
+        # FASE 1: Verificar caminhos diretos conhecidos
+        
+        # Verificar cada caminho conhecido para o time da casa
+        for path in known_paths:
+            current = api_data
+            path_valid = True
+            
+            # Navegar pelo caminho
+            for key in path:
+                if isinstance(current, dict) and key in current:
+                    current = current[key]
+                elif isinstance(current, list) and isinstance(key, int) and key < len(current):
+                    current = current[key]
+                else:
+                    path_valid = False
+                    break
+            
+            # Se chegamos ao final do caminho, extrair dados
+            if path_valid and isinstance(current, dict):
+                logger.info(f"Encontrado possível caminho para dados do time da casa: {path}")
+                
+                # Verificar se contém dados estatísticos ou nome do time
+                has_stats = any(key in current for key in [
+                    "played", "matches_played", "wins", "goals_scored", "xg", "form"
+                ])
+                
+                has_name = "name" in current and (
+                    current["name"] == home_team_name or 
+                    home_team_name.lower() in current["name"].lower() or 
+                    current["name"].lower() in home_team_name.lower()
+                )
+                
+                if has_stats or has_name:
+                    logger.info(f"Extraindo estatísticas do time da casa do caminho: {path}")
+                    extract_stats_recursive(current, home_found, ".".join(str(k) for k in path))
+                
+                # Verificar também se contém subchaves comuns com estatísticas
+                for subkey in ["stats", "statistics", "seasonStats", "data", "team_stats"]:
+                    if subkey in current and isinstance(current[subkey], dict):
+                        logger.info(f"Encontrada subchave {subkey} com estatísticas do time da casa")
+                        extract_stats_recursive(current[subkey], home_found, f"{'.'.join(str(k) for k in path)}.{subkey}")
+        
+        # Adaptar os mesmos caminhos para o time visitante (substituindo 'home' por 'away')
+        away_paths = []
+        for path in known_paths:
+            away_path = []
+            for key in path:
+                if key == "home":
+                    away_path.append("away")
+                elif key == "home_team":
+                    away_path.append("away_team")
+                elif key == 0 and isinstance(key, int):  # Primeiro item → Segundo item
+                    away_path.append(1)
+                else:
+                    away_path.append(key)
+            away_paths.append(away_path)
+        
+        # Verificar cada caminho para o time visitante
+        for path in away_paths:
+            current = api_data
+            path_valid = True
+            
+            # Navegar pelo caminho
+            for key in path:
+                if isinstance(current, dict) and key in current:
+                    current = current[key]
+                elif isinstance(current, list) and isinstance(key, int) and key < len(current):
+                    current = current[key]
+                else:
+                    path_valid = False
+                    break
+            
+            # Se chegamos ao final do caminho, extrair dados
+            if path_valid and isinstance(current, dict):
+                logger.info(f"Encontrado possível caminho para dados do time visitante: {path}")
+                
+                # Verificar se contém dados estatísticos ou nome do time
+                has_stats = any(key in current for key in [
+                    "played", "matches_played", "wins", "goals_scored", "xg", "form"
+                ])
+                
+                has_name = "name" in current and (
+                    current["name"] == away_team_name or 
+                    away_team_name.lower() in current["name"].lower() or
+                    current["name"].lower() in away_team_name.lower()
+                )
+                
+                if has_stats or has_name:
+                    logger.info(f"Extraindo estatísticas do time visitante do caminho: {path}")
+                    extract_stats_recursive(current, away_found, ".".join(str(k) for k in path))
+                
+                # Verificar também se contém subchaves comuns com estatísticas
+                for subkey in ["stats", "statistics", "seasonStats", "data", "team_stats"]:
+                    if subkey in current and isinstance(current[subkey], dict):
+                        logger.info(f"Encontrada subchave {subkey} com estatísticas do time visitante")
+                        extract_stats_recursive(current[subkey], away_found, f"{'.'.join(str(k) for k in path)}.{subkey}")
+        
+        # FASE 2: Busca de dados H2H em caminhos conhecidos
+        h2h_paths = [
+            ["head_to_head"],
+            ["h2h"],
+            ["basic_stats", "match_details", "h2h"],
+            ["match_details", "h2h"],
+            ["data", "h2h"],
+            ["data", "head_to_head"],
+            ["h2h_stats"]
+        ]
+        
+        # Verificar cada caminho para dados H2H
+        for path in h2h_paths:
+            current = api_data
+            path_valid = True
+            
+            # Navegar pelo caminho
+            for key in path:
+                if isinstance(current, dict) and key in current:
+                    current = current[key]
+                else:
+                    path_valid = False
+                    break
+            
+            # Se encontramos dados H2H, extrair
+            if path_valid and isinstance(current, dict):
+                logger.info(f"Encontrados dados H2H no caminho: {path}")
+                
+                # Verificar se contém dados H2H
+                has_h2h = any(key in current for key in ["total_matches", "home_wins", "away_wins", "draws"])
+                
+                if has_h2h:
+                    # Mapeamento de campos H2H
+                    h2h_mapping = {
+                        "total_matches": ["total_matches", "totalMatches", "matches", "matches_total", "total", "count"],
+                        "home_wins": ["home_wins", "team_a_wins", "home_team_wins", "homeWins"],
+                        "away_wins": ["away_wins", "team_b_wins", "away_team_wins", "awayWins"],
+                        "draws": ["draws", "equal", "draw", "empates"],
+                        "avg_goals": ["avg_goals", "average_goals", "goals_avg", "avgGoals", "meanGoals"],
+                        "over_2_5_pct": ["over_2_5_percentage", "over_2_5_pct", "over25_percentage", "over25pct"],
+                        "btts_pct": ["btts_percentage", "btts_pct", "both_teams_scored_percentage", "bttsPct"],
+                        "avg_cards": ["average_cards", "avg_cards", "cards_avg", "avgCards", "meanCards"],
+                        "avg_corners": ["average_corners", "avg_corners", "corners_avg", "avgCorners", "meanCorners"]
+                    }
+                    
+                    # Extrair cada campo H2H
+                    for target_field, source_fields in h2h_mapping.items():
+                        for field in source_fields:
+                            if field in current:
+                                value = current[field]
+                                if value is not None and value != 'N/A':
+                                    try:
+                                        h2h_found[target_field] = float(value)
+                                        break
+                                    except (ValueError, TypeError):
+                                        pass
+        
+        # FASE 3: Busca profunda e recursiva em toda a estrutura
+        def deep_search(obj, path=""):
+            if isinstance(obj, dict):
+                # Verificar se o objeto contém um nome de time
+                if "name" in obj and isinstance(obj["name"], str):
+                    team_name = obj["name"]
+                    
+                    # Verificar se é um dos times que estamos procurando
+                    is_home = False
+                    is_away = False
+                    
+                    # Comparação exata
+                    if team_name == home_team_name:
+                        is_home = True
+                    elif team_name == away_team_name:
+                        is_away = True
+                    
+                    # Comparação parcial (necessário para alguns endpoints)
+                    if not (is_home or is_away):
+                        if home_team_name.lower() in team_name.lower() or team_name.lower() in home_team_name.lower():
+                            is_home = True
+                        elif away_team_name.lower() in team_name.lower() or team_name.lower() in away_team_name.lower():
+                            is_away = True
+                    
+                    # Se encontramos um time, extrair estatísticas
+                    if is_home or is_away:
+                        target_dict = home_found if is_home else away_found
+                        logger.info(f"Encontrado {'time da casa' if is_home else 'time visitante'} pelo nome: {team_name} em {path}")
+                        
+                        # Extrair estatísticas diretamente do objeto
+                        extract_stats_recursive(obj, target_dict, path)
+                
+                # Verificar se este objeto contém palavras-chave relacionadas a casa/fora
+                if not ("h2h" in path.lower() or "vs" in path.lower()):
+                    is_home_related = "home" in path.lower() or "casa" in path.lower()
+                    is_away_related = "away" in path.lower() or "fora" in path.lower() or "visit" in path.lower()
+                    
+                    if is_home_related or is_away_related:
+                        # Verificar se tem estatísticas
+                        has_stats = any(key in obj for key in ["played", "matches_played", "wins", "goals_scored", "xg", "form"])
+                        
+                        if has_stats:
+                            target_dict = home_found if is_home_related else away_found
+                            logger.info(f"Encontradas estatísticas para {'casa' if is_home_related else 'visitante'} em {path}")
+                            extract_stats_recursive(obj, target_dict, path)
+                
+                # Verificar se este objeto parece ser dados H2H
+                if ("h2h" in path.lower() or "head" in path.lower() or "vs" in path.lower()) and not h2h_found:
+                    # Verificar se tem estatísticas H2H
+                    has_h2h = any(key in obj for key in ["total_matches", "home_wins", "away_wins", "draws"])
+                    
+                    if has_h2h:
+                        logger.info(f"Encontrados dados H2H em {path}")
+                        
+                        # Extrair campos H2H com uma lista ampla de possíveis nomes
+                        h2h_fields = {
+                            "total_matches": ["total_matches", "totalMatches", "matches", "total", "count", "jogos", "partidas"],
+                            "home_wins": ["home_wins", "homeWins", "home", "local", "casa"],
+                            "away_wins": ["away_wins", "awayWins", "away", "visitante", "fora"],
+                            "draws": ["draws", "draw", "equal", "empates", "empate"],
+                            "avg_goals": ["avg_goals", "avgGoals", "goals_avg", "media_gols", "mediaGols"],
+                            "over_2_5_pct": ["over_2_5_percentage", "over25", "mais2_5"],
+                            "btts_pct": ["btts_percentage", "btts", "ambos_marcam"],
+                            "avg_cards": ["avg_cards", "avgCards", "media_cartoes"],
+                            "avg_corners": ["avg_corners", "avgCorners", "media_escanteios"]
+                        }
+                        
+                        for target, sources in h2h_fields.items():
+                            for src in sources:
+                                if src in obj:
+                                    try:
+                                        if obj[src] is not None and obj[src] != 'N/A':
+                                            h2h_found[target] = float(obj[src])
+                                            break
+                                    except (ValueError, TypeError):
+                                        pass
+                
+                # Continuar buscando recursivamente em todas as chaves
+                for key, value in obj.items():
+                    new_path = f"{path}.{key}" if path else key
+                    deep_search(value, new_path)
+            
+            elif isinstance(obj, list):
+                # Buscar em cada item da lista
+                for i, item in enumerate(obj):
+                    new_path = f"{path}[{i}]"
+                    deep_search(item, new_path)
+        
+        # Iniciar busca profunda
+        deep_search(api_data)
+        
+        # FASE 4: Verificar dados específicos de forma (form)
+        
+        # Tentar extrair dados de forma de times
+        if "team_form" in api_data:
+            if "home" in api_data["team_form"] and isinstance(api_data["team_form"]["home"], list):
+                form_string = ""
+                for match in api_data["team_form"]["home"][:5]:
+                    if isinstance(match, dict) and "result" in match:
+                        form_string += match["result"]
+                    else:
+                        form_string += "?"
+                
+                if form_string:
+                    home_found["form"] = form_string.ljust(5, '?')[:5]
+                    home_found["formRun_overall"] = form_string.ljust(5, '?')[:5]
+                    logger.info(f"Encontrada forma do time da casa: {form_string}")
+            
+            if "away" in api_data["team_form"] and isinstance(api_data["team_form"]["away"], list):
+                form_string = ""
+                for match in api_data["team_form"]["away"][:5]:
+                    if isinstance(match, dict) and "result" in match:
+                        form_string += match["result"]
+                    else:
+                        form_string += "?"
+                
+                if form_string:
+                    away_found["form"] = form_string.ljust(5, '?')[:5]
+                    away_found["formRun_overall"] = form_string.ljust(5, '?')[:5]
+                    logger.info(f"Encontrada forma do time visitante: {form_string}")
+        
+        # FASE 5: Buscar em campos específicos para dados básicos
+        
+        # Verificar se ha estatísticas básicas nos objetos diretos de time
+        # Este bloco é vital para extrair dados da estrutura específica do JSON
+        # enviado pelo Gist do usuário
+        for team_type, team_name in [('home_team', home_team_name), ('away_team', away_team_name)]:
+            if team_type in api_data and isinstance(api_data[team_type], dict):
+                team_obj = api_data[team_type]
+                target_dict = home_found if team_type == 'home_team' else away_found
+                
+                # Extração de estatísticas básicas importantes
+                basic_stats = [
+                    "played", "wins", "draws", "losses",
+                    "win_pct", "draw_pct", "loss_pct", 
+                    "goals_scored", "goals_conceded",
+                    "btts_pct", "clean_sheets_pct", "over_2_5_pct"
+                ]
+                
+                for stat in basic_stats:
+                    if stat in team_obj:
+                        try:
+                            target_dict[stat] = float(team_obj[stat])
+                        except (ValueError, TypeError):
+                            if isinstance(team_obj[stat], str) and team_obj[stat] != '':
+                                target_dict[stat] = team_obj[stat]
+                
+                # Verificar campos aninhados
+                if "stats" in team_obj and isinstance(team_obj["stats"], dict):
+                    for stat in basic_stats:
+                        if stat in team_obj["stats"]:
+                            try:
+                                target_dict[stat] = float(team_obj["stats"][stat])
+                            except (ValueError, TypeError):
+                                if isinstance(team_obj["stats"][stat], str) and team_obj["stats"][stat] != '':
+                                    target_dict[stat] = team_obj["stats"][stat]
+        
+        # FASE 6: Combinar todos os dados encontrados
+        
+        # Copiar dados encontrados para o resultado
+        for key, value in home_found.items():
+            if value is not None and (
+                (isinstance(value, (int, float)) and value != 0) or 
+                (isinstance(value, str) and value != "" and value != "?????")
+            ):
+                result["home_team"][key] = value
+        
+        for key, value in away_found.items():
+            if value is not None and (
+                (isinstance(value, (int, float)) and value != 0) or 
+                (isinstance(value, str) and value != "" and value != "?????")
+            ):
+                result["away_team"][key] = value
+        
+        for key, value in h2h_found.items():
+            if value is not None and (isinstance(value, (int, float)) and value != 0):
+                result["h2h"][key] = value
+        
+        # Calcular estatísticas derivadas se temos jogos disputados
+        for team_key, team_dict in [("home_team", result["home_team"]), ("away_team", result["away_team"])]:
+            played = team_dict.get("played", 0)
+            
+            if played > 0:
+                # Calcular percentuais win/draw/loss
+                if "wins" in team_dict and "win_pct" not in team_dict:
+                    team_dict["win_pct"] = round((team_dict["wins"] / played) * 100, 1)
+                if "draws" in team_dict and "draw_pct" not in team_dict:
+                    team_dict["draw_pct"] = round((team_dict["draws"] / played) * 100, 1)
+                if "losses" in team_dict and "loss_pct" not in team_dict:
+                    team_dict["loss_pct"] = round((team_dict["losses"] / played) * 100, 1)
+                
+                # Calcular médias por jogo
+                if "goals_scored" in team_dict and "goals_per_game" not in team_dict:
+                    team_dict["goals_per_game"] = round(team_dict["goals_scored"] / played, 2)
+                if "goals_conceded" in team_dict and "conceded_per_game" not in team_dict:
+                    team_dict["conceded_per_game"] = round(team_dict["goals_conceded"] / played, 2)
+        
+        # Verificar total de jogos H2H
+        if "total_matches" not in result["h2h"] or result["h2h"]["total_matches"] == 0:
+            total = (
+                result["h2h"].get("home_wins", 0) + 
+                result["h2h"].get("away_wins", 0) + 
+                result["h2h"].get("draws", 0)
+            )
+            if total > 0:
+                result["h2h"]["total_matches"] = total
+        
+        # Log dos resultados finais da extração
+        if log_details:
+            home_count = count_non_zero_fields(result["home_team"])
+            away_count = count_non_zero_fields(result["away_team"])
+            h2h_count = count_non_zero_fields(result["h2h"])
+            
+            logger.info(f"Extração completa: {home_count} campos não-zero para casa, {away_count} para fora, {h2h_count} para H2H")
+        
+        return result
+        
+    except Exception as e:
+        logger.error(f"Erro durante a extração profunda: {str(e)}")
+        logger.error(traceback.format_exc())
+        return result
+
+
+def extract_stats_recursive(source, target, path=""):
+    """
+    Extrai estatísticas de um dicionário para outro de forma recursiva,
+    buscando por múltiplos nomes possíveis para os mesmos campos.
+    
+    Args:
+        source (dict): Dicionário fonte das estatísticas
+        target (dict): Dicionário alvo para armazenar as estatísticas
+        path (str): Caminho atual para logging
+    """
+    import logging
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    if not isinstance(source, dict):
+        return
+    
+    # Mapeamento abrangente de campo estatístico → possíveis nomes na API
+    field_mapping = {
+        # Estatísticas Gerais
+        "played": ["played", "matches_played", "seasonMatchesPlayed_overall", "MP", "PJ", "Games", "total_matches", "games"],
+        "seasonMatchesPlayed_overall": ["seasonMatchesPlayed_overall", "matches_played", "MP", "games_played", "total_matches"],
+        "wins": ["wins", "seasonWinsNum_overall", "W", "Wins", "win", "team_wins", "won", "victorias", "vitorias"],
+        "seasonWinsNum_overall": ["seasonWinsNum_overall", "wins", "W", "won", "victorias", "total_wins"],
+        "draws": ["draws", "seasonDrawsNum_overall", "D", "Draws", "draw", "team_draws", "empates", "tied"],
+        "seasonDrawsNum_overall": ["seasonDrawsNum_overall", "draws", "D", "drawn", "empates", "total_draws"],
+        "losses": ["losses", "seasonLossesNum_overall", "L", "Losses", "loss", "team_losses", "defeats", "derrotas", "lost"],
+        "seasonLossesNum_overall": ["seasonLossesNum_overall", "losses", "L", "lost", "derrotas", "total_losses"],
+        "win_pct": ["win_percentage", "winPercentage", "win_pct", "win_rate", "victory_rate", "pct_wins"],
+        "draw_pct": ["draw_percentage", "drawPercentage", "draw_pct", "draw_rate", "pct_draws"],
+        "loss_pct": ["loss_percentage", "lossPercentage", "loss_pct", "loss_rate", "defeat_rate", "pct_losses"],
+        "form": ["form", "recent_form", "formRun_overall", "form_string", "team_form", "last_matches"],
+        "formRun_overall": ["formRun_overall", "form", "recent_form", "form_string", "overall_form"],
+        "seasonPPG_overall": ["seasonPPG_overall", "ppg", "points_per_game", "pts_per_game", "average_points"],
+        "seasonRecentPPG": ["seasonRecentPPG", "recent_ppg", "recent_points_per_game", "last5_ppg"],
+        "leaguePosition_overall": ["leaguePosition_overall", "league_position", "position", "rank", "table_position"],
+        
+        # Casa/Fora específicos
+        "home_played": ["home_played", "seasonMatchesPlayed_home", "matches_played_home", "games_home", "home_games"],
+        "seasonMatchesPlayed_home": ["seasonMatchesPlayed_home", "home_played", "matches_played_home", "home_games"],
+        "away_played": ["away_played", "seasonMatchesPlayed_away", "matches_played_away", "games_away", "away_games"],
+        "seasonMatchesPlayed_away": ["seasonMatchesPlayed_away", "away_played", "matches_played_away", "away_games"],
+        "home_wins": ["home_wins", "seasonWinsNum_home", "wins_home", "home_won", "victorias_casa"],
+        "seasonWinsNum_home": ["seasonWinsNum_home", "home_wins", "wins_home", "home_victories"],
+        "away_wins": ["away_wins", "seasonWinsNum_away", "wins_away", "away_won", "victorias_fuera"],
+        "seasonWinsNum_away": ["seasonWinsNum_away", "away_wins", "wins_away", "away_victories"],
+        "home_draws": ["home_draws", "seasonDrawsNum_home", "draws_home", "home_drawn", "empates_casa"],
+        "seasonDrawsNum_home": ["seasonDrawsNum_home", "home_draws", "draws_home", "home_tied"],
+        "away_draws": ["away_draws", "seasonDrawsNum_away", "draws_away", "away_drawn", "empates_fuera"],
+        "seasonDrawsNum_away": ["seasonDrawsNum_away", "away_draws", "draws_away", "away_tied"],
+        "home_losses": ["home_losses", "seasonLossesNum_home", "losses_home", "home_lost", "derrotas_casa"],
+        "seasonLossesNum_home": ["seasonLossesNum_home", "home_losses", "losses_home", "home_defeats"],
+        "away_losses": ["away_losses", "seasonLossesNum_away", "losses_away", "away_lost", "derrotas_fuera"],
+        "seasonLossesNum_away": ["seasonLossesNum_away", "away_losses", "losses_away", "away_defeats"],
+        "home_form": ["home_form", "formRun_home", "form_home", "home_recent_form", "casa_forma"],
+        "formRun_home": ["formRun_home", "home_form", "form_home", "home_recent_form"],
+        "away_form": ["away_form", "formRun_away", "form_away", "away_recent_form", "fora_forma"],
+        "formRun_away": ["formRun_away", "away_form", "form_away", "away_recent_form"],
+        "seasonPPG_home": ["seasonPPG_home", "home_ppg", "points_per_game_home", "home_average_points"],
+        "seasonPPG_away": ["seasonPPG_away", "away_ppg", "points_per_game_away", "away_average_points"],
+        "leaguePosition_home": ["leaguePosition_home", "home_league_position", "position_home", "home_rank"],
+        "leaguePosition_away": ["leaguePosition_away", "away_league_position", "position_away", "away_rank"],
+        
+        # Gols
+        "goals_scored": ["goals_scored", "seasonScoredNum_overall", "scored", "GF", "goals_for", "GoalsFor", "goals"],
+        "seasonScoredNum_overall": ["seasonScoredNum_overall", "goals_scored", "scored", "GF", "total_goals_for"],
+        "goals_conceded": ["goals_conceded", "seasonConcededNum_overall", "conceded", "GA", "goals_against", "GoalsAgainst"],
+        "seasonConcededNum_overall": ["seasonConcededNum_overall", "goals_conceded", "conceded", "GA", "total_goals_against"],
+        "home_goals_scored": ["home_goals_scored", "seasonScoredNum_home", "goals_scored_home", "home_GF", "home_goals"],
+        "seasonScoredNum_home": ["seasonScoredNum_home", "home_goals_scored", "goals_scored_home", "home_goals_for"],
+        "away_goals_scored": ["away_goals_scored", "seasonScoredNum_away", "goals_scored_away", "away_GF", "away_goals"],
+        "seasonScoredNum_away": ["seasonScoredNum_away", "away_goals_scored", "goals_scored_away", "away_goals_for"],
+        "home_goals_conceded": ["home_goals_conceded", "seasonConcededNum_home", "goals_conceded_home", "home_GA"],
+        "seasonConcededNum_home": ["seasonConcededNum_home", "home_goals_conceded", "goals_conceded_home", "home_goals_against"],
+        "away_goals_conceded": ["away_goals_conceded", "seasonConcededNum_away", "goals_conceded_away", "away_GA"],
+        "seasonConcededNum_away": ["seasonConcededNum_away", "away_goals_conceded", "goals_conceded_away", "away_goals_against"],
+        "goals_per_game": ["goals_per_game", "gpg", "goals_per_match", "avg_goals_for", "average_goals_scored"],
+        "conceded_per_game": ["conceded_per_game", "cpg", "conceded_per_match", "avg_goals_against", "average_goals_conceded"],
+        "seasonGoalsTotal_overall": ["seasonGoalsTotal_overall", "total_goals", "goals_total", "all_goals", "total_match_goals"],
+        "seasonGoalsTotal_home": ["seasonGoalsTotal_home", "total_goals_home", "home_goals_total", "home_match_goals"],
+        "seasonGoalsTotal_away": ["seasonGoalsTotal_away", "total_goals_away", "away_goals_total", "away_match_goals"],
+        "clean_sheets_pct": ["clean_sheets_pct", "clean_sheet_percentage", "cs_pct", "percentage_cs", "pct_clean_sheets"],
+        "seasonCSPercentage_overall": ["seasonCSPercentage_overall", "clean_sheet_percentage", "cs_pct", "pct_clean_sheets"],
+        "seasonCS_overall": ["seasonCS_overall", "clean_sheets", "cs", "total_clean_sheets", "shutouts"],
+        "seasonCS_home": ["seasonCS_home", "home_clean_sheets", "cs_home", "clean_sheets_home", "home_shutouts"],
+        "seasonCS_away": ["seasonCS_away", "away_clean_sheets", "cs_away", "clean_sheets_away", "away_shutouts"],
+        "btts_pct": ["btts_pct", "btts_percentage", "both_teams_scored_pct", "pct_btts", "ambos_marcam_pct"],
+        "seasonBTTSPercentage_overall": ["seasonBTTSPercentage_overall", "btts_percentage", "both_teams_to_score_pct", "pct_btts"],
+        "over_2_5_pct": ["over_2_5_pct", "over_2_5_percentage", "o25_pct", "pct_over_25", "mais_25_pct"],
+        "seasonOver25Percentage_overall": ["seasonOver25Percentage_overall", "over_2_5_percentage", "o25_pct", "pct_over_25"],
+        
+        # Expected Goals
+        "xg": ["xg", "xG", "expected_goals", "xg_for", "ExpG", "xGF"],
+        "xg_for_overall": ["xg_for_overall", "xg", "xG", "expected_goals", "total_xg"],
+        "xga": ["xga", "xGA", "expected_goals_against", "xg_against", "ExpGA", "xGAg"],
+        "xg_against_overall": ["xg_against_overall", "xga", "xGA", "expected_goals_against", "total_xga"],
+        "home_xg": ["home_xg", "xg_home", "xg_for_home", "home_expected_goals", "xg_h"],
+        "xg_for_home": ["xg_for_home", "home_xg", "xg_home", "home_expected_goals", "xG_home"],
+        "away_xg": ["away_xg", "xg_away", "xg_for_away", "away_expected_goals", "xg_a"],
+        "xg_for_away": ["xg_for_away", "away_xg", "xg_away", "away_expected_goals", "xG_away"],
+        "home_xga": ["home_xga", "xga_home", "xg_against_home", "home_expected_goals_against", "xGA_home"],
+        "xg_against_home": ["xg_against_home", "home_xga", "xga_home", "home_expected_goals_against"],
+        "away_xga": ["away_xga", "xga_away", "xg_against_away", "away_expected_goals_against", "xGA_away"],
+        "xg_against_away": ["xg_against_away", "away_xga", "xga_away", "away_expected_goals_against"],
+        "xg_for_avg_overall": ["xg_for_avg_overall", "xg_per_game", "expected_goals_per_game", "avg_xg", "xg_avg"],
+        "xg_for_avg_home": ["xg_for_avg_home", "xg_per_game_home", "expected_goals_per_game_home", "home_avg_xg"],
+        "xg_for_avg_away": ["xg_for_avg_away", "xg_per_game_away", "expected_goals_per_game_away", "away_avg_xg"],
+        "xg_against_avg_overall": ["xg_against_avg_overall", "xga_per_game", "expected_goals_against_per_game", "avg_xga"],
+        "xg_against_avg_home": ["xg_against_avg_home", "xga_per_game_home", "expected_goals_against_per_game_home", "home_avg_xga"],
+        "xg_against_avg_away": ["xg_against_avg_away", "xga_per_game_away", "expected_goals_against_per_game_away", "away_avg_xga"],
+        
+        # Cartões
+        "cards_per_game": ["cards_per_game", "cards_avg", "avg_cards", "average_cards", "cards_per_match"],
+        "cardsAVG_overall": ["cardsAVG_overall", "cards_per_game", "cards_avg", "avg_cards", "average_cards"],
+        "home_cards_per_game": ["home_cards_per_game", "cards_per_game_home", "home_cards_avg", "home_avg_cards"],
+        "cardsAVG_home": ["cardsAVG_home", "home_cards_per_game", "cards_per_game_home", "home_cards_avg"],
+        "away_cards_per_game": ["away_cards_per_game", "cards_per_game_away", "away_cards_avg", "away_avg_cards"],
+        "cardsAVG_away": ["cardsAVG_away", "away_cards_per_game", "cards_per_game_away", "away_cards_avg"],
+        "cardsTotal_overall": ["cardsTotal_overall", "total_cards", "cards_total", "cards", "all_cards"],
+        "cardsTotal_home": ["cardsTotal_home", "total_cards_home", "cards_total_home", "home_cards"],
+        "cardsTotal_away": ["cardsTotal_away", "total_cards_away", "cards_total_away", "away_cards"],
+        "yellow_cards": ["yellow_cards", "yellows", "cards_yellow", "CrdY", "YellowCards", "yellow"],
+        "red_cards": ["red_cards", "reds", "cards_red", "CrdR", "RedCards", "red"],
+        "over_3_5_cards_pct": ["over_3_5_cards_pct", "over_3_5_cards_percentage", "o35_cards_pct", "pct_over_35_cards"],
+        
+        # Escanteios
+        "corners_per_game": ["corners_per_game", "corners_avg", "avg_corners", "average_corners", "corners_per_match"],
+        "cornersTotalAVG_overall": ["cornersTotalAVG_overall", "corners_per_game", "corners_avg", "avg_corners"],
+        "home_corners_per_game": ["home_corners_per_game", "corners_per_game_home", "home_corners_avg", "home_avg_corners"],
+        "cornersTotalAVG_home": ["cornersTotalAVG_home", "home_corners_per_game", "corners_per_game_home", "home_corners_avg"],
+        "away_corners_per_game": ["away_corners_per_game", "corners_per_game_away", "away_corners_avg", "away_avg_corners"],
+        "cornersTotalAVG_away": ["cornersTotalAVG_away", "away_corners_per_game", "corners_per_game_away", "away_corners_avg"],
+        "corners_for": ["corners_for", "cornersTotal_overall", "corners", "CK", "Corners", "attacking_corners"],
+        "cornersTotal_overall": ["cornersTotal_overall", "corners_for", "corners", "total_corners_for"],
+        "corners_against": ["corners_against", "cornersAgainst_overall", "corners_against_total", "defensive_corners"],
+        "cornersAgainst_overall": ["cornersAgainst_overall", "corners_against", "corners_against_total"],
+        "cornersAVG_overall": ["cornersAVG_overall", "corners_for_avg", "corners_for_per_game", "avg_corners_for"],
+        "cornersAVG_home": ["cornersAVG_home", "corners_for_avg_home", "corners_for_per_game_home", "home_avg_corners_for"],
+        "cornersAVG_away": ["cornersAVG_away", "corners_for_avg_away", "corners_for_per_game_away", "away_avg_corners_for"],
+        "cornersAgainstAVG_overall": ["cornersAgainstAVG_overall", "corners_against_avg", "corners_against_per_game", "avg_corners_against"],
+        "cornersAgainstAVG_home": ["cornersAgainstAVG_home", "corners_against_avg_home", "corners_against_per_game_home", "home_avg_corners_against"],
+        "cornersAgainstAVG_away": ["cornersAgainstAVG_away", "corners_against_avg_away", "corners_against_per_game_away", "away_avg_corners_against"],
+        "over_9_5_corners_pct": ["over_9_5_corners_pct", "over_9_5_corners_percentage", "o95_corners_pct", "pct_over_95_corners"],
+        
+        # Chutes
+        "shotsAVG_overall": ["shotsAVG_overall", "shots_per_game", "shots_avg", "average_shots", "avg_shots"],
+        "shotsAVG_home": ["shotsAVG_home", "shots_per_game_home", "shots_avg_home", "home_avg_shots"],
+        "shotsAVG_away": ["shotsAVG_away", "shots_per_game_away", "shots_avg_away", "away_avg_shots"],
+        "shotsOnTargetAVG_overall": ["shotsOnTargetAVG_overall", "shots_on_target_per_game", "sot_avg", "shots_on_target_avg", "avg_shots_on_target"],
+        "shotsOnTargetAVG_home": ["shotsOnTargetAVG_home", "shots_on_target_per_game_home", "sot_avg_home", "home_avg_shots_on_target"],
+        "shotsOnTargetAVG_away": ["shotsOnTargetAVG_away", "shots_on_target_per_game_away", "sot_avg_away", "away_avg_shots_on_target"],
+        
+        # Posse de Bola
+        "possession": ["possession", "possessionAVG_overall", "possession_avg", "avg_possession", "Poss", "posesion"],
+        "possessionAVG_overall": ["possessionAVG_overall", "possession", "possession_avg", "average_possession"],
+        "home_possession": ["home_possession", "possessionAVG_home", "possession_home", "home_poss", "casa_posesion"],
+        "possessionAVG_home": ["possessionAVG_home", "home_possession", "possession_home", "home_average_possession"],
+        "away_possession": ["away_possession", "possessionAVG_away", "possession_away", "away_poss", "fora_posesion"],
+        "possessionAVG_away": ["possessionAVG_away", "away_possession", "possession_away", "away_average_possession"]
+    }
+    
+    # Extrair cada campo usando todos os nomes possíveis
+    for target_field, source_fields in field_mapping.items():
+        if target_field not in target:  # Somente se o campo ainda não existe no alvo
+            for field in source_fields:
+                if field in source:
+                    value = source[field]
+                    if value is not None and value != 'N/A' and value != '':
+                        try:
+                            # Para form e similares (campos de texto)
+                            if target_field in ["form", "home_form", "away_form", "formRun_overall", "formRun_home", "formRun_away"]:
+                                if isinstance(value, str):
+                                    target[target_field] = value[:5]  # Limitar a 5 caracteres
+                                    if target_field == "form":
+                                        logger.info(f"Encontrada forma: {value[:5]} em {path}.{field}")
+                                break
+                            
+                            # Para valores numéricos
+                            float_value = float(value)
+                            target[target_field] = float_value
+                            
+                            # Log para campos importantes (somente alguns para evitar spam)
+                            if target_field in ["played", "wins", "goals_scored", "xg", "form"]:
+                                logger.info(f"Encontrado {target_field}={float_value} em {path}.{field}")
+                                
+                            break
+                        except (ValueError, TypeError):
+                            pass
+    
+    # Verificar subchaves importantes
+    for subkey in ["stats", "statistics", "seasonStats", "data", "season_stats"]:
+        if subkey in source and isinstance(source[subkey], dict):
+            extract_stats_recursive(source[subkey], target, f"{path}.{subkey}")
+
+
+def validate_stats_for_agent(stats_data):
+    """
+    Valida os dados estatísticos antes de enviar para o agente IA.
+    
+    Args:
+        stats_data (dict): Dados formatados para enviar ao agente
+        
+    Returns:
+        dict: Dados validados e corrigidos
+    """
+    import logging
+    import copy
+    
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    if not stats_data or not isinstance(stats_data, dict):
+        logger.error("Dados estatísticos inválidos ou vazios")
+        return stats_data
+    
+    # Clonar dados para não modificar o original
+    validated_data = copy.deepcopy(stats_data)
+    
+    # Verificar e corrigir problemas em cada time
+    for team_key in ["home_team", "away_team"]:
+        if team_key not in validated_data:
+            continue
+            
+        team_data = validated_data[team_key]
+        team_name = validated_data.get("match_info", {}).get(team_key, "Time")
+        
+        # 1. Verificar forma inválida
+        if "form" in team_data:
+            form = team_data["form"]
+            
+            # Verificar se a forma é inválida (todos iguais ou ?????)
+            if form in ["WWWWW", "DDDDD", "LLLLL", "?????"]:
+                logger.warning(f"Forma inválida detectada para {team_name}: {form}")
+                
+                # Tentar derivar uma forma mais realista das estatísticas
+                if all(stat in team_data for stat in ["win_pct", "draw_pct", "loss_pct"]):
+                    import random
+                    
+                    # Usar as porcentagens para gerar uma forma mais realista
+                    new_form = ""
+                    for _ in range(5):
+                        r = random.random() * 100
+                        if r < team_data["win_pct"]:
+                            new_form += "W"
+                        elif r < (team_data["win_pct"] + team_data["draw_pct"]):
+                            new_form += "D"
+                        else:
+                            new_form += "L"
+                    
+                    logger.info(f"Forma corrigida para {team_name}: {form} -> {new_form}")
+                    team_data["form"] = new_form
+        
+        # 2. Verificar porcentagens inválidas
+        for field in ["win_pct", "draw_pct", "loss_pct", "clean_sheets_pct", 
+                    "btts_pct", "over_2_5_pct", "over_3_5_cards_pct", 
+                    "over_9_5_corners_pct"]:
+            if field in team_data and (team_data[field] < 0 or team_data[field] > 100):
+                logger.warning(f"Porcentagem inválida em {team_name}.{field}: {team_data[field]}")
+                team_data[field] = max(0, min(100, team_data[field]))
+        
+        # 3. Verificar consistência entre jogos e resultados
+        if "played" in team_data and team_data["played"] > 0:
+            if all(k in team_data for k in ["wins", "draws", "losses"]):
+                total = team_data["wins"] + team_data["draws"] + team_data["losses"]
+                if abs(total - team_data["played"]) > 1:  # Permitir pequena diferença
+                    logger.warning(f"Discrepância nos jogos de {team_name}: played={team_data['played']}, soma={total}")
+                    
+                    # Se a diferença é significativa, ajustar porcentagens
+                    if "win_pct" in team_data and "draw_pct" in team_data and "loss_pct" in team_data:
+                        # Recalcular porcentagens com base nos jogos
+                        if total > 0:
+                            team_data["win_pct"] = round((team_data["wins"] / total) * 100, 1)
+                            team_data["draw_pct"] = round((team_data["draws"] / total) * 100, 1)
+                            team_data["loss_pct"] = round((team_data["losses"] / total) * 100, 1)
+        
+        # 4. Verificar estatísticas de gols
+        if "goals_scored" in team_data and "goals_per_game" not in team_data and "played" in team_data and team_data["played"] > 0:
+            team_data["goals_per_game"] = round(team_data["goals_scored"] / team_data["played"], 2)
+            
+        if "goals_conceded" in team_data and "conceded_per_game" not in team_data and "played" in team_data and team_data["played"] > 0:
+            team_data["conceded_per_game"] = round(team_data["goals_conceded"] / team_data["played"], 2)
+    
+    # Verificar dados de H2H
+    if "h2h" in validated_data:
+        h2h = validated_data["h2h"]
+        
+        # Verificar se total_matches é consistente com os resultados
+        if "total_matches" in h2h and "home_wins" in h2h and "away_wins" in h2h and "draws" in h2h:
+            total = h2h["home_wins"] + h2h["away_wins"] + h2h["draws"]
+            if h2h["total_matches"] == 0 and total > 0:
+                logger.warning(f"H2H total_matches=0 mas soma={total}")
+                h2h["total_matches"] = total
+            elif h2h["total_matches"] > 0 and total > 0 and abs(h2h["total_matches"] - total) > 1:
+                logger.warning(f"Discrepância em H2H: total_matches={h2h['total_matches']}, soma={total}")
+                
+                # Recalcular porcentagens se necessário
+                if "over_2_5_pct" in h2h and "btts_pct" in h2h:
+                    # Nenhum ajuste automático, apenas log
+                    logger.warning("Porcentagens de H2H podem não ser precisas devido à discrepância nos totais")
+        
+        # Verificar porcentagens
+        for field in ["over_2_5_pct", "btts_pct"]:
+            if field in h2h and (h2h[field] < 0 or h2h[field] > 100):
+                logger.warning(f"Porcentagem inválida em h2h.{field}: {h2h[field]}")
+                h2h[field] = max(0, min(100, h2h[field]))
+    
+    logger.info("Validação de dados concluída com sucesso")
+    return validated_data
+
+
+def alternative_paths_extraction(api_data, formatted_data, home_team_name, away_team_name):
+    """
+    Busca estatísticas em caminhos alternativos específicos de algumas APIs.
+    
+    Args:
+        api_data (dict): Dados originais da API
+        formatted_data (dict): Dados formatados a serem preenchidos
+        home_team_name (str): Nome do time da casa
+        away_team_name (str): Nome do time visitante
+    """
+    import logging
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    # Extrair dados do caminho teams[].stats
+    if "teams" in api_data and isinstance(api_data["teams"], list):
+        for i, team in enumerate(api_data["teams"]):
+            if isinstance(team, dict) and "name" in team:
+                # Determinar se é time da casa ou visitante
+                is_home = False
+                is_away = False
+                
+                # Comparação direta
+                if team["name"] == home_team_name:
+                    is_home = True
+                elif team["name"] == away_team_name:
+                    is_away = True
+                
+                # Ou por correspondência parcial
+                if not is_home and not is_away:
+                    if home_team_name.lower() in team["name"].lower():
+                        is_home = True
+                    elif away_team_name.lower() in team["name"].lower():
+                        is_away = True
+                
+                # Se encontramos um time, extrair estatísticas
+                if is_home or is_away:
+                    target_dict = formatted_data["home_team"] if is_home else formatted_data["away_team"]
+                    target_name = home_team_name if is_home else away_team_name
+                    
+                    logger.info(f"Encontrados dados de time em teams[{i}] para {target_name}")
+                    
+                    # Extrair estatísticas
+                    if "stats" in team and isinstance(team["stats"], dict):
+                        logger.info(f"Extraindo estatísticas de teams[{i}].stats")
+                        extract_stats_recursive(team["stats"], target_dict, f"teams[{i}].stats")
+                    
+                    # Extrair diretamente do time
+                    extract_stats_recursive(team, target_dict, f"teams[{i}]")
+    
+    # Extrair dados do caminho statistics
+    if "statistics" in api_data:
+        stats = api_data["statistics"]
+        
+        if isinstance(stats, dict):
+            # Verificar home/away em statistics
+            for team_type in ["home", "away"]:
+                if team_type in stats and isinstance(stats[team_type], dict):
+                    target_dict = formatted_data["home_team"] if team_type == "home" else formatted_data["away_team"]
+                    logger.info(f"Extraindo estatísticas de statistics.{team_type}")
+                    extract_stats_recursive(stats[team_type], target_dict, f"statistics.{team_type}")
+            
+            # Verificar também structure mais plana com prefixos home_/away_
+            home_prefixed = {}
+            away_prefixed = {}
+            
+            for key, value in stats.items():
+                if key.startswith("home_"):
+                    home_prefixed[key.replace("home_", "")] = value
+                elif key.startswith("away_"):
+                    away_prefixed[key.replace("away_", "")] = value
+            
+            if home_prefixed:
+                logger.info(f"Extraindo estatísticas de statistics com prefixo home_")
+                extract_stats_recursive(home_prefixed, formatted_data["home_team"], "statistics.home_prefixed")
+            
+            if away_prefixed:
+                logger.info(f"Extraindo estatísticas de statistics com prefixo away_")
+                extract_stats_recursive(away_prefixed, formatted_data["away_team"], "statistics.away_prefixed")
+    
+    # Extrair dados do caminho lineup.home/away.statistics
+    if "lineup" in api_data and isinstance(api_data["lineup"], dict):
+        for team_type in ["home", "away"]:
+            if team_type in api_data["lineup"] and isinstance(api_data["lineup"][team_type], dict):
+                if "statistics" in api_data["lineup"][team_type]:
+                    target_dict = formatted_data["home_team"] if team_type == "home" else formatted_data["away_team"]
+                    logger.info(f"Extraindo estatísticas de lineup.{team_type}.statistics")
+                    extract_stats_recursive(api_data["lineup"][team_type]["statistics"], target_dict, f"lineup.{team_type}.statistics")
+    
+    # Extrair dados do caminho data.teams
+    if "data" in api_data and isinstance(api_data["data"], dict) and "teams" in api_data["data"]:
+        teams = api_data["data"]["teams"]
+        
+        if isinstance(teams, dict):
+            # Verificar home/away em data.teams
+            for team_type in ["home", "away"]:
+                if team_type in teams and isinstance(teams[team_type], dict):
+                    target_dict = formatted_data["home_team"] if team_type == "home" else formatted_data["away_team"]
+                    logger.info(f"Extraindo estatísticas de data.teams.{team_type}")
+                    extract_stats_recursive(teams[team_type], target_dict, f"data.teams.{team_type}")
@@ -0,0 +1,325 @@
+"""
+Transformação para o formato exato exigido pelo agente de IA.
+"""
+import logging
+
+from utils.prompt_adapter.common import extract_h2h_data
+
+logger = logging.getLogger("valueHunter.prompt_adapter")
+
+
+def transform_to_exact_format(api_data, home_team_name, away_team_name, selected_markets=None):
+    """
+    Transforma os dados da API no formato exato requerido pelo agente de IA.
+    
+    Args:
+        api_data (dict): Dados originais da API FootyStats
+        home_team_name (str): Nome do time da casa
+        away_team_name (str): Nome do time visitante
+        selected_markets (dict, optional): Dicionário de mercados selecionados
+        
+    Returns:
+        dict: Dados no formato exato requerido
+    """
+    import logging
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    # Inicializa a estrutura de dados exata requerida
+    formatted_data = {
+        "match_info": {
+            "home_team": home_team_name,
+            "away_team": away_team_name,
+            "league": "",
+            "league_id": None
+        },
+        "home_team": {
+            # Basic stats
+            "played": 0, "wins": 0, "draws": 0, "losses": 0,
+            "goals_scored": 0, "goals_conceded": 0,
+            "clean_sheets_pct": 0, "btts_pct": 0, "over_2_5_pct": 0,
+            # Home specific
+            "home_played": 0, "home_wins": 0, "home_draws": 0, "home_losses": 0,
+            "home_goals_scored": 0, "home_goals_conceded": 0,
+            # Advanced
+            "xg": 0, "xga": 0, "ppda": 0, "possession": 0,
+            # Card stats
+            "cards_total": 0, "cards_per_game": 0, "yellow_cards": 0, "red_cards": 0,
+            "over_3_5_cards_pct": 0, "home_cards_per_game": 0, "away_cards_per_game": 0,
+            # Corner stats
+            "corners_total": 0, "corners_per_game": 0, "corners_for": 0, "corners_against": 0,
+            "over_9_5_corners_pct": 0, "home_corners_per_game": 0, "away_corners_per_game": 0,
+            # Form (simplified)
+            "form": "", "recent_matches": []
+        },
+        "away_team": {
+            # Basic stats
+            "played": 0, "wins": 0, "draws": 0, "losses": 0,
+            "goals_scored": 0, "goals_conceded": 0,
+            "clean_sheets_pct": 0, "btts_pct": 0, "over_2_5_pct": 0,
+            # Away specific
+            "away_played": 0, "away_wins": 0, "away_draws": 0, "away_losses": 0,
+            "away_goals_scored": 0, "away_goals_conceded": 0,
+            # Advanced
+            "xg": 0, "xga": 0, "ppda": 0, "possession": 0,
+            # Card stats
+            "cards_total": 0, "cards_per_game": 0, "yellow_cards": 0, "red_cards": 0,
+            "over_3_5_cards_pct": 0, "home_cards_per_game": 0, "away_cards_per_game": 0,
+            # Corner stats
+            "corners_total": 0, "corners_per_game": 0, "corners_for": 0, "corners_against": 0,
+            "over_9_5_corners_pct": 0, "home_corners_per_game": 0, "away_corners_per_game": 0,
+            # Form (simplified)
+            "form": "", "recent_matches": []
+        },
+        "h2h": {
+            "total_matches": 0, "home_wins": 0, "away_wins": 0, "draws": 0,
+            "over_2_5_pct": 0, "btts_pct": 0, "avg_cards": 0, "avg_corners": 0,
+            "recent_matches": []
+        }
+    }
+    
+    # Se não houver dados da API, retorna a estrutura padrão
+    if not api_data or not isinstance(api_data, dict):
+        logger.warning("Dados da API inválidos ou vazios, retornando estrutura padrão")
+        return formatted_data
+    
+    try:
+        # Preenche informações da liga
+        if "basic_stats" in api_data and "league_id" in api_data["basic_stats"]:
+            formatted_data["match_info"]["league_id"] = api_data["basic_stats"]["league_id"]
+        
+        # Extrai estatísticas do time da casa e visitante
+        extract_team_data(api_data, formatted_data, "home")
+        extract_team_data(api_data, formatted_data, "away")
+        
+        # Extrai dados de confronto direto (H2H)
+        extract_h2h_data(api_data, formatted_data)
+        
+        # Log de sucesso
+        logger.info(f"Dados formatados com sucesso para {home_team_name} vs {away_team_name}")
+        return formatted_data
+        
+    except Exception as e:
+        logger.error(f"Erro ao formatar dados: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        # Retorna a estrutura padrão em caso de erro
+        return formatted_data
+
+
+def extract_team_data(api_data, formatted_data, team_type):
+    """
+    Extrai dados completos de um time a partir dos dados da API
+    
+    Args:
+        api_data (dict): Dados originais da API
+        formatted_data (dict): Estrutura de dados alvo para preencher
+        team_type (str): "home" ou "away"
+    """
+    team_key = f"{team_type}_team"
+    target_dict = formatted_data[team_key]
+    
+    # Verifica se temos dados básicos para o time
+    if "basic_stats" in api_data and team_key in api_data["basic_stats"]:
+        team_data = api_data["basic_stats"][team_key]
+        
+        # Extrair estatísticas de diferentes possíveis locais
+        stats_data = {}
+        
+        # Caso 1: stats direto no objeto
+        if "stats" in team_data and isinstance(team_data["stats"], dict):
+            stats_data = team_data["stats"]
+        
+        # Caso 2: stats aninhado (stats.stats)
+        elif "stats" in team_data and isinstance(team_data["stats"], dict) and "stats" in team_data["stats"]:
+            stats_data = team_data["stats"]["stats"]
+        
+        # Caso 3: stats diretamente no time_data
+        if not stats_data:
+            for key in ["played", "seasonMatchesPlayed_overall", "wins", "goals_scored"]:
+                if key in team_data:
+                    stats_data = team_data
+                    break
+        
+        # Extrair todos os campos de estatísticas disponíveis
+        if stats_data:
+            # Mapeamento de campo da API para campo no nosso formato
+            field_mapping = {
+                # Estatísticas Gerais
+                "played": ["played", "seasonMatchesPlayed_overall", "matches_played", "MP"],
+                "seasonMatchesPlayed_overall": ["seasonMatchesPlayed_overall", "matches_played", "MP"],
+                "wins": ["wins", "seasonWinsNum_overall", "W"],
+                "seasonWinsNum_overall": ["seasonWinsNum_overall", "wins", "W"],
+                "draws": ["draws", "seasonDrawsNum_overall", "D"],
+                "seasonDrawsNum_overall": ["seasonDrawsNum_overall", "draws", "D"],
+                "losses": ["losses", "seasonLossesNum_overall", "L"],
+                "seasonLossesNum_overall": ["seasonLossesNum_overall", "losses", "L"],
+                "win_pct": ["win_percentage", "winPercentage"],
+                "draw_pct": ["draw_percentage", "drawPercentage"],
+                "loss_pct": ["loss_percentage", "lossPercentage"],
+                "seasonPPG_overall": ["seasonPPG_overall", "ppg", "points_per_game"],
+                "seasonRecentPPG": ["seasonRecentPPG", "recent_ppg"],
+                "leaguePosition_overall": ["leaguePosition_overall", "league_position"],
+                
+                # Estatísticas Casa/Fora
+                "home_played": ["home_played", "seasonMatchesPlayed_home", "matches_played_home"],
+                "away_played": ["away_played", "seasonMatchesPlayed_away", "matches_played_away"],
+                "seasonMatchesPlayed_home": ["seasonMatchesPlayed_home", "home_played", "matches_played_home"],
+                "seasonMatchesPlayed_away": ["seasonMatchesPlayed_away", "away_played", "matches_played_away"],
+                "home_wins": ["home_wins", "seasonWinsNum_home", "wins_home"],
+                "away_wins": ["away_wins", "seasonWinsNum_away", "wins_away"],
+                "seasonWinsNum_home": ["seasonWinsNum_home", "home_wins", "wins_home"],
+                "seasonWinsNum_away": ["seasonWinsNum_away", "away_wins", "wins_away"],
+                "home_draws": ["home_draws", "seasonDrawsNum_home", "draws_home"],
+                "away_draws": ["away_draws", "seasonDrawsNum_away", "draws_away"],
+                "seasonDrawsNum_home": ["seasonDrawsNum_home", "home_draws", "draws_home"],
+                "seasonDrawsNum_away": ["seasonDrawsNum_away", "away_draws", "draws_away"],
+                "home_losses": ["home_losses", "seasonLossesNum_home", "losses_home"],
+                "away_losses": ["away_losses", "seasonLossesNum_away", "losses_away"],
+                "seasonLossesNum_home": ["seasonLossesNum_home", "home_losses", "losses_home"],
+                "seasonLossesNum_away": ["seasonLossesNum_away", "away_losses", "losses_away"],
+                "seasonPPG_home": ["seasonPPG_home", "home_ppg", "points_per_game_home"],
+                "seasonPPG_away": ["seasonPPG_away", "away_ppg", "points_per_game_away"],
+                "leaguePosition_home": ["leaguePosition_home", "home_league_position"],
+                "leaguePosition_away": ["leaguePosition_away", "away_league_position"],
+                "home_form": ["home_form", "formRun_home", "current_form_home"],
+                "away_form": ["away_form", "formRun_away", "current_form_away"],
+                "formRun_home": ["formRun_home", "home_form", "current_form_home"],
+                "formRun_away": ["formRun_away", "away_form", "current_form_away"],
+                
+                # Estatísticas de Gols
+                "goals_scored": ["goals_scored", "seasonScoredNum_overall", "scored", "GF"],
+                "seasonScoredNum_overall": ["seasonScoredNum_overall", "goals_scored", "scored", "GF"],
+                "goals_conceded": ["goals_conceded", "seasonConcededNum_overall", "conceded", "GA"],
+                "seasonConcededNum_overall": ["seasonConcededNum_overall", "goals_conceded", "conceded", "GA"],
+                "home_goals_scored": ["home_goals_scored", "seasonScoredNum_home", "goals_scored_home"],
+                "seasonScoredNum_home": ["seasonScoredNum_home", "home_goals_scored", "goals_scored_home"],
+                "away_goals_scored": ["away_goals_scored", "seasonScoredNum_away", "goals_scored_away"],
+                "seasonScoredNum_away": ["seasonScoredNum_away", "away_goals_scored", "goals_scored_away"],
+                "home_goals_conceded": ["home_goals_conceded", "seasonConcededNum_home", "goals_conceded_home"],
+                "seasonConcededNum_home": ["seasonConcededNum_home", "home_goals_conceded", "goals_conceded_home"],
+                "away_goals_conceded": ["away_goals_conceded", "seasonConcededNum_away", "goals_conceded_away"],
+                "seasonConcededNum_away": ["seasonConcededNum_away", "away_goals_conceded", "goals_conceded_away"],
+                "goals_per_game": ["goals_per_game", "gpg", "goals_per_match"],
+                "conceded_per_game": ["conceded_per_game", "cpg", "conceded_per_match"],
+                "seasonGoalsTotal_overall": ["seasonGoalsTotal_overall", "total_goals"],
+                "seasonGoalsTotal_home": ["seasonGoalsTotal_home", "total_goals_home"],
+                "seasonGoalsTotal_away": ["seasonGoalsTotal_away", "total_goals_away"],
+                "clean_sheets_pct": ["clean_sheets_pct", "clean_sheet_percentage", "cs_pct"],
+                "seasonCSPercentage_overall": ["seasonCSPercentage_overall", "clean_sheet_percentage", "cs_pct"],
+                "seasonCS_overall": ["seasonCS_overall", "clean_sheets", "cs"],
+                "seasonCS_home": ["seasonCS_home", "home_clean_sheets", "cs_home"],
+                "seasonCS_away": ["seasonCS_away", "away_clean_sheets", "cs_away"],
+                "btts_pct": ["btts_pct", "btts_percentage", "both_teams_scored_pct"],
+                "seasonBTTSPercentage_overall": ["seasonBTTSPercentage_overall", "btts_percentage", "both_teams_to_score_pct"],
+                "over_2_5_pct": ["over_2_5_pct", "over_2_5_percentage", "o25_pct"],
+                "seasonOver25Percentage_overall": ["seasonOver25Percentage_overall", "over_2_5_percentage", "o25_pct"],
+                
+                # Expected Goals
+                "xg": ["xg", "xG", "expected_goals", "xg_for"],
+                "xg_for_overall": ["xg_for_overall", "xg", "xG", "expected_goals"],
+                "xga": ["xga", "xGA", "expected_goals_against", "xg_against"],
+                "xg_against_overall": ["xg_against_overall", "xga", "xGA", "expected_goals_against"],
+                "home_xg": ["home_xg", "xg_home", "xg_for_home"],
+                "xg_for_home": ["xg_for_home", "home_xg", "xg_home"],
+                "away_xg": ["away_xg", "xg_away", "xg_for_away"],
+                "xg_for_away": ["xg_for_away", "away_xg", "xg_away"],
+                "home_xga": ["home_xga", "xga_home", "xg_against_home"],
+                "xg_against_home": ["xg_against_home", "home_xga", "xga_home"],
+                "away_xga": ["away_xga", "xga_away", "xg_against_away"],
+                "xg_against_away": ["xg_against_away", "away_xga", "xga_away"],
+                "xg_for_avg_overall": ["xg_for_avg_overall", "xg_per_game", "expected_goals_per_game"],
+                "xg_for_avg_home": ["xg_for_avg_home", "xg_per_game_home", "expected_goals_per_game_home"],
+                "xg_for_avg_away": ["xg_for_avg_away", "xg_per_game_away", "expected_goals_per_game_away"],
+                "xg_against_avg_overall": ["xg_against_avg_overall", "xga_per_game", "expected_goals_against_per_game"],
+                "xg_against_avg_home": ["xg_against_avg_home", "xga_per_game_home", "expected_goals_against_per_game_home"],
+                "xg_against_avg_away": ["xg_against_avg_away", "xga_per_game_away", "expected_goals_against_per_game_away"],
+                
+                # Estatísticas de Cartões
+                "cards_per_game": ["cards_per_game", "cards_avg", "avg_cards"],
+                "cardsAVG_overall": ["cardsAVG_overall", "cards_per_game", "cards_avg"],
+                "home_cards_per_game": ["home_cards_per_game", "cards_per_game_home", "home_cards_avg"],
+                "cardsAVG_home": ["cardsAVG_home", "home_cards_per_game", "cards_per_game_home"],
+                "away_cards_per_game": ["away_cards_per_game", "cards_per_game_away", "away_cards_avg"],
+                "cardsAVG_away": ["cardsAVG_away", "away_cards_per_game", "cards_per_game_away"],
+                "cardsTotal_overall": ["cardsTotal_overall", "total_cards", "cards_total"],
+                "cardsTotal_home": ["cardsTotal_home", "total_cards_home", "cards_total_home"],
+                "cardsTotal_away": ["cardsTotal_away", "total_cards_away", "cards_total_away"],
+                "yellow_cards": ["yellow_cards", "yellows", "cards_yellow"],
+                "red_cards": ["red_cards", "reds", "cards_red"],
+                "over_3_5_cards_pct": ["over_3_5_cards_pct", "over_3_5_cards_percentage", "o35_cards_pct"],
+                
+                # Estatísticas de Escanteios
+                "corners_per_game": ["corners_per_game", "corners_avg", "avg_corners"],
+                "cornersTotalAVG_overall": ["cornersTotalAVG_overall", "corners_per_game", "corners_avg"],
+                "home_corners_per_game": ["home_corners_per_game", "corners_per_game_home", "home_corners_avg"],
+                "cornersTotalAVG_home": ["cornersTotalAVG_home", "home_corners_per_game", "corners_per_game_home"],
+                "away_corners_per_game": ["away_corners_per_game", "corners_per_game_away", "away_corners_avg"],
+                "cornersTotalAVG_away": ["cornersTotalAVG_away", "away_corners_per_game", "corners_per_game_away"],
+                "corners_for": ["corners_for", "cornersTotal_overall", "corners"],
+                "cornersTotal_overall": ["cornersTotal_overall", "corners_for", "corners"],
+                "corners_against": ["corners_against", "cornersAgainst_overall", "corners_against_total"],
+                "cornersAgainst_overall": ["cornersAgainst_overall", "corners_against", "corners_against_total"],
+                "cornersAVG_overall": ["cornersAVG_overall", "corners_for_avg", "corners_for_per_game"],
+                "cornersAVG_home": ["cornersAVG_home", "corners_for_avg_home", "corners_for_per_game_home"],
+                "cornersAVG_away": ["cornersAVG_away", "corners_for_avg_away", "corners_for_per_game_away"],
+                "cornersAgainstAVG_overall": ["cornersAgainstAVG_overall", "corners_against_avg", "corners_against_per_game"],
+                "cornersAgainstAVG_home": ["cornersAgainstAVG_home", "corners_against_avg_home", "corners_against_per_game_home"],
+                "cornersAgainstAVG_away": ["cornersAgainstAVG_away", "corners_against_avg_away", "corners_against_per_game_away"],
+                "over_9_5_corners_pct": ["over_9_5_corners_pct", "over_9_5_corners_percentage", "o95_corners_pct"],
+                
+                # Estatísticas de Chutes
+                "shotsAVG_overall": ["shotsAVG_overall", "shots_per_game", "shots_avg"],
+                "shotsAVG_home": ["shotsAVG_home", "shots_per_game_home", "shots_avg_home"],
+                "shotsAVG_away": ["shotsAVG_away", "shots_per_game_away", "shots_avg_away"],
+                "shotsOnTargetAVG_overall": ["shotsOnTargetAVG_overall", "shots_on_target_per_game", "sot_avg"],
+                "shotsOnTargetAVG_home": ["shotsOnTargetAVG_home", "shots_on_target_per_game_home", "sot_avg_home"],
+                "shotsOnTargetAVG_away": ["shotsOnTargetAVG_away", "shots_on_target_per_game_away", "sot_avg_away"],
+                
+                # Posse de Bola
+                "possession": ["possession", "possessionAVG_overall", "possession_avg"],
+                "possessionAVG_overall": ["possessionAVG_overall", "possession", "possession_avg"],
+                "home_possession": ["home_possession", "possessionAVG_home", "possession_home"],
+                "possessionAVG_home": ["possessionAVG_home", "home_possession", "possession_home"],
+                "away_possession": ["away_possession", "possessionAVG_away", "possession_away"],
+                "possessionAVG_away": ["possessionAVG_away", "away_possession", "possession_away"],
+            }
+            
+            # Extrai cada campo, buscando em múltiplos nomes possíveis
+            for target_field, source_fields in field_mapping.items():
+                for field in source_fields:
+                    if field in stats_data:
+                        value = stats_data[field]
+                        try:
+                            # Caso especial para campos de texto como form
+                            if target_field in ["form", "home_form", "away_form", "formRun_overall", "formRun_home", "formRun_away"]:
+                                if isinstance(value, str):
+                                    target_dict[target_field] = value
+                                break
+                            # Para valores numéricos
+                            elif value is not None and value != 'N/A':
+                                target_dict[target_field] = float(value)
+                                break
+                        except (ValueError, TypeError):
+                            # Ignorar conversão falha
+                            pass
+    
+    # Buscar em advanced_stats
+    if "advanced_stats" in api_data and team_type in api_data["advanced_stats"]:
+        adv_stats = api_data["advanced_stats"][team_type]
+        
+        # Mapeamento para stats avançadas
+        adv_mapping = {
+            "xg": ["xg", "xG", "expected_goals"],
+            "xga": ["xga", "xGA", "expected_goals_against"],
+            "ppda": ["ppda", "passes_per_defensive_action", "PPDA"],
+            "possession": ["possession", "possessionAVG", "possession_avg"]
+        }
+        
+        for target_field, source_fields in adv_mapping.items():
+            for field in source_fields:
+                if field in adv_stats and adv_stats[field] is not None:
+                    try:
+                        target_dict[target_field] = float(adv_stats[field])
+                        break
+                    except (ValueError, TypeError):
+                        pass
@@ -0,0 +1,440 @@
+"""
+Transformação para o formato altamente otimizado do prompt.
+"""
+import logging
+
+from utils.prompt_adapter.common import ensure_critical_fields
+
+logger = logging.getLogger("valueHunter.prompt_adapter")
+
+
+def transform_to_highly_optimized_data(api_data, home_team_name, away_team_name, selected_markets=None):
+    """
+    Transform API data into a properly structured format with all essential fields.
+    
+    Args:
+        api_data (dict): Original API data from FootyStats
+        home_team_name (str): Name of home team
+        away_team_name (str): Name of away team
+        selected_markets (dict, optional): Dictionary of selected markets to filter data
+        
+    Returns:
+        dict: Highly optimized data structure with minimal footprint
+    """
+    import logging
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    try:
+        # Initialize with the correct structure - FIXO: usado match_info e home_team/away_team
+        optimized_data = {
+            "match_info": {  # Changed from "match" to "match_info"
+                "home_team": home_team_name,  # Changed from "home" to "home_team"
+                "away_team": away_team_name,  # Changed from "away" to "away_team"
+                "league": "",
+                "league_id": None
+            },
+            "home_team": {},  # Changed from "home" to "home_team"
+            "away_team": {},  # Changed from "away" to "away_team"
+            "h2h": {}
+        }
+        
+        # Check if we have valid API data
+        if not api_data or not isinstance(api_data, dict):
+            logger.error("Invalid API data provided")
+            return optimized_data
+        
+        # Debug: Log API data structure
+        logger.info(f"API data keys: {list(api_data.keys())}")
+        if "basic_stats" in api_data:
+            logger.info(f"basic_stats keys: {list(api_data['basic_stats'].keys())}")
+        
+        # Fill in league info
+        if "basic_stats" in api_data and "league_id" in api_data["basic_stats"]:
+            optimized_data["match_info"]["league_id"] = api_data["basic_stats"]["league_id"]
+        
+        # ENSURE ALL ESSENTIAL STATS ARE INCLUDED - don't rely on selected markets
+        essential_stats = {
+            # Basic stats
+            "played", "wins", "draws", "losses", 
+            "goals_scored", "goals_conceded", 
+            "clean_sheets_pct", "btts_pct", "over_2_5_pct",
+            
+            # Home/Away specific
+            "home_played", "home_wins", "home_draws", "home_losses",
+            "home_goals_scored", "home_goals_conceded",
+            "away_played", "away_wins", "away_draws", "away_losses",
+            "away_goals_scored", "away_goals_conceded",
+            
+            # Advanced
+            "xg", "xga", "ppda", "possession",
+            
+            # Cards
+            "cards_total", "cards_per_game", "yellow_cards", "red_cards",
+            "over_3_5_cards_pct", "home_cards_per_game", "away_cards_per_game",
+            
+            # Corners
+            "corners_total", "corners_per_game", "corners_for", "corners_against",
+            "over_9_5_corners_pct", "home_corners_per_game", "away_corners_per_game"
+        }
+        
+        # Extract home team stats - use all essential stats
+        home_stats = extract_expanded_team_stats(api_data, "home", essential_stats)
+        optimized_data["home_team"] = home_stats
+        
+        # Extract away team stats - use all essential stats
+        away_stats = extract_expanded_team_stats(api_data, "away", essential_stats)
+        optimized_data["away_team"] = away_stats
+        
+        # Extract complete h2h data
+        optimized_data["h2h"] = extract_expanded_h2h(api_data)
+        
+        # Add form data
+        optimized_data["home_team"]["form"] = extract_form_string(api_data, "home")
+        optimized_data["away_team"]["form"] = extract_form_string(api_data, "away")
+        
+        # Add fallbacks for critical fields
+        ensure_critical_fields(optimized_data, home_team_name, away_team_name)
+        
+        # Debug log - Verificar campos extraídos
+        logger.info(f"Home stats extracted: {list(home_stats.keys())}")
+        logger.info(f"Away stats extracted: {list(away_stats.keys())}")
+        logger.info(f"H2H stats extracted: {list(optimized_data['h2h'].keys())}")
+        
+        logger.info(f"Created complete data structure for {home_team_name} vs {away_team_name}")
+        return optimized_data
+        
+    except Exception as e:
+        logger.error(f"Error creating optimized data: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return {
+            "match_info": {"home_team": home_team_name, "away_team": away_team_name},
+            "home_team": {}, 
+            "away_team": {},
+            "h2h": {}
+        }
+
+
+def extract_expanded_team_stats(api_data, team_type, essential_stats):
+    """
+    Extract comprehensive team statistics with fallbacks for missing data.
+    
+    Args:
+        api_data (dict): Original API data
+        team_type (str): "home" or "away"
+        essential_stats (set): Set of essential stat names to include
+        
+    Returns:
+        dict: Complete stats dictionary with all essential fields
+    """
+    stats = {}
+    
+    # Initialize with default values for all essential stats
+    for stat in essential_stats:
+        stats[stat] = 0
+    
+    # Fill in form placeholder
+    stats["form"] = "?????"
+    stats["recent_matches"] = []
+    
+    # If no valid data, return defaults
+    if not api_data or "basic_stats" not in api_data:
+        return stats
+    
+    # Try to extract real data
+    team_key = f"{team_type}_team"
+    if team_key in api_data["basic_stats"]:
+        team_data = api_data["basic_stats"][team_key]
+        
+        # Debug log
+        logger.info(f"{team_type}_team keys: {list(team_data.keys() if isinstance(team_data, dict) else [])}")
+        
+        # Try different possible locations and formats for stats
+        if "stats" in team_data:
+            raw_stats = None
+            if isinstance(team_data["stats"], dict):
+                if "stats" in team_data["stats"]:
+                    raw_stats = team_data["stats"]["stats"]
+                else:
+                    raw_stats = team_data["stats"]
+            
+            if raw_stats:
+                # Debug log
+                logger.info(f"{team_type} raw_stats keys: {list(raw_stats.keys() if isinstance(raw_stats, dict) else [])}")
+                
+                # Map API fields to our essential stats with multiple possible keys
+                field_mapping = {
+                    "played": ["matches_played", "seasonMatchesPlayed_overall", "MP"],
+                    "wins": ["wins", "seasonWinsNum_overall", "W"],
+                    "draws": ["draws", "seasonDrawsNum_overall", "D"],
+                    "losses": ["losses", "seasonLossesNum_overall", "L"],
+                    "goals_scored": ["goals_scored", "seasonGoals_overall", "Gls", "goals"],
+                    "goals_conceded": ["goals_conceded", "seasonConceded_overall", "GA"],
+                    "xg": ["xG", "xg", "xg_for_overall", "expected_goals"],
+                    "xga": ["xGA", "xga", "xg_against_avg_overall"],
+                    "possession": ["possession", "possessionAVG_overall", "Poss"],
+                    "clean_sheets_pct": ["clean_sheet_percentage", "seasonCSPercentage_overall"],
+                    "btts_pct": ["btts_percentage", "seasonBTTSPercentage_overall"],
+                    "over_2_5_pct": ["over_2_5_percentage", "seasonOver25Percentage_overall"],
+                    "home_played": ["matches_played_home", "seasonMatchesPlayed_home"],
+                    "home_wins": ["home_wins", "seasonWinsNum_home"],
+                    "home_draws": ["home_draws", "seasonDrawsNum_home"],
+                    "home_losses": ["home_losses", "seasonLossesNum_home"],
+                    "home_goals_scored": ["goals_scored_home", "seasonGoals_home"],
+                    "home_goals_conceded": ["goals_conceded_home", "seasonConceded_home"],
+                    "away_played": ["matches_played_away", "seasonMatchesPlayed_away"],
+                    "away_wins": ["away_wins", "seasonWinsNum_away"],
+                    "away_draws": ["away_draws", "seasonDrawsNum_away"],
+                    "away_losses": ["away_losses", "seasonLossesNum_away"],
+                    "away_goals_scored": ["goals_scored_away", "seasonGoals_away"],
+                    "away_goals_conceded": ["goals_conceded_away", "seasonConceded_away"],
+                    "cards_total": ["cards_total", "seasonCrdYNum_overall", "CrdY"],
+                    "yellow_cards": ["yellow_cards", "seasonCrdYNum_overall", "CrdY"],
+                    "red_cards": ["red_cards", "seasonCrdRNum_overall", "CrdR"],
+                    "over_3_5_cards_pct": ["over_3_5_cards_percentage"],
+                    "corners_total": ["corners_total"],
+                    "corners_for": ["corners_for", "seasonCornersFor_overall", "CK"],
+                    "corners_against": ["corners_against", "seasonCornersAgainst_overall"],
+                    "over_9_5_corners_pct": ["over_9_5_corners_percentage"],
+                }
+                
+                # Extract fields using mapping
+                for stat_name, api_keys in field_mapping.items():
+                    for key in api_keys:
+                        if key in raw_stats:
+                            value = raw_stats[key]
+                            # Validate and convert value
+                            if value is not None and value != 'N/A':
+                                try:
+                                    stats[stat_name] = float(value)
+                                    break  # Found valid value, stop looking
+                                except (ValueError, TypeError):
+                                    pass  # Continue to next key if value can't be converted
+        
+        # Try to get PPDA from advanced_stats if available
+        if "advanced_stats" in api_data and team_type in api_data["advanced_stats"]:
+            adv_stats = api_data["advanced_stats"][team_type]
+            ppda_keys = ["ppda", "passes_per_defensive_action"]
+            for key in ppda_keys:
+                if key in adv_stats and adv_stats[key] is not None:
+                    try:
+                        stats["ppda"] = float(adv_stats[key])
+                        break
+                    except (ValueError, TypeError):
+                        pass
+        
+        # Calculate derived statistics
+        # Example: if we have enough games played, calculate per-game stats
+        if stats["played"] > 0:
+            if stats["cards_total"] > 0:
+                stats["cards_per_game"] = round(stats["cards_total"] / stats["played"], 2)
+            if stats["corners_for"] > 0 or stats["corners_against"] > 0:
+                stats["corners_total"] = stats["corners_for"] + stats["corners_against"]
+                stats["corners_per_game"] = round(stats["corners_total"] / stats["played"], 2)
+    
+    return stats
+
+
+def extract_expanded_h2h(api_data):
+    """
+    Extract comprehensive head-to-head data.
+    
+    Args:
+        api_data (dict): Original API data
+        
+    Returns:
+        dict: Complete H2H data
+    """
+    h2h = {
+        "total_matches": 0,
+        "home_wins": 0,
+        "away_wins": 0,
+        "draws": 0,
+        "over_2_5_pct": 0,
+        "btts_pct": 0,
+        "avg_cards": 0,
+        "avg_corners": 0,
+        "recent_matches": []
+    }
+    
+    if not api_data:
+        return h2h
+    
+    # Check for H2H data in different locations
+    h2h_data = None
+    
+    # Direct h2h property
+    if "head_to_head" in api_data:
+        h2h_data = api_data["head_to_head"]
+    # Inside match_details
+    elif "match_details" in api_data and api_data["match_details"]:
+        if "h2h" in api_data["match_details"]:
+            h2h_data = api_data["match_details"]["h2h"]
+    
+    # If we found H2H data, extract it
+    if h2h_data and isinstance(h2h_data, dict):
+        # Map API fields to our fields
+        field_mapping = {
+            "total_matches": ["total_matches", "matches"],
+            "home_wins": ["home_wins"],
+            "away_wins": ["away_wins"],
+            "draws": ["draws"],
+            "over_2_5_pct": ["over_2_5_percentage"],
+            "btts_pct": ["btts_percentage"],
+            "avg_cards": ["average_cards"],
+            "avg_corners": ["average_corners"]
+        }
+        
+        # Extract each field
+        for h2h_field, api_keys in field_mapping.items():
+            for key in api_keys:
+                if key in h2h_data and h2h_data[key] is not None:
+                    try:
+                        h2h[h2h_field] = float(h2h_data[key])
+                        break
+                    except (ValueError, TypeError):
+                        pass
+        
+        # Extract recent matches if available
+        if "matches" in h2h_data and isinstance(h2h_data["matches"], list):
+            h2h["recent_matches"] = h2h_data["matches"][:5]  # Take only the 5 most recent
+    
+    return h2h
+
+
+def extract_form_string(api_data, team_type):
+    """
+    Extrai forma de um time de várias fontes possíveis nos dados da API.
+    Versão otimizada que prioriza team_last_matches.
+    
+    Args:
+        api_data (dict): Dados brutos da API
+        team_type (str): "home" ou "away"
+        
+    Returns:
+        str: String de forma como "WDLWD" ou None se não encontrada
+    """
+    import logging
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    # Fonte 1: team_last_matches (melhor fonte)
+    if "team_last_matches" in api_data and team_type in api_data["team_last_matches"]:
+        matches = api_data["team_last_matches"][team_type]
+        if isinstance(matches, list) and len(matches) > 0:
+            form = ""
+            # Apenas os 5 jogos mais recentes (os primeiros na lista)
+            for match in matches[:5]:
+                if isinstance(match, dict) and "result" in match:
+                    form += match["result"]
+            
+            if form and len(form) > 0:
+                logger.info(f"Forma extraída de team_last_matches.{team_type}: {form}")
+                return form[:5]  # Garantir que só temos 5 caracteres
+    
+    # Fonte 2: team_form (outra fonte comum)
+    if "team_form" in api_data and team_type in api_data["team_form"]:
+        form_data = api_data["team_form"][team_type]
+        if isinstance(form_data, list) and len(form_data) > 0:
+            form = ""
+            for match in form_data[:5]:
+                if isinstance(match, dict) and "result" in match:
+                    form += match["result"]
+            
+            if form and len(form) > 0:
+                logger.info(f"Forma extraída de team_form.{team_type}: {form}")
+                return form[:5]
+    
+    # Fonte 3: recent_form nos dados do time
+    if "team_stats" in api_data and team_type in api_data["team_stats"]:
+        team_stats = api_data["team_stats"][team_type]
+        if "recent_form" in team_stats and isinstance(team_stats["recent_form"], str):
+            form = team_stats["recent_form"]
+            if len(form) > 0:
+                logger.info(f"Forma extraída de team_stats.{team_type}.recent_form: {form}")
+                return form[:5]
+    
+    # Fonte 4: formRun_overall nos dados do time
+    if "team_info" in api_data and team_type in api_data["team_info"]:
+        team_info = api_data["team_info"][team_type]
+        if "formRun_overall" in team_info and isinstance(team_info["formRun_overall"], str):
+            form = team_info["formRun_overall"]
+            if len(form) > 0:
+                logger.info(f"Forma extraída de team_info.{team_type}.formRun_overall: {form}")
+                return form[:5]
+    
+    # Não foi possível encontrar dados de forma
+    logger.warning(f"Não foi possível extrair forma para {team_type}")
+    return None
+
+
+def ensure_recent_matches(formatted_data, home_team_name, away_team_name):
+    """
+    Ensure both teams have recent matches data WITHOUT using fictional English teams
+    
+    Args:
+        formatted_data (dict): Target data structure
+        home_team_name (str): Name of home team
+        away_team_name (str): Name of away team
+    """
+    # Generate minimal data structure for home team if needed
+    if not formatted_data["home_team"]["recent_matches"]:
+        form = formatted_data["home_team"]["form"]
+        
+        # If no form data, use "?????"
+        if not form:
+            form = "?????"
+            formatted_data["home_team"]["form"] = form
+            
+        # Create empty structure without fictional teams
+        recent_matches = []
+        for i in range(min(5, len(form))):
+            result = form[i] if i < len(form) else "?"
+            recent_matches.append({
+                "opponent": "Sin datos",  # "No data" in Spanish, more appropriate for South American teams
+                "result": result,
+                "score": "0-0",
+                "date": f"2025-03-{10-i:02d}"
+            })
+            
+        formatted_data["home_team"]["recent_matches"] = recent_matches
+    
+    # Generate minimal data structure for away team if needed
+    if not formatted_data["away_team"]["recent_matches"]:
+        form = formatted_data["away_team"]["form"]
+        
+        # If no form data, use "?????"
+        if not form:
+            form = "?????"
+            formatted_data["away_team"]["form"] = form
+            
+        # Create empty structure without fictional teams
+        recent_matches = []
+        for i in range(min(5, len(form))):
+            result = form[i] if i < len(form) else "?"
+            recent_matches.append({
+                "opponent": "Sin datos",  # "No data" in Spanish, more appropriate for South American teams
+                "result": result,
+                "score": "0-0",
+                "date": f"2025-03-{10-i:02d}"
+            })
+            
+        formatted_data["away_team"]["recent_matches"] = recent_matches
+    
+    # Generate minimal H2H recent matches if needed
+    if not formatted_data["h2h"]["recent_matches"]:
+        # Create minimal structure for h2h matches
+        total_matches = int(formatted_data["h2h"]["total_matches"])
+        
+        if total_matches > 0:
+            recent_matches = []
+            
+            for i in range(min(5, total_matches)):
+                recent_matches.append({
+                    "date": f"Sin fecha",
+                    "home_team": home_team_name,
+                    "away_team": away_team_name,
+                    "score": "Sin datos",
+                    "competition": "Sin datos"
+                })
+                
+            formatted_data["h2h"]["recent_matches"] = recent_matches
@@ -0,0 +1,321 @@
+"""
+Transformação para a estrutura otimizada e achatada do prompt.
+"""
+import logging
+
+from utils.prompt_adapter.common import ensure_critical_fields, get_value
+
+logger = logging.getLogger("valueHunter.prompt_adapter")
+
+
+def transform_to_optimized_data(api_data, home_team_name, away_team_name, selected_markets=None):
+    """
+    Transform API data into a more optimized, flattened structure
+    
+    Args:
+        api_data (dict): Original API data from FootyStats
+        home_team_name (str): Name of home team
+        away_team_name (str): Name of away team
+        selected_markets (dict, optional): Dictionary of selected markets to filter data
+        
+    Returns:
+        dict: Optimized data structure
+    """
+    import logging
+    logger = logging.getLogger("valueHunter.prompt_adapter")
+    
+    try:
+        # Initialize the optimized structure - USING THE EXPECTED FORMAT
+        optimized_data = {
+            "match_info": {
+                "home_team": home_team_name,
+                "away_team": away_team_name,
+                "league": "",
+                "league_id": None
+            },
+            "home_team": {
+                # Basic stats
+                "played": 0,
+                "wins": 0,
+                "draws": 0,
+                "losses": 0,
+                "goals_scored": 0,
+                "goals_conceded": 0,
+                "clean_sheets_pct": 0,
+                "btts_pct": 0,
+                "over_2_5_pct": 0,
+                # Home specific
+                "home_played": 0,
+                "home_wins": 0,
+                "home_draws": 0,
+                "home_losses": 0,
+                "home_goals_scored": 0,
+                "home_goals_conceded": 0,
+                # Advanced
+                "xg": 0,
+                "xga": 0,
+                "ppda": 0,
+                "possession": 0,
+                # Card stats
+                "cards_total": 0,
+                "cards_per_game": 0,
+                "yellow_cards": 0,
+                "red_cards": 0,
+                "over_3_5_cards_pct": 0,
+                "home_cards_per_game": 0,
+                "away_cards_per_game": 0,
+                # Corner stats
+                "corners_total": 0,
+                "corners_per_game": 0,
+                "corners_for": 0,
+                "corners_against": 0,
+                "over_9_5_corners_pct": 0,
+                "home_corners_per_game": 0,
+                "away_corners_per_game": 0,
+                # Form (simplified)
+                "form": "",
+                "recent_matches": []
+            },
+            "away_team": {
+                # Copy of the same structure for away team
+                "played": 0,
+                "wins": 0,
+                "draws": 0,
+                "losses": 0,
+                "goals_scored": 0,
+                "goals_conceded": 0,
+                "clean_sheets_pct": 0,
+                "btts_pct": 0,
+                "over_2_5_pct": 0,
+                # Away specific
+                "away_played": 0,
+                "away_wins": 0,
+                "away_draws": 0,
+                "away_losses": 0,
+                "away_goals_scored": 0,
+                "away_goals_conceded": 0,
+                # Advanced
+                "xg": 0,
+                "xga": 0,
+                "ppda": 0,
+                "possession": 0,
+                # Card stats
+                "cards_total": 0,
+                "cards_per_game": 0,
+                "yellow_cards": 0,
+                "red_cards": 0,
+                "over_3_5_cards_pct": 0,
+                "home_cards_per_game": 0,
+                "away_cards_per_game": 0,
+                # Corner stats
+                "corners_total": 0,
+                "corners_per_game": 0,
+                "corners_for": 0,
+                "corners_against": 0,
+                "over_9_5_corners_pct": 0,
+                "home_corners_per_game": 0,
+                "away_corners_per_game": 0,
+                # Form (simplified)
+                "form": "",
+                "recent_matches": []
+            },
+            "h2h": {
+                "total_matches": 0,
+                "home_wins": 0,
+                "away_wins": 0,
+                "draws": 0,
+                "over_2_5_pct": 0,
+                "btts_pct": 0,
+                "avg_cards": 0,
+                "avg_corners": 0,
+                "recent_matches": []
+            }
+        }
+        
+        # Check if we have valid API data
+        if not api_data or not isinstance(api_data, dict):
+            logger.error("Invalid API data provided")
+            return optimized_data
+        
+        # Fill in league info
+        if "basic_stats" in api_data and "league_id" in api_data["basic_stats"]:
+            optimized_data["match_info"]["league_id"] = api_data["basic_stats"]["league_id"]
+            
+        # Extract home team stats
+        home_team_data = {}
+        if "basic_stats" in api_data and "home_team" in api_data["basic_stats"]:
+            # Get raw data from API
+            home_raw = api_data["basic_stats"]["home_team"]
+            
+            # Extract stats from nested structure
+            if "stats" in home_raw:
+                if isinstance(home_raw["stats"], dict):
+                    # If stats is a direct object
+                    home_team_data = home_raw["stats"]
+                elif "stats" in home_raw["stats"] and isinstance(home_raw["stats"]["stats"], dict):
+                    # If stats is nested deeper
+                    home_team_data = home_raw["stats"]["stats"]
+            
+            # Now extract all stats from the data
+            extract_all_stats(optimized_data["home_team"], home_team_data, "home")
+            
+            # Get PPDA from advanced stats if available
+            if "advanced_stats" in api_data and "home" in api_data["advanced_stats"]:
+                optimized_data["home_team"]["ppda"] = get_value(api_data["advanced_stats"]["home"], ["ppda", "passes_per_defensive_action"])
+        
+        # Extract away team stats (similar structure)
+        away_team_data = {}
+        if "basic_stats" in api_data and "away_team" in api_data["basic_stats"]:
+            # Get raw data from API
+            away_raw = api_data["basic_stats"]["away_team"]
+            
+            # Extract stats from nested structure
+            if "stats" in away_raw:
+                if isinstance(away_raw["stats"], dict):
+                    # If stats is a direct object
+                    away_team_data = away_raw["stats"]
+                elif "stats" in away_raw["stats"] and isinstance(away_raw["stats"]["stats"], dict):
+                    # If stats is nested deeper
+                    away_team_data = away_raw["stats"]["stats"]
+            
+            # Now extract all stats from the data
+            extract_all_stats(optimized_data["away_team"], away_team_data, "away")
+            
+            # Get PPDA from advanced stats if available
+            if "advanced_stats" in api_data and "away" in api_data["advanced_stats"]:
+                optimized_data["away_team"]["ppda"] = get_value(api_data["advanced_stats"]["away"], ["ppda", "passes_per_defensive_action"])
+        
+        # Extract head-to-head data
+        if "head_to_head" in api_data:
+            h2h_data = api_data["head_to_head"]
+            
+            optimized_data["h2h"]["total_matches"] = get_value(h2h_data, ["total_matches"])
+            optimized_data["h2h"]["home_wins"] = get_value(h2h_data, ["home_wins"])
+            optimized_data["h2h"]["away_wins"] = get_value(h2h_data, ["away_wins"])
+            optimized_data["h2h"]["draws"] = get_value(h2h_data, ["draws"])
+            optimized_data["h2h"]["over_2_5_pct"] = get_value(h2h_data, ["over_2_5_percentage"])
+            optimized_data["h2h"]["btts_pct"] = get_value(h2h_data, ["btts_percentage"])
+            optimized_data["h2h"]["avg_cards"] = get_value(h2h_data, ["average_cards"])
+            optimized_data["h2h"]["avg_corners"] = get_value(h2h_data, ["average_corners"])
+        
+        # Extract form data
+        if "team_form" in api_data:
+            # Home team form
+            if "home" in api_data["team_form"] and isinstance(api_data["team_form"]["home"], list):
+                form_list = []
+                form_string = ""
+                
+                for match in api_data["team_form"]["home"][:5]:
+                    result = match.get("result", "?")
+                    form_list.append(result)
+                    form_string += result
+                
+                optimized_data["home_team"]["form"] = form_string
+                optimized_data["home_team"]["recent_matches"] = api_data["team_form"]["home"][:5]
+            
+            # Away team form
+            if "away" in api_data["team_form"] and isinstance(api_data["team_form"]["away"], list):
+                form_list = []
+                form_string = ""
+                
+                for match in api_data["team_form"]["away"][:5]:
+                    result = match.get("result", "?")
+                    form_list.append(result)
+                    form_string += result
+                
+                optimized_data["away_team"]["form"] = form_string
+                optimized_data["away_team"]["recent_matches"] = api_data["team_form"]["away"][:5]
+        
+        # Ensure all critical fields have reasonable values
+        ensure_critical_fields(optimized_data, home_team_name, away_team_name)
+        
+        logger.info(f"Data structure optimized successfully for {home_team_name} vs {away_team_name}")
+        return optimized_data
+        
+    except Exception as e:
+        logger.error(f"Error transforming data to optimized format: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return optimized_data  # Return the default structure
+
+
+def extract_all_stats(target_dict, data_dict, team_type):
+    """
+    Extract all stats from data dictionary to target dictionary
+    
+    Args:
+        target_dict (dict): Target dictionary to populate
+        data_dict (dict): Source data dictionary
+        team_type (str): "home" or "away"
+    """
+    # Basic stats
+    target_dict["played"] = get_value(data_dict, ["matches_played", "seasonMatchesPlayed_overall", "MP"])
+    target_dict["wins"] = get_value(data_dict, ["wins", "seasonWinsNum_overall", "W"])
+    target_dict["draws"] = get_value(data_dict, ["draws", "seasonDrawsNum_overall", "D"])
+    target_dict["losses"] = get_value(data_dict, ["losses", "seasonLossesNum_overall", "L"])
+    target_dict["goals_scored"] = get_value(data_dict, ["goals_scored", "seasonGoals_overall", "Gls"])
+    target_dict["goals_conceded"] = get_value(data_dict, ["goals_conceded", "seasonConceded_overall", "GA"])
+    
+    # Goal trends
+    target_dict["clean_sheets_pct"] = get_value(data_dict, ["clean_sheet_percentage", "seasonCSPercentage_overall"])
+    target_dict["btts_pct"] = get_value(data_dict, ["btts_percentage", "seasonBTTSPercentage_overall"])
+    target_dict["over_2_5_pct"] = get_value(data_dict, ["over_2_5_percentage", "seasonOver25Percentage_overall"])
+    
+    # Home/Away specific
+    prefix = team_type  # "home" or "away"
+    target_dict[f"{prefix}_played"] = get_value(data_dict, [f"matches_played_{prefix}", f"seasonMatchesPlayed_{prefix}"])
+    target_dict[f"{prefix}_wins"] = get_value(data_dict, [f"{prefix}_wins", f"seasonWinsNum_{prefix}"])
+    target_dict[f"{prefix}_draws"] = get_value(data_dict, [f"{prefix}_draws", f"seasonDrawsNum_{prefix}"])
+    target_dict[f"{prefix}_losses"] = get_value(data_dict, [f"{prefix}_losses", f"seasonLossesNum_{prefix}"])
+    target_dict[f"{prefix}_goals_scored"] = get_value(data_dict, [f"goals_scored_{prefix}", f"seasonGoals_{prefix}"])
+    target_dict[f"{prefix}_goals_conceded"] = get_value(data_dict, [f"goals_conceded_{prefix}", f"seasonConceded_{prefix}"])
+    
+    # Advanced stats
+    target_dict["xg"] = get_value(data_dict, ["xG", "xg", "xg_for_overall"])
+    target_dict["xga"] = get_value(data_dict, ["xGA", "xga", "xg_against_avg_overall"])
+    target_dict["possession"] = get_value(data_dict, ["possession", "possessionAVG_overall", "Poss"])
+    
+    # Card stats
+    target_dict["cards_total"] = get_value(data_dict, ["cards_total", "seasonCrdYNum_overall", "CrdY"]) + get_value(data_dict, ["seasonCrdRNum_overall", "CrdR"], 0)
+    target_dict["yellow_cards"] = get_value(data_dict, ["yellow_cards", "seasonCrdYNum_overall", "CrdY"])
+    target_dict["red_cards"] = get_value(data_dict, ["red_cards", "seasonCrdRNum_overall", "CrdR"])
+    target_dict["over_3_5_cards_pct"] = get_value(data_dict, ["over_3_5_cards_percentage"])
+    
+    # If matches played exists, calculate per-game averages
+    matches_played = target_dict["played"]
+    if matches_played > 0:
+        target_dict["cards_per_game"] = round(target_dict["cards_total"] / matches_played, 2)
+        
+    # Corner stats
+    target_dict["corners_for"] = get_value(data_dict, ["corners_for", "seasonCornersFor_overall", "CK"])
+    target_dict["corners_against"] = get_value(data_dict, ["corners_against", "seasonCornersAgainst_overall"])
+    target_dict["corners_total"] = target_dict["corners_for"] + target_dict["corners_against"]
+    target_dict["over_9_5_corners_pct"] = get_value(data_dict, ["over_9_5_corners_percentage"])
+    
+    # Calculate per-game averages for corners if matches played
+    if matches_played > 0:
+        target_dict["corners_per_game"] = round(target_dict["corners_total"] / matches_played, 2)
+
+
+def adapt_api_data_for_prompt(complete_analysis):
+    """
+    Adapta os dados coletados da API para o formato esperado pelo format_enhanced_prompt
+    
+    Args:
+        complete_analysis (dict): Dados coletados pelo enhanced_api_client
+        
+    Returns:
+        dict: Dados formatados para o format_enhanced_prompt
+    """
+    try:
+        # Use a função transform_to_optimized_data para garantir a estrutura correta
+        return transform_to_optimized_data(
+            complete_analysis, 
+            complete_analysis.get("basic_stats", {}).get("home_team", {}).get("name", "Home Team"),
+            complete_analysis.get("basic_stats", {}).get("away_team", {}).get("name", "Away Team")
+        )
+    except Exception as e:
+        logger.error(f"Erro ao adaptar dados para prompt: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return None
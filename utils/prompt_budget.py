@@ -0,0 +1,166 @@
+"""
+Montagem de prompts com orçamento de tokens.
+
+O prompt é dividido em seções com prioridade; o tamanho de cada uma é
+medido com o tokenizador local (tiktoken, quando instalado, ou uma
+aproximação) e, se o total passar do orçamento, as seções opcionais de
+menor prioridade são descartadas. Estatísticas por time viram tabelas
+compactas, sem linhas vazias ou preenchidas com zeros e "?".
+"""
+import logging
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+logger = logging.getLogger("valueHunter.prompt_budget")
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Encoding usado pelo gpt-4o (com fallback para o do gpt-4)
+TOKENIZER_ENCODINGS = ("o200k_base", "cl100k_base")
+
+# Orçamento padrão de tokens de entrada
+PROMPT_TOKEN_BUDGET = 1500
+
+# Valores tratados como ausentes
+EMPTY_VALUES = ("", "?", "?????", "N/A", "-")
+
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+@dataclass
+class PromptSection:
+    """Seção do prompt; seções obrigatórias nunca são descartadas"""
+    name: str
+    text: str
+    priority: int = 0
+    required: bool = False
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Carrega o encoding do tiktoken uma vez por processo (None se indisponível)"""
+    if tiktoken is None:
+        return None
+    for name in TOKENIZER_ENCODINGS:
+        try:
+            return tiktoken.get_encoding(name)
+        except Exception as e:
+            logger.warning(f"Encoding {name} indisponível: {str(e)}")
+    return None
+
+
+def tokenizer_name():
+    """Nome do tokenizador em uso"""
+    encoding = _get_encoding()
+    return encoding.name if encoding is not None else "aproximado"
+
+
+def count_tokens(text):
+    """
+    Conta os tokens de um texto
+
+    Sem o tiktoken, aproxima: cada palavra conta 1 token a cada 4 caracteres
+    e cada sinal de pontuação conta 1.
+
+    Args:
+        text (str): Texto
+
+    Returns:
+        int: Número de tokens
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return sum(math.ceil(len(piece) / 4) for piece in _WORD_PATTERN.findall(text))
+
+
+def is_empty(value):
+    """True para valores ausentes, NaN ou placeholders como "?????" (zero é um valor real)"""
+    if value is None or isinstance(value, bool):
+        return value is None
+    if isinstance(value, (int, float)):
+        return math.isnan(value)
+    return str(value).strip() in EMPTY_VALUES
+
+
+def format_value(value, suffix=""):
+    """Formata um número de forma curta (até 2 casas, sem zeros à direita)"""
+    if is_empty(value):
+        return "-"
+    if isinstance(value, float):
+        text = f"{value:.2f}".rstrip("0").rstrip(".")
+    else:
+        text = str(value)
+    return f"{text}{suffix}"
+
+
+def compact_table(columns, rows):
+    """
+    Tabela markdown compacta, omitindo linhas sem nenhum valor
+
+    Args:
+        columns (list): Cabeçalhos (primeiro é o da métrica)
+        rows (list): Tuplas (rótulo, valor1, valor2, ...); valores podem ser
+            números/strings ou tuplas (valor, sufixo)
+
+    Returns:
+        str: Tabela ou "" se todas as linhas estiverem vazias
+    """
+    lines = []
+    for label, *values in rows:
+        raw = [v[0] if isinstance(v, tuple) else v for v in values]
+        if all(is_empty(v) for v in raw):
+            continue
+        cells = [format_value(*v) if isinstance(v, tuple) else format_value(v) for v in values]
+        lines.append(f"|{label}|" + "|".join(cells) + "|")
+    if not lines:
+        return ""
+    header = "|" + "|".join(columns) + "|"
+    separator = "|" + "|".join("-" for _ in columns) + "|"
+    return "\n".join([header, separator] + lines)
+
+
+def build_prompt(sections, budget=PROMPT_TOKEN_BUDGET):
+    """
+    Junta as seções respeitando o orçamento de tokens
+
+    Args:
+        sections (list): PromptSection na ordem em que devem aparecer
+        budget (int): Máximo de tokens (None = sem limite)
+
+    Returns:
+        tuple: (prompt, relatório {"sections": {nome: tokens}, "dropped": [...],
+                "total", "budget", "tokenizer"})
+    """
+    sections = [s for s in sections if s.text and s.text.strip()]
+    tokens = {s.name: count_tokens(s.text) for s in sections}
+    total = sum(tokens.values())
+
+    dropped = []
+    if budget is not None and total > budget:
+        optional = sorted((s for s in sections if not s.required), key=lambda s: s.priority)
+        for section in optional:
+            if total <= budget:
+                break
+            dropped.append(section.name)
+            total -= tokens[section.name]
+        if total > budget:
+            logger.warning(f"Prompt acima do orçamento mesmo só com seções obrigatórias: {total} > {budget}")
+
+    kept = [s for s in sections if s.name not in dropped]
+    prompt = "\n\n".join(s.text.strip() for s in kept)
+    report = {
+        "sections": {s.name: tokens[s.name] for s in kept},
+        "dropped": dropped,
+        "total": count_tokens(prompt),
+        "budget": budget,
+        "tokenizer": tokenizer_name()
+    }
+    return prompt, report
@@ -0,0 +1,308 @@
+"""
+Ratings de força dos times atualizados incrementalmente.
+
+Para cada temporada mantém um Elo e ratings de ataque/defesa por time,
+atualizados apenas com os jogos ``complete`` de ``league-matches`` que
+ainda não foram processados. O estado é persistido em
+``DATA_DIR/ratings/season_<id>.json`` e consultado em O(1) por time.
+"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+from utils.core import DATA_DIR
+
+logger = logging.getLogger("valueHunter.ratings")
+
+RATINGS_DIR = os.path.join(DATA_DIR, "ratings")
+RATINGS_VERSION = 1
+
+# Parâmetros do Elo
+ELO_START = 1500.0
+ELO_K = 20.0
+ELO_HOME_ADVANTAGE = 60.0
+
+# Suavização exponencial dos ratings de ataque/defesa (1.0 = média da liga)
+STRENGTH_ALPHA = 0.1
+
+# Médias de gols usadas antes de haver jogos suficientes na temporada
+DEFAULT_HOME_GOALS = 1.5
+DEFAULT_AWAY_GOALS = 1.2
+
+_seasons = {}
+_seasons_lock = threading.Lock()
+
+
+def _goal_diff_multiplier(goal_diff):
+    """Multiplicador do Elo pelo saldo de gols (World Football Elo)"""
+    goal_diff = abs(goal_diff)
+    if goal_diff <= 1:
+        return 1.0
+    if goal_diff == 2:
+        return 1.5
+    return (11 + goal_diff) / 8
+
+
+class SeasonRatings:
+    """
+    Ratings de todos os times de uma temporada
+
+    Atributos:
+        season_id (int): ID da temporada
+        teams (dict): team_id (str) -> {"elo", "attack", "defence", "matches"}
+        processed (set): IDs dos jogos já incorporados
+        home_goals (float): Total de gols dos mandantes nos jogos processados
+        away_goals (float): Total de gols dos visitantes nos jogos processados
+    """
+
+    def __init__(self, season_id):
+        self.season_id = season_id
+        self.teams = {}
+        self.processed = set()
+        self.home_goals = 0.0
+        self.away_goals = 0.0
+        self.updated_at = None
+        self.lock = threading.Lock()
+
+    @property
+    def file_path(self):
+        return os.path.join(RATINGS_DIR, f"season_{self.season_id}.json")
+
+    @property
+    def league_averages(self):
+        """Médias de gols por jogo de mandantes e visitantes"""
+        played = len(self.processed)
+        # Poucos jogos ou média zerada (divisor dos ratings): usa as médias padrão
+        if played < 10 or self.home_goals <= 0 or self.away_goals <= 0:
+            return DEFAULT_HOME_GOALS, DEFAULT_AWAY_GOALS
+        return self.home_goals / played, self.away_goals / played
+
+    def _team(self, team_id):
+        key = str(team_id)
+        if key not in self.teams:
+            self.teams[key] = {"elo": ELO_START, "attack": 1.0, "defence": 1.0, "matches": 0}
+        return self.teams[key]
+
+    def load(self):
+        """
+        Carrega o estado persistido da temporada
+
+        Returns:
+            bool: True se o arquivo foi carregado
+        """
+        if not os.path.exists(self.file_path):
+            return False
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != RATINGS_VERSION:
+                logger.warning(f"Versão de ratings diferente para season_id {self.season_id}, recalculando")
+                return False
+            self.teams = data.get("teams", {})
+            self.processed = set(data.get("processed", []))
+            self.home_goals = data.get("home_goals", 0.0)
+            self.away_goals = data.get("away_goals", 0.0)
+            self.updated_at = data.get("updated_at")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao carregar ratings da temporada {self.season_id}: {str(e)}")
+            return False
+
+    def save(self):
+        """
+        Persiste o estado da temporada (escrita atômica)
+
+        Returns:
+            bool: True se salvo com sucesso
+        """
+        try:
+            os.makedirs(RATINGS_DIR, exist_ok=True)
+            temp_path = f"{self.file_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": RATINGS_VERSION,
+                    "season_id": self.season_id,
+                    "teams": self.teams,
+                    "processed": sorted(self.processed),
+                    "home_goals": self.home_goals,
+                    "away_goals": self.away_goals,
+                    "updated_at": self.updated_at
+                }, f)
+            os.replace(temp_path, self.file_path)
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao salvar ratings da temporada {self.season_id}: {str(e)}")
+            return False
+
+    def apply_match(self, home_id, away_id, home_goals, away_goals):
+        """
+        Incorpora o resultado de um jogo aos ratings dos dois times
+
+        Args:
+            home_id (int): ID do time da casa
+            away_id (int): ID do time visitante
+            home_goals (int): Gols do time da casa
+            away_goals (int): Gols do visitante
+        """
+        home = self._team(home_id)
+        away = self._team(away_id)
+        avg_home, avg_away = self.league_averages
+
+        # Elo
+        expected_home = 1 / (1 + 10 ** ((away["elo"] - home["elo"] - ELO_HOME_ADVANTAGE) / 400))
+        if home_goals > away_goals:
+            score_home = 1.0
+        elif home_goals == away_goals:
+            score_home = 0.5
+        else:
+            score_home = 0.0
+        delta = ELO_K * _goal_diff_multiplier(home_goals - away_goals) * (score_home - expected_home)
+        home["elo"] += delta
+        away["elo"] -= delta
+
+        # Ataque/defesa relativos à média da liga (gols ajustados pelo adversário)
+        home_attack_obs = home_goals / (avg_home * away["defence"])
+        away_attack_obs = away_goals / (avg_away * home["defence"])
+        home_defence_obs = away_goals / (avg_away * away["attack"])
+        away_defence_obs = home_goals / (avg_home * home["attack"])
+
+        home["attack"] += STRENGTH_ALPHA * (home_attack_obs - home["attack"])
+        away["attack"] += STRENGTH_ALPHA * (away_attack_obs - away["attack"])
+        home["defence"] += STRENGTH_ALPHA * (home_defence_obs - home["defence"])
+        away["defence"] += STRENGTH_ALPHA * (away_defence_obs - away["defence"])
+
+        home["matches"] += 1
+        away["matches"] += 1
+        self.home_goals += home_goals
+        self.away_goals += away_goals
+
+    def update(self, matches):
+        """
+        Incorpora os jogos completos ainda não processados, em ordem de data
+
+        Args:
+            matches (list): Jogos no formato de league-matches
+
+        Returns:
+            int: Número de jogos novos incorporados
+        """
+        new_matches = []
+        for match in matches or []:
+            if not isinstance(match, dict) or match.get("status") != "complete":
+                continue
+            match_id = match.get("id")
+            if match_id is None or match_id in self.processed:
+                continue
+            try:
+                new_matches.append((
+                    int(match.get("date_unix") or 0), match_id,
+                    match["homeID"], match["awayID"],
+                    int(match["homeGoalCount"]), int(match["awayGoalCount"])
+                ))
+            except (KeyError, ValueError, TypeError):
+                continue
+
+        with self.lock:
+            for _, match_id, home_id, away_id, home_goals, away_goals in sorted(new_matches):
+                self.apply_match(home_id, away_id, home_goals, away_goals)
+                self.processed.add(match_id)
+            if new_matches:
+                self.updated_at = time.time()
+
+        return len(new_matches)
+
+    def get(self, team_id):
+        """Retorna os ratings de um time ou None se ele ainda não jogou"""
+        return self.teams.get(str(team_id))
+
+    def expected_goals(self, home_id, away_id):
+        """
+        Gols esperados de cada time a partir dos ratings de ataque/defesa
+
+        Args:
+            home_id (int): ID do time da casa
+            away_id (int): ID do time visitante
+
+        Returns:
+            tuple: (gols esperados da casa, gols esperados do visitante)
+        """
+        home = self.get(home_id) or {"attack": 1.0, "defence": 1.0}
+        away = self.get(away_id) or {"attack": 1.0, "defence": 1.0}
+        avg_home, avg_away = self.league_averages
+        return (avg_home * home["attack"] * away["defence"],
+                avg_away * away["attack"] * home["defence"])
+
+    def win_probability(self, home_id, away_id):
+        """Probabilidade Elo (0-1) de o time da casa pontuar mais que o visitante"""
+        home = self.get(home_id) or {"elo": ELO_START}
+        away = self.get(away_id) or {"elo": ELO_START}
+        return 1 / (1 + math.pow(10, (away["elo"] - home["elo"] - ELO_HOME_ADVANTAGE) / 400))
+
+
+def get_season_ratings(season_id):
+    """
+    Retorna os ratings da temporada, carregando do disco na primeira vez
+
+    Args:
+        season_id (int): ID da temporada
+
+    Returns:
+        SeasonRatings: Ratings da temporada
+    """
+    with _seasons_lock:
+        ratings = _seasons.get(season_id)
+        if ratings is None:
+            ratings = SeasonRatings(season_id)
+            ratings.load()
+            _seasons[season_id] = ratings
+        return ratings
+
+
+def update_season_ratings(season_id, matches=None, force_refresh=False):
+    """
+    Atualiza os ratings da temporada com os jogos completos novos
+
+    Args:
+        season_id (int): ID da temporada
+        matches (list, optional): Jogos de league-matches já obtidos
+        force_refresh (bool): Se True, ignora o cache da API
+
+    Returns:
+        SeasonRatings: Ratings atualizados ou None em caso de erro
+    """
+    try:
+        if matches is None:
+            from utils.enhanced_api_client import api_request
+            response = api_request("league-matches", {"season_id": season_id}, use_cache=not force_refresh)
+            if not response or not isinstance(response.get("data"), list):
+                logger.error(f"Falha ao obter jogos para ratings da temporada {season_id}")
+                return None
+            matches = response["data"]
+
+        ratings = get_season_ratings(season_id)
+        added = ratings.update(matches)
+        if added:
+            ratings.save()
+            logger.info(f"Ratings da temporada {season_id} atualizados com {added} jogos novos")
+        return ratings
+
+    except Exception as e:
+        logger.error(f"Erro ao atualizar ratings da temporada {season_id}: {str(e)}")
+        return None
+
+
+def get_team_rating(season_id, team_id):
+    """
+    Ratings de um time na temporada (O(1), sem recalcular)
+
+    Args:
+        season_id (int): ID da temporada
+        team_id (int): ID do time
+
+    Returns:
+        dict: {"elo", "attack", "defence", "matches"} ou None
+    """
+    return get_season_ratings(season_id).get(team_id)
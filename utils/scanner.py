@@ -0,0 +1,294 @@
+"""
+Scanner de valor para todos os jogos futuros de uma ou mais ligas.
+
+Busca os jogos não concluídos de cada temporada, monta as features dos
+times a partir da tabela colunar da liga e calcula as probabilidades do
+modelo para todos os jogos numa única passada vetorizada. Em seguida
+cruza com uma tabela de odds (CSV ou lista de dicts) e ordena as seleções
+pela vantagem do modelo sobre a probabilidade implícita. Não usa a IA.
+"""
+import logging
+import time
+
+import numpy as np
+
+from utils.calibration import apply_calibration
+from utils.probabilities import calculate_batch_probabilities, team_feature_arrays
+
+logger = logging.getLogger("valueHunter.scanner")
+
+# Seleção -> (grupo no resultado do modelo, chave, mercado para remover a margem)
+SELECTIONS = {
+    "home_win": ("moneyline", "home_win", "moneyline"),
+    "draw": ("moneyline", "draw", "moneyline"),
+    "away_win": ("moneyline", "away_win", "moneyline"),
+    "home_or_draw": ("double_chance", "home_or_draw", None),
+    "home_or_away": ("double_chance", "home_or_away", None),
+    "away_or_draw": ("double_chance", "away_or_draw", None),
+    "btts_yes": ("btts", "yes", "btts"),
+    "btts_no": ("btts", "no", "btts"),
+    "over_2_5": ("over_under", "over_2_5", "goals"),
+    "under_2_5": ("over_under", "under_2_5", "goals"),
+    "corners_over_9_5": ("corners", "over_9_5", "corners"),
+    "corners_under_9_5": ("corners", "under_9_5", "corners"),
+    "cards_over_3_5": ("cards", "over_3_5", "cards"),
+    "cards_under_3_5": ("cards", "under_3_5", "cards"),
+}
+
+# Nomes alternativos aceitos nas colunas da tabela de odds
+SELECTION_ALIASES = {
+    "1": "home_win",
+    "x": "draw",
+    "2": "away_win",
+    "1x": "home_or_draw",
+    "12": "home_or_away",
+    "x2": "away_or_draw",
+    "btts_sim": "btts_yes",
+    "btts_nao": "btts_no",
+}
+
+SELECTION_KEYS = list(SELECTIONS)
+
+# Vantagem mínima padrão (pontos percentuais sobre a probabilidade implícita)
+DEFAULT_MIN_EDGE = 0.0
+
+
+def _normalize_name(name):
+    return " ".join(str(name or "").lower().split())
+
+
+def _odd(value):
+    """Converte uma odd decimal; valores ausentes ou <= 1 viram NaN"""
+    try:
+        value = float(str(value).replace(",", "."))
+    except (ValueError, TypeError):
+        return np.nan
+    return value if value > 1 else np.nan
+
+
+def load_odds_table(source):
+    """
+    Lê a tabela de odds
+
+    Cada linha identifica o jogo por ``match_id`` ou por ``home``/``away``
+    e traz uma coluna por seleção (chaves de SELECTIONS ou SELECTION_ALIASES)
+    com a odd decimal.
+
+    Args:
+        source: Caminho/arquivo CSV, DataFrame ou lista de dicts
+
+    Returns:
+        list: Linhas como dicts com chaves normalizadas ou lista vazia em caso de erro
+    """
+    try:
+        if isinstance(source, list):
+            rows = source
+        else:
+            import pandas as pd
+            df = source if isinstance(source, pd.DataFrame) else pd.read_csv(source)
+            rows = df.to_dict(orient="records")
+
+        normalized = []
+        for row in rows:
+            entry = {}
+            for key, value in row.items():
+                key = str(key).strip().lower()
+                entry[SELECTION_ALIASES.get(key, key)] = value
+            normalized.append(entry)
+        return normalized
+    except Exception as e:
+        logger.error(f"Erro ao ler tabela de odds: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return []
+
+
+def load_upcoming_fixtures(season_id, offline=False):
+    """
+    Jogos ainda não concluídos de uma temporada com a tabela de times da liga
+
+    Mesmo filtro de get_upcoming_matches, mas passando pelo cache da API.
+
+    Args:
+        season_id (int): ID da temporada
+        offline (bool): Se True, usa apenas o cache local
+
+    Returns:
+        tuple: (lista de jogos, LeagueStatsTable) ou ([], None)
+    """
+    from utils.enhanced_api_client import (
+        api_request, read_cached_response, get_teams_for_league
+    )
+    from utils.league_stats import build_league_stats_table, get_cached_league_stats_table
+
+    params = {"season_id": season_id}
+    response = read_cached_response("league-matches", params) if offline else api_request("league-matches", params)
+    if not response or not isinstance(response.get("data"), list):
+        logger.warning(f"Sem jogos para season_id {season_id}")
+        return [], None
+    upcoming = [m for m in response["data"] if isinstance(m, dict) and m.get("status", "complete") != "complete"]
+
+    table = get_cached_league_stats_table(season_id)
+    if table is None:
+        if offline:
+            teams_response = read_cached_response("league-teams", {"season_id": season_id, "include": "stats"})
+            if teams_response and isinstance(teams_response.get("data"), list):
+                table = build_league_stats_table(season_id, teams_response["data"])
+        else:
+            get_teams_for_league(season_id)
+            table = get_cached_league_stats_table(season_id)
+
+    if table is None:
+        logger.warning(f"Sem estatísticas de times para season_id {season_id}")
+        return [], None
+    return upcoming, table
+
+
+def _fixture_team_row(table, team_id, team_name):
+    row = table.find_team_id(team_id)
+    if row is None:
+        row = table.find_team(team_name)
+    return row
+
+
+def _match_odds(fixtures, odds_rows):
+    """
+    Associa cada linha de odds a um jogo
+
+    Returns:
+        np.ndarray: Matriz (jogos x seleções) de odds, NaN onde não há odd
+    """
+    odds = np.full((len(fixtures), len(SELECTION_KEYS)), np.nan)
+    by_id = {str(f["match_id"]): i for i, f in enumerate(fixtures) if f["match_id"] is not None}
+    by_names = {(_normalize_name(f["home"]), _normalize_name(f["away"])): i for i, f in enumerate(fixtures)}
+
+    for row in odds_rows:
+        index = None
+        match_id = row.get("match_id")
+        if match_id is not None and str(match_id).split(".")[0] in by_id:
+            index = by_id[str(match_id).split(".")[0]]
+        else:
+            home = _normalize_name(row.get("home"))
+            away = _normalize_name(row.get("away"))
+            index = by_names.get((home, away))
+            if index is None and home and away:
+                # Correspondência parcial, como em find_team
+                for (f_home, f_away), i in by_names.items():
+                    if (home in f_home or f_home in home) and (away in f_away or f_away in away):
+                        index = i
+                        break
+        if index is None:
+            continue
+        for col, key in enumerate(SELECTION_KEYS):
+            if key in row:
+                odds[index, col] = _odd(row[key])
+    return odds
+
+
+def _implied_probabilities(odds):
+    """
+    Probabilidade implícita (0-1) de cada odd
+
+    Quando todas as seleções de um mercado têm odd, a margem da casa é
+    removida normalizando o grupo para somar 1.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        implied = 1.0 / odds
+    groups = {}
+    for col, key in enumerate(SELECTION_KEYS):
+        market = SELECTIONS[key][2]
+        if market:
+            groups.setdefault(market, []).append(col)
+    for cols in groups.values():
+        block = implied[:, cols]
+        complete = ~np.isnan(block).any(axis=1)
+        totals = block.sum(axis=1)
+        implied[np.ix_(complete, cols)] = block[complete] / totals[complete, None]
+    return implied
+
+
+def scan_fixtures(season_ids, odds_source, min_edge=DEFAULT_MIN_EDGE, offline=False):
+    """
+    Precifica todos os jogos futuros das temporadas e ordena as apostas de valor
+
+    Args:
+        season_ids (list): IDs das temporadas (ligas selecionadas)
+        odds_source: Tabela de odds (ver load_odds_table)
+        min_edge (float): Vantagem mínima em pontos percentuais
+        offline (bool): Se True, usa apenas o cache local
+
+    Returns:
+        dict: {"bets": lista ordenada por vantagem, "fixtures": jogos encontrados,
+               "priced": jogos precificados, "elapsed": segundos} ou None em caso de erro
+    """
+    try:
+        start = time.perf_counter()
+        fixtures = []
+        home_features = []
+        away_features = []
+        fixture_seasons = []
+
+        for season_id in season_ids:
+            upcoming, table = load_upcoming_fixtures(season_id, offline)
+            for match in upcoming:
+                home_row = _fixture_team_row(table, match.get("homeID"), match.get("home_name"))
+                away_row = _fixture_team_row(table, match.get("awayID"), match.get("away_name"))
+                if home_row is None or away_row is None:
+                    continue
+                fixtures.append({
+                    "season_id": season_id,
+                    "match_id": match.get("id"),
+                    "date_unix": match.get("date_unix"),
+                    "home": match.get("home_name") or table.names[home_row],
+                    "away": match.get("away_name") or table.names[away_row],
+                })
+                home_features.append(table.team_features(home_row))
+                away_features.append(table.team_features(away_row))
+                fixture_seasons.append(season_id)
+
+        result = {"bets": [], "fixtures": len(fixtures), "priced": 0, "elapsed": 0.0}
+        if not fixtures:
+            result["elapsed"] = time.perf_counter() - start
+            return result
+
+        batch = calculate_batch_probabilities(
+            team_feature_arrays(home_features), team_feature_arrays(away_features),
+            season_ids=fixture_seasons
+        )
+        if batch is None:
+            return None
+        batch = apply_calibration(batch)
+
+        probs = np.column_stack([batch[group][key] for group, key, _ in SELECTIONS.values()]) / 100
+        odds = _match_odds(fixtures, load_odds_table(odds_source))
+        implied = _implied_probabilities(odds)
+
+        edge = (probs - implied) * 100
+        expected_value = probs * odds - 1
+        usable = batch["valid"][:, None] & np.isfinite(edge) & (edge >= min_edge)
+
+        rows, cols = np.nonzero(usable)
+        order = np.lexsort((-expected_value[rows, cols], -edge[rows, cols]))
+        for r, c in zip(rows[order], cols[order]):
+            fixture = fixtures[r]
+            result["bets"].append({
+                **fixture,
+                "selection": SELECTION_KEYS[c],
+                "odd": float(odds[r, c]),
+                "model_prob": float(probs[r, c] * 100),
+                "implied_prob": float(implied[r, c] * 100),
+                "edge": float(edge[r, c]),
+                "expected_value": float(expected_value[r, c] * 100),
+            })
+
+        result["priced"] = int((batch["valid"] & ~np.isnan(odds).all(axis=1)).sum())
+        result["elapsed"] = time.perf_counter() - start
+        logger.info(f"Scanner: {len(fixtures)} jogos, {result['priced']} com odds, "
+                    f"{len(result['bets'])} seleções com valor em {result['elapsed']:.2f}s")
+        return result
+
+    except Exception as e:
+        logger.error(f"Erro no scanner de jogos: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return None
@@ -0,0 +1,315 @@
+"""
+Motor de mercados de gols baseado na matriz de placares (Poisson).
+
+A partir dos gols esperados de cada time monta a matriz de probabilidade
+casa x fora (com correção opcional de Dixon-Coles para placares baixos) e
+deriva dela, numa única passada, todos os mercados de gols: 1X2, Over/Under
+em qualquer linha, Ambos Marcam, placar exato e handicap asiático.
+
+As tabelas de PMF de Poisson são pré-computadas (log-fatoriais) e
+memorizadas por valor de lambda. Todas as funções aceitam escalares ou
+arrays de N jogos.
+"""
+import logging
+import math
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+logger = logging.getLogger("valueHunter.scoreline")
+
+# Gols máximos por time na matriz (a massa restante é renormalizada)
+MAX_GOALS = 10
+
+# Linhas calculadas por padrão
+DEFAULT_TOTAL_LINES = (0.5, 1.5, 2.5, 3.5, 4.5, 5.5)
+DEFAULT_HANDICAP_LINES = (-2.5, -2.0, -1.5, -1.0, -0.75, -0.5, -0.25, 0.0,
+                          0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 2.5)
+
+# Resolução dos lambdas no cache de PMFs e número máximo de entradas
+LAMBDA_DECIMALS = 4
+PMF_CACHE_SIZE = 20000
+
+_pmf_cache = {}
+_pmf_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _log_factorials(max_goals):
+    """Tabela de log(k!) para k = 0..max_goals"""
+    return np.array([math.lgamma(k + 1) for k in range(max_goals + 1)], dtype=np.float64)
+
+
+def poisson_pmf_table(lambdas, max_goals=MAX_GOALS):
+    """
+    Tabela de PMF de Poisson para vários lambdas
+
+    Args:
+        lambdas (np.ndarray): Gols esperados (N,)
+        max_goals (int): Maior número de gols considerado
+
+    Returns:
+        np.ndarray: Matriz (N, max_goals + 1) com P(X = k)
+    """
+    lambdas = np.maximum(np.asarray(lambdas, dtype=np.float64), 1e-9)
+    k = np.arange(max_goals + 1)
+    log_pmf = k * np.log(lambdas)[:, None] - lambdas[:, None] - _log_factorials(max_goals)
+    return np.exp(log_pmf)
+
+
+def _pmf_rows(lambdas, max_goals):
+    """
+    Monta as PMFs de N lambdas reaproveitando o cache por valor
+
+    Os lambdas que ainda não estão no cache são calculados juntos, numa
+    única chamada vetorizada. A tabela é montada com as linhas obtidas
+    nesta chamada, sem reler o cache (que outra thread pode ter limpado).
+    """
+    rounded = np.round(lambdas, LAMBDA_DECIMALS)
+    unique, inverse = np.unique(rounded, return_inverse=True)
+    keys = unique.tolist()
+
+    with _pmf_cache_lock:
+        rows = {lam: _pmf_cache.get((lam, max_goals)) for lam in keys}
+    missing = [lam for lam, row in rows.items() if row is None]
+    if missing:
+        computed = poisson_pmf_table(np.array(missing), max_goals)
+        with _pmf_cache_lock:
+            if len(_pmf_cache) + len(missing) > PMF_CACHE_SIZE:
+                _pmf_cache.clear()
+            for lam, row in zip(missing, computed):
+                row.setflags(write=False)
+                _pmf_cache[(lam, max_goals)] = row
+                rows[lam] = row
+
+    table = np.stack([rows[lam] for lam in keys])
+    return table[inverse]
+
+
+def poisson_pmf(lam, max_goals=MAX_GOALS):
+    """
+    PMF de Poisson para um único lambda, servida do cache
+
+    Args:
+        lam (float): Gols esperados
+        max_goals (int): Maior número de gols considerado
+
+    Returns:
+        np.ndarray: Vetor (max_goals + 1,)
+    """
+    return _pmf_rows(np.array([float(lam)]), max_goals)[0]
+
+
+def scoreline_matrix(lambda_home, lambda_away, rho=0.0, max_goals=MAX_GOALS):
+    """
+    Matriz de probabilidades de placar para N jogos
+
+    Args:
+        lambda_home: Gols esperados do time da casa (escalar ou array N)
+        lambda_away: Gols esperados do visitante (escalar ou array N)
+        rho (float): Parâmetro de Dixon-Coles (0 desativa; valores típicos -0.05 a -0.15)
+        max_goals (int): Maior número de gols por time
+
+    Returns:
+        np.ndarray: Matriz (N, max_goals + 1, max_goals + 1); [n, i, j] = P(casa i, fora j)
+    """
+    lambda_home = np.atleast_1d(np.asarray(lambda_home, dtype=np.float64))
+    lambda_away = np.atleast_1d(np.asarray(lambda_away, dtype=np.float64))
+
+    home_pmf = _pmf_rows(lambda_home, max_goals)
+    away_pmf = _pmf_rows(lambda_away, max_goals)
+    matrix = home_pmf[:, :, None] * away_pmf[:, None, :]
+
+    if rho:
+        # Correção de Dixon-Coles para 0-0, 0-1, 1-0 e 1-1
+        matrix[:, 0, 0] *= np.maximum(0, 1 - lambda_home * lambda_away * rho)
+        matrix[:, 0, 1] *= np.maximum(0, 1 + lambda_home * rho)
+        matrix[:, 1, 0] *= np.maximum(0, 1 + lambda_away * rho)
+        matrix[:, 1, 1] *= np.maximum(0, 1 - rho)
+
+    # Renormalizar a massa truncada acima de max_goals
+    matrix /= matrix.sum(axis=(1, 2), keepdims=True)
+    return matrix
+
+
+@lru_cache(maxsize=8)
+def _aggregation_matrices(size):
+    """
+    Matrizes one-hot que somam a matriz de placares achatada por total de
+    gols e por diferença de gols (casa - fora)
+
+    Returns:
+        tuple: (matriz de totais, matriz de diferenças), ambas (size², 2*size - 1)
+    """
+    goals = np.arange(size)
+    total_index = (goals[:, None] + goals[None, :]).ravel()
+    margin_index = (goals[:, None] - goals[None, :]).ravel() + (size - 1)
+    totals = np.zeros((size * size, 2 * size - 1))
+    margins = np.zeros((size * size, 2 * size - 1))
+    totals[np.arange(size * size), total_index] = 1
+    margins[np.arange(size * size), margin_index] = 1
+    return totals, margins
+
+
+def _line_key(line):
+    """Formata a linha no padrão das chaves do app (2.5 -> '2_5', -0.25 -> 'm0_25')"""
+    text = f"{abs(line):g}".replace(".", "_")
+    if "_" not in text:
+        text += "_0"
+    return f"m{text}" if line < 0 else text
+
+
+def _settle(margin, line):
+    """
+    Resultado de uma aposta por linha para cada margem possível
+
+    Linhas de quarto (ex: -0.25) são divididas em duas metades.
+
+    Returns:
+        np.ndarray: Retorno em unidades de stake (-1 a 1) para cada margem
+    """
+    if abs(line * 4) % 2 == 1:
+        halves = (line - 0.25, line + 0.25)
+    else:
+        halves = (line, line)
+    return sum(np.sign(margin + half) for half in halves) / 2
+
+
+def _settlement_probs(dist, margins, line):
+    """Probabilidades de vitória, meia vitória, devolução, meia derrota e derrota"""
+    outcome = _settle(margins, line)
+    return {
+        "win": dist[:, outcome == 1].sum(axis=1) * 100,
+        "half_win": dist[:, outcome == 0.5].sum(axis=1) * 100,
+        "push": dist[:, outcome == 0].sum(axis=1) * 100,
+        "half_loss": dist[:, outcome == -0.5].sum(axis=1) * 100,
+        "loss": dist[:, outcome == -1].sum(axis=1) * 100,
+    }
+
+
+def calculate_scoreline_markets(lambda_home, lambda_away, rho=0.0, total_lines=DEFAULT_TOTAL_LINES,
+                                handicap_lines=DEFAULT_HANDICAP_LINES, top_scores=5,
+                                max_goals=MAX_GOALS):
+    """
+    Deriva todos os mercados de gols da matriz de placares
+
+    Args:
+        lambda_home: Gols esperados do time da casa (escalar ou array N)
+        lambda_away: Gols esperados do visitante (escalar ou array N)
+        rho (float): Parâmetro de Dixon-Coles (0 desativa)
+        total_lines (iterable): Linhas de Over/Under (x.5 ou inteiras, com devolução)
+        handicap_lines (iterable): Handicaps asiáticos aplicados ao time da casa
+        top_scores (int): Quantidade de placares exatos mais prováveis
+        max_goals (int): Maior número de gols por time
+
+    Returns:
+        dict: Mercados em percentual, com arrays de tamanho N; se os lambdas
+              forem escalares, os arrays são convertidos para floats.
+              None em caso de erro
+    """
+    try:
+        scalar_input = np.ndim(lambda_home) == 0 and np.ndim(lambda_away) == 0
+        matrix = scoreline_matrix(lambda_home, lambda_away, rho, max_goals)
+        n, size, _ = matrix.shape
+
+        goals = np.arange(size)
+
+        # Distribuições do total de gols e da diferença de gols (casa - fora)
+        flat = matrix.reshape(n, -1)
+        total_agg, margin_agg = _aggregation_matrices(size)
+        total_dist = flat @ total_agg
+        margin_dist = flat @ margin_agg
+        totals = np.arange(2 * size - 1)
+        margins = np.arange(-(size - 1), size)
+
+        home_win = margin_dist[:, margins > 0].sum(axis=1) * 100
+        draw = margin_dist[:, margins == 0].sum(axis=1) * 100
+        away_win = margin_dist[:, margins < 0].sum(axis=1) * 100
+
+        over_under = {}
+        for line in total_lines:
+            over_under[_line_key(line)] = {
+                "over": total_dist[:, totals > line].sum(axis=1) * 100,
+                "under": total_dist[:, totals < line].sum(axis=1) * 100,
+                "push": total_dist[:, totals == line].sum(axis=1) * 100,
+            }
+
+        asian_handicap = {
+            _line_key(line): _settlement_probs(margin_dist, margins, line)
+            for line in handicap_lines
+        }
+
+        btts_yes = (1 - matrix[:, 0, :].sum(axis=1) - matrix[:, :, 0].sum(axis=1) + matrix[:, 0, 0]) * 100
+
+        order = np.argsort(-flat, axis=1, kind="stable")[:, :top_scores]
+        labels = np.array([f"{idx // size}-{idx % size}" for idx in range(size * size)])
+        correct_score = {
+            "scores": labels[order],
+            "probabilities": np.take_along_axis(flat, order, axis=1) * 100
+        }
+
+        result = {
+            "moneyline": {"home_win": home_win, "draw": draw, "away_win": away_win},
+            "double_chance": {
+                "home_or_draw": home_win + draw,
+                "away_or_draw": away_win + draw,
+                "home_or_away": home_win + away_win
+            },
+            "over_under": over_under,
+            "btts": {"yes": btts_yes, "no": 100 - btts_yes},
+            "asian_handicap": asian_handicap,
+            "correct_score": correct_score,
+            "expected_goals": {
+                "home": (matrix.sum(axis=2) * goals).sum(axis=1),
+                "away": (matrix.sum(axis=1) * goals).sum(axis=1)
+            },
+            "matrix": matrix
+        }
+
+        if scalar_input:
+            result = _to_scalars(result)
+        return result
+
+    except Exception as e:
+        logger.error(f"Erro no cálculo da matriz de placares: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return None
+
+
+def _to_scalars(result):
+    """Converte o resultado de um único jogo para floats e listas simples"""
+    def convert(value):
+        if isinstance(value, dict):
+            return {k: convert(v) for k, v in value.items()}
+        if isinstance(value, np.ndarray) and value.shape == (1,):
+            return float(value[0])
+        return value
+
+    converted = {key: convert(value) for key, value in result.items()
+                 if key not in ("correct_score", "matrix")}
+    converted["correct_score"] = [
+        {"score": str(score), "probability": float(prob)}
+        for score, prob in zip(result["correct_score"]["scores"][0],
+                               result["correct_score"]["probabilities"][0])
+    ]
+    converted["matrix"] = result["matrix"][0]
+    return converted
+
+
+def over_probability(markets, line):
+    """
+    Probabilidade de Over para uma linha já calculada
+
+    Args:
+        markets (dict): Resultado de calculate_scoreline_markets (um jogo)
+        line (float): Linha de gols
+
+    Returns:
+        float: Probabilidade em percentual ou None se a linha não foi calculada
+    """
+    if not markets:
+        return None
+    entry = markets.get("over_under", {}).get(_line_key(line))
+    return entry["over"] if entry else None
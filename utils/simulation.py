@@ -0,0 +1,252 @@
+"""
+Simulador Monte Carlo vetorizado para mercados de escanteios e cartões.
+
+Sorteia, para N jogos de uma vez, as contagens de cada time a partir das
+suas taxas médias usando uma mistura Gamma-Poisson (binomial negativa),
+que permite sobre-dispersão em relação à Poisson. A distribuição do total
+de cada jogo é montada uma única vez e dela saem as probabilidades de
+Over/Under para qualquer linha.
+
+As simulações são semeadas (resultados reprodutíveis) e guardadas num
+cache LRU em memória.
+"""
+import hashlib
+import logging
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger("valueHunter.simulation")
+
+# Número padrão de amostras por jogo
+DEFAULT_SAMPLES = 10000
+DEFAULT_SEED = 2024
+
+# Sobre-dispersão padrão (variância = média + dispersão * média²)
+DEFAULT_DISPERSION = {
+    "corners": 0.05,
+    "cards": 0.10,
+}
+
+# Linhas calculadas por padrão
+DEFAULT_LINES = {
+    "corners": (7.5, 8.5, 9.5, 10.5, 11.5, 12.5),
+    "cards": (2.5, 3.5, 4.5, 5.5, 6.5),
+}
+
+SIMULATION_CACHE_SIZE = 256
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _cache_key(home_rates, away_rates, dispersion, n_samples, seed):
+    """Chave do cache a partir dos parâmetros da simulação"""
+    digest = hashlib.sha1()
+    digest.update(np.round(home_rates, 6).tobytes())
+    digest.update(np.round(away_rates, 6).tobytes())
+    digest.update(f"{dispersion}|{n_samples}|{seed}".encode())
+    return digest.hexdigest()
+
+
+def _draw_counts(rng, rates, dispersion, n_samples):
+    """
+    Sorteia contagens (N, n_samples) para as taxas dadas
+
+    Com dispersão > 0 usa a mistura Gamma-Poisson; com 0, Poisson pura.
+    """
+    rates = np.maximum(rates, 1e-9)[:, None]
+    if dispersion > 0:
+        shape = 1.0 / dispersion
+        rates = rng.gamma(shape, rates * dispersion, size=(rates.shape[0], n_samples))
+        return rng.poisson(rates)
+    return rng.poisson(rates, size=(rates.shape[0], n_samples))
+
+
+def simulate_total_distribution(home_rates, away_rates, dispersion=0.0, n_samples=DEFAULT_SAMPLES,
+                                seed=DEFAULT_SEED):
+    """
+    Distribuição simulada do total (casa + fora) para N jogos
+
+    Args:
+        home_rates: Média de contagens do time da casa (escalar ou array N)
+        away_rates: Média de contagens do visitante (escalar ou array N)
+        dispersion (float): Sobre-dispersão (0 = Poisson)
+        n_samples (int): Amostras por jogo
+        seed (int): Semente do gerador
+
+    Returns:
+        np.ndarray: Matriz (N, max_total + 1) com P(total = k)
+    """
+    home_rates = np.atleast_1d(np.asarray(home_rates, dtype=np.float64))
+    away_rates = np.atleast_1d(np.asarray(away_rates, dtype=np.float64))
+
+    key = _cache_key(home_rates, away_rates, dispersion, n_samples, seed)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+            return _cache[key]
+        _cache_stats["misses"] += 1
+
+    rng = np.random.default_rng(seed)
+    totals = (_draw_counts(rng, home_rates, dispersion, n_samples) +
+              _draw_counts(rng, away_rates, dispersion, n_samples))
+
+    # Histograma de todos os jogos numa única chamada de bincount
+    n = totals.shape[0]
+    width = int(totals.max()) + 1
+    offsets = (np.arange(n) * width)[:, None]
+    counts = np.bincount((totals + offsets).ravel(), minlength=n * width)
+    distribution = counts.reshape(n, width) / n_samples
+    distribution.setflags(write=False)
+
+    with _cache_lock:
+        _cache[key] = distribution
+        if len(_cache) > SIMULATION_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return distribution
+
+
+def simulate_count_markets(home_rates, away_rates, lines, dispersion=0.0, n_samples=DEFAULT_SAMPLES,
+                           seed=DEFAULT_SEED):
+    """
+    Probabilidades de Over/Under para várias linhas e N jogos a partir de um lote simulado
+
+    Args:
+        home_rates: Média de contagens do time da casa (escalar ou array N)
+        away_rates: Média de contagens do visitante (escalar ou array N)
+        lines (iterable): Linhas (ex: 8.5, 9.5, 10 — linhas inteiras têm devolução)
+        dispersion (float): Sobre-dispersão (0 = Poisson)
+        n_samples (int): Amostras por jogo
+        seed (int): Semente do gerador
+
+    Returns:
+        dict: {"lines", "over", "under", "push" (N x L, em %), "expected" (N,)}
+              ou None em caso de erro
+    """
+    try:
+        distribution = simulate_total_distribution(home_rates, away_rates, dispersion, n_samples, seed)
+        lines = np.asarray(list(lines), dtype=np.float64)
+        values = np.arange(distribution.shape[1])
+
+        over = distribution @ (values[:, None] > lines[None, :]) * 100
+        under = distribution @ (values[:, None] < lines[None, :]) * 100
+        push = distribution @ (values[:, None] == lines[None, :]) * 100
+
+        return {
+            "lines": lines,
+            "over": over,
+            "under": under,
+            "push": push,
+            "expected": distribution @ values
+        }
+    except Exception as e:
+        logger.error(f"Erro na simulação Monte Carlo: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return None
+
+
+def _rate(data, key, default):
+    """Valor numérico de uma estatística; ausente, None ou não numérico vira o padrão"""
+    try:
+        value = float(data.get(key, default))
+    except (ValueError, TypeError):
+        return default
+    return default if math.isnan(value) else value
+
+
+def match_count_rates(home_team, away_team, analysis_data=None):
+    """
+    Taxas de escanteios e cartões por time, com os mesmos ajustes de
+    calculate_advanced_probabilities (posse para escanteios, intensidade
+    do jogo para cartões)
+
+    Args:
+        home_team (dict): Estatísticas do time da casa
+        away_team (dict): Estatísticas do time visitante
+        analysis_data (dict, optional): analysis_data retornado pelo cálculo de probabilidades
+
+    Returns:
+        dict: {"corners": (casa, fora), "cards": (casa, fora)}
+    """
+    home_possession = _rate(home_team, 'possession', 50) / 100
+    away_possession = _rate(away_team, 'possession', 50) / 100
+    home_corners = _rate(home_team, 'corners_per_game', 5) * (home_possession * 0.5 + 0.5)
+    away_corners = _rate(away_team, 'corners_per_game', 5) * (away_possession * 0.5 + 0.5)
+
+    intensity_factor = 1.0
+    if analysis_data:
+        score_gap = abs(_rate(analysis_data, "home_total_score", 0) - _rate(analysis_data, "away_total_score", 0))
+        intensity_factor = 1 + 0.3 * (1 - score_gap)
+    home_cards = _rate(home_team, 'cards_per_game', 2) * intensity_factor
+    away_cards = _rate(away_team, 'cards_per_game', 2) * intensity_factor
+
+    return {
+        "corners": (home_corners, away_corners),
+        "cards": (home_cards, away_cards)
+    }
+
+
+def simulate_match_markets(home_team, away_team, analysis_data=None, n_samples=DEFAULT_SAMPLES,
+                           seed=DEFAULT_SEED):
+    """
+    Simula escanteios e cartões de um jogo nas linhas padrão
+
+    Args:
+        home_team (dict): Estatísticas do time da casa
+        away_team (dict): Estatísticas do time visitante
+        analysis_data (dict, optional): analysis_data retornado pelo cálculo de probabilidades
+        n_samples (int): Amostras por jogo
+        seed (int): Semente do gerador
+
+    Returns:
+        dict: {"corners": {...}, "cards": {...}} no formato de simulate_count_markets
+    """
+    rates = match_count_rates(home_team, away_team, analysis_data)
+    return {
+        market: simulate_count_markets(
+            rates[market][0], rates[market][1], DEFAULT_LINES[market],
+            DEFAULT_DISPERSION[market], n_samples, seed
+        )
+        for market in ("corners", "cards")
+    }
+
+
+def line_probability(markets, line, side="over", index=0):
+    """
+    Probabilidade simulada de uma linha
+
+    Args:
+        markets (dict): Resultado de simulate_count_markets
+        line (float): Linha desejada
+        side (str): "over", "under" ou "push"
+        index (int): Índice do jogo no lote
+
+    Returns:
+        float: Probabilidade em percentual ou None se a linha não foi simulada
+    """
+    if not markets:
+        return None
+    matches = np.nonzero(markets["lines"] == line)[0]
+    if matches.size == 0:
+        return None
+    return float(markets[side][index, matches[0]])
+
+
+def get_simulation_cache_stats():
+    """Retorna os contadores de acertos/falhas e o tamanho do cache"""
+    with _cache_lock:
+        return {**_cache_stats, "size": len(_cache)}
+
+
+def clear_simulation_cache():
+    """Limpa o cache de simulações"""
+    with _cache_lock:
+        _cache.clear()
+        _cache_stats["hits"] = 0
+        _cache_stats["misses"] = 0
@@ -0,0 +1,359 @@
+"""
+Saída estruturada (JSON) da análise com IA.
+
+No modo JSON a IA responde num schema com comentários por seleção,
+oportunidades e nível de confiança; a resposta é validada uma única vez e
+a apresentação é renderizada a partir dessa estrutura. Probabilidades,
+odds e vantagens não vêm do texto da IA: saem de uma tabela de seleções
+montada numa passada sobre as probabilidades calculadas e as odds
+estruturadas (get_odds_input). Durante o streaming a análise é
+renderizada com os itens do JSON que já chegaram completos.
+"""
+import json
+import logging
+import re
+
+logger = logging.getLogger("valueHunter.structured_analysis")
+
+# Vantagem mínima (pontos percentuais) para considerar valor
+VALUE_THRESHOLD = 2.0
+
+CONFIDENCE_LEVELS = ("Baixo", "Médio", "Alto")
+
+# Seleções de cada mercado (chaves das odds estruturadas)
+MARKET_SELECTIONS = {
+    "money_line": ("home", "draw", "away"),
+    "chance_dupla": ("1x", "12", "x2"),
+    "ambos_marcam": ("yes", "no"),
+    "over_under": ("over", "under"),
+    "escanteios": ("over", "under"),
+    "cartoes": ("over", "under")
+}
+
+# Cabeçalho de cada mercado na seção de probabilidades, na ordem de exibição
+MARKET_HEADERS = {
+    "money_line": "Money Line (1X2)",
+    "chance_dupla": "Chance Dupla (Double Chance)",
+    "ambos_marcam": "Ambos Marcam (BTTS)",
+    "over_under": "Over/Under Gols",
+    "escanteios": "Escanteios",
+    "cartoes": "Cartões"
+}
+
+ANALYSIS_JSON_SCHEMA = {
+    "type": "object",
+    "additionalProperties": False,
+    "required": ["markets", "opportunities", "confidence"],
+    "properties": {
+        "markets": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["market", "selection", "comment"],
+                "properties": {
+                    "market": {"type": "string", "enum": list(MARKET_SELECTIONS)},
+                    "selection": {"type": "string"},
+                    "comment": {"type": "string"}
+                }
+            }
+        },
+        "opportunities": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["market", "selection", "reason"],
+                "properties": {
+                    "market": {"type": "string", "enum": list(MARKET_SELECTIONS)},
+                    "selection": {"type": "string"},
+                    "reason": {"type": "string"}
+                }
+            }
+        },
+        "confidence": {
+            "type": "object",
+            "additionalProperties": False,
+            "required": ["level", "explanation"],
+            "properties": {
+                "level": {"type": "string", "enum": list(CONFIDENCE_LEVELS)},
+                "explanation": {"type": "string"}
+            }
+        }
+    }
+}
+
+# Parâmetro response_format da API para o modo JSON
+ANALYSIS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "match_analysis", "strict": True, "schema": ANALYSIS_JSON_SCHEMA}
+}
+
+
+def _line_over_probability(market, line, original_probabilities):
+    """Probabilidade real de Over na linha configurada nas odds"""
+    if market == "over_under":
+        # Todas as linhas (inclusive 2.5) vêm da matriz de placares, para a escada ser consistente
+        from utils.scoreline import over_probability
+        scoreline_over = over_probability(original_probabilities.get("scoreline"), line)
+        if scoreline_over is not None:
+            return scoreline_over
+        return original_probabilities["over_under"].get("over_2_5", 0)  # Sem matriz: modelo padrão
+
+    # Escanteios e cartões: todas as linhas (inclusive a padrão) da simulação Monte Carlo;
+    # sem simulação, modelo padrão na linha padrão e ajuste linear nas demais
+    from utils.simulation import line_probability
+    key, default_line, step = (("corners", 9.5, 10) if market == "escanteios" else ("cards", 3.5, 15))
+    simulated_over = line_probability(original_probabilities.get("simulation", {}).get(key), line)
+    if simulated_over is not None:
+        return simulated_over
+    base_over = original_probabilities[key].get(f"over_{str(default_line).replace('.', '_')}", 0)
+    if line == default_line:
+        return base_over
+    base_over = base_over or 50
+    if line < default_line:
+        return min(95, base_over + ((default_line - line) * step))
+    return max(5, base_over - ((line - default_line) * step))
+
+
+def analysis_selections(selected_markets, original_probabilities, implied_probabilities, odds, home_team, away_team):
+    """
+    Tabela de seleções (odd, probabilidade real e implícita, vantagem) dos mercados selecionados
+
+    Args:
+        selected_markets (dict): Mercados selecionados
+        original_probabilities (dict): Probabilidades calculadas
+        implied_probabilities (dict): Probabilidades implícitas (calculate_implied_probabilities)
+        odds (dict): Odds estruturadas (get_odds_input)
+        home_team (str): Time da casa
+        away_team (str): Time visitante
+
+    Returns:
+        list: Dicts com market, selection, label, opportunity_label, odd, real,
+              implied, edge e value
+    """
+    original_probabilities = original_probabilities or {}
+    implied_probabilities = implied_probabilities or {}
+    odds = odds or {}
+    rows = []
+
+    def add(market, selection, label, real, implied_key, opportunity_label=None):
+        implied = implied_probabilities.get(implied_key, 0)
+        rows.append({
+            "market": market,
+            "selection": selection,
+            "label": label,
+            "opportunity_label": opportunity_label or label,
+            "odd": odds.get(market, {}).get(selection),
+            "real": real,
+            "implied": implied,
+            "edge": real - implied,
+            "value": real > implied + VALUE_THRESHOLD
+        })
+
+    if selected_markets.get("money_line") and "moneyline" in original_probabilities:
+        moneyline = original_probabilities["moneyline"]
+        add("money_line", "home", home_team, moneyline.get("home_win", 0), "home")
+        add("money_line", "draw", "Empate", moneyline.get("draw", 0), "draw")
+        add("money_line", "away", away_team, moneyline.get("away_win", 0), "away")
+
+    if selected_markets.get("chance_dupla") and "double_chance" in original_probabilities:
+        double_chance = original_probabilities["double_chance"]
+        add("chance_dupla", "1x", f"{home_team} ou Empate", double_chance.get("home_or_draw", 0), "home_draw")
+        add("chance_dupla", "12", f"{home_team} ou {away_team}", double_chance.get("home_or_away", 0), "home_away")
+        add("chance_dupla", "x2", f"Empate ou {away_team}", double_chance.get("away_or_draw", 0), "draw_away")
+
+    if selected_markets.get("ambos_marcam") and "btts" in original_probabilities:
+        btts = original_probabilities["btts"]
+        add("ambos_marcam", "yes", "Sim", btts.get("yes", 0), "btts_yes", "Ambos Marcam - Sim")
+        add("ambos_marcam", "no", "Não", btts.get("no", 0), "btts_no", "Ambos Marcam - Não")
+
+    for market, probability_key, unit, prefix in (("over_under", "over_under", "Gols", ""),
+                                                  ("escanteios", "corners", "Escanteios", "corners_"),
+                                                  ("cartoes", "cards", "Cartões", "cards_")):
+        if not (selected_markets.get(market) and probability_key in original_probabilities and market in odds):
+            continue
+        line = float(odds[market]["line"])
+        line_str = str(line).replace('.', '_')
+        over_real = _line_over_probability(market, line, original_probabilities)
+        add(market, "over", f"Over {line} {unit}", over_real, f"{prefix}over_{line_str}")
+        add(market, "under", f"Under {line} {unit}", 100.0 - over_real, f"{prefix}under_{line_str}")
+
+    return rows
+
+
+def parse_structured_analysis(content):
+    """
+    Valida a resposta JSON da IA (uma única vez)
+
+    Números da IA não são usados; ficam apenas comentários, motivos das
+    oportunidades e o nível de confiança.
+
+    Args:
+        content (str): Resposta da IA
+
+    Returns:
+        dict: {"comments": {(market, selection): str}, "reasons": {...},
+               "confidence": {"level", "explanation"}} ou None se inválida
+    """
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Resposta estruturada não é JSON válido: {str(e)}")
+        return None
+
+    try:
+        confidence = data["confidence"]
+        if confidence["level"] not in CONFIDENCE_LEVELS or not isinstance(confidence["explanation"], str):
+            raise ValueError(f"Nível de confiança inválido: {confidence.get('level')}")
+
+        def entries(items, text_key):
+            result = {}
+            for item in items:
+                market, selection, text = item["market"], item["selection"], item[text_key]
+                if selection in MARKET_SELECTIONS.get(market, ()) and isinstance(text, str):
+                    result[(market, selection)] = text.strip()
+            return result
+
+        return {
+            "comments": entries(data["markets"], "comment"),
+            "reasons": entries(data["opportunities"], "reason"),
+            "confidence": {"level": confidence["level"], "explanation": confidence["explanation"].strip()}
+        }
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        logger.warning(f"Resposta estruturada fora do schema: {str(e)}")
+        return None
+
+
+def parse_partial_analysis(content):
+    """
+    Extrai os itens já completos de uma resposta JSON ainda em streaming
+
+    Comentários e motivos entram à medida que cada objeto de markets e
+    opportunities termina; a confiança aparece como "Em análise" até o
+    objeto dela chegar completo.
+
+    Args:
+        content (str): Resposta parcial da IA
+
+    Returns:
+        dict: Mesmo formato de parse_structured_analysis
+    """
+    decoder = json.JSONDecoder()
+
+    def complete_items(key):
+        match = re.search(rf'"{key}"\s*:\s*\[', content)
+        if not match:
+            return []
+        items, index = [], match.end()
+        while True:
+            while index < len(content) and content[index] in " \t\r\n,":
+                index += 1
+            if index >= len(content) or content[index] != "{":
+                return items
+            try:
+                item, index = decoder.raw_decode(content, index)
+            except ValueError:
+                return items
+            items.append(item)
+
+    def entries(items, text_key):
+        result = {}
+        for item in items:
+            if not isinstance(item, dict) or not isinstance(item.get(text_key), str):
+                continue
+            market, selection = item.get("market"), item.get("selection")
+            if selection in MARKET_SELECTIONS.get(market, ()):
+                result[(market, selection)] = item[text_key].strip()
+        return result
+
+    confidence = {"level": "Em análise", "explanation": ""}
+    match = re.search(r'"confidence"\s*:\s*', content)
+    if match:
+        try:
+            data, _ = decoder.raw_decode(content, match.end())
+            if data.get("level") in CONFIDENCE_LEVELS and isinstance(data.get("explanation"), str):
+                confidence = {"level": data["level"], "explanation": data["explanation"].strip()}
+        except (ValueError, AttributeError):
+            pass
+
+    return {
+        "comments": entries(complete_items("markets"), "comment"),
+        "reasons": entries(complete_items("opportunities"), "reason"),
+        "confidence": confidence
+    }
+
+
+def render_structured_analysis(selections, structured, home_team, away_team, selected_markets, odds,
+                               analysis_data=None):
+    """
+    Renderiza a análise final a partir das seleções e da resposta estruturada
+
+    Args:
+        selections (list): Resultado de analysis_selections
+        structured (dict): Resultado de parse_structured_analysis (None = sem
+            comentários da IA e confiança "Médio")
+        home_team (str): Time da casa
+        away_team (str): Time visitante
+        selected_markets (dict): Mercados selecionados
+        odds (dict): Odds estruturadas
+        analysis_data (dict, optional): Consistência e forma (calculate_advanced_probabilities)
+
+    Returns:
+        str: Análise formatada
+    """
+    from utils.data import format_odds_markets
+
+    structured = structured or {"comments": {}, "reasons": {}, "confidence": None}
+    comments, reasons = structured["comments"], structured["reasons"]
+
+    sections = [f"# Análise da Partida\n## {home_team} x {away_team}"]
+    sections.append("# Análise de Mercados Disponíveis:\n" + format_odds_markets(
+        {market: data for market, data in (odds or {}).items() if selected_markets.get(market)},
+        home_team, away_team
+    ))
+
+    probs_section = "# Probabilidades Calculadas (REAL vs IMPLÍCITA):\n"
+    opportunities = []
+    for market, header in MARKET_HEADERS.items():
+        rows = [row for row in selections if row["market"] == market]
+        if not rows:
+            continue
+        probs_section += f"## {header}:\n"
+        for row in rows:
+            key = (market, row["selection"])
+            probs_section += (f"- **{row['label']}**: Real {row['real']:.1f}% vs Implícita {row['implied']:.1f}%"
+                              f"{' (Valor)' if row['value'] else ''}\n")
+            if comments.get(key):
+                probs_section += f"  {comments[key]}\n"
+            if row["value"]:
+                opportunity = (f"- **{row['opportunity_label']}**: Real {row['real']:.1f}% vs Implícita {row['implied']:.1f}% "
+                               f"(Valor de {row['edge']:.1f}%)")
+                if reasons.get(key):
+                    opportunity += f" - {reasons[key]}"
+                opportunities.append(opportunity)
+    sections.append(probs_section)
+
+    if opportunities:
+        sections.append("# Oportunidades Identificadas:\n" + "\n".join(opportunities))
+    else:
+        sections.append("# Oportunidades Identificadas:\nInfelizmente não detectamos valor em nenhuma dos seus inputs.")
+
+    confidence = structured["confidence"] or {"level": "Médio", "explanation": ""}
+    confidence_section = f"# Nível de Confiança Geral: {confidence['level']}\n"
+    if analysis_data:
+        home_consistency = analysis_data.get("home_consistency", 0) * 100
+        away_consistency = analysis_data.get("away_consistency", 0) * 100
+        home_form_points = int(analysis_data.get("home_form_points", 0) * 15)
+        away_form_points = int(analysis_data.get("away_form_points", 0) * 15)
+        confidence_section += f"- **Consistência**: {home_team}: {home_consistency:.1f}%, {away_team}: {away_consistency:.1f}%. Consistência é uma medida que indica quão previsível é o desempenho da equipe.\n"
+        confidence_section += f"- **Forma Recente**: {home_team}: {home_form_points}/15, {away_team}: {away_form_points}/15. Forma representa a pontuação dos últimos 5 jogos (vitória=3pts, empate=1pt, derrota=0pts).\n"
+    else:
+        confidence_section += "- **Consistência**: Consistência é uma medida que indica quão previsível é o desempenho da equipe.\n"
+        confidence_section += "- **Forma Recente**: Forma representa a pontuação dos últimos 5 jogos (vitória=3pts, empate=1pt, derrota=0pts).\n"
+    confidence_section += "- Valores mais altos em ambas métricas aumentam a confiança na previsão."
+    if confidence["explanation"]:
+        confidence_section += f"\n\n{confidence['explanation']}"
+    sections.append(confidence_section)
+
+    return "\n\n".join(sections)
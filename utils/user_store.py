@@ -0,0 +1,727 @@
+"""
+Armazenamento dos usuários em SQLite (modo WAL).
+
+Cada operação do UserManager altera apenas as próprias linhas: uma linha
+por usuário na tabela ``users`` e um registro por análise na tabela
+``usage_events`` (indexada por email), em vez de regravar o arquivo JSON
+inteiro a cada clique. O contador ``credits_used`` de cada usuário é
+atualizado na mesma transação de cada evento de uso, de modo que consultar
+créditos não depende do tamanho do histórico; ``check_credit_counters``
+confere (e reconstrói) os contadores a partir dos eventos.
+
+``usage_events`` é um registro só de acréscimos. Eventos com mais de
+USAGE_RETENTION_DAYS dias são consolidados periodicamente em agregados
+diários (``usage_daily``: análises, créditos e contagens por liga, time e
+mercado), e o UserManager carrega apenas os usuários, sem o histórico.
+
+Os números do painel administrativo (usuários por pacote, créditos
+vendidos, análises por dia, ligas, jogos, times e mercados) ficam em
+``admin_stats``, atualizada na mesma transação de cada cadastro, troca de
+pacote, compra de créditos e registro de uso; ``rebuild_admin_stats``
+recalcula tudo a partir dos usuários, agregados diários e eventos.
+
+``load_users`` devolve os dados no mesmo formato do antigo
+``user_data.json``, e ``import_users`` importa esse formato (usado pela
+migração, ver migrate_users.py).
+"""
+import os
+import json
+import sqlite3
+import time
+import logging
+import threading
+from datetime import date, datetime, timedelta
+
+logger = logging.getLogger("valueHunter.user_store")
+
+# Versão do schema (PRAGMA user_version)
+SCHEMA_VERSION = 4
+
+# Eventos de uso mais antigos que isso são consolidados em agregados diários
+USAGE_RETENTION_DAYS = 30
+
+# Intervalo mínimo entre consolidações automáticas (segundos)
+USAGE_COMPACTION_INTERVAL = 86400
+
+# Tempo após o esgotamento até a renovação dos créditos gratuitos (segundos)
+FREE_CREDITS_RESET_AFTER = 86400
+
+# Campos do usuário com coluna própria; os demais vão para "extra" (JSON)
+USER_COLUMNS = ("password", "name", "tier", "purchased_credits", "credits_used",
+                "free_credits_exhausted_at", "paid_credits_exhausted_at", "created_at")
+
+# Campos do registro de uso com coluna própria; os demais vão para "data" (JSON)
+USAGE_COLUMNS = ("date", "timestamp", "markets")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    name TEXT,
+    tier TEXT NOT NULL DEFAULT 'free',
+    purchased_credits INTEGER NOT NULL DEFAULT 0,
+    credits_used INTEGER NOT NULL DEFAULT 0,
+    free_credits_exhausted_at TEXT,
+    paid_credits_exhausted_at TEXT,
+    created_at TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS usage_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT NOT NULL,
+    date TEXT,
+    timestamp TEXT,
+    markets INTEGER NOT NULL DEFAULT 0,
+    in_daily INTEGER NOT NULL DEFAULT 1,
+    in_total INTEGER NOT NULL DEFAULT 1,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_usage_events_email ON usage_events (email, in_total);
+CREATE INDEX IF NOT EXISTS idx_usage_events_date ON usage_events (date);
+CREATE TABLE IF NOT EXISTS usage_daily (
+    email TEXT NOT NULL,
+    date TEXT NOT NULL,
+    events INTEGER NOT NULL DEFAULT 0,
+    markets INTEGER NOT NULL DEFAULT 0,
+    counted_markets INTEGER NOT NULL DEFAULT 0,
+    breakdown TEXT,
+    PRIMARY KEY (email, date)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS admin_stats (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, key)
+);
+CREATE INDEX IF NOT EXISTS idx_admin_stats_rank ON admin_stats (kind, value);
+"""
+
+# Tipos de admin_stats: tier (usuários por pacote), totals (analyses, credits_used,
+# detailed, credits_sold), day_analyses e day_credits (por data) e contagens
+# por league, fixture, team e market
+ADMIN_RANKINGS = (("league", "leagues"), ("fixture", "fixtures"), ("team", "teams"), ("market", "markets_used"))
+
+# Inserção com colunas explícitas (a ordem física muda com ALTER TABLE)
+USER_INSERT_SQL = (f"INTO users (email, {', '.join(USER_COLUMNS)}, extra) "
+                   f"VALUES ({', '.join('?' * (len(USER_COLUMNS) + 2))})")
+
+# Créditos usados de cada usuário segundo os eventos e agregados (uso contabilizado)
+COUNTED_USAGE_SQL = ("(SELECT COALESCE(SUM(markets), 0) FROM usage_events "
+                     "WHERE usage_events.email = users.email AND in_total = 1) + "
+                     "(SELECT COALESCE(SUM(counted_markets), 0) FROM usage_daily "
+                     "WHERE usage_daily.email = users.email)")
+
+
+def empty_breakdown():
+    """Agregado de uso vazio"""
+    return {"events": 0, "markets": 0, "detailed": 0, "leagues": {}, "fixtures": {}, "teams": {},
+            "markets_used": {}}
+
+
+def add_usage_record(breakdown, usage):
+    """Soma um registro de uso (formato do user_data.json) ao agregado"""
+    breakdown["events"] += 1
+    breakdown["markets"] += usage.get("markets", 0) or 0
+    if "league" not in usage:
+        return breakdown
+    # Registros com dados da análise (liga, times e mercados)
+    breakdown["detailed"] += 1
+    league = usage.get("league") or "Desconhecido"
+    breakdown["leagues"][league] = breakdown["leagues"].get(league, 0) + 1
+    home_team, away_team = usage.get("home_team"), usage.get("away_team")
+    for team in (home_team, away_team):
+        if team:
+            breakdown["teams"][team] = breakdown["teams"].get(team, 0) + 1
+    if home_team and away_team:
+        fixture = f"{home_team} x {away_team}"
+        breakdown["fixtures"][fixture] = breakdown["fixtures"].get(fixture, 0) + 1
+    for market in usage.get("markets_used") or []:
+        breakdown["markets_used"][market] = breakdown["markets_used"].get(market, 0) + 1
+    return breakdown
+
+
+def merge_breakdown(target, other):
+    """Soma o agregado ``other`` em ``target``"""
+    for key in ("events", "markets", "detailed"):
+        target[key] += other.get(key, 0)
+    for key in ("leagues", "fixtures", "teams", "markets_used"):
+        for name, count in (other.get(key) or {}).items():
+            target[key][name] = target[key].get(name, 0) + count
+    return target
+
+
+def admin_stats_rows(breakdown, days):
+    """
+    Linhas (tipo, chave, valor) de admin_stats correspondentes a um agregado de uso
+
+    Args:
+        breakdown (dict): Agregado de uso (ver empty_breakdown)
+        days (dict): data -> (análises, créditos)
+
+    Returns:
+        list: Tuplas (kind, key, value) com valores não nulos
+    """
+    rows = [("totals", "analyses", breakdown["events"]),
+            ("totals", "credits_used", breakdown["markets"]),
+            ("totals", "detailed", breakdown["detailed"])]
+    for day, (events, markets) in days.items():
+        if day:
+            rows += [("day_analyses", day, events), ("day_credits", day, markets)]
+    for kind, key in ADMIN_RANKINGS:
+        rows += [(kind, name, count) for name, count in breakdown[key].items()]
+    return [row for row in rows if row[2]]
+
+
+def free_credits_due(exhausted_at, now=None):
+    """True se já passou o prazo de renovação desde o esgotamento (ISO) dos créditos gratuitos"""
+    if not exhausted_at:
+        return False
+    try:
+        elapsed = ((now or datetime.now()) - datetime.fromisoformat(exhausted_at)).total_seconds()
+    except (TypeError, ValueError):
+        return False
+    return elapsed >= FREE_CREDITS_RESET_AFTER
+
+
+class SQLiteUserStore:
+    """Usuários e registros de uso num banco SQLite, com escrita por linha"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Uma conexão por instância, protegida por lock (o Streamlit pode
+        # executar a mesma sessão em threads diferentes)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock:
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+                return
+            # A versão é relida com o lock de escrita: outro processo abrindo o mesmo
+            # banco antigo espera esta migração e depois a encontra concluída
+            with self._transaction() as conn:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version >= SCHEMA_VERSION:
+                    return
+                # Cria tabelas e índices ausentes (v3: agregados diários, v4: admin_stats);
+                # executescript faria COMMIT, então os comandos vão um a um
+                for statement in SCHEMA.split(";"):
+                    if statement.strip():
+                        conn.execute(statement)
+                if 1 <= version < 2:
+                    # v2: contador de créditos usados, calculado uma vez a partir dos eventos
+                    conn.execute("ALTER TABLE users ADD COLUMN credits_used INTEGER NOT NULL DEFAULT 0")
+                    conn.execute(f"UPDATE users SET credits_used = ({COUNTED_USAGE_SQL})")
+                if 1 <= version < 4:
+                    self._rebuild_admin_stats(conn)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _transaction(self):
+        """Transação com lock de escrita imediato (BEGIN IMMEDIATE)"""
+        store = self
+
+        class _Transaction:
+            def __enter__(self):
+                store._lock.acquire()
+                store._conn.execute("BEGIN IMMEDIATE")
+                return store._conn
+
+            def __exit__(self, exc_type, exc, tb):
+                try:
+                    store._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+                finally:
+                    store._lock.release()
+                return False
+
+        return _Transaction()
+
+    # ----- conversão entre linhas e o formato do user_data.json -----
+
+    @staticmethod
+    def _user_row(email, user):
+        extra = {k: v for k, v in user.items() if k not in USER_COLUMNS and k != "usage"}
+        defaults = {"password": "", "tier": "free", "purchased_credits": 0, "credits_used": 0}
+        values = [user.get(column) if user.get(column) is not None else defaults.get(column)
+                  for column in USER_COLUMNS]
+        return (email, *values, json.dumps(extra, ensure_ascii=False) if extra else None)
+
+    @staticmethod
+    def _usage_row(email, usage, in_daily=True, in_total=True):
+        data = {k: v for k, v in usage.items() if k not in USAGE_COLUMNS}
+        return (
+            email,
+            usage.get("date"),
+            usage.get("timestamp"),
+            usage.get("markets", 0) or 0,
+            int(in_daily),
+            int(in_total),
+            json.dumps(data, ensure_ascii=False) if data else None
+        )
+
+    @staticmethod
+    def _usage_record(row):
+        usage = {"date": row["date"], "markets": row["markets"], "timestamp": row["timestamp"]}
+        if row["data"]:
+            usage.update(json.loads(row["data"]))
+        return usage
+
+    # ----- leitura -----
+
+    def data_version(self):
+        """Muda sempre que outra conexão (ou processo) grava no banco"""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def count_users(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def load_users(self, include_usage=False):
+        """
+        Carrega todos os usuários no formato do user_data.json
+
+        Args:
+            include_usage (bool): Se True, inclui usage.daily e usage.total com os
+                                  eventos ainda não consolidados (exportação e migração)
+
+        Returns:
+            dict: email -> dados do usuário
+        """
+        with self._lock:
+            user_rows = self._conn.execute("SELECT * FROM users").fetchall()
+            usage_rows = (self._conn.execute("SELECT * FROM usage_events ORDER BY id").fetchall()
+                          if include_usage else [])
+
+        users = {}
+        for row in user_rows:
+            user = {column: row[column] for column in USER_COLUMNS}
+            if row["extra"]:
+                user.update(json.loads(row["extra"]))
+            if include_usage:
+                user["usage"] = {"daily": [], "total": []}
+            users[row["email"]] = user
+
+        for row in usage_rows:
+            user = users.get(row["email"])
+            if user is None:
+                continue
+            usage = self._usage_record(row)
+            if row["in_daily"]:
+                user["usage"]["daily"].append(usage)
+            if row["in_total"]:
+                user["usage"]["total"].append(dict(usage) if row["in_daily"] else usage)
+        return users
+
+    # ----- escrita por usuário -----
+
+    def insert_user(self, email, user):
+        """Cria o usuário (sem registros de uso); retorna False se o email já existe"""
+        with self._transaction() as conn:
+            cursor = conn.execute("INSERT OR IGNORE " + USER_INSERT_SQL,
+                                  self._user_row(email, user))
+            if cursor.rowcount != 1:
+                return False
+            self._count_tier_change(conn, None, user.get("tier") or "free")
+            return True
+
+    def save_user(self, email, user):
+        """Grava todos os campos do usuário (exceto o uso), criando-o se necessário"""
+        with self._transaction() as conn:
+            old_tier = self._current_tier(conn, email)
+            conn.execute("INSERT OR REPLACE " + USER_INSERT_SQL,
+                         self._user_row(email, user))
+            self._count_tier_change(conn, old_tier, user.get("tier") or "free")
+
+    def update_user(self, email, fields):
+        """
+        Atualiza apenas os campos informados do usuário
+
+        Args:
+            email (str): Email do usuário
+            fields (dict): Campos de USER_COLUMNS e valores novos
+        """
+        columns = [column for column in fields if column in USER_COLUMNS]
+        if not columns:
+            return
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        with self._transaction() as conn:
+            old_tier = self._current_tier(conn, email) if "tier" in columns else None
+            conn.execute(f"UPDATE users SET {assignments} WHERE email = ?",
+                         [fields[column] for column in columns] + [email])
+            if old_tier is not None:
+                self._count_tier_change(conn, old_tier, fields["tier"])
+
+    def add_credits(self, email, amount):
+        """
+        Soma créditos comprados ao usuário e aos créditos vendidos, numa transação
+
+        Args:
+            email (str): Email do usuário
+            amount (int): Créditos comprados
+
+        Returns:
+            dict: Campos atuais do usuário, ou None se ele não existe
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute("UPDATE users SET purchased_credits = purchased_credits + ?, "
+                                  "paid_credits_exhausted_at = NULL WHERE email = ?", (amount, email))
+            if cursor.rowcount != 1:
+                return None
+            self._bump_admin_stats(conn, [("totals", "credits_sold", amount)])
+            row = conn.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
+            return {column: row[column] for column in USER_COLUMNS}
+
+    def _insert_usage(self, conn, email, usage):
+        """Evento de uso, contador de créditos e agregados do painel (dentro de uma transação)"""
+        markets = usage.get("markets", 0) or 0
+        conn.execute("INSERT INTO usage_events (email, date, timestamp, markets, in_daily, in_total, data) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?)", self._usage_row(email, usage))
+        conn.execute("UPDATE users SET credits_used = credits_used + ? WHERE email = ?", (markets, email))
+        breakdown = add_usage_record(empty_breakdown(), usage)
+        self._bump_admin_stats(conn, admin_stats_rows(breakdown, {usage.get("date"): (1, markets)}))
+
+    def add_usage(self, email, usage):
+        """Acrescenta um registro de uso (histórico diário e total) e atualiza o contador"""
+        with self._transaction() as conn:
+            self._insert_usage(conn, email, usage)
+
+    def consume_credits(self, email, usage, base_credits):
+        """
+        Confere o saldo e registra o uso numa única transação
+
+        BEGIN IMMEDIATE obtém o lock de escrita do banco antes da leitura do
+        saldo, então consumos simultâneos (threads ou processos) são
+        serializados e nenhum deles gasta além do disponível.
+
+        Args:
+            email (str): Email do usuário
+            usage (dict): Registro de uso (com "markets" a descontar)
+            base_credits (dict): Créditos do pacote por tier
+
+        Returns:
+            tuple: (True se consumiu, campos atuais do usuário ou None se não existe)
+        """
+        markets = usage.get("markets", 0) or 0
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
+            if row is None:
+                return False, None
+            # Renovação dos créditos gratuitos na mesma transação do desconto
+            if free_credits_due(row["free_credits_exhausted_at"]) and \
+                    self._reset_free_credits(conn, email, row["free_credits_exhausted_at"]):
+                row = conn.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
+            total = base_credits.get(row["tier"], base_credits.get("free", 0)) + row["purchased_credits"]
+            if total - row["credits_used"] < markets:
+                return False, {column: row[column] for column in USER_COLUMNS}
+
+            self._insert_usage(conn, email, usage)
+            row = conn.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
+            return True, {column: row[column] for column in USER_COLUMNS}
+
+    def clear_total_usage(self, email):
+        """Zera o uso contabilizado (usage.total) e o contador, preservando o histórico diário"""
+        with self._transaction() as conn:
+            self._clear_total_usage(conn, email)
+
+    @staticmethod
+    def _clear_total_usage(conn, email):
+        conn.execute("UPDATE usage_events SET in_total = 0 WHERE email = ? AND in_total = 1", (email,))
+        conn.execute("DELETE FROM usage_events WHERE email = ? AND in_daily = 0 AND in_total = 0", (email,))
+        conn.execute("UPDATE usage_daily SET counted_markets = 0 WHERE email = ?", (email,))
+        conn.execute("UPDATE users SET credits_used = 0 WHERE email = ?", (email,))
+
+    def _reset_free_credits(self, conn, email, exhausted_at):
+        """
+        Renova os créditos gratuitos (dentro de uma transação) se a linha ainda
+        tem a marca de esgotamento lida; outra renovação concorrente já a limpou
+        """
+        cursor = conn.execute("UPDATE users SET free_credits_exhausted_at = NULL WHERE email = ? "
+                              "AND tier = 'free' AND free_credits_exhausted_at = ?", (email, exhausted_at))
+        if cursor.rowcount != 1:
+            return False
+        self._clear_total_usage(conn, email)
+        return True
+
+    def reset_free_credits(self, email, exhausted_at):
+        """
+        Renova os créditos gratuitos de um usuário esgotado em ``exhausted_at``
+
+        Args:
+            email (str): Email do usuário
+            exhausted_at (str): Marca de esgotamento conhecida (ISO)
+
+        Returns:
+            tuple: (True se esta chamada renovou, campos atuais do usuário ou None se não existe)
+        """
+        with self._transaction() as conn:
+            reset = self._reset_free_credits(conn, email, exhausted_at)
+            row = conn.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
+            return reset, ({column: row[column] for column in USER_COLUMNS} if row else None)
+
+    # ----- consolidação do histórico -----
+
+    def compact_usage(self, before):
+        """
+        Consolida os eventos de uso anteriores a uma data em agregados diários
+
+        Args:
+            before (str): Data ISO; eventos com data anterior são consolidados
+
+        Returns:
+            int: Número de eventos consolidados
+        """
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT * FROM usage_events WHERE date < ? ORDER BY id", (before,)).fetchall()
+
+            days = {}
+            for row in rows:
+                day = days.setdefault((row["email"], row["date"]), {"breakdown": empty_breakdown(),
+                                                                    "counted_markets": 0})
+                if row["in_daily"]:
+                    add_usage_record(day["breakdown"], self._usage_record(row))
+                if row["in_total"]:
+                    day["counted_markets"] += row["markets"]
+
+            for (email, day_date), day in days.items():
+                breakdown = day["breakdown"]
+                counted_markets = day["counted_markets"]
+                existing = conn.execute("SELECT counted_markets, breakdown FROM usage_daily "
+                                        "WHERE email = ? AND date = ?", (email, day_date)).fetchone()
+                if existing:
+                    merge_breakdown(breakdown, json.loads(existing["breakdown"] or "{}"))
+                    counted_markets += existing["counted_markets"]
+                conn.execute("INSERT OR REPLACE INTO usage_daily (email, date, events, markets, counted_markets, "
+                             "breakdown) VALUES (?, ?, ?, ?, ?, ?)",
+                             (email, day_date, breakdown["events"], breakdown["markets"], counted_markets,
+                              json.dumps(breakdown, ensure_ascii=False)))
+
+            conn.execute("DELETE FROM usage_events WHERE date < ?", (before,))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_compaction', ?)",
+                         (str(time.time()),))
+
+        if rows:
+            logger.info(f"Histórico de uso consolidado: {len(rows)} eventos em {len(days)} agregados diários")
+        return len(rows)
+
+    def compact_usage_if_due(self, retention_days=USAGE_RETENTION_DAYS, interval=USAGE_COMPACTION_INTERVAL):
+        """Consolida eventos antigos se a última consolidação tiver mais de ``interval`` segundos"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'last_compaction'").fetchone()
+        if row and time.time() - float(row["value"]) < interval:
+            return 0
+        return self.compact_usage((date.today() - timedelta(days=retention_days)).isoformat())
+
+    # ----- agregados do painel administrativo -----
+
+    @staticmethod
+    def _bump_admin_stats(conn, rows):
+        conn.executemany("INSERT INTO admin_stats (kind, key, value) VALUES (?, ?, ?) "
+                         "ON CONFLICT (kind, key) DO UPDATE SET value = value + excluded.value", rows)
+
+    @staticmethod
+    def _current_tier(conn, email):
+        row = conn.execute("SELECT tier FROM users WHERE email = ?", (email,)).fetchone()
+        return row["tier"] if row else None
+
+    def _count_tier_change(self, conn, old_tier, new_tier):
+        if old_tier == new_tier:
+            return
+        rows = [("tier", tier, delta) for tier, delta in ((old_tier, -1), (new_tier, 1)) if tier]
+        self._bump_admin_stats(conn, rows)
+
+    def rebuild_admin_stats(self):
+        """Recalcula admin_stats a partir dos usuários, agregados diários e eventos"""
+        with self._transaction() as conn:
+            self._rebuild_admin_stats(conn)
+
+    def _rebuild_admin_stats(self, conn):
+        # Créditos vendidos só existem como contador; sem ele, os créditos comprados
+        # atuais são a melhor estimativa
+        sold = conn.execute("SELECT value FROM admin_stats WHERE kind = 'totals' AND key = 'credits_sold'").fetchone()
+        credits_sold = (sold["value"] if sold else
+                        conn.execute("SELECT COALESCE(SUM(purchased_credits), 0) FROM users").fetchone()[0])
+
+        breakdown = empty_breakdown()
+        days = {}
+        for row in conn.execute("SELECT date, events, markets, breakdown FROM usage_daily").fetchall():
+            merge_breakdown(breakdown, json.loads(row["breakdown"] or "{}"))
+            events, markets = days.get(row["date"], (0, 0))
+            days[row["date"]] = (events + row["events"], markets + row["markets"])
+        for row in conn.execute("SELECT * FROM usage_events WHERE in_daily = 1").fetchall():
+            add_usage_record(breakdown, self._usage_record(row))
+            events, markets = days.get(row["date"], (0, 0))
+            days[row["date"]] = (events + 1, markets + row["markets"])
+
+        rows = admin_stats_rows(breakdown, days)
+        rows += [("tier", row["tier"], row["users"]) for row in
+                 conn.execute("SELECT tier, COUNT(*) AS users FROM users GROUP BY tier").fetchall()]
+        if credits_sold:
+            rows.append(("totals", "credits_sold", credits_sold))
+        conn.execute("DELETE FROM admin_stats")
+        self._bump_admin_stats(conn, rows)
+
+    def admin_summary(self, top=10, days=30, recent=20):
+        """
+        Números do painel administrativo, lidos apenas dos agregados
+
+        Args:
+            top (int): Tamanho dos rankings (ligas, jogos, times e mercados)
+            days (int): Dias de análises por dia a incluir
+            recent (int): Quantidade de análises detalhadas recentes
+
+        Returns:
+            dict: tiers, users, credits_sold, analyses, credits_used, detailed,
+                  per_day, leagues, fixtures, teams, markets_used e recent
+        """
+        since = (date.today() - timedelta(days=days - 1)).isoformat()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, key, value FROM admin_stats WHERE kind IN ('tier', 'totals') "
+                "OR (kind IN ('day_analyses', 'day_credits') AND key >= ?)", (since,)
+            ).fetchall()
+            rankings = {
+                name: [(row["key"], row["value"]) for row in self._conn.execute(
+                    "SELECT key, value FROM admin_stats WHERE kind = ? AND value > 0 "
+                    "ORDER BY value DESC, key LIMIT ?", (kind, top)).fetchall()]
+                for kind, name in ADMIN_RANKINGS
+            }
+            # Eventos mais recentes primeiro (a chave primária já está em ordem de inserção)
+            recent_rows = self._conn.execute("SELECT * FROM usage_events WHERE in_daily = 1 "
+                                             "ORDER BY id DESC LIMIT ?", (recent * 5,)).fetchall()
+
+        tiers = {row["key"]: row["value"] for row in rows if row["kind"] == "tier" and row["value"] > 0}
+        totals = {row["key"]: row["value"] for row in rows if row["kind"] == "totals"}
+        per_day = {}
+        for row in rows:
+            if row["kind"] in ("day_analyses", "day_credits"):
+                per_day.setdefault(row["key"], {"date": row["key"], "analyses": 0, "credits": 0})
+                per_day[row["key"]]["analyses" if row["kind"] == "day_analyses" else "credits"] = row["value"]
+
+        detailed = []
+        for row in recent_rows:
+            usage = self._usage_record(row)
+            if "league" in usage and len(detailed) < recent:
+                detailed.append(dict(usage, email=row["email"]))
+
+        return dict(
+            tiers=tiers,
+            users=sum(tiers.values()),
+            credits_sold=totals.get("credits_sold", 0),
+            analyses=totals.get("analyses", 0),
+            credits_used=totals.get("credits_used", 0),
+            detailed=totals.get("detailed", 0),
+            per_day=[per_day[day] for day in sorted(per_day)],
+            recent=detailed,
+            **rankings
+        )
+
+    def list_users(self, offset=0, limit=50, search=None):
+        """
+        Uma página da lista de usuários, em ordem de email
+
+        Args:
+            offset (int): Posição inicial
+            limit (int): Tamanho da página
+            search (str): Trecho do email ou do nome (opcional)
+
+        Returns:
+            tuple: (lista de dicts email/name/tier/purchased_credits/credits_used, total)
+        """
+        where, params = "", []
+        if search:
+            where, params = "WHERE email LIKE ? OR name LIKE ?", [f"%{search}%", f"%{search}%"]
+        with self._lock:
+            if search:
+                total = self._conn.execute(f"SELECT COUNT(*) FROM users {where}", params).fetchone()[0]
+            else:
+                total = self._conn.execute("SELECT COALESCE(SUM(value), 0) FROM admin_stats "
+                                           "WHERE kind = 'tier'").fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT email, name, tier, purchased_credits, credits_used FROM users {where} "
+                f"ORDER BY email LIMIT ? OFFSET ?", params + [limit, offset]
+            ).fetchall()
+        return [dict(row) for row in rows], total
+
+    # ----- contadores -----
+
+    def check_credit_counters(self, repair=False):
+        """
+        Confere os contadores de créditos usados contra os eventos de uso
+
+        Args:
+            repair (bool): Se True, reconstrói os contadores divergentes
+
+        Returns:
+            list: Tuplas (email, contador gravado, soma dos eventos) divergentes
+        """
+        with self._transaction() as conn:
+            mismatches = [tuple(row) for row in conn.execute(
+                f"SELECT email, credits_used, ({COUNTED_USAGE_SQL}) AS expected FROM users "
+                f"WHERE credits_used != expected"
+            ).fetchall()]
+            if repair and mismatches:
+                conn.execute(f"UPDATE users SET credits_used = ({COUNTED_USAGE_SQL}) "
+                             f"WHERE credits_used != ({COUNTED_USAGE_SQL})")
+        return mismatches
+
+    # ----- importação -----
+
+    def import_users(self, users, replace=False):
+        """
+        Importa usuários no formato do user_data.json numa única transação
+
+        Registros presentes em usage.daily e usage.total viram um único
+        evento; os que só aparecem numa das listas são marcados como tal.
+
+        Args:
+            users (dict): email -> dados do usuário
+            replace (bool): Se True, substitui usuários já existentes no banco
+
+        Returns:
+            tuple: (usuários importados, registros de uso importados)
+        """
+        imported_users = 0
+        imported_usage = 0
+        with self._transaction() as conn:
+            for email, user in users.items():
+                exists = conn.execute("SELECT 1 FROM users WHERE email = ?", (email,)).fetchone()
+                if exists and not replace:
+                    continue
+                conn.execute("DELETE FROM usage_events WHERE email = ?", (email,))
+                conn.execute("DELETE FROM usage_daily WHERE email = ?", (email,))
+                conn.execute("INSERT OR REPLACE " + USER_INSERT_SQL,
+                             self._user_row(email, user))
+                imported_users += 1
+
+                usage = user.get("usage") or {}
+                total = list(usage.get("total") or [])
+                rows = []
+                for record in usage.get("daily") or []:
+                    in_total = record in total
+                    if in_total:
+                        total.remove(record)
+                    rows.append(self._usage_row(email, record, True, in_total))
+                rows.extend(self._usage_row(email, record, False, True) for record in total)
+                conn.executemany("INSERT INTO usage_events (email, date, timestamp, markets, in_daily, in_total, "
+                                 "data) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.execute(f"UPDATE users SET credits_used = ({COUNTED_USAGE_SQL}) WHERE email = ?", (email,))
+                imported_usage += len(rows)
+            self._rebuild_admin_stats(conn)
+        return imported_users, imported_usage